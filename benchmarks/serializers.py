@@ -0,0 +1,63 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Times the bulk serialization of interfaces against serializing each one by merging dictionaries,
+like the serializers did before the plans.
+
+    python benchmarks/serializers.py [interfaces]
+"""
+
+import sys
+import timeit
+
+from netman.api.objects import base_interface, interface
+from netman.core.objects.interface import Interface
+from netman.core.objects.port_modes import TRUNK
+
+RUNS = 5
+
+
+def merged_interface_to_api(i):
+    return dict(
+        dict(
+            shutdown=i.shutdown,
+            port_mode=base_interface.serialized_port_mode[i.port_mode],
+            access_vlan=i.access_vlan,
+            trunk_native_vlan=i.trunk_native_vlan,
+            trunk_vlans=sorted(i.trunk_vlans),
+            mtu=i.mtu
+        ),
+        name=i.name,
+        bond_master=i.bond_master,
+        auto_negotiation=i.auto_negotiation,
+        force_up=i.force_up,
+        recovery_timeout=i.recovery_timeout
+    )
+
+
+def main(count):
+    interfaces = [Interface(name="ge-0/0/{}".format(i), port_mode=TRUNK, trunk_vlans=range(1, 50))
+                  for i in range(count)]
+
+    merged = min(timeit.repeat(lambda: [merged_interface_to_api(i) for i in interfaces], number=1, repeat=RUNS))
+    bulk = min(timeit.repeat(lambda: interface.to_api_list(interfaces), number=1, repeat=RUNS))
+
+    print("{} interfaces, best of {} runs".format(count, RUNS))
+    print("  merging dictionaries : {:.3f}s".format(merged))
+    print("  bulk                 : {:.3f}s ({:.2f}x)".format(bulk, merged / bulk))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
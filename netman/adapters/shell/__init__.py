@@ -14,3 +14,4 @@
 
 default_command_timeout = 300
 default_connect_timeout = 60
+default_pipelining = False
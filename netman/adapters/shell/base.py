@@ -13,11 +13,18 @@
 # limitations under the License.
 
 
+# what is logged and timed instead of a sensitive command, such as a password
+SENSITIVE_COMMAND_LABEL = "<sensitive>"
+
+
 class TerminalClient(object):
-    def do(self, command, wait_for=None, include_last_line=False):
+    def do(self, command, wait_for=None, include_last_line=False, sensitive=False):
         raise NotImplemented()
 
-    def send_key(self, key, wait_for=None, include_last_line=False):
+    def do_many(self, commands):
+        return [self.do(command) for command in commands]
+
+    def send_key(self, key, wait_for=None, include_last_line=False, sensitive=False):
         raise NotImplemented()
 
     def quit(self, command):
@@ -19,14 +19,15 @@ import time
 import paramiko
 from netman.adapters import shell
 
-from netman.adapters.shell.base import TerminalClient
+from netman.adapters.shell.base import TerminalClient, SENSITIVE_COMMAND_LABEL
+from netman.core import metrics
 from netman.core.objects.exceptions import CouldNotConnect, ConnectTimeout, CommandTimeout
 
 
 class SshClient(TerminalClient):
 
     def __init__(self, host, username, password, port=22, prompt=('>', '#'), connect_timeout=None, command_timeout=None,
-                 reading_interval=0.01, reading_chunk_size=9999):
+                 reading_interval=0.01, reading_chunk_size=9999, pipelining=None):
         self.logger = logging.getLogger(__name__)
 
         self.host = host
@@ -37,25 +38,49 @@ class SshClient(TerminalClient):
         connect_timeout = connect_timeout or shell.default_connect_timeout
         self.reading_interval = reading_interval
         self.reading_chunk_size = reading_chunk_size
+        self.pipelining = shell.default_pipelining if pipelining is None else pipelining
 
         self.current_buffer = ''
         self.client = None
         self.channel = None
         self.full_log = ""
 
-        self._open_channel(host, port, username, password, connect_timeout)
+        with metrics.timed("ssh", "login") as measure:
+            self._open_channel(host, port, username, password, connect_timeout)
+            measure.received_bytes = len(self.full_log)
 
-    def do(self, command, wait_for=None, include_last_line=False):
-        self.logger.debug("[SSH][{}@{}:{}] Send >> {}".format(self.username, self.host, self.port, command))
+    def do(self, command, wait_for=None, include_last_line=False, sensitive=False):
+        label = SENSITIVE_COMMAND_LABEL if sensitive else command
+        self.logger.debug("[SSH][{}@{}:{}] Send >> {}".format(self.username, self.host, self.port, label))
 
-        self.channel.send(command + '\n')
-        return self._read_until(wait_for, include_last_line)
+        with metrics.timed("ssh", label) as measure:
+            self.channel.send(command + '\n')
+            result = self._read_until(wait_for, include_last_line)
+            measure.received_bytes = len(self.current_buffer)
+        return result
+
+    def do_many(self, commands):
+        if not self.pipelining or len(commands) < 2:
+            return super(SshClient, self).do_many(commands)
+
+        self.logger.debug("[SSH][{}@{}:{}] Send >> {}".format(self.username, self.host, self.port, " | ".join(commands)))
+
+        with metrics.timed("ssh", "pipeline") as measure:
+            self.channel.send("".join(command + '\n' for command in commands))
+            results = self._read_pipelined(commands)
+            measure.received_bytes = len(self.current_buffer)
+
+        return results
 
-    def send_key(self, key, wait_for=None, include_last_line=False):
-        self.logger.debug("[SSH][{}@{}:{}] Send KEY >> {}".format(self.username, self.host, self.port, key))
+    def send_key(self, key, wait_for=None, include_last_line=False, sensitive=False):
+        label = SENSITIVE_COMMAND_LABEL if sensitive else repr(key)
+        self.logger.debug("[SSH][{}@{}:{}] Send KEY >> {}".format(self.username, self.host, self.port, label))
 
-        self.channel.send(key)
-        return self._read_until(wait_for, include_last_line)
+        with metrics.timed("ssh", label) as measure:
+            self.channel.send(key)
+            result = self._read_until(wait_for, include_last_line)
+            measure.received_bytes = len(self.current_buffer)
+        return result
 
     def quit(self, command):
         self.logger.debug("[SSH][{}@{}:{}] Quit >> {}".format(self.username, self.host, self.port, command))
@@ -109,6 +134,59 @@ class SshClient(TerminalClient):
             self.full_log += read
             self.current_buffer += read
 
+    def _read_pipelined(self, commands):
+        self.current_buffer = ''
+
+        # the commands are in the input of the shell already, they are never written again: a slow command
+        # only delays the echoes of the next ones
+        started_at = time.time()
+        while True:
+            while self.channel.recv_ready():
+                read = self.channel.recv(self.reading_chunk_size)
+                self.logger.debug("[SSH][{}@{}:{}] Recv << {}".format(self.username, self.host, self.port, repr(read)))
+                self.full_log += read
+                self.current_buffer += read
+
+            results = split_pipelined_output(self.current_buffer, commands, self.prompt)
+            if len(results) == len(commands):
+                return results
+
+            if time.time() - started_at > self.command_timeout:
+                raise CommandTimeout(self.prompt, self.current_buffer)
+
+            time.sleep(self.reading_interval)
+
     def __del__(self):
         if self.client:
             self.client.close()
+
+
+def split_pipelined_output(buffer, commands, prompt):
+    """
+    Splits what a shell answered to commands written all at once into the output of each command.
+
+    Every command is echoed after the prompt that ended the output of the previous one, the output
+    of the last command is complete once the buffer ends with the prompt again. Commands the shell
+    did not answer, because it dropped them or is still working on them, are left out.
+    """
+    lines = buffer.splitlines()
+    if not lines or not lines[0].endswith(commands[0]):
+        return []
+
+    results = []
+    start = 0
+    for command in commands[1:]:
+        end = next((i for i in range(start + 1, len(lines)) if _is_echo_of(lines[i], command, prompt)), None)
+        if end is None:
+            break
+        results.append(filter(None, lines[start + 1:end]))
+        start = end
+
+    if buffer.endswith(prompt) and start < len(lines) - 1:
+        results.append(filter(None, lines[start + 1:-1]))
+
+    return results
+
+
+def _is_echo_of(line, command, prompt):
+    return line.endswith(command) and line[:len(line) - len(command)].endswith(prompt)
@@ -17,7 +17,8 @@ import telnetlib
 from telnetlib import IAC, DO, DONT, WILL, WONT
 
 from netman.adapters import shell
-from netman.adapters.shell.base import TerminalClient
+from netman.adapters.shell.base import TerminalClient, SENSITIVE_COMMAND_LABEL
+from netman.core import metrics
 from netman.core.objects.exceptions import CouldNotConnect, CommandTimeout, ConnectTimeout
 
 
@@ -32,18 +33,24 @@ class TelnetClient(TerminalClient):
         self.connect_timeout = connect_timeout or shell.default_connect_timeout
         self.full_log = ""
 
-        self.telnet = self._connect()
-        self._login(username, password)
+        with metrics.timed("telnet", "login") as measure:
+            self.telnet = self._connect()
+            self._login(username, password)
+            measure.received_bytes = len(self.full_log)
 
-    def do(self, command, wait_for=None, include_last_line=False):
-        self.telnet.write(str(command) + "\r\n")
-        result = self._read_until(wait_for)
+    def do(self, command, wait_for=None, include_last_line=False, sensitive=False):
+        with metrics.timed("telnet", SENSITIVE_COMMAND_LABEL if sensitive else command) as measure:
+            self.telnet.write(str(command) + "\r\n")
+            result = self._read_until(wait_for)
+            measure.received_bytes = len(result)
 
         return _filter_input_and_empty_lines(command, include_last_line, result)
 
-    def send_key(self, key, wait_for=None, include_last_line=False):
-        self.telnet.write(key)
-        result = self._read_until(wait_for)
+    def send_key(self, key, wait_for=None, include_last_line=False, sensitive=False):
+        with metrics.timed("telnet", SENSITIVE_COMMAND_LABEL if sensitive else repr(key)) as measure:
+            self.telnet.write(key)
+            result = self._read_until(wait_for)
+            measure.received_bytes = len(result)
 
         return _filter_input_and_empty_lines(key, include_last_line, result)
 
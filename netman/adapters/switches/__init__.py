@@ -13,12 +13,12 @@
 # limitations under the License.
 import warnings
 
-from netman.adapters.switches import brocade
 from netman.core.objects.switch_transactional import FlowControlSwitch
 
 
 def brocade_factory_ssh(switch_descriptor, lock):
     warnings.warn("Use SwitchFactory.get_switch_by_descriptor directly to instantiate a switch", DeprecationWarning)
+    from netman.adapters.switches import brocade
     return FlowControlSwitch(
         wrapped_switch=brocade.ssh(switch_descriptor=switch_descriptor),
         lock=lock
@@ -27,6 +27,7 @@ def brocade_factory_ssh(switch_descriptor, lock):
 
 def brocade_factory_telnet(switch_descriptor, lock):
     warnings.warn("Use SwitchFactory.get_switch_by_descriptor directly to instantiate a switch", DeprecationWarning)
+    from netman.adapters.switches import brocade
     return FlowControlSwitch(
         wrapped_switch=brocade.telnet(switch_descriptor=switch_descriptor),
         lock=lock
@@ -1,4 +1,10 @@
+import httplib
+import json
 import re
+import select
+import socket
+import threading
+import uuid
 import warnings
 
 import pyeapi
@@ -9,6 +15,7 @@ from pyeapi.eapilib import CommandError
 from netman import regex
 from netman.adapters.shell import default_command_timeout
 from netman.adapters.switches.util import split_on_dedent
+from netman.core import metrics
 from netman.core.objects.exceptions import VlanAlreadyExist, UnknownVlan, BadVlanNumber, BadVlanName, \
     IPAlreadySet, IPNotAvailable, UnknownIP, DhcpRelayServerAlreadyExists, UnknownDhcpRelayServer, UnknownInterface, \
     UnknownBond, VarpAlreadyExistsForVlan, VarpDoesNotExistForVlan, BadLoadIntervalNumber
@@ -17,6 +24,7 @@ from netman.core.objects.interface_states import OFF, ON
 from netman.core.objects.port_modes import ACCESS, TRUNK
 from netman.core.objects.switch_base import SwitchBase
 from netman.core.objects.vlan import Vlan
+from netman.core.objects.vlan_set import VlanSet
 from netman.core.validator import is_valid_mpls_state
 
 
@@ -39,38 +47,59 @@ def eapi(switch_descriptor):
 
 
 class Arista(SwitchBase):
-    def __init__(self, switch_descriptor, transport):
+    def __init__(self, switch_descriptor, transport, deferred_edits=False, write_memory=True, node_pool=None):
         super(Arista, self).__init__(switch_descriptor)
         self.switch_descriptor = switch_descriptor
         self.transport = transport
+        self.deferred_edits = deferred_edits
+        self.write_memory = write_memory
+        self.node_pool = node_pool if node_pool is not None else eapi_node_pool
+        self.pending_commands = []
+        self.node = None
 
     def _connect(self):
-        self.node = pyeapi.connect(host=self.switch_descriptor.hostname,
-                                   username=self.switch_descriptor.username,
-                                   password=self.switch_descriptor.password,
-                                   port=self.switch_descriptor.port,
-                                   transport=self.transport,
-                                   return_node=True,
-                                   timeout=default_command_timeout)
+        self.node = self.node_pool.acquire(self._pool_key(), self._new_node)
 
     def _disconnect(self):
+        if self.node is not None:
+            self.node_pool.release(self._pool_key(), self.node)
         self.node = None
 
+    def _new_node(self):
+        node = pyeapi.connect(host=self.switch_descriptor.hostname,
+                              username=self.switch_descriptor.username,
+                              password=self.switch_descriptor.password,
+                              port=self.switch_descriptor.port,
+                              transport=self.transport,
+                              return_node=True,
+                              timeout=default_command_timeout)
+        node.connection.transport = PersistentTransport(node.connection.transport)
+        return node
+
+    def _pool_key(self):
+        return (self.transport, self.switch_descriptor.hostname, self.switch_descriptor.port,
+                self.switch_descriptor.username, self.switch_descriptor.password)
+
     def _end_transaction(self):
-        pass
+        self.pending_commands = []
 
     def _start_transaction(self):
-        pass
+        self.pending_commands = []
 
     def commit_transaction(self):
-        self.node.enable('write memory')
+        self.flush_commands()
+        if self.write_memory:
+            self.save_configuration()
+
+    def save_configuration(self):
+        self._enable('write memory')
 
     def rollback_transaction(self):
-        pass
+        self.pending_commands = []
 
     def get_vlan(self, number):
         try:
-            vlans_result, interfaces_result = self.node.enable(
+            vlans_result, interfaces_result = self._enable(
                 ["show vlan {}".format(number), "show interfaces Vlan{}".format(number)], strict=True)
             vlans_info = vlans_result['result']
             interfaces_info = interfaces_result['result']
@@ -92,11 +121,19 @@ class Arista(SwitchBase):
         return vlans[0]
 
     def get_vlans(self):
-        vlans_result, interfaces_result = self.node.enable(["show vlan", "show interfaces"], strict=True)
+        vlans_result, = self._enable(["show vlan"], strict=True)
 
         vlans = _extract_vlans(vlans_result['result'])
-        _apply_interface_data(interfaces_result['result'], vlans)
-        self._apply_interface_vlan_data(vlans)
+        self._apply_interface_vlan_data(vlans, with_ips=True)
+
+        return sorted(vlans, key=lambda v: v.number)
+
+    def get_vlans_by_number(self, numbers):
+        vlans_result, = self._enable(["show vlan"], strict=True)
+
+        vlans = [vlan for vlan in _extract_vlans(vlans_result['result']) if vlan.number in numbers]
+        if len(vlans) > 0:
+            self._apply_interface_vlan_data(vlans, with_ips=True)
 
         return sorted(vlans, key=lambda v: v.number)
 
@@ -104,7 +141,7 @@ class Arista(SwitchBase):
         if not isvlan(number):
             raise BadVlanNumber()
         try:
-            self.node.enable(["show vlan {}".format(number)], strict=True)
+            self._enable(["show vlan {}".format(number)], strict=True)
             raise VlanAlreadyExist(number)
         except CommandError:
             pass
@@ -113,18 +150,36 @@ class Arista(SwitchBase):
         if name is not None:
             commands.append("name {}".format(name))
 
-        try:
-            self.node.config(commands)
-        except CommandError:
+        def errors(_):
             raise BadVlanName()
 
+        self._config(commands, errors=errors)
+
     def remove_vlan(self, number):
         try:
-            self.node.enable(["show vlan {}".format(number)], strict=True)
+            self._enable(["show vlan {}".format(number)], strict=True)
         except CommandError:
             raise UnknownVlan(number)
 
-        self.node.config(["no interface Vlan{}".format(number), "no vlan {}".format(number)])
+        self._config(["no interface Vlan{}".format(number), "no vlan {}".format(number)])
+
+    def add_vlans(self, numbers):
+        existing = self._existing_vlan_numbers(numbers)
+        if len(existing) > 0:
+            raise VlanAlreadyExist(existing[0])
+
+        self._config(["vlan {}".format(number) for number in numbers])
+
+    def remove_vlans(self, numbers):
+        existing = self._existing_vlan_numbers(numbers)
+        missing = [number for number in numbers if number not in existing]
+        if len(missing) > 0:
+            raise UnknownVlan(missing[0])
+
+        commands = []
+        for number in numbers:
+            commands.extend(["no interface Vlan{}".format(number), "no vlan {}".format(number)])
+        self._config(commands)
 
     def add_ip_to_vlan(self, vlan_number, ip_network):
         vlan = self.get_vlan(vlan_number)
@@ -140,11 +195,12 @@ class Arista(SwitchBase):
             "interface vlan {}".format(vlan_number),
             add_ip_command
         ]
-        try:
-            self.node.config(commands)
-        except CommandError as e:
+
+        def errors(e):
             raise IPNotAvailable(ip_network, reason=str(e))
 
+        self._config(commands, errors=errors)
+
     def remove_ip_from_vlan(self, vlan_number, ip_network):
         vlan = self.get_vlan(vlan_number)
         existing_ip = next((ip for ip in vlan.ips
@@ -165,7 +221,7 @@ class Arista(SwitchBase):
                 "interface Vlan{}".format(vlan_number),
                 remove_ip_command
             ]
-            self.node.config(commands)
+            self._config(commands)
         else:
             raise UnknownIP(ip_network)
 
@@ -175,7 +231,7 @@ class Arista(SwitchBase):
             "show interfaces {} switchport".format(interface_id)
         ]
         try:
-            result = self.node.enable(commands, strict=True)
+            result = self._enable(commands, strict=True)
         except CommandError:
             raise UnknownInterface(interface_id)
 
@@ -189,21 +245,44 @@ class Arista(SwitchBase):
             "show interfaces",
             "show interfaces switchport"
         ]
-        result = self.node.enable(commands, strict=True)
+        result = self._enable(commands, strict=True)
 
         interfaces = parse_interfaces(result[0]['result']['interfaces'], result[1]['result']['switchports'])
         return interfaces
 
+    def get_interfaces_by_name(self, names):
+        commands = []
+        for name in names:
+            commands += ["show interfaces {}".format(name), "show interfaces {} switchport".format(name)]
+        try:
+            result = self._enable(commands, strict=True)
+        except CommandError:
+            return self._get_existing_interfaces(names)
+
+        interfaces_data = {}
+        switchports_data = {}
+        for interfaces_result, switchports_result in zip(result[::2], result[1::2]):
+            interfaces_data.update(interfaces_result['result']['interfaces'])
+            switchports_data.update(switchports_result['result']['switchports'])
+
+        return parse_interfaces(interfaces_data, switchports_data)
+
+    def _get_existing_interfaces(self, names):
+        interfaces = []
+        for name in names:
+            try:
+                interfaces.append(self.get_interface(name))
+            except UnknownInterface:
+                pass
+        return interfaces
+
     def set_trunk_mode(self, interface_id):
         commands = [
             "interface {}".format(interface_id),
             "switchport mode trunk",
             "switchport trunk allowed vlan none"
         ]
-        try:
-            self.node.config(commands)
-        except CommandError:
-            raise UnknownInterface(interface_id)
+        self._config(commands, errors=unknown_interface(interface_id))
 
     def add_trunk_vlan(self, interface_id, vlan):
         self.get_vlan(vlan)
@@ -211,10 +290,7 @@ class Arista(SwitchBase):
             "interface {}".format(interface_id),
             "switchport trunk allowed vlan add {}".format(vlan)
         ]
-        try:
-            self.node.config(commands)
-        except CommandError:
-            raise UnknownInterface(interface_id)
+        self._config(commands, errors=unknown_interface(interface_id))
 
     def remove_trunk_vlan(self, interface_id, vlan):
         interface = self.get_interface(interface_id)
@@ -225,7 +301,30 @@ class Arista(SwitchBase):
             "interface {}".format(interface_id),
             "switchport trunk allowed vlan remove {}".format(vlan)
         ]
-        self.node.config(commands)
+        self._config(commands)
+
+    def add_trunk_vlans(self, interface_id, vlans):
+        missing = VlanSet(vlans) - self._existing_vlan_numbers(vlans)
+        if len(missing) > 0:
+            raise UnknownVlan(missing[0])
+
+        commands = [
+            "interface {}".format(interface_id),
+            "switchport trunk allowed vlan add {}".format(VlanSet(vlans).to_ranges_string())
+        ]
+        self._config(commands, errors=unknown_interface(interface_id))
+
+    def remove_trunk_vlans(self, interface_id, vlans):
+        interface = self.get_interface(interface_id)
+        missing = VlanSet(vlans) - interface.trunk_vlans
+        if len(missing) > 0:
+            raise UnknownVlan(missing[0])
+
+        commands = [
+            "interface {}".format(interface_id),
+            "switchport trunk allowed vlan remove {}".format(VlanSet(vlans).to_ranges_string())
+        ]
+        self._config(commands)
 
     def set_bond_trunk_mode(self, number):
         with NamedBond(number) as bond:
@@ -245,8 +344,8 @@ class Arista(SwitchBase):
         if ip_address in vlan.dhcp_relay_servers:
             raise DhcpRelayServerAlreadyExists(vlan_number=vlan_number, ip_address=ip_address)
 
-        self.node.config(['interface Vlan{}'.format(vlan_number),
-                          'ip helper-address {}'.format(ip_address)])
+        self._config(['interface Vlan{}'.format(vlan_number),
+                      'ip helper-address {}'.format(ip_address)])
 
     def remove_dhcp_relay_server(self, vlan_number, ip_address):
         vlan = self.get_vlan(vlan_number)
@@ -254,30 +353,30 @@ class Arista(SwitchBase):
         if ip_address not in vlan.dhcp_relay_servers:
             raise UnknownDhcpRelayServer(vlan_number=vlan_number, ip_address=ip_address)
 
-        self.node.config(['interface Vlan{}'.format(vlan_number),
-                          'no ip helper-address {}'.format(ip_address)])
+        self._config(['interface Vlan{}'.format(vlan_number),
+                      'no ip helper-address {}'.format(ip_address)])
 
     def set_vlan_load_interval(self, vlan_number, time_interval):
         self.get_vlan(vlan_number)
 
-        try:
-            self.node.config(['interface Vlan{}'.format(vlan_number),
-                              'load-interval {}'.format(time_interval)])
-        except CommandError:
+        def errors(_):
             raise BadLoadIntervalNumber()
 
+        self._config(['interface Vlan{}'.format(vlan_number),
+                      'load-interval {}'.format(time_interval)], errors=errors)
+
     def unset_vlan_load_interval(self, vlan_number):
         self.get_vlan(vlan_number)
 
-        self.node.config(['interface Vlan{}'.format(vlan_number),
-                          'no load-interval'])
+        self._config(['interface Vlan{}'.format(vlan_number),
+                      'no load-interval'])
 
     def set_vlan_mpls_ip_state(self, vlan_number, state):
         is_valid_mpls_state(state)
         self.get_vlan(vlan_number)
 
-        self.node.config(['interface Vlan{}'.format(vlan_number),
-                          'mpls ip' if state else 'no mpls ip'])
+        self._config(['interface Vlan{}'.format(vlan_number),
+                      'mpls ip' if state else 'no mpls ip'])
 
     def add_vlan_varp_ip(self, vlan_number, ip_network):
         vlan = self.get_vlan(vlan_number)
@@ -285,13 +384,13 @@ class Arista(SwitchBase):
         if ip_network in vlan.varp_ips:
             raise VarpAlreadyExistsForVlan(vlan=vlan_number, ip_network=ip_network)
 
-        try:
-            self.node.config(['interface Vlan{}'.format(vlan_number),
-                              'ip virtual-router address {}'.format(ip_network)])
-        except CommandError as e:
+        def errors(e):
             if regex.match("^.*is already assigned to interface Vlan(\d+)]", e.message):
                 raise IPNotAvailable(ip_network=ip_network, reason=str(e))
-            raise
+            raise e
+
+        self._config(['interface Vlan{}'.format(vlan_number),
+                      'ip virtual-router address {}'.format(ip_network)], errors=errors)
 
     def remove_vlan_varp_ip(self, vlan_number, ip_network):
         vlan = self.get_vlan(vlan_number)
@@ -299,36 +398,295 @@ class Arista(SwitchBase):
         if ip_network not in vlan.varp_ips:
             raise VarpDoesNotExistForVlan(vlan=vlan_number, ip_network=ip_network)
 
-        self.node.config(['interface Vlan{}'.format(vlan_number),
-                          'no ip virtual-router address {}'.format(ip_network)])
+        self._config(['interface Vlan{}'.format(vlan_number),
+                      'no ip virtual-router address {}'.format(ip_network)])
 
-    def _apply_interface_vlan_data(self, vlans):
+    def _apply_interface_vlan_data(self, vlans, with_ips=False):
+        # with_ips reads the addresses from the config rather than from "show interfaces", whose
+        # reply carries the counters of every port when listing all vlans
         config = self._fetch_interface_vlans_config(vlans)
+        vlans_by_number = {vlan.number: vlan for vlan in vlans}
 
         for interface in split_on_dedent(config):
             if regex.match("^.*Vlan(\d+)$", interface[0]):
-                vlan = _find_vlan_by_number(vlans, regex[0])
+                vlan = vlans_by_number[int(regex[0])]
                 for line in interface[1:]:
-                    if regex.match(" *ip helper-address (.*)", line):
+                    setting = line.strip()
+                    if setting.startswith("ip helper-address "):
+                        address = setting[len("ip helper-address "):]
                         try:
-                            vlan.dhcp_relay_servers.append(IPAddress(regex[0]))
+                            vlan.dhcp_relay_servers.append(IPAddress(address))
                         except AddrFormatError:
                             self.logger.warning(
-                                'Unsupported IP Helper address found in Vlan {} : {}'.format(vlan.number, regex[0]))
-                    if regex.match(" *ip virtual-router address (.*)", line):
-                        vlan.varp_ips.append(IPNetwork(regex[0]))
-                    if regex.match(" *load-interval (.*)", line):
-                        vlan.load_interval = int(regex[0])
-                    if regex.match(" *no mpls ip", line):
+                                'Unsupported IP Helper address found in Vlan {} : {}'.format(vlan.number, address))
+                    elif setting.startswith("ip virtual-router address "):
+                        vlan.varp_ips.append(IPNetwork(setting[len("ip virtual-router address "):]))
+                    elif setting.startswith("load-interval "):
+                        vlan.load_interval = int(setting[len("load-interval "):])
+                    elif setting == "no mpls ip":
                         vlan.mpls_ip = False
+                    elif with_ips and setting.startswith("ip address "):
+                        address = setting.split()[2]
+                        try:
+                            vlan.ips.append(IPNetwork(address))
+                        except AddrFormatError:
+                            self.logger.warning(
+                                'Unsupported IP address found in Vlan {} : {}'.format(vlan.number, address))
 
     def _fetch_interface_vlans_config(self, vlans):
         all_interface_vlans = sorted('Vlan{}'.format(vlan.number) for vlan in vlans)
-        return self.node.get_config(params='interfaces {}'.format(' '.join(all_interface_vlans)))
+        if self._pending_subjects() & {_vlan_subject(vlan.number) for vlan in vlans}:
+            self.flush_commands()
+        params = 'interfaces {}'.format(' '.join(all_interface_vlans))
+        with metrics.timed("eapi", "show running-config {}".format(params)):
+            return self.node.get_config(params=params)
+
+    def flush_commands(self):
+        if len(self.pending_commands) == 0:
+            return
+
+        pending_commands, self.pending_commands = self.pending_commands, []
+        session = "netman-{}".format(uuid.uuid4().hex)
+
+        commands = ["configure session {}".format(session)]
+        operations = [None]
+        for index, (operation_commands, _) in enumerate(pending_commands):
+            commands.extend(operation_commands)
+            operations.extend([index] * len(operation_commands))
+        commands.append("commit")
+
+        try:
+            with metrics.timed("eapi", "configure session ({} commands)".format(len(commands) - 2)):
+                self.node.run_commands(commands)
+        except CommandError as e:
+            self._abort_session(session)
+
+            # the output holds the result of every command ran, "enable" included, up to the failing one
+            failed = len(e.output or []) - 2
+            operation = operations[failed] if 0 <= failed < len(operations) else None
+            if operation is None or pending_commands[operation][1] is None:
+                raise
+            pending_commands[operation][1](e)
+
+            self.pending_commands = pending_commands[:operation] + pending_commands[operation + 1:]
+            self.flush_commands()
+
+    def _abort_session(self, session):
+        try:
+            self.node.run_commands(["configure session {}".format(session), "abort"])
+        except CommandError as e:
+            self.logger.warning("Could not abort configuration session {} : {}".format(session, e))
+
+    def _existing_vlan_numbers(self, numbers):
+        vlans_result, = self._enable(["show vlan"], strict=True)
+        return sorted(int(number) for number in vlans_result['result']['vlans'] if int(number) in numbers)
+
+    def _pending_subjects(self):
+        return {_config_subject(command)
+                for operation_commands, _ in self.pending_commands
+                for command in operation_commands} - {None}
+
+    def _enable(self, commands, **kwargs):
+        # reads run outside the configure session, against the running config: the queue is only sent
+        # first when a read looks at a vlan or an interface it changes, so that the checks still see it
+        pending = self._pending_subjects()
+        if pending and any(_reads(command, pending) for command in _as_list(commands)):
+            self.flush_commands()
+        with metrics.timed("eapi", _describe(commands)):
+            return self.node.enable(commands, **kwargs)
+
+    def _config(self, commands, errors=None, **kwargs):
+        # errors is called with the CommandError refusing the commands, it raises what explains the failure
+        # or returns if the error can be ignored.
+        if self.deferred_edits and self.in_transaction:
+            self.pending_commands.append((commands, errors))
+            return
+
+        try:
+            with metrics.timed("eapi", _describe(commands)):
+                return self.node.config(commands, **kwargs)
+        except CommandError as e:
+            if errors is None:
+                raise
+            errors(e)
+
+
+def _describe(commands):
+    return commands if isinstance(commands, basestring) else "; ".join(commands)
+
+
+def _as_list(commands):
+    return [commands] if isinstance(commands, basestring) else commands
+
+
+def _vlan_subject(number):
+    return "vlan", int(number)
+
+
+def _interface_subject(name):
+    if regex.match("^vlan\s*(\d+)$", name.lower()):
+        return _vlan_subject(regex[0])
+    return "interface", name.lower()
+
+
+def _config_subject(command):
+    if regex.match("^(?:no )?vlan (\d+)$", command.strip()):
+        return _vlan_subject(regex[0])
+    if regex.match("^(?:no )?interface (.+)$", command.strip()):
+        return _interface_subject(regex[0])
+    return None
+
+
+def _reads(command, subjects):
+    if regex.match("^show vlan (\d+)$", command):
+        return _vlan_subject(regex[0]) in subjects
+    if regex.match("^show vlan$", command):
+        return any(kind == "vlan" for kind, _ in subjects)
+    if regex.match("^show interfaces (\S+)(?: switchport)?$", command) and regex[0] != "switchport":
+        return _interface_subject(regex[0]) in subjects
+    return True
+
+
+class EapiNodePool(object):
+    """
+    Idle eAPI nodes of each switch, with their HTTP connection still open.
+
+    A node is used by one switch instance at a time, between its connect and its disconnect, the
+    pool only hands it to the next one so that requests reuse the connection instead of opening a
+    new one and going through the TLS handshake again.
+    """
+
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self.lock = threading.Lock()
+        self.idle = {}
+
+    def acquire(self, key, create):
+        with self.lock:
+            nodes = self.idle.get(key)
+            if nodes:
+                return nodes.pop()
+        return create()
+
+    def release(self, key, node):
+        with self.lock:
+            nodes = self.idle.setdefault(key, [])
+            if len(nodes) < self.max_idle:
+                nodes.append(node)
+                return
+        _close(node)
+
+    def clear(self):
+        with self.lock:
+            idle, self.idle = self.idle, {}
+        for nodes in idle.values():
+            for node in nodes:
+                _close(node)
 
 
-def _find_vlan_by_number(vlans, number):
-    return next((vlan for vlan in vlans if vlan.number == int(number)))
+class PersistentTransport(object):
+    """
+    HTTP(S) connection of a pyeapi connection that stays open between requests, pyeapi closes it
+    after each one. A connection the switch closed while it was idle is replaced before sending.
+    If it is found closed while sending, the request is sent again on a new connection, once, only
+    when it is made of show commands : a change the switch may have applied is never sent twice.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.request = []
+        self.reused = False
+
+    def __getattr__(self, item):
+        return getattr(self.connection, item)
+
+    def __str__(self):
+        return str(self.connection)
+
+    def __repr__(self):
+        return repr(self.connection)
+
+    def putrequest(self, *args, **kwargs):
+        self.request = [("putrequest", args, kwargs)]
+        if self.connection.sock is not None and _dropped(self.connection.sock):
+            self.connection.close()
+        self.reused = self.connection.sock is not None
+        try:
+            self.connection.putrequest(*args, **kwargs)
+        except httplib.CannotSendRequest:
+            self.connection.close()
+            self.reused = False
+            self.connection.putrequest(*args, **kwargs)
+
+    def putheader(self, *args, **kwargs):
+        self.request.append(("putheader", args, kwargs))
+        self.connection.putheader(*args, **kwargs)
+
+    def endheaders(self, *args, **kwargs):
+        self.request.append(("endheaders", args, kwargs))
+        try:
+            self.connection.endheaders(*args, **kwargs)
+        except socket.error as e:
+            if not self._stale(e):
+                raise
+            self._send_again()
+
+    def getresponse(self, *args, **kwargs):
+        try:
+            return self.connection.getresponse(*args, **kwargs)
+        except (httplib.BadStatusLine, socket.error) as e:
+            if not self._stale(e):
+                raise
+            self._send_again()
+            return self.connection.getresponse(*args, **kwargs)
+
+    def close(self):
+        pass
+
+    def disconnect(self):
+        self.connection.close()
+
+    def _stale(self, error):
+        return self.reused and not isinstance(error, socket.timeout) and self._read_only()
+
+    def _read_only(self):
+        _, args, kwargs = self.request[-1]
+        try:
+            commands = json.loads(kwargs.get("message_body", args[0] if args else None))["params"]["cmds"]
+        except (TypeError, ValueError, KeyError):
+            return False
+        commands = [c.get("cmd") if isinstance(c, dict) else c for c in commands]
+        return all(isinstance(c, basestring) and (c == "enable" or c.startswith("show ")) for c in commands)
+
+    def _send_again(self):
+        self.connection.close()
+        self.reused = False
+        for method, args, kwargs in self.request:
+            getattr(self.connection, method)(*args, **kwargs)
+
+
+def _dropped(sock):
+    # an idle HTTP connection has nothing to read, unless the switch closed it
+    try:
+        return len(select.select([sock], [], [], 0)[0]) > 0
+    except (select.error, socket.error, ValueError):
+        return True
+
+
+eapi_node_pool = EapiNodePool()
+
+
+def _close(node):
+    disconnect = getattr(node.connection.transport, "disconnect", None)
+    if disconnect is not None:
+        disconnect()
+
+
+def unknown_interface(interface_id):
+    def errors(_):
+        raise UnknownInterface(interface_id)
+
+    return errors
 
 
 def parse_interfaces(interfaces_data, switchports_data):
@@ -360,26 +718,23 @@ def patch_switchport(interface, data):
         interface.port_mode = TRUNK
 
     interface.trunk_native_vlan = data["trunkingNativeVlanId"]
-    interface.trunk_vlans = parse_vlan_ranges(data["trunkAllowedVlans"]) if data["trunkAllowedVlans"] else []
+    interface.trunk_vlans = parse_vlan_ranges(data["trunkAllowedVlans"]) if data["trunkAllowedVlans"] else VlanSet()
 
 
 def parse_vlan_ranges(all_ranges):
     if all_ranges is None or all_ranges == "ALL":
-        return range(1, 4094)
+        return VlanSet.from_ranges([(1, 4093)])
     elif all_ranges == "NONE":
-        return []
+        return VlanSet()
     else:
-        full_list = []
-        for vlan_list in [parse_range(r) for r in all_ranges.split(",")]:
-            full_list += vlan_list
-        return full_list
+        return VlanSet.from_ranges(parse_range(r) for r in all_ranges.split(","))
 
 
 def parse_range(single_range):
     if regex.match("(\d+)-(\d+)", single_range):
-        return range(int(regex[0]), int(regex[1]) + 1)
+        return int(regex[0]), int(regex[1])
     else:
-        return [int(single_range)]
+        return int(single_range), int(single_range)
 
 
 def bond_name(number):
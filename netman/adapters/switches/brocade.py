@@ -22,7 +22,7 @@ from netman import regex
 from netman.adapters.shell.ssh import SshClient
 from netman.adapters.shell.telnet import TelnetClient
 from netman.adapters.switches.util import SubShell, split_on_bang, split_on_dedent, no_output, \
-    ResultChecker
+    ResultChecker, CommandPipeline
 from netman.core.objects.access_groups import IN, OUT
 from netman.core.objects.exceptions import IPNotAvailable, UnknownIP, UnknownVlan, UnknownAccessGroup, BadVlanNumber, \
     BadVlanName, UnknownInterface, TrunkVlanNotSet, VlanVrfNotSet, UnknownVrf, BadVrrpTimers, BadVrrpPriorityNumber, \
@@ -34,6 +34,7 @@ from netman.core.objects.interface_states import OFF
 from netman.core.objects.port_modes import ACCESS, TRUNK
 from netman.core.objects.switch_base import SwitchBase
 from netman.core.objects.vlan import Vlan
+from netman.core.objects.vlan_set import VlanSet
 from netman.core.objects.vrrp_group import VrrpGroup
 
 
@@ -64,7 +65,7 @@ class Brocade(SwitchBase):
 
         if self.shell.get_current_prompt().endswith(">"):
             self.shell.do("enable", wait_for=":")
-            self.shell.do(self.switch_descriptor.password)
+            self.shell.do(self.switch_descriptor.password, sensitive=True)
 
         self.shell.do("skip-page-display")
 
@@ -184,6 +185,29 @@ class Brocade(SwitchBase):
         with self.config(), self.interface(interface_id):
             self.shell.do("disable" if state is OFF else "enable")
 
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        if description is not None or mtu is not None:
+            raise NotImplementedError()
+
+        if access_vlan is not None:
+            self._get_vlan(access_vlan)
+
+        pipeline = CommandPipeline(self.shell)
+        pipeline.enter(self.config())
+        if state is not None:
+            for interface_id in interface_ids:
+                pipeline.enter(self.interface(interface_id))
+                pipeline.do("disable" if state is OFF else "enable")
+                pipeline.exit()
+
+        if access_vlan is not None:
+            pipeline.enter(self.vlan(access_vlan))
+            for interface_id in interface_ids:
+                pipeline.do("untagged {}".format(interface_id), validate=no_output(UnknownInterface, interface_id))
+            pipeline.exit()
+        pipeline.exit()
+        pipeline.run()
+
     def unset_interface_access_vlan(self, interface_id):
         content = self.shell.do("show vlan brief | include {}".format(_to_short_name(interface_id)))
         if len(content) == 0:
@@ -543,7 +567,7 @@ def set_vlans_properties(interface_vlans):
         interface_vlans["object"].trunk_native_vlan = interface_vlans["untagged"]
     if len(interface_vlans["tagged"]) > 0:
         interface_vlans["object"].port_mode = TRUNK
-        interface_vlans["object"].trunk_vlans = interface_vlans["tagged"]
+        interface_vlans["object"].trunk_vlans = VlanSet(interface_vlans["tagged"])
 
 
 def get_interface_vlans_association(interface, vlans):
@@ -609,6 +633,11 @@ class BackwardCompatibleBrocade(Brocade):
     def set_interface_state(self, interface_id, state):
         return super(BackwardCompatibleBrocade, self).set_interface_state(_add_ethernet(interface_id), state)
 
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        return super(BackwardCompatibleBrocade, self).edit_interfaces([_add_ethernet(i) for i in interface_ids],
+                                                                      description=description, state=state,
+                                                                      mtu=mtu, access_vlan=access_vlan)
+
     def set_trunk_mode(self, interface_id):
         return super(BackwardCompatibleBrocade, self).set_trunk_mode(_add_ethernet(interface_id))
 
@@ -20,6 +20,7 @@ from netman.core.objects.interface_states import OFF, ON
 from netman.core.objects.port_modes import ACCESS, TRUNK
 from netman.core.objects.switch_base import SwitchBase
 from netman.core.objects.vlan import Vlan
+from netman.core.objects.vlan_set import VlanSet
 from netman.core.objects.vrrp_group import VrrpGroup
 
 __all__ = ['CachedSwitch']
@@ -135,6 +136,14 @@ class CachedSwitch(SwitchBase):
 
         return copy.deepcopy(self.vlans_cache.values())
 
+    def get_vlans_by_number(self, numbers):
+        missing = [n for n in numbers if n not in self.vlans_cache or n in self.vlans_cache.refresh_items]
+        if missing:
+            for vlan in self.real_switch.get_vlans_by_number(missing):
+                self.vlans_cache[vlan.number] = vlan
+
+        return copy.deepcopy([self.vlans_cache[n] for n in numbers if n in self.vlans_cache])
+
     def get_vlan_interfaces(self, number):
         if (self.vlan_interfaces_cache.refresh_items and number not in self.vlan_interfaces_cache) \
                 or number in self.vlan_interfaces_cache.refresh_items:
@@ -154,6 +163,24 @@ class CachedSwitch(SwitchBase):
                 for interface in self.real_switch.get_interfaces())
         return copy.deepcopy(self.interfaces_cache.values())
 
+    def get_interfaces_by_name(self, names):
+        missing = [n for n in names if n not in self.interfaces_cache or n in self.interfaces_cache.refresh_items]
+        if missing:
+            for interface in self.real_switch.get_interfaces_by_name(missing):
+                self.interfaces_cache[interface.name] = interface
+
+        return copy.deepcopy([self.interfaces_cache[n] for n in names if n in self.interfaces_cache])
+
+    def get_interfaces_by_name_prefix(self, prefix):
+        if self.interfaces_cache.refresh_items:
+            interfaces = self.real_switch.get_interfaces_by_name_prefix(prefix)
+            for interface in interfaces:
+                self.interfaces_cache[interface.name] = interface
+            return copy.deepcopy(interfaces)
+
+        return copy.deepcopy([interface for interface in self.interfaces_cache.values()
+                              if interface.name.startswith(prefix)])
+
     def get_bond(self, number):
         if (self.bonds_cache.refresh_items and number not in self.bonds_cache)\
                 or number in self.bonds_cache.refresh_items:
@@ -178,6 +205,15 @@ class CachedSwitch(SwitchBase):
         self.real_switch.remove_vlan(number)
         del self.vlans_cache[number]
 
+    def add_vlans(self, numbers):
+        self.real_switch.add_vlans(numbers)
+        self.vlans_cache.refresh_items.update(numbers)
+
+    def remove_vlans(self, numbers):
+        self.real_switch.remove_vlans(numbers)
+        for number in numbers:
+            del self.vlans_cache[number]
+
     def set_vlan_access_group(self, vlan_number, direction, name):
         self.real_switch.set_vlan_access_group(vlan_number, direction, name)
         self.vlans_cache[vlan_number].access_groups[direction] = name
@@ -208,7 +244,7 @@ class CachedSwitch(SwitchBase):
         self.real_switch.set_access_mode(interface_id)
         self.interfaces_cache[interface_id].port_mode = ACCESS
         self.interfaces_cache[interface_id].trunk_native_vlan = None
-        self.interfaces_cache[interface_id].trunk_vlans = []
+        self.interfaces_cache[interface_id].trunk_vlans = VlanSet()
 
     def set_trunk_mode(self, interface_id):
         self.real_switch.set_trunk_mode(interface_id)
@@ -261,6 +297,14 @@ class CachedSwitch(SwitchBase):
         except ValueError:
             pass
 
+    def add_trunk_vlans(self, interface_id, vlans):
+        self.real_switch.add_trunk_vlans(interface_id, vlans)
+        self.interfaces_cache[interface_id].trunk_vlans.extend(vlans)
+
+    def remove_trunk_vlans(self, interface_id, vlans):
+        self.real_switch.remove_trunk_vlans(interface_id, vlans)
+        self.interfaces_cache[interface_id].trunk_vlans -= vlans
+
     def add_bond_trunk_vlan(self, bond_number, vlan):
         self.real_switch.add_bond_trunk_vlan(bond_number, vlan)
         self.bonds_cache[bond_number].trunk_vlans.append(vlan)
@@ -300,6 +344,18 @@ class CachedSwitch(SwitchBase):
         self.real_switch.unset_interface_state(interface_id)
         self.interfaces_cache.refresh_items.add(interface_id)
 
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        self.real_switch.edit_interfaces(interface_ids, description=description, state=state, mtu=mtu,
+                                         access_vlan=access_vlan)
+        for interface_id in interface_ids:
+            interface = self.interfaces_cache[interface_id]
+            if state is not None:
+                interface.shutdown = (state == OFF)
+            if mtu is not None:
+                interface.mtu = mtu
+            if access_vlan is not None:
+                interface.access_vlan = access_vlan
+
     def set_interface_auto_negotiation_state(self, interface_id, state):
         self.real_switch.set_interface_auto_negotiation_state(interface_id, state)
         self.interfaces_cache[interface_id].auto_negotiation = (state == ON)
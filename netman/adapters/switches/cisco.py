@@ -18,7 +18,8 @@ from netaddr.ip import IPNetwork, IPAddress
 
 from netman import regex
 from netman.adapters.shell.ssh import SshClient
-from netman.adapters.switches.util import SubShell, split_on_dedent, split_on_bang, no_output
+from netman.adapters.switches.util import SubShell, split_on_dedent, split_on_bang, no_output, VlanInterfacesIndex, \
+    CommandPipeline
 from netman.core.objects.access_groups import IN, OUT
 from netman.core.objects.exceptions import IPNotAvailable, UnknownVlan, UnknownIP, UnknownAccessGroup, BadVlanNumber, \
     BadVlanName, UnknownInterface, UnknownVrf, VlanVrfNotSet, IPAlreadySet, VrrpAlreadyExistsForVlan, BadVrrpGroupNumber, \
@@ -31,6 +32,7 @@ from netman.core.objects.switch_base import SwitchBase
 from netman.core.objects.switch_transactional import FlowControlSwitch
 from netman.core.objects.unicast_rpf_modes import STRICT
 from netman.core.objects.vlan import Vlan
+from netman.core.objects.vlan_set import VlanSet
 from netman.core.objects.vrrp_group import VrrpGroup
 
 
@@ -49,6 +51,7 @@ class Cisco(SwitchBase):
     def __init__(self, switch_descriptor):
         super(Cisco, self).__init__(switch_descriptor)
         self.ssh = None
+        self.vlan_interfaces = VlanInterfacesIndex()
 
     def _connect(self):
         params = dict(
@@ -63,12 +66,13 @@ class Cisco(SwitchBase):
 
         if self.ssh.get_current_prompt().endswith(">"):
             self.ssh.do("enable", wait_for=": ")
-            self.ssh.do(self.switch_descriptor.password)
+            self.ssh.do(self.switch_descriptor.password, sensitive=True)
 
         self.ssh.do("terminal length 0")
         self.ssh.do("terminal width 0")
 
     def _disconnect(self):
+        self.vlan_interfaces.invalidate()
         self.ssh.quit("exit")
         self.logger.info(self.ssh.full_log)
 
@@ -116,6 +120,24 @@ class Cisco(SwitchBase):
                     )
         return vlans.values()
 
+    def get_vlans_by_number(self, numbers):
+        vlans = {}
+        vlan_interfaces_data = {}
+        for data in split_on_bang(self.ssh.do("show running-config")):
+            if regex.match("^vlan ([\d,-]+)\s*$", data[0]):
+                for number in parse_vlan_ranges(regex[0]):
+                    if number in numbers:
+                        vlans[number] = Vlan(number, icmp_redirects=True, arp_routing=True, ntp=True)
+                        apply_vlan_running_config_data(vlans[number], data)
+            elif regex.match("^interface Vlan(\d+)\s*$", data[0]):
+                vlan_interfaces_data[int(regex[0])] = data
+
+        for number, data in vlan_interfaces_data.items():
+            if number in vlans:
+                apply_interface_running_config_data(vlans[number], data)
+
+        return [vlans[number] for number in sorted(vlans)]
+
     def add_vlan(self, number, name=None):
         if self._show_run_vlan(number):
             raise VlanAlreadyExist(number)
@@ -140,12 +162,36 @@ class Cisco(SwitchBase):
             self.ssh.do('no interface vlan {}'.format(number))
             self.ssh.do('no vlan {}'.format(number))
 
+    def add_vlans(self, numbers):
+        self._check_vlans_are_new(numbers)
+
+        pipeline = CommandPipeline(self.ssh)
+        pipeline.enter(self.config())
+        for number in numbers:
+            pipeline.enter(SubShell(self.ssh, enter='vlan {}'.format(number), exit_cmd='exit',
+                                    validate=no_output(BadVlanNumber)))
+            pipeline.exit()
+        pipeline.exit()
+        pipeline.run()
+
+    def remove_vlans(self, numbers):
+        self._check_vlans_exist(numbers)
+
+        pipeline = CommandPipeline(self.ssh)
+        pipeline.enter(self.config())
+        for number in numbers:
+            pipeline.do('no interface vlan {}'.format(number))
+            pipeline.do('no vlan {}'.format(number))
+        pipeline.exit()
+        pipeline.run()
+
     def get_interfaces(self):
         interfaces = []
         for data in split_on_bang(self.ssh.do("show running-config | begin interface")):
             interface = parse_interface(data)
             if interface:
                 interfaces.append(interface)
+        self.vlan_interfaces.load((interface.name, vlan_members(interface)) for interface in interfaces)
         return interfaces
 
     def set_access_vlan(self, interface_id, vlan):
@@ -186,10 +232,44 @@ class Cisco(SwitchBase):
         with self.config(), self.interface(interface_id):
             self.ssh.do('switchport trunk allowed vlan remove {}'.format(vlan))
 
+    def add_trunk_vlans(self, interface_id, vlans):
+        self._check_vlans_exist(vlans)
+
+        with self.config(), self.interface(interface_id):
+            self.ssh.do('switchport trunk allowed vlan add {}'.format(VlanSet(vlans).to_ranges_string()))
+
+    def remove_trunk_vlans(self, interface_id, vlans):
+        interface = self.get_interface(interface_id)
+        missing = VlanSet(vlans) - interface.trunk_vlans
+        if len(missing) > 0:
+            raise UnknownVlan(missing[0])
+
+        with self.config(), self.interface(interface_id):
+            self.ssh.do('switchport trunk allowed vlan remove {}'.format(VlanSet(vlans).to_ranges_string()))
+
     def set_interface_state(self, interface_id, state):
         with self.config(), self.interface(interface_id):
             self.ssh.do('shutdown' if state is OFF else "no shutdown")
 
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        if description is not None or mtu is not None:
+            raise NotImplementedError()
+
+        if access_vlan is not None:
+            self._get_vlan_run_conf(access_vlan)
+
+        pipeline = CommandPipeline(self.ssh)
+        pipeline.enter(self.config())
+        for interface_id in interface_ids:
+            pipeline.enter(self.interface(interface_id))
+            if state is not None:
+                pipeline.do('shutdown' if state is OFF else "no shutdown")
+            if access_vlan is not None:
+                pipeline.do('switchport access vlan {}'.format(access_vlan))
+            pipeline.exit()
+        pipeline.exit()
+        pipeline.run()
+
     def set_interface_native_vlan(self, interface_id, vlan):
         self._get_vlan_run_conf(vlan)
 
@@ -294,7 +374,9 @@ class Cisco(SwitchBase):
             self.ssh.do("no ip helper-address {}".format(ip_address))
 
     def get_vlan_interfaces(self, vlan_number):
-        vlan_interfaces = get_vlan_interfaces_from_data(vlan_number, self.get_interfaces())
+        if not self.vlan_interfaces.loaded:
+            self.get_interfaces()
+        vlan_interfaces = self.vlan_interfaces.interfaces_of(vlan_number)
         if not vlan_interfaces:
             self.get_vlan(vlan_number)
         return vlan_interfaces
@@ -324,6 +406,7 @@ class Cisco(SwitchBase):
             return self.unset_interface_native_vlan(bond.name)
 
     def config(self):
+        self.vlan_interfaces.invalidate()
         return SubShell(self.ssh, enter="configure terminal", exit_cmd='exit')
 
     def interface(self, interface_id):
@@ -511,14 +594,14 @@ def parse_interface(data):
             i.port_mode = DYNAMIC
             i.access_vlan = access_vlan
             i.trunk_native_vlan = native_vlan
-            i.trunk_vlans = parse_vlan_ranges(trunk_vlans) if trunk_vlans else []
+            i.trunk_vlans = parse_vlan_ranges(trunk_vlans) if trunk_vlans else VlanSet()
         elif port_mode == 'access':
             i.port_mode = ACCESS
             i.access_vlan = access_vlan
         elif port_mode == 'trunk':
             i.port_mode = TRUNK
             i.trunk_native_vlan = native_vlan
-            i.trunk_vlans = parse_vlan_ranges(trunk_vlans) if trunk_vlans else []
+            i.trunk_vlans = parse_vlan_ranges(trunk_vlans) if trunk_vlans else VlanSet()
 
         return i
     return None
@@ -585,38 +668,29 @@ def apply_vlan_running_config_data(vlan, data):
 
 def parse_vlan_ranges(all_ranges):
     if all_ranges is None:
-        return range(1, 4094)
+        return VlanSet.from_ranges([(1, 4093)])
     elif all_ranges == "none":
-        return []
+        return VlanSet()
     else:
-        full_list = []
-        for vlan_list in [parse(r) for r in all_ranges.split(",")]:
-            full_list += vlan_list
-        return full_list
-
-
-def get_vlan_interfaces_from_data(vlan_number, interfaces_data):
-    vlan_interfaces = []
-    for interface in interfaces_data:
-        if interface.port_mode is TRUNK:
-            if interface.trunk_vlans and vlan_number in interface.trunk_vlans:
-                vlan_interfaces.append(interface.name)
-            elif vlan_number == interface.trunk_native_vlan:
-                vlan_interfaces.append(interface.name)
-        elif interface.port_mode is ACCESS and interface.access_vlan == vlan_number:
-            vlan_interfaces.append(interface.name)
-        elif interface.port_mode is DYNAMIC:
-            if interface.access_vlan == vlan_number or interface.trunk_native_vlan == vlan_number or \
-                    (interface.trunk_vlans and vlan_number in interface.trunk_vlans):
-                vlan_interfaces.append(interface.name)
-    return vlan_interfaces
+        return VlanSet.from_ranges(parse(r) for r in all_ranges.split(","))
+
+
+def vlan_members(interface):
+    vlans = VlanSet()
+    if interface.port_mode in (TRUNK, DYNAMIC):
+        vlans.extend(interface.trunk_vlans or [])
+        if interface.trunk_native_vlan is not None:
+            vlans.add(interface.trunk_native_vlan)
+    if interface.port_mode in (ACCESS, DYNAMIC) and interface.access_vlan is not None:
+        vlans.add(interface.access_vlan)
+    return vlans
 
 
 def parse(single_range):
     if regex.match("(\d+)-(\d+)", single_range):
-        return range(int(regex[0]), int(regex[1]) + 1)
+        return int(regex[0]), int(regex[1])
     else:
-        return [int(single_range)]
+        return int(single_range), int(single_range)
 
 
 def bond_name(number):
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import warnings
+from functools import partial
 
 from netman.adapters.shell.ssh import SshClient
 from netman.adapters.shell.telnet import TelnetClient
@@ -24,12 +25,13 @@ from netman.adapters.switches.cisco import parse_vlan_ranges
 from netman.core.objects.vlan import Vlan
 from netman import regex
 from netman.core.objects.switch_transactional import FlowControlSwitch
-from netman.adapters.switches.util import SubShell, no_output, ResultChecker, PageReader
+from netman.adapters.switches.util import SubShell, no_output, ResultChecker, PageReader, CommandPipeline
 from netman.core.objects.exceptions import UnknownInterface, BadVlanName, \
     BadVlanNumber, UnknownVlan, InterfaceInWrongPortMode, NativeVlanNotSet, TrunkVlanNotSet, BadInterfaceDescription, \
     VlanAlreadyExist, UnknownBond, InvalidMtuSize, InterfaceResetIncomplete, \
     PrivilegedAccessRefused
 from netman.core.objects.switch_base import SwitchBase
+from netman.core.objects.vlan_set import VlanSet
 
 
 def ssh(switch_descriptor):
@@ -52,10 +54,11 @@ def factory_telnet(switch_descriptor, lock):
 
 class Dell(SwitchBase):
 
-    def __init__(self, switch_descriptor, shell_factory):
+    def __init__(self, switch_descriptor, shell_factory, write_memory=True):
         super(Dell, self).__init__(switch_descriptor)
         self.shell = None
         self.shell_factory = shell_factory
+        self.write_memory = write_memory
 
         self.page_reader = PageReader(
             read_while="--More-- or (q)uit",
@@ -76,7 +79,7 @@ class Dell(SwitchBase):
         self.shell = self.shell_factory(**params)
 
         self.shell.do("enable", wait_for=":")
-        password_return = self.shell.do(self.switch_descriptor.password)
+        password_return = self.shell.do(self.switch_descriptor.password, sensitive=True)
         if any(["Incorrect Password" in line for line in password_return]):
             raise PrivilegedAccessRefused(password_return)
 
@@ -94,6 +97,10 @@ class Dell(SwitchBase):
         pass
 
     def commit_transaction(self):
+        if self.write_memory:
+            self.save_configuration()
+
+    def save_configuration(self):
         self.shell.do("copy running-config startup-config", wait_for="? (y/n) ")
         self.shell.send_key("y")
 
@@ -154,6 +161,30 @@ class Dell(SwitchBase):
             with self.vlan_database():
                 self.set('no vlan {}', number).on_result_matching(".*These VLANs do not exist:.*", UnknownVlan, number)
 
+    def add_vlans(self, numbers):
+        self._check_vlans_are_new(numbers)
+
+        pipeline = CommandPipeline(self.shell)
+        pipeline.enter(self.config())
+        pipeline.enter(self.vlan_database())
+        for number in numbers:
+            pipeline.do('vlan {}'.format(number))
+        pipeline.exit()
+        pipeline.exit()
+        pipeline.run()
+
+    def remove_vlans(self, numbers):
+        self._check_vlans_exist(numbers)
+
+        pipeline = CommandPipeline(self.shell)
+        pipeline.enter(self.config())
+        pipeline.enter(self.vlan_database())
+        for number in numbers:
+            pipeline.do('no vlan {}'.format(number), validate=partial(self._check_vlan_removal, number))
+        pipeline.exit()
+        pipeline.exit()
+        pipeline.run()
+
     def set_interface_description(self, interface_id, description):
         with self.config(), self.interface(interface_id):
             self.set('description "{}"', description).on_any_result(BadInterfaceDescription, description)
@@ -172,14 +203,49 @@ class Dell(SwitchBase):
 
     def set_access_vlan(self, interface_id, vlan):
         with self.config(), self.interface(interface_id):
-            self.set("switchport access vlan {}", vlan)\
-                .on_result_matching(".*VLAN ID not found.*", UnknownVlan, vlan)\
-                .on_result_matching(".*Interface not in Access Mode.*", InterfaceInWrongPortMode, "trunk")
+            self._set_access_vlan(vlan)
 
     def set_interface_mtu(self, interface_id, size):
         with self.config(), self.interface(interface_id):
-            self.set("mtu {}", size)\
-                .on_result_matching(".*Value is out of range.*", InvalidMtuSize, size)
+            self._set_mtu(size)
+
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        pipeline = CommandPipeline(self.shell)
+        pipeline.enter(self.config())
+        for interface_id in interface_ids:
+            pipeline.enter(self.interface(interface_id))
+            if description is not None:
+                pipeline.do('description "{}"'.format(description),
+                            validate=no_output(BadInterfaceDescription, description))
+            if state is not None:
+                pipeline.do('shutdown' if state is OFF else 'no shutdown')
+            if mtu is not None:
+                pipeline.do("mtu {}".format(mtu), validate=partial(self._check_mtu, mtu))
+            if access_vlan is not None:
+                pipeline.do("switchport access vlan {}".format(access_vlan),
+                            validate=partial(self._check_access_vlan, access_vlan))
+            pipeline.exit()
+        pipeline.exit()
+        pipeline.run()
+
+    def _set_access_vlan(self, vlan):
+        self._check_access_vlan(vlan, self.shell.do("switchport access vlan {}".format(vlan)))
+
+    def _check_access_vlan(self, vlan, result):
+        ResultChecker(result)\
+            .on_result_matching(".*VLAN ID not found.*", UnknownVlan, vlan)\
+            .on_result_matching(".*Interface not in Access Mode.*", InterfaceInWrongPortMode, "trunk")
+
+    def _set_mtu(self, size):
+        self._check_mtu(size, self.shell.do("mtu {}".format(size)))
+
+    def _check_mtu(self, size, result):
+        ResultChecker(result)\
+            .on_result_matching(".*Value is out of range.*", InvalidMtuSize, size)
+
+    def _check_vlan_removal(self, number, result):
+        ResultChecker(result)\
+            .on_result_matching(".*These VLANs do not exist:.*", UnknownVlan, number)
 
     def unset_interface_mtu(self, interface_id):
         with self.config(), self.interface(interface_id):
@@ -246,6 +312,35 @@ class Dell(SwitchBase):
         with self.config(), self.interface(interface_id):
             self.set("switchport {} allowed vlan remove {}", actual_port_mode, vlan)
 
+    def add_trunk_vlans(self, interface_id, vlans):
+        interface_data = self.get_interface_data(interface_id)
+
+        actual_port_mode = resolve_port_mode(interface_data)
+        if actual_port_mode == "access":
+            raise InterfaceInWrongPortMode("access")
+
+        with self.config(), self.interface(interface_id):
+            if actual_port_mode is None:
+                self.set("switchport mode trunk")
+                actual_port_mode = "trunk"
+
+            result = self.shell.do("switchport {} allowed vlan add {}".format(
+                actual_port_mode, VlanSet(vlans).to_ranges_string()))
+            for line in result:
+                if regex.match(".*VLAN\s+(\d+)\s+ERROR: This VLAN does not exist.*", line):
+                    raise UnknownVlan(int(regex[0]))
+
+    def remove_trunk_vlans(self, interface_id, vlans):
+        interface_data = self.get_interface_data(interface_id)
+        trunk_vlans = resolve_trunk_vlans(interface_data)
+
+        if len(VlanSet(vlans) - trunk_vlans) > 0:
+            raise TrunkVlanNotSet(interface_id)
+
+        actual_port_mode = resolve_port_mode(interface_data)
+        with self.config(), self.interface(interface_id):
+            self.set("switchport {} allowed vlan remove {}", actual_port_mode, VlanSet(vlans).to_ranges_string())
+
     def edit_interface_spanning_tree(self, interface_id, edge=None):
         commands = []
         if edge is not None:
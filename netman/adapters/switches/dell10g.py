@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import warnings
+from functools import partial
 
 from netman import regex
 from netman.adapters.shell.ssh import SshClient
 from netman.adapters.shell.telnet import TelnetClient
 from netman.adapters.switches.cisco import parse_vlan_ranges
 from netman.adapters.switches.dell import Dell, resolve_port_mode
+from netman.adapters.switches.util import CommandPipeline, SubShell, no_output, ResultChecker
 from netman.core.objects.exceptions import InterfaceInWrongPortMode, UnknownVlan, UnknownInterface, BadVlanName, \
     BadVlanNumber, TrunkVlanNotSet, VlanAlreadyExist
 from netman.core.objects.interface import Interface
@@ -25,6 +27,7 @@ from netman.core.objects.mac_address import MacAddress
 from netman.core.objects.port_modes import TRUNK, ACCESS
 from netman.core.objects.switch_transactional import FlowControlSwitch
 from netman.core.objects.vlan import Vlan
+from netman.core.objects.vlan_set import VlanSet
 
 
 def ssh(switch_descriptor):
@@ -103,6 +106,28 @@ class Dell10G(Dell):
         with self.config():
             self.set('no vlan {}', number).on_result_matching(".*These VLANs do not exist:.*", UnknownVlan, number)
 
+    def add_vlans(self, numbers):
+        self._check_vlans_are_new(numbers)
+
+        pipeline = CommandPipeline(self.shell)
+        pipeline.enter(self.config())
+        for number in numbers:
+            pipeline.enter(SubShell(self.shell, enter='vlan {}'.format(number), exit_cmd='exit',
+                                    validate=no_output(BadVlanNumber)))
+            pipeline.exit()
+        pipeline.exit()
+        pipeline.run()
+
+    def remove_vlans(self, numbers):
+        self._check_vlans_exist(numbers)
+
+        pipeline = CommandPipeline(self.shell)
+        pipeline.enter(self.config())
+        for number in numbers:
+            pipeline.do('no vlan {}'.format(number), validate=partial(self._check_vlan_removal, number))
+        pipeline.exit()
+        pipeline.run()
+
     def set_access_mode(self, interface_id):
         with self.config(), self.interface(interface_id):
             self.shell.do("no switchport trunk allowed vlan")
@@ -127,8 +152,20 @@ class Dell10G(Dell):
             raise InterfaceInWrongPortMode(actual_port_mode)
 
         with self.config(), self.interface(interface_id):
-            self.set("switchport access vlan {}", vlan) \
-                .on_result_matching(".*VLAN ID not found.*", UnknownVlan, vlan)
+            self._set_access_vlan(vlan)
+
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        if mtu is not None:
+            raise NotImplementedError()
+
+        if access_vlan is not None:
+            for interface_id in interface_ids:
+                actual_port_mode = resolve_port_mode(self.get_interface_data(interface_id))
+                if actual_port_mode in ("trunk", "general"):
+                    raise InterfaceInWrongPortMode(actual_port_mode)
+
+        super(Dell10G, self).edit_interfaces(interface_ids, description=description, state=state,
+                                             access_vlan=access_vlan)
 
     def add_trunk_vlan(self, interface_id, vlan):
         interface_data = self.get_interface_data(interface_id)
@@ -168,6 +205,34 @@ class Dell10G(Dell):
         with self.config(), self.interface(interface_id):
             self.set("switchport {} allowed vlan remove {}", actual_port_mode, vlan)
 
+    def add_trunk_vlans(self, interface_id, vlans):
+        interface_data = self.get_interface_data(interface_id)
+
+        actual_port_mode = resolve_port_mode(interface_data)
+        if actual_port_mode == "access":
+            raise InterfaceInWrongPortMode("access")
+
+        self._check_vlans_exist(vlans)
+
+        with self.config(), self.interface(interface_id):
+            if actual_port_mode is None:
+                self.set("switchport mode trunk")
+                actual_port_mode = "trunk"
+
+            operation = "add " if actual_port_mode != "trunk" or has_trunk_vlans(interface_data) else ""
+            self.set("switchport {} allowed vlan {}{}", actual_port_mode, operation, VlanSet(vlans).to_ranges_string())
+
+    def remove_trunk_vlans(self, interface_id, vlans):
+        interface_data = self.get_interface_data(interface_id)
+        trunk_vlans = resolve_trunk_vlans(interface_data)
+
+        if len(VlanSet(vlans) - trunk_vlans) > 0:
+            raise TrunkVlanNotSet(interface_id)
+
+        actual_port_mode = resolve_port_mode(interface_data)
+        with self.config(), self.interface(interface_id):
+            self.set("switchport {} allowed vlan remove {}", actual_port_mode, VlanSet(vlans).to_ranges_string())
+
     def get_interface_data(self, interface_id):
         interface_data = self.shell.do("show running-config interface {}".format(interface_id))
         if any(["Invalid input" in line or regex.match(".*invalid interface.*", line) for line in interface_data]):
@@ -245,6 +310,10 @@ class Dell10G(Dell):
         else:
             return interface, "Physical"
 
+    def _check_access_vlan(self, vlan, result):
+        ResultChecker(result) \
+            .on_result_matching(".*VLAN ID not found.*", UnknownVlan, vlan)
+
     def set_interface_mtu(self, interface_id, size):
         raise NotImplementedError()
 
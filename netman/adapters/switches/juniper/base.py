@@ -12,12 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
+from collections import OrderedDict
+from copy import deepcopy
+
 from ncclient import manager
 from ncclient.operations import RPCError, TimeoutExpiredError
 from ncclient.xml_ import new_ele, sub_ele, to_ele, to_xml
 from netaddr import IPNetwork
 
 from netman import regex
+from netman.adapters.switches.juniper.candidate_cache import CandidateCache, LEAF_LISTS
+from netman.adapters.switches.juniper.inventory import PhysicalInterfaceInventory
+from netman.adapters.switches.util import VlanInterfacesIndex
+from netman.core import metrics
 from netman.core.objects.access_groups import IN, OUT
 from netman.core.objects.bond import Bond
 from netman.core.objects.exceptions import LockedSwitch, VlanAlreadyExist, UnknownVlan, \
@@ -28,18 +36,32 @@ from netman.core.objects.interface_states import ON, OFF
 from netman.core.objects.port_modes import ACCESS, TRUNK, BOND_MEMBER
 from netman.core.objects.switch_base import SwitchBase
 from netman.core.objects.vlan import Vlan
+from netman.core.objects.vlan_set import VlanSet
+
+interface_inventory = PhysicalInterfaceInventory()
+
+# above this many vlans, reading all of them costs less than a filter naming each one
+MAX_SELECTED_VLANS = 200
+MAX_SELECTED_INTERFACES = 200
 
 
 class Juniper(SwitchBase):
+    supports_group_commit = True
 
     def __init__(self, switch_descriptor, custom_strategies,
-                 timeout=300):
+                 timeout=300, deferred_edits=False, inventory=None):
         super(Juniper, self).__init__(switch_descriptor)
         self.timeout = timeout
         self.custom_strategies = custom_strategies
+        self.deferred_edits = deferred_edits
+        self.inventory = inventory if inventory is not None else interface_inventory
         self.netconf = None
 
         self.in_transaction = False
+        self.candidate_cache = CandidateCache()
+        self.pending_updates = []
+        self.sent_updates = []
+        self.vlan_interfaces = VlanInterfacesIndex()
 
     def _connect(self):
         params = dict(
@@ -54,9 +76,11 @@ class Juniper(SwitchBase):
         if self.switch_descriptor.port:
             params["port"] = self.switch_descriptor.port
 
-        self.netconf = manager.connect(**params)
+        with metrics.timed("netconf", "connect"):
+            self.netconf = manager.connect(**params)
 
     def _disconnect(self):
+        self.vlan_interfaces.invalidate()
         try:
             self.netconf.close_session()
         except TimeoutExpiredError:
@@ -73,18 +97,34 @@ class Juniper(SwitchBase):
                 raise LockedSwitch()
             else:
                 raise
+        self.candidate_cache.clear()
+        self.pending_updates = []
+        self.sent_updates = []
+        self.vlan_interfaces.invalidate()
         self.in_transaction = True
 
     def end_transaction(self):
         self.in_transaction = False
+        self.candidate_cache.clear()
+        self.vlan_interfaces.invalidate()
+        self.pending_updates = []
+        self.sent_updates = []
         self.netconf.unlock(target="candidate")
 
     def rollback_transaction(self):
+        self.candidate_cache.clear()
+        self.vlan_interfaces.invalidate()
+        self.pending_updates = []
+        self.sent_updates = []
         self.netconf.discard_changes()
 
     def commit_transaction(self):
+        self.flush_updates()
+        self.candidate_cache.clear()
+        self.vlan_interfaces.invalidate()
         try:
-            self.netconf.commit()
+            with metrics.timed("netconf", "commit"):
+                self.netconf.commit()
         except RPCError as e:
             self.logger.info("An RPCError was raised : {}".format(e))
             raise OperationNotCompleted(str(e).strip())
@@ -101,9 +141,56 @@ class Juniper(SwitchBase):
         return vlan_list
 
     def get_vlan(self, number):
-        config = self.query(self.custom_strategies.all_vlans, all_interfaces)
+        config = self.query(self.custom_strategies.one_vlan_by_vlan_id(number))
         vlan_node = self.custom_strategies.vlan_node(config, number)
-        return self.get_vlan_from_node(vlan_node, config)
+        vlan = self.get_vlan_from_node(vlan_node, config)
+
+        l3_if_type, l3_if_name = self.custom_strategies.get_l3_interface(vlan_node)
+        if l3_if_name is not None:
+            config = self.query(one_interface_unit(l3_if_type, l3_if_name))
+            self.fill_vlan_from_interface_unit(vlan, first(config.xpath("data/configuration/interfaces/interface/unit")))
+
+        return vlan
+
+    def get_vlans_by_number(self, numbers):
+        numbers = VlanSet(numbers)
+        if len(numbers) == 0:
+            return []
+        elif len(numbers) > MAX_SELECTED_VLANS:
+            return [vlan for vlan in self.get_vlans() if vlan.number in numbers]
+
+        config = self.query(self._some_vlans_by_vlan_id(numbers))
+
+        vlans = []
+        l3_interfaces = []
+        for vlan_node in self.custom_strategies.vlan_nodes(config):
+            vlan = self.get_vlan_from_node(vlan_node, config)
+            if vlan is not None and vlan.number in numbers:
+                vlans.append(vlan)
+                l3_if_type, l3_if_name = self.custom_strategies.get_l3_interface(vlan_node)
+                if l3_if_name is not None:
+                    l3_interfaces.append((vlan, l3_if_type, l3_if_name))
+
+        if len(l3_interfaces) > 0:
+            config = self.query(some_interface_units((t, n) for _, t, n in l3_interfaces))
+            units = {}
+            for interface_node in config.xpath("data/configuration/interfaces/interface"):
+                for unit_node in interface_node.xpath("unit"):
+                    units[(interface_node.findtext("name"), unit_node.findtext("name"))] = unit_node
+            for vlan, l3_if_type, l3_if_name in l3_interfaces:
+                self.fill_vlan_from_interface_unit(
+                    vlan, units.get((l3_if_type, l3_if_name), units.get((None, l3_if_name))))
+
+        return vlans
+
+    def _some_vlans_by_vlan_id(self, numbers):
+        def m():
+            vlans = self.custom_strategies.all_vlans()
+            for number in numbers:
+                vlans.extend(self.custom_strategies.one_vlan_by_vlan_id(number)())
+            return vlans
+
+        return m
 
     def get_vlan_from_node(self, vlan_node, config):
         vlan_id_node = first(vlan_node.xpath("vlan-id"))
@@ -120,14 +207,17 @@ class Juniper(SwitchBase):
             if l3_if_name is not None:
                 interface_vlan_node = first(config.xpath("data/configuration/interfaces/interface/name[text()=\"{}\"]/.."
                                                          "/unit/name[text()=\"{}\"]/..".format(l3_if_type, l3_if_name)))
-                if interface_vlan_node is not None:
-                    vlan.ips = parse_ips(interface_vlan_node)
-                    vlan.access_groups[IN] = parse_inet_filter(interface_vlan_node, "input")
-                    vlan.access_groups[OUT] = parse_inet_filter(interface_vlan_node, "output")
-                    vlan.vrrp_groups = self.custom_strategies.parse_vrrp_groups(interface_vlan_node)
-                    vlan.icmp_redirects = self.custom_strategies.parse_icmp_redirects(interface_vlan_node)
+                self.fill_vlan_from_interface_unit(vlan, interface_vlan_node)
         return vlan
 
+    def fill_vlan_from_interface_unit(self, vlan, interface_vlan_node):
+        if interface_vlan_node is not None:
+            vlan.ips = parse_ips(interface_vlan_node)
+            vlan.access_groups[IN] = parse_inet_filter(interface_vlan_node, "input")
+            vlan.access_groups[OUT] = parse_inet_filter(interface_vlan_node, "output")
+            vlan.vrrp_groups = self.custom_strategies.parse_vrrp_groups(interface_vlan_node)
+            vlan.icmp_redirects = self.custom_strategies.parse_icmp_redirects(interface_vlan_node)
+
     def get_interfaces(self):
         physical_interfaces = self._list_physical_interfaces()
         config = self.query(all_interfaces, self.custom_strategies.all_vlans)
@@ -145,7 +235,7 @@ class Juniper(SwitchBase):
         return interface_list
 
     def add_vlan(self, number, name=None):
-        config = self.query(self.custom_strategies.all_vlans)
+        config = self.query(self.custom_strategies.one_vlan_by_vlan_id(number))
 
         try:
             self.custom_strategies.vlan_node(config, number)
@@ -156,11 +246,11 @@ class Juniper(SwitchBase):
         update = Update()
         self.custom_strategies.add_update_vlans(update, number, name)
 
-        try:
-            self._push(update)
-        except RPCError as e:
+        def errors(e):
             self.custom_strategies.manage_update_vlan_exception(e.message, number)
-            raise
+            raise e
+
+        self._push(update, errors=errors)
 
     def remove_vlan(self, number):
         config = self.query(self.custom_strategies.all_vlans, all_interfaces)
@@ -187,10 +277,74 @@ class Juniper(SwitchBase):
 
         self._push(update)
 
+    def add_vlans(self, numbers):
+        numbers = VlanSet(numbers)
+        if len(numbers) > MAX_SELECTED_VLANS:
+            config = self.query(self.custom_strategies.all_vlans)
+        else:
+            config = self.query(self._some_vlans_by_vlan_id(numbers))
+
+        existing = sorted(number for number in self._vlan_nodes_by_number(config) if number in numbers)
+        if len(existing) > 0:
+            raise VlanAlreadyExist(existing[0])
+
+        update = Update()
+        for number in numbers:
+            self.custom_strategies.add_update_vlans(update, number, None)
+
+        def errors(e):
+            vlan_in_use = re.search("value (\d+) is being used", e.message)
+            self.custom_strategies.manage_update_vlan_exception(
+                e.message, int(vlan_in_use.group(1)) if vlan_in_use else numbers[0])
+            raise e
+
+        self._push(update, errors=errors)
+
+    def remove_vlans(self, numbers):
+        numbers = VlanSet(numbers)
+        config = self.query(self.custom_strategies.all_vlans, all_interfaces)
+
+        vlan_nodes = self._vlan_nodes_by_number(config)
+        for number in numbers:
+            if number not in vlan_nodes:
+                raise UnknownVlan(number)
+
+        update = Update()
+        vlan_names = set()
+        for number in numbers:
+            vlan_name = first(vlan_nodes[number].xpath("name")).text
+            vlan_names.add(vlan_name)
+            self.custom_strategies.remove_update_vlans(update, vlan_name)
+
+            l3_if_type, l3_if_name = self.custom_strategies.get_l3_interface(vlan_nodes[number])
+            if l3_if_name is not None:
+                update.add_interface(interface_unit_interface_removal(l3_if_type, l3_if_name))
+
+        for interface_node in config.xpath("data/configuration/interfaces/interface"):
+            members_modifications = self.custom_strategies.craft_members_modification_to_remove_vlans(
+                interface_node, vlan_names, numbers)
+
+            if len(members_modifications) > 0:
+                update.add_interface(self.custom_strategies.interface_vlan_members_update(
+                    first(interface_node.xpath("name")).text,
+                    first(interface_node.xpath("unit/name")).text,
+                    members_modifications)
+                )
+
+        self._push(update)
+
+    def _vlan_nodes_by_number(self, config):
+        vlan_nodes = {}
+        for vlan_node in self.custom_strategies.vlan_nodes(config):
+            vlan_id_node = first(vlan_node.xpath("vlan-id"))
+            if vlan_id_node is not None:
+                vlan_nodes[int(vlan_id_node.text)] = vlan_node
+        return vlan_nodes
+
     def set_access_mode(self, interface_id):
         update_attributes = []
 
-        config = self.query(all_interfaces, self.custom_strategies.all_vlans)
+        config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
 
         interface_node = self.get_interface_config(interface_id, config)
 
@@ -233,11 +387,20 @@ class Juniper(SwitchBase):
         update_attributes = []
         update_vlan_members = []
 
-        config = self.query(all_interfaces, self.custom_strategies.all_vlans)
+        config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
 
         self.custom_strategies.vlan_node(config, vlan)
 
         interface_node = self.get_interface_config(interface_id, config)
+        self._compute_access_vlan_update(interface_node, config, vlan, update_attributes, update_vlan_members)
+
+        if update_attributes or update_vlan_members:
+            update = Update()
+            update.add_interface(self.custom_strategies.interface_update(interface_id, "0", update_attributes, update_vlan_members))
+
+            self._push_interface_update(interface_id, update, errors=unknown_vlan_errors(vlan))
+
+    def _compute_access_vlan_update(self, interface_node, config, vlan, update_attributes, update_vlan_members):
         interface = self.node_to_interface(interface_node, config)
 
         if interface.port_mode == TRUNK:
@@ -248,17 +411,6 @@ class Juniper(SwitchBase):
         if interface.access_vlan != vlan:
             self.custom_strategies.update_vlan_members(interface_node, update_vlan_members, vlan)
 
-        if update_attributes or update_vlan_members:
-            update = Update()
-            update.add_interface(self.custom_strategies.interface_update(interface_id, "0", update_attributes, update_vlan_members))
-
-            try:
-                self._push_interface_update(interface_id, update)
-            except RPCError as e:
-                if "No vlan matches vlan tag" in e.message:
-                    raise UnknownVlan(vlan)
-                raise
-
     def unset_interface_access_vlan(self, interface_id):
         config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
         interface_node = self.get_interface_config(interface_id, config)
@@ -279,7 +431,7 @@ class Juniper(SwitchBase):
         port_mode_node = None
         native_vlan_id_node = None
 
-        config = self.query(all_interfaces, self.custom_strategies.all_vlans)
+        config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
 
         self.custom_strategies.vlan_node(config, vlan)
 
@@ -305,12 +457,7 @@ class Juniper(SwitchBase):
             update = Update()
             update.add_interface(interface)
 
-            try:
-                self._push_interface_update(interface_id, update)
-            except RPCError as e:
-                if "No vlan matches vlan tag" in e.message:
-                    raise UnknownVlan(vlan)
-                raise
+            self._push_interface_update(interface_id, update, errors=unknown_vlan_errors(vlan))
 
     def set_interface_auto_negotiation_state(self, interface_id, negotiation_state):
         content = to_ele("""
@@ -418,6 +565,7 @@ class Juniper(SwitchBase):
         update.add_interface(content)
 
         self._push_interface_update(interface_id, update)
+        self.inventory.invalidate(self.switch_descriptor)
 
     def unset_interface_native_vlan(self, interface_id):
         config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
@@ -433,7 +581,7 @@ class Juniper(SwitchBase):
         self._push(update)
 
     def add_trunk_vlan(self, interface_id, vlan):
-        config = self.query(all_interfaces, self.custom_strategies.all_vlans)
+        config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
 
         self.custom_strategies.vlan_node(config, vlan)
 
@@ -457,7 +605,7 @@ class Juniper(SwitchBase):
             self._push_interface_update(interface_id, update)
 
     def remove_trunk_vlan(self, interface_id, vlan):
-        config = self.query(all_interfaces, self.custom_strategies.all_vlans)
+        config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
         interface_node = self.get_interface_config(interface_id, config)
         if interface_node is None:
             raise UnknownInterface(interface_id)
@@ -479,29 +627,82 @@ class Juniper(SwitchBase):
 
         self._push(update)
 
+    def add_trunk_vlans(self, interface_id, vlans):
+        vlans = VlanSet(vlans)
+        config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
+
+        missing = vlans - self._vlan_nodes_by_number(config).keys()
+        if len(missing) > 0:
+            raise UnknownVlan(missing[0])
+
+        interface_node = self.get_interface_config(interface_id, config)
+
+        interface = self.node_to_interface(interface_node, config)
+
+        actual_port_mode = self.get_port_mode(interface_node)
+
+        if actual_port_mode is ACCESS or interface.access_vlan is not None:
+            raise InterfaceInWrongPortMode("access")
+
+        new_vlans = vlans - interface.trunk_vlans
+        if len(new_vlans) > 0:
+            update = Update()
+            update.add_interface(self.custom_strategies.interface_update(
+                interface_id, "0",
+                [self.custom_strategies.get_interface_port_mode_update_element("trunk")] if actual_port_mode is None else None,
+                [self.custom_strategies.get_vlan_member_update_element(to_range(xrange(start, end + 1)))
+                 for start, end in new_vlans.ranges]
+            ))
+
+            self._push_interface_update(interface_id, update)
+
+    def remove_trunk_vlans(self, interface_id, vlans):
+        vlans = VlanSet(vlans)
+        config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
+        interface_node = self.get_interface_config(interface_id, config)
+        if interface_node is None:
+            raise UnknownInterface(interface_id)
+
+        interface = self.node_to_interface(interface_node, config)
+
+        if interface.port_mode is ACCESS:
+            raise InterfaceInWrongPortMode("access")
+
+        vlan_nodes = self._vlan_nodes_by_number(config)
+        missing = vlans - vlan_nodes.keys()
+        if len(missing) > 0:
+            raise UnknownVlan(missing[0])
+
+        if len(vlans - interface.trunk_vlans) > 0:
+            raise TrunkVlanNotSet(interface_id)
+
+        vlan_names = set(first(vlan_nodes[vlan].xpath("name")).text for vlan in vlans)
+        modifications = self.custom_strategies.craft_members_modification_to_remove_vlans(interface_node, vlan_names, vlans)
+
+        update = Update()
+        update.add_interface(self.custom_strategies.interface_update(interface_id, "0", vlan_members=modifications))
+
+        self._push(update)
+
     def set_interface_description(self, interface_id, description):
         update = Update()
         update.add_interface(interface_main_update(interface_id, [
             to_ele("<description>{}</description>".format(description))
         ]))
 
-        try:
-            self._push(update)
-        except RPCError as e:
+        def errors(e):
             self.logger.info("actual setting error was {}".format(e))
             raise UnknownInterface(interface_id)
 
+        self._push(update, errors=errors)
+
     def unset_interface_description(self, interface_id):
         update = Update()
         update.add_interface(interface_main_update(interface_id, [
             to_ele("<description operation=\"delete\" />")
         ]))
 
-        try:
-            self._push(update)
-        except RPCError as e:
-            if e.severity != "warning":
-                raise UnknownInterface(interface_id)
+        self._push(update, errors=unknown_interface_unless_warning(interface_id))
 
     def set_interface_mtu(self, interface_id, size):
         update = Update()
@@ -509,26 +710,22 @@ class Juniper(SwitchBase):
             to_ele("<mtu>{}</mtu>".format(size))
         ]))
 
-        try:
-            self._push(update)
-        except RPCError as e:
+        def errors(e):
             self.logger.info("actual setting error was {}".format(e))
             if "Value {} is not within range".format(size) in str(e):
                 raise InvalidMtuSize(str(e))
 
             raise UnknownInterface(interface_id)
 
+        self._push(update, errors=errors)
+
     def unset_interface_mtu(self, interface_id):
         update = Update()
         update.add_interface(interface_main_update(interface_id, [
             to_ele("<mtu operation=\"delete\" />")
         ]))
 
-        try:
-            self._push(update)
-        except RPCError as e:
-            if e.severity != "warning":
-                raise UnknownInterface(interface_id)
+        self._push(update, errors=unknown_interface_unless_warning(interface_id))
 
     def edit_interface_spanning_tree(self, interface_id, edge=None):
         config = self.query(one_interface(interface_id),
@@ -552,18 +749,69 @@ class Juniper(SwitchBase):
         update = Update()
         update.add_interface(interface_state_update(interface_id, state))
 
-        try:
-            self._push(update)
-        except RPCError as e:
+        def errors(e):
             self.logger.info("actual setting error was {}".format(e))
             # When sending a "delete operation" on a nonexistent element <disable />, this is the error that is thrown.
             # It's ignored because the result of this operation would be the same as if the command was successful.
             if "statement not found" not in e.message:
                 raise UnknownInterface(interface_id)
 
+        self._push(update, errors=errors)
+
     def unset_interface_state(self, interface_id):
         self.set_interface_state(interface_id, state=ON)
 
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        filters = [some_interfaces(*interface_ids)]
+        if access_vlan is not None:
+            filters.append(self.custom_strategies.all_vlans)
+        config = self.query(*filters)
+
+        if access_vlan is not None:
+            self.custom_strategies.vlan_node(config, access_vlan)
+
+        update = Update()
+        for interface_id in interface_ids:
+            interface_node = self.get_interface_config(interface_id, config)
+
+            attributes = []
+            if description is not None:
+                attributes.append(to_ele("<description>{}</description>".format(description)))
+            if state is OFF:
+                attributes.append(to_ele("<disable />"))
+            elif state is ON and interface_node is not None and len(interface_node.xpath("disable")) > 0:
+                attributes.append(to_ele("<disable operation=\"delete\" />"))
+            if mtu is not None:
+                attributes.append(to_ele("<mtu>{}</mtu>".format(mtu)))
+
+            update_attributes = []
+            update_vlan_members = []
+            if access_vlan is not None:
+                self._compute_access_vlan_update(interface_node, config, access_vlan,
+                                                 update_attributes, update_vlan_members)
+
+            if update_attributes or update_vlan_members:
+                content = self.custom_strategies.interface_update(interface_id, "0", update_attributes, update_vlan_members)
+            elif attributes:
+                content = interface_main_update(interface_id, None)
+            else:
+                continue
+
+            content[1:1] = attributes
+            update.add_interface(content)
+
+        def errors(e):
+            self.logger.info("actual setting error was {}".format(e))
+            if mtu is not None and "Value {} is not within range".format(mtu) in str(e):
+                raise InvalidMtuSize(str(e))
+            if access_vlan is not None and "No vlan matches vlan tag" in e.message:
+                raise UnknownVlan(access_vlan)
+
+            raise UnknownInterface(next((i for i in interface_ids if i in e.message), interface_ids[0]))
+
+        if update.interfaces_root is not None:
+            self._push(update, errors=errors)
+
     def set_interface_lldp_state(self, interface_id, enabled):
         config = self.query(one_interface(interface_id),
                             one_protocol_interface("lldp", self._for_protocol(interface_id)))
@@ -594,13 +842,13 @@ class Juniper(SwitchBase):
         update = Update()
         update.add_interface(bond_update(number, bond_lacp_options()))
 
-        try:
-            self._push(update)
-        except RPCError as e:
+        def errors(e):
             if "device value outside range" in e.message:
                 raise BadBondNumber()
 
-            raise
+            raise e
+
+        self._push(update, errors=errors)
 
     def remove_bond(self, number):
         config = self.query(all_interfaces, one_protocol_interface("rstp", self._for_protocol(bond_name(number))))
@@ -621,7 +869,8 @@ class Juniper(SwitchBase):
         self._push(update)
 
     def add_interface_to_bond(self, interface, bond_id):
-        config = self.query(all_interfaces, self.custom_strategies.all_vlans, rstp_protocol_interfaces)
+        config = self.query(some_interfaces(bond_name(bond_id), interface), self.custom_strategies.all_vlans,
+                            one_protocol_interface("rstp", self._for_protocol(interface)))
         bond = self.node_to_bond(self.get_bond_config(bond_id, config), config)
 
         update = Update()
@@ -635,15 +884,15 @@ class Juniper(SwitchBase):
         self._push_interface_update(interface, update)
 
     def remove_interface_from_bond(self, interface):
-        try:
-            update = Update()
-            update.add_interface(free_from_bond_operation(interface))
-            self._push(update)
-        except RPCError:
+        def errors(_):
             self._get_physical_interface(interface)
 
             raise InterfaceNotInBond()
 
+        update = Update()
+        update.add_interface(free_from_bond_operation(interface))
+        self._push(update, errors=errors)
+
     def set_bond_link_speed(self, number, speed):
         config = self.query(all_interfaces)
         self.get_bond_config(number, config)
@@ -669,9 +918,9 @@ class Juniper(SwitchBase):
     def get_bonds(self):
         config = self.query(all_interfaces, self.custom_strategies.all_vlans)
         bond_nodes = config.xpath("data/configuration/interfaces/interface/aggregated-ether-options/..")
+        slaves_by_bond = self.index_bond_members(config)
         return [
-            self.node_to_bond(node, config, self.get_bond_slaves_config(
-                value_of(node.xpath("name"), transformer=bond_number), config))
+            self.node_to_bond(node, config, slaves_by_bond.get(first_text(node.xpath("name"))))
             for node in bond_nodes]
 
     def set_bond_description(self, number, description):
@@ -707,33 +956,101 @@ class Juniper(SwitchBase):
     def edit_bond_spanning_tree(self, number, edge=None):
         return self.edit_interface_spanning_tree(bond_name(number), edge=edge)
 
-    def _push_interface_update(self, interface_id, configuration):
-        try:
-            self._push(configuration)
-        except RPCError as e:
+    def _push_interface_update(self, interface_id, configuration, errors=None):
+        def interface_errors(e):
             if "port value outside range" in e.message \
                     or "invalid interface type" in e.message \
                     or "device value outside range" in e.message:
                 raise UnknownInterface(interface_id)
-            raise
+            if errors is not None:
+                return errors(e)
+            raise e
+
+        self._push(configuration, errors=interface_errors)
+
+    def _push(self, configuration, errors=None):
+        # errors is called with the RPCError refusing the update, it raises what explains the failure
+        # or returns if the error can be ignored.
+        if self.deferred_edits and self.in_transaction:
+            # the switch has not validated the update yet, the sections it touches are read again once it is sent
+            self.pending_updates.append((configuration, errors))
+            self.candidate_cache.forget(configuration.root)
+            self.vlan_interfaces.invalidate()
+            return
+
+        self._edit_config(configuration.root, errors)
+        self.candidate_cache.apply(configuration.root)
+        self.vlan_interfaces.invalidate()
 
-    def _push(self, configuration):
+    def flush_updates(self):
+        if len(self.pending_updates) == 0:
+            return
+
+        pending_updates, self.pending_updates = self.pending_updates, []
+        coalesced = coalesce([update.root for update, _ in pending_updates]) if len(pending_updates) > 1 else None
+        if coalesced is not None:
+            try:
+                self._edit_config(coalesced)
+                self.sent_updates.extend(pending_updates)
+                return
+            except RPCError:
+                self.logger.info("Sending the {} updates one by one to find the failing one".format(len(pending_updates)))
+                self._restore_candidate()
+
+        # every update is sent even if one fails, the caller may still commit the others
+        failure = None
+        for update in pending_updates:
+            configuration, errors = update
+            try:
+                self._edit_config(configuration.root, errors)
+                self.sent_updates.append(update)
+            except Exception as e:
+                failure = failure or e
+
+        if failure is not None:
+            raise failure
+
+    def _restore_candidate(self):
+        # the refused edit may have been partly applied, the candidate is brought back to the updates it accepted
+        self.netconf.discard_changes()
+        self.candidate_cache.clear()
+        for configuration, errors in self.sent_updates:
+            self._edit_config(configuration.root, errors)
+
+    def _edit_config(self, configuration, errors=None):
         config = new_ele('config')
-        config.append(configuration.root)
+        config.append(configuration)
 
         self.logger.info("Sending edit : {}".format(to_xml(config)))
         try:
-            self.netconf.edit_config(target="candidate", config=config)
+            with metrics.timed("netconf", "edit-config"):
+                self.netconf.edit_config(target="candidate", config=config)
         except RPCError as e:
             self.logger.info("An RPCError was raised : {}".format(e))
-            raise
+            self.candidate_cache.clear()
+            if errors is None:
+                raise
+            errors(e)
 
     def query(self, *args):
         filter_node = new_ele("filter")
         conf = sub_ele(filter_node, "configuration")
         for arg in args:
             conf.append(arg())
-        return self.netconf.get_config(source="candidate" if self.in_transaction else "running", filter=filter_node)
+
+        if self.in_transaction:
+            cached = self.candidate_cache.get(list(conf))
+            if cached is not None:
+                return cached
+            self.flush_updates()
+
+        with metrics.timed("netconf", "get-config") as measure:
+            config = self.netconf.get_config(source="candidate" if self.in_transaction else "running", filter=filter_node)
+            measure.received_bytes = _reply_size(config)
+
+        if self.in_transaction:
+            self.candidate_cache.store(list(conf), config)
+        return config
 
     def get_interface(self, interface_id):
         config = self.query(one_interface(interface_id), self.custom_strategies.all_vlans)
@@ -743,6 +1060,33 @@ class Juniper(SwitchBase):
 
         return self._get_physical_interface(interface_id).to_interface()
 
+    def get_interfaces_by_name(self, names):
+        if len(names) == 0:
+            return []
+
+        config = self.query(some_interfaces(*names), self.custom_strategies.all_vlans)
+
+        interfaces = []
+        for name in names:
+            interface_node = self.get_interface_config(name, config)
+            if interface_node is not None:
+                interfaces.append(self.node_to_interface(interface_node, config))
+            else:
+                try:
+                    interfaces.append(self._get_physical_interface(name).to_interface())
+                except UnknownInterface:
+                    pass
+
+        return interfaces
+
+    def get_interfaces_by_name_prefix(self, prefix):
+        names = [i.name for i in self._list_physical_interfaces()
+                 if i.name.startswith(prefix) and not i.name.startswith("ae")]
+        if len(names) > MAX_SELECTED_INTERFACES:
+            return [interface for interface in self.get_interfaces() if interface.name.startswith(prefix)]
+
+        return self.get_interfaces_by_name(names)
+
     def get_interface_config(self, interface_id, config=None):
         config = config or self.query(one_interface(interface_id))
         interface_node = first(config.xpath(
@@ -763,6 +1107,15 @@ class Juniper(SwitchBase):
             'ieee-802.3ad/bundle[text()=\"{0}\"]/../../..'.format(
                 bond_name(bond_id)))
 
+    def index_bond_members(self, config):
+        slaves_by_bond = {}
+        for interface_node in config.xpath("data/configuration/interfaces/interface"):
+            bond = first_text(interface_node.xpath("ether-options/ieee-802.3ad/bundle"))
+            if bond is not None:
+                slaves_by_bond.setdefault(bond, []).append(interface_node)
+
+        return slaves_by_bond
+
     def get_port_mode(self, interface_node):
         if interface_node is None:
             return None
@@ -818,38 +1171,54 @@ class Juniper(SwitchBase):
         return bond
 
     def get_vlan_interfaces(self, vlan_number):
-        config = self.query(self.custom_strategies.one_vlan_by_vlan_id(vlan_number), all_interfaces)
+        if not self.vlan_interfaces.loaded:
+            self._load_vlan_interfaces()
 
-        vlan_node = self.custom_strategies.vlan_node(config, vlan_number)
-        interface_nodes = config.xpath("data/configuration/interfaces/interface")
-        return self.get_vlan_interfaces_from_node(vlan_node, interface_nodes)
+        if not self.vlan_interfaces.knows(int(vlan_number)):
+            raise UnknownVlan(vlan_number)
+        return self.vlan_interfaces.interfaces_of(int(vlan_number))
 
-    def get_vlan_interfaces_from_node(self, vlan_node, interface_nodes):
-        vlan_name = first(vlan_node.xpath("name")).text
-        vlan_number = int(first(vlan_node.xpath("vlan-id")).text)
-        interfaces = []
-        for interface in interface_nodes:
+    def _load_vlan_interfaces(self):
+        config = self.query(self.custom_strategies.all_vlans, all_interfaces)
+
+        members = []
+        for interface in config.xpath("data/configuration/interfaces/interface"):
+            vlans = self.custom_strategies.list_vlan_members(interface, config)
             native_vlan_id_node = self.custom_strategies.get_interface_trunk_native_vlan_id_node(interface)
-            if len(native_vlan_id_node) == 1 and int(first(native_vlan_id_node).text) == vlan_number:
-                interfaces.append(first(interface.xpath("name")).text)
+            if len(native_vlan_id_node) == 1:
+                vlans.add(int(first(native_vlan_id_node).text))
+            members.append((first(interface.xpath("name")).text, vlans))
 
-            members = [members.text for members in interface.xpath("unit/family/ethernet-switching/vlan/members")]
-            if _is_vlan_in_interface_members(vlan_number, vlan_name, members):
-                interfaces.append(first(interface.xpath("name")).text)
-        return interfaces
+        known_vlans = VlanSet(int(vlan_id.text) for vlan_node in self.custom_strategies.vlan_nodes(config)
+                              for vlan_id in vlan_node.xpath("vlan-id"))
+        self.vlan_interfaces.load(members, known_vlans)
+
+    def refresh_physical_interfaces(self):
+        self.inventory.invalidate(self.switch_descriptor)
+        return self._list_physical_interfaces()
 
     def _get_physical_interface(self, interface_id):
+        interfaces = self.inventory.get(self.switch_descriptor, self._fetch_physical_interfaces)
+        if interface_id not in interfaces:
+            self.inventory.invalidate(self.switch_descriptor)
+            interfaces = self.inventory.get(self.switch_descriptor, self._fetch_physical_interfaces)
+
         try:
-            return next(i for i in self._list_physical_interfaces() if i.name == interface_id)
-        except StopIteration:
+            return interfaces[interface_id]
+        except KeyError:
             raise UnknownInterface(interface_id)
 
     def _list_physical_interfaces(self):
-        terse = self.netconf.rpc(to_ele("""
-            <get-interface-information>
-              <terse/>
-            </get-interface-information>
-        """))
+        return self.inventory.get(self.switch_descriptor, self._fetch_physical_interfaces).values()
+
+    def _fetch_physical_interfaces(self):
+        with metrics.timed("netconf", "get-interface-information") as measure:
+            terse = self.netconf.rpc(to_ele("""
+                <get-interface-information>
+                  <terse/>
+                </get-interface-information>
+            """))
+            measure.received_bytes = _reply_size(terse)
 
         return [_PhysicalInterface(i.xpath("name")[0].text.strip(),
                                    shutdown=i.xpath("admin-status")[0].text.strip() == "down")
@@ -859,11 +1228,13 @@ class Juniper(SwitchBase):
         return self.custom_strategies.get_protocols_interface_name(interface_name)
 
     def get_mac_addresses(self):
-        mac_table = self.netconf.rpc(to_ele("""
-            <get-ethernet-switching-table-information>
-                <detail/>
-            </get-ethernet-switching-table-information>
-        """))
+        with metrics.timed("netconf", "get-ethernet-switching-table-information") as measure:
+            mac_table = self.netconf.rpc(to_ele("""
+                <get-ethernet-switching-table-information>
+                    <detail/>
+                </get-ethernet-switching-table-information>
+            """))
+            measure.received_bytes = _reply_size(mac_table)
 
         return self.custom_strategies.parse_mac_address_table(mac_table)
 
@@ -872,6 +1243,79 @@ def all_interfaces():
     return new_ele("interfaces")
 
 
+def coalesce(configurations):
+    """
+    Merges updates into one, entries of the same list (same tag and <name>) are merged together.
+
+    Returns None when the updates can't be merged without changing their meaning, such as an entry
+    given an operation by one update and changed by another.
+    """
+    root = new_ele("configuration")
+    for configuration in configurations:
+        for section in configuration:
+            if not _merge_update(root, section):
+                return None
+    return root
+
+
+def _merge_update(target, node):
+    existing = _same_entry(target, node)
+    if existing is None:
+        target.append(deepcopy(node))
+        return True
+
+    if dict(existing.attrib) != dict(node.attrib) or "operation" in node.attrib:
+        return False
+
+    existing_children, children = _elements(existing), _elements(node)
+    if len(existing_children) == 0 and len(children) == 0:
+        existing.text = node.text
+        return True
+    if len(existing_children) == 0 or len(children) == 0:
+        return False
+
+    return all(_merge_update(existing, child) for child in children)
+
+
+def _same_entry(target, node):
+    candidates = [c for c in _elements(target) if c.tag == node.tag]
+
+    if node.tag in LEAF_LISTS:
+        return next((c for c in candidates if (c.text or "").strip() == (node.text or "").strip()), None)
+
+    key = node.findtext("name")
+    if key is not None:
+        return next((c for c in candidates if c.findtext("name") == key), None)
+
+    return next(iter(candidates), None)
+
+
+def _elements(node):
+    return [c for c in node if isinstance(c.tag, basestring)]
+
+
+def unknown_vlan_errors(vlan):
+    def m(e):
+        if "No vlan matches vlan tag" in e.message:
+            raise UnknownVlan(vlan)
+        raise e
+
+    return m
+
+
+def unknown_interface_unless_warning(interface_id):
+    def m(e):
+        if e.severity != "warning":
+            raise UnknownInterface(interface_id)
+
+    return m
+
+
+def _reply_size(reply):
+    xml = getattr(reply, "xml", None)
+    return len(xml) if isinstance(xml, basestring) else None
+
+
 def one_interface(interface_id):
     def m():
         return to_ele("""
@@ -885,14 +1329,44 @@ def one_interface(interface_id):
     return m
 
 
-def rstp_protocol_interfaces():
-    return to_ele("""
-        <protocols>
-          <rstp>
-            <interface />
-          </rstp>
-        </protocols>
-    """)
+def some_interfaces(*interface_ids):
+    def m():
+        return to_ele("""
+            <interfaces>{}</interfaces>
+        """.format("".join("<interface><name>{}</name></interface>".format(i) for i in interface_ids)))
+
+    return m
+
+
+def one_interface_unit(interface_id, unit):
+    def m():
+        return to_ele("""
+            <interfaces>
+                <interface>
+                    <name>{}</name>
+                    <unit>
+                        <name>{}</name>
+                    </unit>
+                </interface>
+            </interfaces>
+        """.format(interface_id, unit))
+
+    return m
+
+
+def some_interface_units(units):
+    units_by_interface = OrderedDict()
+    for interface_id, unit in units:
+        units_by_interface.setdefault(interface_id, []).append(unit)
+
+    def m():
+        return to_ele("""
+            <interfaces>{}</interfaces>
+        """.format("".join("<interface><name>{}</name>{}</interface>".format(
+            interface_id, "".join("<unit><name>{}</name></unit>".format(u) for u in interface_units))
+            for interface_id, interface_units in units_by_interface.items())))
+
+    return m
 
 
 def one_protocol_interface(protocol, interface_name):
@@ -1041,10 +1515,10 @@ def first_text(node):
 
 def parse_range(r):
     if regex.match("(\d+)-(\d+)", r):
-        return range(int(regex[0]), int(regex[1]) + 1)
+        return VlanSet.from_ranges([(int(regex[0]), int(regex[1]))])
     elif regex.match("(\d+)", r):
-        return [int(regex[0])]
-    return []
+        return VlanSet([int(regex[0])])
+    return VlanSet()
 
 
 def to_range(number_list):
@@ -1171,20 +1645,6 @@ def _compute_edge_state_modifications(interface_id, edge, config):
     return modifications
 
 
-def _is_vlan_in_interface_members(vlan_number, vlan_name, members):
-    for member_name in members:
-        if regex.match("(\d+)-(\d+)", member_name):
-            start, end = regex
-            if int(start) <= vlan_number <= int(end):
-                return True
-        elif member_name == vlan_name:
-            return True
-        elif int(member_name) == vlan_number:
-            return True
-
-    return False
-
-
 class _PhysicalInterface(object):
     def __init__(self, name, shutdown):
         self.name = name
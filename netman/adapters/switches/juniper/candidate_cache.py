@@ -0,0 +1,230 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from copy import deepcopy
+import re
+
+from lxml import etree
+
+LEAF_LISTS = ("members", "vlan-id-list", "virtual-address")
+ALTERED_BY_SWITCH = ("authentication-key",)
+# a range of members may be kept as written or expanded, depending on the switch
+MEMBERS_RANGE = re.compile(r"^\d+-\d+$")
+
+
+class CandidateCache(object):
+    """
+    Copy of the candidate configuration sections read during a transaction.
+
+    Complete sections (``<vlans/>``, ``<interfaces/>``, ...) are kept, as well as the entries read
+    alone by their ``<name>`` (``<interfaces><interface><name>ge-0/0/1</name></interface></interfaces>``).
+    Every edit pushed to the candidate is applied on them so they stay identical to what the switch
+    would answer. Anything that can't be applied with certainty is dropped instead.
+    """
+
+    def __init__(self):
+        self.sections = {}
+        self.entries = {}
+
+    def clear(self):
+        self.sections = {}
+        self.entries = {}
+
+    def get(self, filters):
+        if len(filters) == 0:
+            return None
+
+        reply = etree.Element("rpc-reply")
+        configuration = etree.SubElement(etree.SubElement(reply, "data"), "configuration")
+        for f in filters:
+            if _name(f) in self.sections:
+                section = _select(self.sections[_name(f)], f)
+            elif _entry_key(f) in self.entries:
+                section = self._entry_section(_entry_key(f))
+            else:
+                return None
+
+            if section is not None and len(_children(section)) > 0:
+                configuration.append(section)
+        return CachedReply(reply)
+
+    def store(self, filters, reply):
+        for f in filters:
+            if len(_children(f)) == 0:
+                sections = reply.xpath("data/configuration/{}".format(_name(f)))
+                self.sections[_name(f)] = deepcopy(sections[0]) if sections else etree.Element(_name(f))
+            elif _entry_key(f) is not None:
+                section, tag, name = _entry_key(f)
+                entries = [e for e in reply.xpath("data/configuration/{}/{}".format(section, tag))
+                           if _entry_name(e) == name]
+                self.entries[_entry_key(f)] = deepcopy(entries[0]) if entries else None
+
+    def forget(self, configuration):
+        for update in _children(configuration):
+            self.sections.pop(_name(update), None)
+            for key in self._touched_entries(update):
+                del self.entries[key]
+
+    def apply(self, configuration):
+        for update in _children(configuration):
+            section = self.sections.get(_name(update))
+            if section is not None and (update.get("operation") is not None or not _merge(section, update)):
+                del self.sections[_name(update)]
+
+            for key in self._touched_entries(update):
+                if not self._merge_entry(key, update):
+                    del self.entries[key]
+
+    def _entry_section(self, key):
+        section = etree.Element(key[0])
+        if self.entries[key] is not None:
+            section.append(deepcopy(self.entries[key]))
+        return section
+
+    def _merge_entry(self, key, update):
+        changes = _children(update, key[1])
+        if self.entries[key] is None or update.get("operation") is not None \
+                or any(_entry_name(c) is None for c in changes):
+            return False
+        return all(c.get("operation") is None and _merge(self.entries[key], c)
+                   for c in changes if _entry_name(c) == key[2])
+
+    def _touched_entries(self, update):
+        return [key for key in self.entries if key[0] == _name(update) and (
+            update.get("operation") is not None
+            or any(_entry_name(c) in (None, key[2]) for c in _children(update, key[1])))]
+
+
+class CachedReply(object):
+    def __init__(self, doc):
+        self.doc = doc
+
+    def xpath(self, expression):
+        return self.doc.xpath(expression)
+
+    def find(self, expression):
+        return self.doc.find(expression)
+
+    def findtext(self, expression):
+        return self.doc.findtext(expression)
+
+    @property
+    def data_xml(self):
+        return etree.tostring(self.doc)
+
+
+def _select(node, subtree_filter):
+    children = _children(subtree_filter)
+    if len(children) == 0:
+        return deepcopy(node)
+
+    content_matches = [c for c in children if len(_children(c)) == 0 and _text(c)]
+    for match in content_matches:
+        if not any(_text(n) == _text(match) for n in _children(node, _name(match))):
+            return None
+
+    selections = [c for c in children if c not in content_matches]
+    if len(selections) == 0:
+        return deepcopy(node)
+
+    result = etree.Element(_name(node))
+    for match in content_matches:
+        result.append(deepcopy(next(n for n in _children(node, _name(match)) if _text(n) == _text(match))))
+
+    selected = False
+    for selection in selections:
+        for child in _children(node, _name(selection)):
+            selected_child = _select(child, selection)
+            if selected_child is not None:
+                result.append(selected_child)
+                selected = True
+
+    return result if selected or len(content_matches) > 0 else None
+
+
+def _entry_key(subtree_filter):
+    entries = _children(subtree_filter)
+    if len(entries) != 1 or len(_children(entries[0])) != 1 or _entry_name(entries[0]) is None:
+        return None
+
+    return _name(subtree_filter), _name(entries[0]), _entry_name(entries[0])
+
+
+def _entry_name(node):
+    names = _children(node, "name")
+    if len(names) == 0 or not _text(names[0]):
+        return None
+    return _text(names[0])
+
+
+def _merge(target, update):
+    for change in _children(update):
+        operation = change.get("operation")
+        existing = _find(target, change)
+
+        if _name(change) in ALTERED_BY_SWITCH:
+            return False
+
+        if _name(change) in LEAF_LISTS and MEMBERS_RANGE.match(_text(change)):
+            return False
+
+        if operation == "delete" and len(existing) == 0:
+            return False
+        elif operation in ("delete", "replace"):
+            for node in existing:
+                target.remove(node)
+        elif operation is not None:
+            return False
+
+        if operation == "delete":
+            continue
+        elif operation == "replace" or len(existing) == 0:
+            node = etree.Element(_name(change))
+            node.text = change.text
+            if not _merge(node, change):
+                return False
+            target.append(node)
+        elif len(_children(change)) == 0:
+            existing[0].text = change.text
+        elif not _merge(existing[0], change) or len(_children(existing[0])) == 0:
+            return False
+
+    return True
+
+
+def _find(target, change):
+    candidates = _children(target, _name(change))
+
+    if _name(change) in LEAF_LISTS:
+        if _text(change):
+            return [n for n in candidates if _text(n) == _text(change)]
+        return candidates
+
+    key = next(iter(_children(change, "name")), None)
+    if key is not None:
+        return [n for n in candidates if any(_text(k) == _text(key) for k in _children(n, "name"))]
+
+    return candidates[:1]
+
+
+def _children(node, name=None):
+    return [c for c in node if isinstance(c.tag, basestring) and (name is None or _name(c) == name)]
+
+
+def _name(node):
+    return etree.QName(node).localname
+
+
+def _text(node):
+    return (node.text or "").strip()
@@ -0,0 +1,54 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class PhysicalInterfaceInventory(object):
+    """
+    Physical interfaces of each switch, indexed by name and kept for ``ttl`` seconds.
+
+    The ports of a chassis rarely change, switch instances living for a single request share
+    this inventory so that finding one interface doesn't cost a full listing every time.
+    """
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, switch_descriptor, fetch):
+        with self.lock:
+            entry = self.entries.get(_key(switch_descriptor))
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            return entry[1]
+
+        interfaces = OrderedDict((i.name, i) for i in fetch())
+        with self.lock:
+            self.entries[_key(switch_descriptor)] = (time.time(), interfaces)
+        return interfaces
+
+    def invalidate(self, switch_descriptor):
+        with self.lock:
+            self.entries.pop(_key(switch_descriptor), None)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+
+
+def _key(switch_descriptor):
+    return switch_descriptor.hostname, switch_descriptor.port
@@ -19,6 +19,7 @@ from netman.adapters.switches.juniper.base import first, Juniper, Update, one_in
 from netman.adapters.switches.juniper.qfx_copper import JuniperQfxCopperCustomStrategies
 from netman.core.objects.exceptions import BadVlanName, BadVlanNumber, VlanAlreadyExist, UnknownVlan, IPAlreadySet, \
     UnknownIP, AccessVlanNotSet, UnknownInterface, VrrpDoesNotExistForVlan
+from netman.core.objects.vlan_set import VlanSet
 from netman.core.objects.vrrp_group import VrrpGroup
 
 IRB = "irb"
@@ -44,6 +45,12 @@ class MxJuniper(Juniper):
     def unset_interface_state(self, interface_id):
         raise NotImplementedError()
 
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        if description is not None or state is not None or mtu is not None:
+            raise NotImplementedError()
+
+        super(MxJuniper, self).edit_interfaces(interface_ids, access_vlan=access_vlan)
+
     def set_interface_auto_negotiation_state(self, interface_id, negotiation_state):
         raise NotImplementedError()
 
@@ -400,14 +407,14 @@ class JuniperMXCustomStrategies(JuniperQfxCopperCustomStrategies):
             return None, None
 
     def list_vlan_members(self, interface_node, config):
-        vlans = set()
+        vlans = VlanSet()
 
         vlan_id_list = interface_node.xpath("unit/family/bridge/vlan-id-list") + interface_node.xpath("unit/family/bridge/vlan-id")
 
         for members in vlan_id_list:
-            vlans = vlans.union(parse_range(members.text))
+            vlans.extend(parse_range(members.text))
 
-        return sorted(vlans)
+        return vlans
 
     def update_vlan_members(self, interface_node, vlan_members, vlan):
         if interface_node is not None:
@@ -417,28 +424,27 @@ class JuniperMXCustomStrategies(JuniperQfxCopperCustomStrategies):
         vlan_members.append(to_ele("<vlan-id>{}</vlan-id>".format(vlan)))
 
     def craft_members_modification_to_remove_vlan(self, interface_node, vlan_name, number):
+        return self.craft_members_modification_to_remove_vlans(interface_node, [vlan_name], VlanSet([number]))
+
+    def craft_members_modification_to_remove_vlans(self, interface_node, vlan_names, numbers):
         members_modifications = []
 
         vlan_id_list = interface_node.xpath("unit/family/bridge/vlan-id-list") + interface_node.xpath("unit/family/bridge/vlan-id")
 
         for vlan_members_node in vlan_id_list:
-            if vlan_members_node.text == vlan_name:
+            if vlan_members_node.text in vlan_names:
                 members_modifications.append(to_ele("<{tag} operation=\"delete\">{id}</{tag}>".format(
                     tag=vlan_members_node.tag,
                     id=vlan_members_node.text)
                 ))
             else:
                 vlan_list = parse_range(vlan_members_node.text)
-                if number in vlan_list:
+                remaining = vlan_list - numbers
+                if len(remaining) < len(vlan_list):
                     members_modifications.append(to_ele("<vlan-id-list operation=\"delete\">{}</vlan-id-list>".format(vlan_members_node.text)))
 
-                    below = vlan_list[:vlan_list.index(number)]
-                    if len(below) > 0:
-                        members_modifications.append(to_ele("<vlan-id-list>{}</vlan-id-list>".format(to_range(below))))
-
-                    above = vlan_list[vlan_list.index(number) + 1:]
-                    if len(above) > 0:
-                        members_modifications.append(to_ele("<vlan-id-list>{}</vlan-id-list>".format(to_range(above))))
+                    for start, end in remaining.ranges:
+                        members_modifications.append(to_ele("<vlan-id-list>{}</vlan-id-list>".format(to_range(xrange(start, end + 1)))))
 
         return members_modifications
 
@@ -17,6 +17,7 @@ from netman.adapters.switches.juniper.base import interface_speed, interface_rep
     first_text, bond_name, Juniper, first, value_of, parse_range, to_range
 from netman.core.objects.exceptions import BadVlanName, BadVlanNumber, VlanAlreadyExist, UnknownVlan
 from netman.core.objects.mac_address import MacAddress
+from netman.core.objects.vlan_set import VlanSet
 
 
 def netconf(switch_descriptor, *args, **kwargs):
@@ -151,14 +152,14 @@ class JuniperCustomStrategies(object):
             return None, None
 
     def list_vlan_members(self, interface_node, config):
-        vlans = set()
+        vlans = VlanSet()
         for members in interface_node.xpath("unit/family/ethernet-switching/vlan/members"):
             vlan_id = value_of(config.xpath('data/configuration/vlans/vlan/name[text()="{}"]/../vlan-id'.format(members.text)), transformer=int)
             if vlan_id:
-                vlans = vlans.union([vlan_id])
+                vlans.add(vlan_id)
             else:
-                vlans = vlans.union(parse_range(members.text))
-        return sorted(vlans)
+                vlans.extend(parse_range(members.text))
+        return vlans
 
     def update_vlan_members(self, interface_node, vlan_members, vlan):
         if interface_node is not None:
@@ -167,22 +168,21 @@ class JuniperCustomStrategies(object):
         vlan_members.append(to_ele("<members>{}</members>".format(vlan)))
 
     def craft_members_modification_to_remove_vlan(self, interface_node, vlan_name, number):
+        return self.craft_members_modification_to_remove_vlans(interface_node, [vlan_name], VlanSet([number]))
+
+    def craft_members_modification_to_remove_vlans(self, interface_node, vlan_names, numbers):
         members_modifications = []
         for vlan_members_node in interface_node.xpath("unit/family/ethernet-switching/vlan/members"):
-            if vlan_members_node.text == vlan_name:
+            if vlan_members_node.text in vlan_names:
                 members_modifications.append(to_ele("<members operation=\"delete\">{}</members>".format(vlan_members_node.text)))
             else:
                 vlan_list = parse_range(vlan_members_node.text)
-                if number in vlan_list:
+                remaining = vlan_list - numbers
+                if len(remaining) < len(vlan_list):
                     members_modifications.append(to_ele("<members operation=\"delete\">{}</members>".format(vlan_members_node.text)))
 
-                    below = vlan_list[:vlan_list.index(number)]
-                    if len(below) > 0:
-                        members_modifications.append(to_ele("<members>{}</members>".format(to_range(below))))
-
-                    above = vlan_list[vlan_list.index(number) + 1:]
-                    if len(above) > 0:
-                        members_modifications.append(to_ele("<members>{}</members>".format(to_range(above))))
+                    for start, end in remaining.ranges:
+                        members_modifications.append(to_ele("<members>{}</members>".format(to_range(xrange(start, end + 1)))))
 
         return members_modifications
 
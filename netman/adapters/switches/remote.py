@@ -13,8 +13,11 @@
 # limitations under the License.
 
 import __builtin__
+from collections import OrderedDict
 import importlib
 import json
+import threading
+import urllib
 import uuid
 import warnings
 
@@ -29,6 +32,9 @@ from netman.core.objects.access_groups import IN, OUT
 from netman.core.objects.exceptions import NetmanException, UnknownSession
 from netman.core.objects.interface_states import OFF, ON
 from netman.core.objects.switch_base import SwitchBase
+from netman.core.objects.vlan_set import VlanSet
+
+MAX_CONDITIONAL_REPLIES = 256
 
 
 def factory(switch_descriptor):
@@ -43,6 +49,7 @@ class RemoteSwitch(SwitchBase):
         super(RemoteSwitch, self).__init__(switch_descriptor)
         self.requests = requests
         self.session_id = None
+        self.conditional_replies = conditional_replies
 
         if isinstance(self.switch_descriptor.netman_server, list):
             self._proxy = self.switch_descriptor.netman_server[0]
@@ -112,11 +119,25 @@ class RemoteSwitch(SwitchBase):
     def get_vlans(self):
         return [vlan.to_core(row) for row in self.get("/vlans").json()]
 
+    def get_vlans_by_number(self, numbers):
+        query = urllib.urlencode({'numbers': VlanSet(numbers).to_ranges_string()})
+        return [vlan.to_core(row) for row in self.get("/vlans?{}".format(query)).json()]
+
     def get_interface(self, interface_id):
-        return interface.to_core(self.get("/interfaces/{}".format(interface_id)).json())
+        reply = self.get("/interfaces/{}".format(interface_id))
+        return interface.to_core(reply.json(), version=reply.headers.get('Netman-Version'))
 
     def get_interfaces(self):
-        return [interface.to_core(row) for row in self.get("/interfaces").json()]
+        reply = self.get("/interfaces")
+        return [interface.to_core(row, version=reply.headers.get('Netman-Version')) for row in reply.json()]
+
+    def get_interfaces_by_name(self, names):
+        reply = self.get("/interfaces?{}".format(urllib.urlencode({'names': ",".join(names)})))
+        return [interface.to_core(row, version=reply.headers.get('Netman-Version')) for row in reply.json()]
+
+    def get_interfaces_by_name_prefix(self, prefix):
+        reply = self.get("/interfaces?{}".format(urllib.urlencode({'name_prefix': prefix})))
+        return [interface.to_core(row, version=reply.headers.get('Netman-Version')) for row in reply.json()]
 
     def get_bond(self, number):
         reply = self.get('/bonds/{}'.format(number))
@@ -135,6 +156,12 @@ class RemoteSwitch(SwitchBase):
     def remove_vlan(self, number):
         self.delete("/vlans/{0}".format(str(number)))
 
+    def add_vlans(self, numbers):
+        self.post("/vlan-ranges", raw_data=VlanSet(numbers).to_ranges_string())
+
+    def remove_vlans(self, numbers):
+        self.delete("/vlan-ranges/{}".format(VlanSet(numbers).to_ranges_string()))
+
     def get_vlan_interfaces(self, vlan_number):
         return self.get("/vlans/{}/interfaces".format(vlan_number)).json()
 
@@ -221,6 +248,12 @@ class RemoteSwitch(SwitchBase):
     def remove_trunk_vlan(self, interface_id, vlan):
         self.delete("/interfaces/" + interface_id + '/trunk-vlans/' + str(vlan))
 
+    def add_trunk_vlans(self, interface_id, vlans):
+        self.post("/interfaces/" + interface_id + '/trunk-vlan-ranges', raw_data=VlanSet(vlans).to_ranges_string())
+
+    def remove_trunk_vlans(self, interface_id, vlans):
+        self.delete("/interfaces/" + interface_id + '/trunk-vlan-ranges/' + VlanSet(vlans).to_ranges_string())
+
     def add_bond_trunk_vlan(self, bond_number, vlan):
         self.post("/bonds/" + str(bond_number) + '/trunk-vlans', raw_data=str(vlan))
 
@@ -264,6 +297,19 @@ class RemoteSwitch(SwitchBase):
     def unset_interface_state(self, interface_id):
         self.delete("/interfaces/" + interface_id + '/shutdown')
 
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        data = {"interfaces": list(interface_ids)}
+        if description is not None:
+            data["description"] = description
+        if state is not None:
+            data["shutdown"] = state is OFF
+        if mtu is not None:
+            data["mtu"] = mtu
+        if access_vlan is not None:
+            data["access_vlan"] = access_vlan
+
+        self.put("/interfaces", data=data)
+
     def set_interface_auto_negotiation_state(self, interface_id, state):
         self.put("/interfaces/" + interface_id + '/auto-negotiation', raw_data='true' if state is ON else 'false')
 
@@ -364,8 +410,7 @@ class RemoteSwitch(SwitchBase):
 
     def get(self, relative_url):
         return self._retry_on_unknown_session(
-            lambda: self.validated(
-                self.requests.get(**self.request(relative_url))))
+            lambda: self._conditional_get(self.request(relative_url)))
 
     def post(self, relative_url, data=None, raw_data=None):
         return self._retry_on_unknown_session(
@@ -417,6 +462,25 @@ class RemoteSwitch(SwitchBase):
             "headers": headers,
         }
 
+    def _conditional_get(self, details):
+        if self.session_id is not None:
+            return self.validated(self.requests.get(**details))
+
+        key = (details["url"], details["headers"]["Netman-Max-Version"])
+        cached = self.conditional_replies.get(key)
+        if cached is not None:
+            details["headers"]["If-None-Match"] = cached.headers["ETag"]
+
+        reply = self.validated(self.requests.get(**details))
+
+        if reply.status_code == 304 and cached is not None:
+            self.logger.info("{} not modified, reusing last reply".format(details["url"]))
+            return cached
+
+        if "ETag" in reply.headers:
+            self.conditional_replies.store(key, reply)
+        return reply
+
     def validated(self, req):
         if req.status_code >= 400:
             try:
@@ -452,5 +516,41 @@ class RemoteSwitch(SwitchBase):
             return operation()
 
 
+class ConditionalReplies(object):
+    """
+    Last reply carrying an ETag of every url read outside of a session.
+
+    RemoteSwitch instances are built for every request, the replies are kept for all of them so a proxy
+    polling the same url can revalidate it. The body depends on ``Netman-Max-Version``, which is part of
+    the key. Only the ``max_size`` most recently used urls are kept.
+    """
+
+    def __init__(self, max_size=MAX_CONDITIONAL_REPLIES):
+        self.max_size = max_size
+        self.replies = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            reply = self.replies.pop(key, None)
+            if reply is not None:
+                self.replies[key] = reply
+            return reply
+
+    def store(self, key, reply):
+        with self.lock:
+            self.replies.pop(key, None)
+            self.replies[key] = reply
+            while len(self.replies) > self.max_size:
+                self.replies.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.replies.clear()
+
+
+conditional_replies = ConditionalReplies()
+
+
 def _get_json_boolean(state):
     return {True: "true", False: "false"}[state]
@@ -27,6 +27,7 @@ class SubShell(object):
         self.enter = enter
         self.exit = exit_cmd
         self.validate = validate or (lambda x: None)
+        self.validated = validate is not None
 
     def __enter__(self):
         if isinstance(self.enter, list):
@@ -43,6 +44,65 @@ class SubShell(object):
         self.ssh.do(self.exit)
 
 
+class CommandPipeline(object):
+    """
+    Commands written to the shell in blocks instead of waiting for the prompt after each of them.
+
+    A command with a validation is the last of its block, so that a failure stops the commands after
+    it like when they are sent one at a time : the failure is raised after leaving the sub shells
+    still opened.
+    """
+
+    def __init__(self, shell):
+        self.shell = shell
+        self.steps = []
+        self.levels = []
+
+    def do(self, command, validate=None):
+        self.steps.append((command, validate, None, False))
+
+    def enter(self, sub_shell):
+        commands = sub_shell.enter if isinstance(sub_shell.enter, list) else [sub_shell.enter]
+        validate = sub_shell.validate if sub_shell.validated else None
+
+        self.steps.append((commands[0], validate, sub_shell.exit, False))
+        for command in commands[1:]:
+            self.steps.append((command, validate, None, False))
+        self.levels.append(sub_shell.exit)
+
+    def exit(self):
+        self.steps.append((self.levels.pop(), None, None, True))
+
+    def run(self):
+        opened = []
+        for block in self._blocks():
+            results = self.shell.do_many([command for command, _, _, _ in block])
+
+            for (command, validate, opens, closes), result in zip(block, results):
+                if validate:
+                    try:
+                        validate(result)
+                    except Exception:
+                        for exit_cmd in reversed(opened):
+                            self.shell.do(exit_cmd)
+                        raise
+                if opens:
+                    opened.append(opens)
+                if closes:
+                    opened.pop()
+
+    def _blocks(self):
+        block = []
+        for step in self.steps:
+            block.append(step)
+            _, validate, _, _ = step
+            if validate:
+                yield block
+                block = []
+        if block:
+            yield block
+
+
 def no_output(exc, *args):
     def m(welcome_msg):
         if len(welcome_msg) > 0:
@@ -105,3 +165,41 @@ class PageReader(object):
                                                   include_last_line=True)
 
         return result[:-1]
+
+
+class VlanInterfacesIndex(object):
+    """
+    Interfaces carrying each vlan, built from a single read of the interfaces configuration.
+
+    Drivers load it with the ``(interface name, vlans)`` pairs they parsed, in configuration
+    order, and invalidate it when the connection ends or the configuration changes.
+    """
+
+    def __init__(self):
+        self.members = None
+        self.known_vlans = None
+        self.interfaces_by_vlan = {}
+
+    def load(self, members, known_vlans=None):
+        self.members = list(members)
+        self.known_vlans = known_vlans
+        self.interfaces_by_vlan = {}
+
+    def invalidate(self):
+        self.members = None
+        self.known_vlans = None
+        self.interfaces_by_vlan = {}
+
+    @property
+    def loaded(self):
+        return self.members is not None
+
+    def knows(self, vlan_number):
+        return self.known_vlans is None or vlan_number in self.known_vlans
+
+    def interfaces_of(self, vlan_number):
+        interfaces = self.interfaces_by_vlan.get(vlan_number)
+        if interfaces is None:
+            interfaces = [name for name, vlans in self.members if vlan_number in vlans]
+            self.interfaces_by_vlan[vlan_number] = interfaces
+        return list(interfaces)
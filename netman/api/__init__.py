@@ -13,4 +13,4 @@
 # limitations under the License.
 
 
-NETMAN_API_VERSION = 2
+NETMAN_API_VERSION = 3
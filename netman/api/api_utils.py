@@ -58,6 +58,19 @@ def to_response(fn):
     return wrapper
 
 
+def conditional(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        response = fn(*args, **kwargs)
+        if response.status_code == 200:
+            response.vary.add("Netman-Max-Version")
+            response.add_etag()
+            response.make_conditional(request)
+        return response
+
+    return wrapper
+
+
 def exception_to_response(exception, code):
     data = {'error': str(exception)}
 
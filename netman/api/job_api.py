@@ -0,0 +1,102 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+
+from flask import request
+
+from netman.api.api_utils import to_response
+from netman.api.objects import job
+from netman.api.validators import content, is_job
+
+
+class JobApi(object):
+    def __init__(self, job_manager):
+        self.job_manager = job_manager
+        self.server = None
+
+    @property
+    def logger(self):
+        return logging.getLogger(__name__)
+
+    def hook_to(self, server):
+        server.add_url_rule('/jobs', view_func=self.submit_job, methods=['POST'])
+        server.add_url_rule('/jobs/<job_id>', view_func=self.get_job, methods=['GET'])
+
+        self.server = server
+        return self
+
+    @to_response
+    @content(is_job)
+    def submit_job(self, method, resource, body, content_type):
+        """
+        Queue an operation on a switch and return immediately, the operation is run by a worker in the background.
+        The ``Netman-*`` headers of this request are passed along to the operation.
+
+        :body:
+            Highlighted fields are mandatory
+
+            .. literalinclude:: ../doc_config/api_samples/post_jobs.json
+                :language: json
+                :emphasize-lines: 2-3
+
+        :code 202 ACCEPTED:
+        :code 409 CONFLICT: Too many unfinished jobs
+
+        Example output:
+
+        .. literalinclude:: ../doc_config/api_samples/post_jobs_result.json
+            :language: json
+
+        """
+
+        headers = {k: v for k, v in request.headers.items() if k.startswith("Netman-")}
+        job_id = self.job_manager.submit(lambda: self._replay(method, resource, headers, body, content_type))
+
+        return 202, {'job_id': job_id}
+
+    @to_response
+    def get_job(self, job_id):
+        """
+        Displays the status of a job and, once done, the response of its operation
+
+        :arg str job_id: ID of the job
+        :code 200 OK:
+
+        Example output:
+
+        .. literalinclude:: ../doc_config/api_samples/get_jobs_job_id.json
+            :language: json
+
+        """
+
+        return 200, job.to_api(self.job_manager.get_job(job_id))
+
+    def _replay(self, method, resource, headers, body, content_type):
+        # dispatched in a request of its own, without going through the WSGI stack of a client again
+        with self.server.test_request_context('/{}'.format(resource), method=method, headers=headers, data=body,
+                                              content_type=content_type):
+            response = self.server.full_dispatch_request()
+
+        return response.status_code, _content_of(response)
+
+
+def _content_of(response):
+    data = response.get_data()
+    if not data:
+        return None
+    if response.mimetype == 'application/json':
+        return json.loads(data)
+    return data
@@ -14,19 +14,20 @@
 
 import logging
 import os
+from collections import OrderedDict
 
-from flask import send_from_directory
-from pkg_resources import get_distribution
+from flask import send_from_directory, current_app
 
 from netman.api.api_utils import to_response
 from netman.api.objects import info
+from netman.core import metrics
 
 
 class NetmanApi(object):
-    def __init__(self, switch_factory=None, get_distribution_callback=get_distribution):
+    def __init__(self, switch_factory=None, get_distribution_callback=None):
         self.switch_factory = switch_factory
         self.app = None
-        self.get_distribution = get_distribution_callback
+        self.get_distribution = get_distribution_callback or get_distribution
 
     @property
     def logger(self):
@@ -37,6 +38,9 @@ class NetmanApi(object):
         server.add_url_rule('/netman/info', endpoint="netman_info", view_func=self.get_info, methods=['GET'])
         server.add_url_rule('/netman/apidocs/', endpoint="netman_apidocs", view_func=self.api_docs, methods=['GET'])
         server.add_url_rule('/netman/apidocs/<path:filename>', endpoint="netman_apidocs", view_func=self.api_docs, methods=['GET'])
+        server.add_url_rule('/netman/metrics', endpoint="netman_metrics", view_func=self.get_metrics, methods=['GET'])
+        server.before_request(metrics.start_recording)
+        server.after_request(add_server_timing)
 
     @to_response
     def get_info(self):
@@ -60,6 +64,17 @@ class NetmanApi(object):
             lock_provider=_class_fqdn(self.switch_factory.lock_factory)
         )
 
+    def get_metrics(self):
+        """
+        Durations of the switch operations and of the commands they sent, in the Prometheus text format,
+        labeled by switch model and operation
+
+        :code 200 OK:
+
+        """
+
+        return current_app.response_class(metrics.registry.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
     def api_docs(self, filename=None):
         """
         Shows this documentation
@@ -68,5 +83,24 @@ class NetmanApi(object):
         return send_from_directory(os.path.dirname(__file__) + "/doc/html/", filename or "index.html")
 
 
+def add_server_timing(response):
+    totals = OrderedDict()
+    for measure in metrics.stop_recording():
+        name = "{}.{}".format(measure.operation or "request", measure.kind)
+        count, duration = totals.get(name, (0, 0.0))
+        totals[name] = (count + 1, duration + measure.duration)
+
+    if len(totals) > 0:
+        response.headers['Server-Timing'] = ", ".join(
+            '{};dur={:.1f};desc="{} commands"'.format(name, duration * 1000, count)
+            for name, (count, duration) in totals.items())
+    return response
+
+
 def _class_fqdn(obj):
     return "{}.{}".format(obj.__module__, obj.__class__.__name__)
+
+
+def get_distribution(name):
+    from pkg_resources import get_distribution
+    return get_distribution(name)
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+MAX_PLANS = 64
+
 
 def sub_dict(d, *keys):
     return {k: d[k] for k in keys}
@@ -26,20 +28,30 @@ class Serializer(object):
     def to_core(self, api_dict):
         raise NotImplementedError()
 
+    def to_api_list(self, core_objects):
+        return [self.to_api(o) for o in core_objects]
+
 
 class Serializers(object):
     def __init__(self, *serializers):
         self.serializers = sorted(serializers, key=lambda s: s.since_version, reverse=True)
+        self.plans = {None: self.serializers[-1]}
 
     def at_most(self, version):
-        if version is None:
-            return self.serializers[-1]
-        for s in self.serializers:
-            if s.since_version <= float(version):
-                return s
+        # clients send the same Netman-Max-Version on every request, the serializer chosen is kept for it
+        if version in self.plans:
+            return self.plans[version]
+
+        serializer = next((s for s in self.serializers if s.since_version <= float(version)), None)
+        if len(self.plans) < MAX_PLANS:
+            self.plans[version] = serializer
+        return serializer
 
     def to_api(self, core_object, version=None):
         return self.at_most(version).to_api(core_object)
 
+    def to_api_list(self, core_objects, version=None):
+        return self.at_most(version).to_api_list(core_objects)
+
     def to_core(self, api_dict, version=None):
         return self.at_most(version).to_core(api_dict)
@@ -15,8 +15,9 @@
 from netman.api.objects import sub_dict, Serializer, Serializers
 from netman.core.objects.interface import BaseInterface
 from netman.core.objects.port_modes import ACCESS, TRUNK, DYNAMIC, BOND_MEMBER
+from netman.core.objects.vlan_set import VlanSet
 
-__all__ = ['to_api', 'to_core']
+__all__ = ['to_api', 'to_core', 'to_api_list']
 
 
 serialized_port_mode = {
@@ -26,28 +27,52 @@ serialized_port_mode = {
     BOND_MEMBER: "bond_member"
 }
 
+core_port_mode = {v: k for k, v in serialized_port_mode.items()}
+
 
 class V1(Serializer):
     since_version = 1
 
     def to_core(self, serialized):
         return BaseInterface(
-            port_mode=dict((v, k) for k, v in serialized_port_mode.iteritems())[serialized.pop('port_mode')],
-            **sub_dict(serialized, 'shutdown', 'access_vlan', 'trunk_native_vlan', 'trunk_vlans', 'mtu')
+            port_mode=core_port_mode[serialized.pop('port_mode')],
+            trunk_vlans=self.vlans_to_core(serialized['trunk_vlans']),
+            **sub_dict(serialized, 'shutdown', 'access_vlan', 'trunk_native_vlan', 'mtu')
         )
 
     def to_api(self, base_interface):
-        return dict(
-            shutdown=base_interface.shutdown,
-            port_mode=serialized_port_mode[base_interface.port_mode],
-            access_vlan=base_interface.access_vlan,
-            trunk_native_vlan=base_interface.trunk_native_vlan,
-            trunk_vlans=sorted(base_interface.trunk_vlans),
-            mtu=base_interface.mtu
-        )
+        return {
+            "shutdown": base_interface.shutdown,
+            "port_mode": serialized_port_mode[base_interface.port_mode],
+            "access_vlan": base_interface.access_vlan,
+            "trunk_native_vlan": base_interface.trunk_native_vlan,
+            "trunk_vlans": self.vlans_to_api(base_interface.trunk_vlans),
+            "mtu": base_interface.mtu
+        }
+
+    def vlans_to_core(self, vlans):
+        return vlans
+
+    def vlans_to_api(self, vlans):
+        return sorted(vlans)
+
+
+class V3(V1):
+    """
+    Vlan lists are sent as ``[start, end]`` ranges, a trunk carrying every vlan is ``[[1, 4094]]``
+    instead of 4094 numbers.
+    """
+    since_version = 3
+
+    def vlans_to_core(self, vlans):
+        return VlanSet.from_ranges(vlans)
+
+    def vlans_to_api(self, vlans):
+        return [[start, end] for start, end in VlanSet(vlans).ranges]
 
 
-serializers = Serializers(V1())
+serializers = Serializers(V1(), V3())
 
 to_api = serializers.to_api
 to_core = serializers.to_core
+to_api_list = serializers.to_api_list
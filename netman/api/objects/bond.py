@@ -19,26 +19,29 @@ from netman.core.objects.bond import Bond
 from netman.core.objects.interface import Interface
 
 
-__all__ = ['to_api', 'to_core']
+__all__ = ['to_api', 'to_core', 'to_api_list']
 
 
 class V2(Serializer):
     since_version = 2
 
     def to_api(self, bond):
-        return dict(
-            number=bond.number,
-            link_speed=bond.link_speed,
-            members=bond.members,
-            **base_interface.to_api(bond)
-        )
+        serialized = base_interface.to_api(bond, version=self.since_version)
+        serialized["number"] = bond.number
+        serialized["link_speed"] = bond.link_speed
+        serialized["members"] = bond.members
+        return serialized
 
     def to_core(self, api_bond):
-        params = dict(vars(base_interface.to_core(api_bond)))
+        params = base_interface.to_core(api_bond, version=self.since_version).as_dict()
         params.update(sub_dict(api_bond, 'number', 'link_speed', 'members'))
         return Bond(**params)
 
 
+class V3(V2):
+    since_version = 3
+
+
 class V1(Serializer):
     since_version = 1
 
@@ -59,12 +62,13 @@ class V1(Serializer):
         )
 
     def to_core(self, api_bond):
-        params = dict(vars(base_interface.to_core(api_bond['interface'])))
+        params = base_interface.to_core(api_bond['interface']).as_dict()
         params.update(sub_dict(api_bond, 'number', 'link_speed', 'members'))
         return Bond(**params)
 
 
-serializers = Serializers(V1(), V2())
+serializers = Serializers(V1(), V2(), V3())
 
 to_api = serializers.to_api
 to_core = serializers.to_core
+to_api_list = serializers.to_api_list
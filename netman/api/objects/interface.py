@@ -17,29 +17,33 @@ from netman.api.objects import base_interface
 from netman.core.objects.interface import Interface
 
 
-__all__ = ['to_api', 'to_core']
+__all__ = ['to_api', 'to_core', 'to_api_list']
 
 
 class V1(Serializer):
     since_version = 1
 
     def to_api(self, interface):
-        return dict(
-            base_interface.to_api(interface),
-            name=interface.name,
-            bond_master=interface.bond_master,
-            auto_negotiation=interface.auto_negotiation,
-            force_up=interface.force_up,
-            recovery_timeout=interface.recovery_timeout
-        )
+        serialized = base_interface.to_api(interface, version=self.since_version)
+        serialized["name"] = interface.name
+        serialized["bond_master"] = interface.bond_master
+        serialized["auto_negotiation"] = interface.auto_negotiation
+        serialized["force_up"] = interface.force_up
+        serialized["recovery_timeout"] = interface.recovery_timeout
+        return serialized
 
     def to_core(self, serialized):
-        params = dict(vars(base_interface.to_core(serialized)))
+        params = base_interface.to_core(serialized, version=self.since_version).as_dict()
         params.update(sub_dict(serialized, 'name', 'bond_master', 'auto_negotiation', 'force_up'))
         return Interface(**params)
 
 
-serializers = Serializers(V1())
+class V3(V1):
+    since_version = 3
+
+
+serializers = Serializers(V1(), V3())
 
 to_api = serializers.to_api
 to_core = serializers.to_core
+to_api_list = serializers.to_api_list
@@ -0,0 +1,27 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+def to_api(job):
+    result = None
+    if job.result is not None:
+        code, content = job.result
+        result = dict(code=code, content=content)
+
+    return dict(
+        id=job.id,
+        status=job.status,
+        result=result,
+        error=job.error
+    )
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from operator import itemgetter
+
 from netaddr import IPNetwork, IPAddress
 
 from netman.api.objects import vrrp_group
@@ -20,25 +22,29 @@ from netman.core.objects.vlan import Vlan
 
 
 def to_api(vlan):
-    return dict(
-        number=vlan.number,
-        name=vlan.name,
-        ips=serialize_ip_network(vlan.ips),
-        vrrp_groups=sorted([vrrp_group.to_api(group) for group in vlan.vrrp_groups], key=lambda i: i['id']),
-        vrf_forwarding=vlan.vrf_forwarding,
-        access_groups={
+    return {
+        "number": vlan.number,
+        "name": vlan.name,
+        "ips": serialize_ip_network(vlan.ips),
+        "vrrp_groups": _sorted([vrrp_group.to_api(group) for group in vlan.vrrp_groups], 'id'),
+        "vrf_forwarding": vlan.vrf_forwarding,
+        "access_groups": {
             "in": vlan.access_groups[IN],
             "out": vlan.access_groups[OUT]
         },
-        dhcp_relay_servers=[str(server) for server in vlan.dhcp_relay_servers],
-        arp_routing=vlan.arp_routing,
-        icmp_redirects=vlan.icmp_redirects,
-        unicast_rpf_mode=vlan.unicast_rpf_mode,
-        ntp=vlan.ntp,
-        varp_ips=serialize_ip_network(vlan.varp_ips),
-        load_interval=vlan.load_interval,
-        mpls_ip=vlan.mpls_ip
-    )
+        "dhcp_relay_servers": [str(server) for server in vlan.dhcp_relay_servers],
+        "arp_routing": vlan.arp_routing,
+        "icmp_redirects": vlan.icmp_redirects,
+        "unicast_rpf_mode": vlan.unicast_rpf_mode,
+        "ntp": vlan.ntp,
+        "varp_ips": serialize_ip_network(vlan.varp_ips),
+        "load_interval": vlan.load_interval,
+        "mpls_ip": vlan.mpls_ip
+    }
+
+
+def to_api_list(vlans):
+    return [to_api(v) for v in vlans]
 
 
 def to_core(serialized):
@@ -63,4 +69,10 @@ def deserialize_ip_network(ips):
 
 
 def serialize_ip_network(ips):
-    return sorted([{'address': ipn.ip.format(), 'mask': ipn.prefixlen} for ipn in ips], key=lambda i: i['address'])
+    return _sorted([{'address': str(ipn.ip), 'mask': ipn.prefixlen} for ipn in ips], 'address')
+
+
+def _sorted(serialized, key):
+    if len(serialized) < 2:
+        return serialized
+    return sorted(serialized, key=itemgetter(key))
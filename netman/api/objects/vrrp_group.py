@@ -18,15 +18,15 @@ from netman.core.objects.vrrp_group import VrrpGroup
 
 
 def to_api(vrrp):
-    return dict(
-        id=vrrp.id,
-        ips=sorted([str(i) for i in vrrp.ips]),
-        priority=vrrp.priority,
-        track_id=vrrp.track_id,
-        track_decrement=vrrp.track_decrement,
-        hello_interval=vrrp.hello_interval,
-        dead_interval=vrrp.dead_interval,
-    )
+    return {
+        "id": vrrp.id,
+        "ips": sorted([str(i) for i in vrrp.ips]),
+        "priority": vrrp.priority,
+        "track_id": vrrp.track_id,
+        "track_decrement": vrrp.track_decrement,
+        "hello_interval": vrrp.hello_interval,
+        "dead_interval": vrrp.dead_interval,
+    }
 
 
 def to_core(serialized):
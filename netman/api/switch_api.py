@@ -14,13 +14,14 @@
 
 from flask import request
 
-from netman.api.api_utils import BadRequest, to_response
+from netman.api.api_utils import BadRequest, to_response, conditional
 from netman.api.objects import bond, interface, vlan
 from netman.api.switch_api_base import SwitchApiBase
 from netman.api.validators import Switch, is_boolean, is_vlan_number, Interface, Vlan, resource, content, is_ip_network, \
     IPNetworkResource, is_access_group_name, Direction, is_vlan, is_bond, Bond, \
     is_bond_link_speed, is_bond_number, is_description, is_vrf_name, \
-    is_vrrp_group, VrrpGroup, is_dict_with, optional, is_type, is_int, is_unincast_rpf_mode, is_recovery_timeout
+    is_vrrp_group, VrrpGroup, is_dict_with, optional, is_type, is_int, is_unincast_rpf_mode, is_recovery_timeout, \
+    InterfaceQuery, VlanQuery, VlanRanges, is_vlan_ranges
 from netman.core.objects.interface_states import OFF, ON
 from netman.core.validator import is_valid_mpls_state
 
@@ -29,10 +30,13 @@ class SwitchApi(SwitchApiBase):
 
     def hook_to(self, server):
         server.add_url_rule('/switches/<hostname>/versions', view_func=self.get_versions, methods=['GET'])
+        server.add_url_rule('/switches/<hostname>/flush', view_func=self.flush_configuration, methods=['POST'])
         server.add_url_rule('/switches/<hostname>/vlans', view_func=self.get_vlans, methods=['GET'])
         server.add_url_rule('/switches/<hostname>/vlans', view_func=self.add_vlan, methods=['POST'])
         server.add_url_rule('/switches/<hostname>/vlans/<vlan_number>', view_func=self.get_vlan, methods=['GET'])
         server.add_url_rule('/switches/<hostname>/vlans/<vlan_number>', view_func=self.remove_vlan, methods=['DELETE'])
+        server.add_url_rule('/switches/<hostname>/vlan-ranges', view_func=self.add_vlans, methods=['POST'])
+        server.add_url_rule('/switches/<hostname>/vlan-ranges/<vlan_ranges>', view_func=self.remove_vlans, methods=['DELETE'])
         server.add_url_rule('/switches/<hostname>/vlans/<vlan_number>/interfaces', view_func=self.get_vlan_interfaces, methods=['GET'])
         server.add_url_rule('/switches/<hostname>/vlans/<vlan_number>/ips', view_func=self.add_ip, methods=['POST'])
         server.add_url_rule('/switches/<hostname>/vlans/<vlan_number>/ips/<path:ip_network>', view_func=self.remove_ip, methods=['DELETE'])
@@ -55,6 +59,7 @@ class SwitchApi(SwitchApiBase):
         server.add_url_rule('/switches/<hostname>/vlans/<vlan_number>/load-interval', view_func=self.unset_vlan_load_interval, methods=['DELETE'])
         server.add_url_rule('/switches/<hostname>/vlans/<vlan_number>/mpls-ip', view_func=self.set_vlan_mpls_ip_state, methods=['PUT'])
         server.add_url_rule('/switches/<hostname>/interfaces', view_func=self.get_interfaces, methods=['GET'])
+        server.add_url_rule('/switches/<hostname>/interfaces', view_func=self.edit_interfaces, methods=['PUT'])
         server.add_url_rule('/switches/<hostname>/mac-addresses', view_func=self.get_mac_addresses, methods=['GET'])
         server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>', view_func=self.reset_interface, methods=['PUT'])
         server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>', view_func=self.get_interface, methods=['GET'])
@@ -65,6 +70,8 @@ class SwitchApi(SwitchApiBase):
         server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>/access-vlan', view_func=self.unset_interface_access_vlan, methods=['DELETE'])
         server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>/trunk-vlans', view_func=self.add_trunk_vlan, methods=['POST'])
         server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>/trunk-vlans/<vlan_number>', view_func=self.remove_trunk_vlan, methods=['DELETE'])
+        server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>/trunk-vlan-ranges', view_func=self.add_trunk_vlans, methods=['POST'])
+        server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>/trunk-vlan-ranges/<vlan_ranges>', view_func=self.remove_trunk_vlans, methods=['DELETE'])
         server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>/trunk-native-vlan', view_func=self.set_interface_native_vlan, methods=['PUT'])
         server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>/trunk-native-vlan', view_func=self.unset_interface_native_vlan, methods=['DELETE'])
         server.add_url_rule('/switches/<hostname>/interfaces/<path:interface_id>/bond-master', view_func=self.add_interface_to_bond, methods=['PUT'])
@@ -101,6 +108,19 @@ class SwitchApi(SwitchApiBase):
 
         return self
 
+    @to_response
+    def flush_configuration(self, hostname):
+        """
+        Saves now the configuration of a switch whose save is still pending
+
+        :arg str hostname: Hostname or IP of the switch
+        """
+        save_scheduler = getattr(self.switch_factory, "save_scheduler", None)
+        if save_scheduler is not None:
+            save_scheduler.flush(hostname)
+
+        return 204, None
+
     @to_response
     @resource(Switch)
     def get_versions(self, switch):
@@ -119,14 +139,19 @@ class SwitchApi(SwitchApiBase):
 
         return 200, switch.get_versions()
 
+    @conditional
     @to_response
-    @resource(Switch)
-    def get_vlans(self, switch):
+    @resource(Switch, VlanQuery)
+    def get_vlans(self, switch, query):
         """
         Displays informations about all VLANs
 
         :arg str hostname: Hostname or IP of the switch
+        :query str fields: Comma separated list of the attributes to return, all of them by default
+        :query str name_prefix: Only return VLANs whose name starts with this value
+        :query str numbers: Only return these VLANs, comma separated numbers and ranges (ex. ``10,20,100-120``)
         :code 200 OK:
+        :code 304 Not Modified: The ``If-None-Match`` header matches the ``ETag`` of the content
 
         Example output:
 
@@ -134,9 +159,14 @@ class SwitchApi(SwitchApiBase):
             :language: json
 
         """
-        vlans = sorted(switch.get_vlans(), key=lambda x: x.number)
+        if query.numbers is not None:
+            vlans = switch.get_vlans_by_number(query.numbers)
+        else:
+            vlans = switch.get_vlans()
+
+        vlans = sorted([v for v in vlans if query.matches(v)], key=lambda x: x.number)
 
-        return 200, [vlan.to_api(v) for v in vlans]
+        return 200, [query.select(v) for v in vlan.to_api_list(vlans)]
 
     @to_response
     @resource(Switch, Vlan)
@@ -157,6 +187,7 @@ class SwitchApi(SwitchApiBase):
 
         return 200, switch.get_vlan_interfaces(vlan_number)
 
+    @conditional
     @to_response
     @resource(Switch, Vlan)
     def get_vlan(self, switch, vlan_number):
@@ -166,6 +197,7 @@ class SwitchApi(SwitchApiBase):
         :arg str hostname: Hostname or IP of the switch
         :arg int vlan_number: Vlan number, between 1 and 4096
         :code 200 OK:
+        :code 304 Not Modified: The ``If-None-Match`` header matches the ``ETag`` of the content
 
         Example output:
 
@@ -210,6 +242,38 @@ class SwitchApi(SwitchApiBase):
         switch.remove_vlan(vlan_number)
         return 204, None
 
+    @to_response
+    @content(is_vlan_ranges)
+    @resource(Switch)
+    def add_vlans(self, switch, vlans):
+        """
+        Create many VLANs at once, all of them or none if one already exists
+
+        :arg str hostname: Hostname or IP of the switch
+        :body:
+            Comma separated numbers and ranges
+
+            .. literalinclude:: ../doc_config/api_samples/post_switch_hostname_vlan_ranges.txt
+
+        """
+
+        switch.add_vlans(vlans)
+        return 201, None
+
+    @to_response
+    @resource(Switch, VlanRanges)
+    def remove_vlans(self, switch, vlans):
+        """
+        Deletes many VLANs at once, all of them or none if one does not exist
+
+        :arg str hostname: Hostname or IP of the switch
+        :arg str vlan_ranges: Comma separated numbers and ranges (ex. ``100-300,400``)
+
+        """
+
+        switch.remove_vlans(vlans)
+        return 204, None
+
     @to_response
     @content(is_ip_network)
     @resource(Switch, Vlan)
@@ -405,6 +469,7 @@ class SwitchApi(SwitchApiBase):
         switch.set_vlan_mpls_ip_state(vlan_number, state)
         return 204, None
 
+    @conditional
     @to_response
     @resource(Switch)
     def get_interface(self, switch, interface_id):
@@ -414,33 +479,83 @@ class SwitchApi(SwitchApiBase):
         :arg str hostname: Hostname or IP of the switch
         :arg str interface_id: name of the interface
         :code 200 OK:
+        :code 304 Not Modified: The ``If-None-Match`` header matches the ``ETag`` of the content
 
         Example output:
 
-        .. literalinclude:: ../doc_config/api_samples/get_switch_hostname_interface.json
+        .. literalinclude:: ../doc_config/api_samples/get_switch_hostname_interface_v3.json
             :language: json
 
         """
-        return 200, interface.to_api(switch.get_interface(interface_id))
+        return 200, interface.to_api(
+            switch.get_interface(interface_id),
+            version=request.headers.get("Netman-Max-Version"))
 
+    @conditional
     @to_response
-    @resource(Switch)
-    def get_interfaces(self, switch):
+    @resource(Switch, InterfaceQuery)
+    def get_interfaces(self, switch, query):
         """
         Displays informations about all physical interfaces
 
         :arg str hostname: Hostname or IP of the switch
+        :query str fields: Comma separated list of the attributes to return, all of them by default
+        :query str name_prefix: Only return interfaces whose name starts with this value
+        :query str port_mode: Only return interfaces in this port mode (access, trunk, dynamic or bond_member)
+        :query int vlan: Only return interfaces carrying this VLAN, as access, native or trunk VLAN
+        :query str names: Only return these interfaces, comma separated
         :code 200 OK:
+        :code 304 Not Modified: The ``If-None-Match`` header matches the ``ETag`` of the content
 
         Example output:
 
-        .. literalinclude:: ../doc_config/api_samples/get_switch_hostname_interfaces.json
+        .. literalinclude:: ../doc_config/api_samples/get_switch_hostname_interfaces_v3.json
             :language: json
 
         """
-        interfaces = sorted(switch.get_interfaces(), key=lambda x: x.name.lower())
+        if query.names is not None:
+            interfaces = switch.get_interfaces_by_name(query.names)
+        elif query.name_prefix is not None:
+            interfaces = switch.get_interfaces_by_name_prefix(query.name_prefix)
+        else:
+            interfaces = switch.get_interfaces()
+
+        interfaces = sorted([i for i in interfaces if query.matches(i)], key=lambda x: x.name.lower())
+
+        serialized = interface.to_api_list(interfaces, version=request.headers.get("Netman-Max-Version"))
+
+        return 200, [query.select(i) for i in serialized]
+
+    @to_response
+    @content(is_dict_with(
+        interfaces=is_type(list),
+        description=optional(is_type(basestring)),
+        shutdown=optional(is_type(bool)),
+        mtu=optional(is_type(int)),
+        access_vlan=optional(is_type(int))))
+    @resource(Switch)
+    def edit_interfaces(self, switch, interfaces, description=None, shutdown=None, mtu=None, access_vlan=None):
+        """
+        Configures the same attributes on many interfaces at once
+
+        :arg str hostname: Hostname or IP of the switch
+        :arg list interfaces: Interface names (ex. ``FastEthernet0/1``, ``ethernet1/11``)
+        :arg str description: Interface description
+        :arg bool shutdown: Shuts the interfaces down when true, brings them up when false
+        :arg int mtu: Interface mtu
+        :arg int access_vlan: Access vlan number
+        :body:
+            .. literalinclude:: ../doc_config/api_samples/put_switch_hostname_interfaces.json
+        """
+        if access_vlan is not None:
+            access_vlan = is_vlan_number(access_vlan)['vlan_number']
 
-        return 200, [interface.to_api(i) for i in interfaces]
+        state = None
+        if shutdown is not None:
+            state = OFF if shutdown else ON
+
+        switch.edit_interfaces(interfaces, description=description, state=state, mtu=mtu, access_vlan=access_vlan)
+        return 204, None
 
     @to_response
     @content(is_boolean)
@@ -770,6 +885,38 @@ class SwitchApi(SwitchApiBase):
         switch.remove_trunk_vlan(interface_id, vlan_number)
         return 204, None
 
+    @to_response
+    @content(is_vlan_ranges)
+    @resource(Switch, Interface)
+    def add_trunk_vlans(self, switch, interface, vlans):
+        """
+        Adds many vlans to the trunk members of an interface at once
+
+        :arg str hostname: Hostname or IP of the switch
+        :arg str interface_id: Interface name (ex. ``FastEthernet0/1``, ``ethernet1/11``)
+        :body:
+            Comma separated numbers and ranges
+
+            .. literalinclude:: ../doc_config/api_samples/post_switch_hostname_interfaces_intname_trunkvlanranges.txt
+
+        """
+        switch.add_trunk_vlans(interface, vlans)
+        return 204, None
+
+    @to_response
+    @resource(Switch, Interface, VlanRanges)
+    def remove_trunk_vlans(self, switch, interface_id, vlans):
+        """
+        Removes many vlans from the trunk members of an interface at once
+
+        :arg str hostname: Hostname or IP of the switch
+        :arg str interface_id: Interface name (ex. ``FastEthernet0/1``, ``ethernet1/11``)
+        :arg str vlan_ranges: Comma separated numbers and ranges (ex. ``10-20,30``)
+
+        """
+        switch.remove_trunk_vlans(interface_id, vlans)
+        return 204, None
+
     @to_response
     @content(is_vlan_number)
     @resource(Switch, Bond)
@@ -860,6 +1007,7 @@ class SwitchApi(SwitchApiBase):
         switch.unset_bond_native_vlan(bond_number)
         return 204, None
 
+    @conditional
     @to_response
     @resource(Switch, Bond)
     def get_bond(self, switch, bond_number):
@@ -868,10 +1016,11 @@ class SwitchApi(SwitchApiBase):
 
         :arg str hostname: Hostname or IP of the switch
         :code 200 OK:
+        :code 304 Not Modified: The ``If-None-Match`` header matches the ``ETag`` of the content
 
         Example output:
 
-        .. literalinclude:: ../doc_config/api_samples/get_switch_hostname_bond_v2.json
+        .. literalinclude:: ../doc_config/api_samples/get_switch_hostname_bond_v3.json
             :language: json
 
         """
@@ -880,6 +1029,7 @@ class SwitchApi(SwitchApiBase):
             switch.get_bond(bond_number),
             version=request.headers.get("Netman-Max-Version"))
 
+    @conditional
     @to_response
     @resource(Switch)
     def get_bonds(self, switch):
@@ -888,18 +1038,17 @@ class SwitchApi(SwitchApiBase):
 
         :arg str hostname: Hostname or IP of the switch
         :code 200 OK:
+        :code 304 Not Modified: The ``If-None-Match`` header matches the ``ETag`` of the content
 
         Example output:
 
-        .. literalinclude:: ../doc_config/api_samples/get_switch_hostname_bonds_v2.json
+        .. literalinclude:: ../doc_config/api_samples/get_switch_hostname_bonds_v3.json
             :language: json
 
         """
         bonds = sorted(switch.get_bonds(), key=lambda x: x.number)
 
-        return 200, [bond.to_api(
-            b, version=request.headers.get("Netman-Max-Version")
-        ) for b in bonds]
+        return 200, bond.to_api_list(bonds, version=request.headers.get("Netman-Max-Version"))
 
     @to_response
     @content(is_bond)
@@ -1246,4 +1395,4 @@ class SwitchApi(SwitchApiBase):
             :language: json
         """
 
-        return 200, [port.__dict__ for port in switch.get_mac_addresses()]
+        return 200, [port.as_dict() for port in switch.get_mac_addresses()]
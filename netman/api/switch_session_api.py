@@ -83,6 +83,7 @@ class SwitchSessionApi(SwitchApiBase):
                 '/switches/{}/{}'.format(session_id, resource_name),
                 method=request.method,
                 headers={k: v for k, v in request.headers.items()},
+                query_string=request.query_string,
                 data=request.data)
             return response
 
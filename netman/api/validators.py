@@ -21,11 +21,17 @@ from flask import request
 from netaddr import IPNetwork, AddrFormatError, IPAddress
 
 from netman.api.api_utils import BadRequest, MultiContext
+from netman.api.objects import interface as interface_serializer, sub_dict, vlan as vlan_serializer
+from netman.api.objects.base_interface import serialized_port_mode
 from netman.core.objects.access_groups import IN, OUT
 from netman.core.objects.exceptions import UnknownResource, BadVlanNumber, \
     BadVlanName, BadBondNumber, BadBondLinkSpeed, MalformedSwitchSessionRequest, \
     BadVrrpGroupNumber, BadRecoveryTimeoutNumber
+from netman.core.objects import interface as core_interface
+from netman.core.objects.port_modes import ACCESS
 from netman.core.objects.unicast_rpf_modes import STRICT
+from netman.core.objects import vlan as core_vlan
+from netman.core.objects.vlan_set import VlanSet
 
 
 def resource(*validators):
@@ -69,6 +75,21 @@ class Vlan:
         pass
 
 
+class VlanRanges:
+    def __init__(self, switch_api):
+        self.switch_api = switch_api
+        self.vlans = None
+
+    def process(self, parameters):
+        self.vlans = is_vlan_ranges(parameters.pop('vlan_ranges'))['vlans']
+
+    def __enter__(self):
+        return self.vlans
+
+    def __exit__(self, *_):
+        pass
+
+
 class Bond:
     def __init__(self, switch_api):
         self.switch_api = switch_api
@@ -213,6 +234,103 @@ class VrrpGroup:
         pass
 
 
+class Query(object):
+    criteria = {}
+
+    def __init__(self, switch_api):
+        self.switch_api = switch_api
+        self.fields = None
+        self.filters = []
+
+    def process(self, parameters):
+        if 'fields' in request.args:
+            self.fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+
+            unknown_fields = [f for f in self.fields if f not in self.known_fields()]
+            if len(unknown_fields) > 0:
+                raise BadRequest("Unknown fields : {}".format(", ".join(unknown_fields)))
+
+        for name, criterion in self.criteria.items():
+            if name in request.args:
+                self.filters.append(criterion(request.args[name]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def known_fields(self):
+        raise NotImplementedError()
+
+    def matches(self, obj):
+        return all(f(obj) for f in self.filters)
+
+    def select(self, serialized):
+        if self.fields is None:
+            return serialized
+
+        return sub_dict(serialized, *self.fields)
+
+
+def has_name_prefix(prefix):
+    return lambda obj: (obj.name or "").startswith(prefix)
+
+
+def has_port_mode(port_mode):
+    if port_mode not in serialized_port_mode.values():
+        raise BadRequest("Unknown port mode : {}".format(port_mode))
+    return lambda interface: serialized_port_mode[interface.port_mode] == port_mode
+
+
+def carries_vlan(vlan_number):
+    number = is_vlan_number(vlan_number)['vlan_number']
+    return lambda interface: number in [interface.access_vlan, interface.trunk_native_vlan] or number in interface.trunk_vlans
+
+
+class InterfaceQuery(Query):
+    criteria = {
+        'name_prefix': has_name_prefix,
+        'port_mode': has_port_mode,
+        'vlan': carries_vlan
+    }
+
+    def __init__(self, switch_api):
+        super(InterfaceQuery, self).__init__(switch_api)
+        self.names = None
+        self.name_prefix = None
+
+    def process(self, parameters):
+        super(InterfaceQuery, self).process(parameters)
+        if 'names' in request.args:
+            self.names = [n.strip() for n in request.args['names'].split(',') if n.strip()]
+            if len(self.names) == 0:
+                raise BadRequest("Malformed interface names, should be a comma separated list")
+        self.name_prefix = request.args.get('name_prefix') or None
+
+    def known_fields(self):
+        return interface_serializer.to_api(core_interface.Interface(port_mode=ACCESS),
+                                           version=request.headers.get("Netman-Max-Version"))
+
+
+class VlanQuery(Query):
+    criteria = {
+        'name_prefix': has_name_prefix
+    }
+
+    def __init__(self, switch_api):
+        super(VlanQuery, self).__init__(switch_api)
+        self.numbers = None
+
+    def process(self, parameters):
+        super(VlanQuery, self).process(parameters)
+        if 'numbers' in request.args:
+            self.numbers = is_vlan_ranges(request.args['numbers'])['vlans']
+
+    def known_fields(self):
+        return vlan_serializer.to_api(core_vlan.Vlan())
+
+
 def is_session(data, **_):
     try:
         json_data = json.loads(data)
@@ -226,6 +344,34 @@ def is_session(data, **_):
     }
 
 
+def is_job(data, **_):
+    try:
+        json_data = json.loads(data)
+    except ValueError:
+        raise BadRequest("Malformed content, should be a JSON object")
+
+    method = str(json_data.get("method", "")).upper()
+    if method not in ["GET", "POST", "PUT", "DELETE"]:
+        raise BadRequest("Unknown method : {}".format(method))
+
+    resource = str(json_data.get("resource", "")).lstrip("/")
+    if not resource.startswith("switches/"):
+        raise BadRequest("Jobs can only run operations on switches resources")
+
+    body = json_data.get("body")
+    content_type = "text/plain"
+    if body is not None and not isinstance(body, basestring):
+        body = json.dumps(body)
+        content_type = "application/json"
+
+    return {
+        'method': method,
+        'resource': resource,
+        'body': body,
+        'content_type': content_type
+    }
+
+
 def is_vlan(data, **_):
     try:
         json_data = json.loads(data)
@@ -259,6 +405,18 @@ def is_vlan_number(vlan_number, **_):
     return {'vlan_number': vlan_int}
 
 
+def is_vlan_ranges(vlan_ranges, **_):
+    vlans = VlanSet()
+    for vlan_range in vlan_ranges.split(","):
+        bounds = [is_vlan_number(bound.strip())['vlan_number'] for bound in vlan_range.split("-", 1)]
+        if bounds[0] > bounds[-1]:
+            logging.getLogger("netman.api").info("Rejected vlan range : {}".format(vlan_range))
+            raise BadVlanNumber()
+        vlans.add_range(bounds[0], bounds[-1])
+
+    return {'vlans': vlans}
+
+
 def is_ip_network(data, **_):
     try:
         try:
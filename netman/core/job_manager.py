@@ -0,0 +1,104 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+from logging import getLogger
+import Queue
+import threading
+import time
+import uuid
+
+from netman.core.objects.exceptions import UnknownJob, TooManyJobs
+from netman.core.objects.job import Job, RUNNING, DONE, FAILED
+
+
+class JobManager(object):
+    def __init__(self, workers=4, max_jobs=1000, job_expiration=600):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.job_expiration = job_expiration
+        self.jobs = OrderedDict()
+        self.queue = Queue.Queue()
+        self.lock = threading.Lock()
+        self.threads = []
+
+    @property
+    def logger(self):
+        return getLogger(__name__)
+
+    def submit(self, operation):
+        with self.lock:
+            self._purge()
+            if len(self.jobs) >= self.max_jobs:
+                self._make_room()
+            if len(self.jobs) >= self.max_jobs:
+                raise TooManyJobs(self.max_jobs)
+
+            job = Job(id=str(uuid.uuid4()))
+            self.jobs[job.id] = job
+            self._start_workers()
+
+        self.logger.info("Queuing job {}".format(job.id))
+        self.queue.put((job, operation))
+        return job.id
+
+    def get_job(self, job_id):
+        with self.lock:
+            self._purge()
+            try:
+                return self.jobs[job_id]
+            except KeyError:
+                raise UnknownJob(job_id)
+
+    def run(self, job, operation):
+        self.logger.info("Running job {}".format(job.id))
+        job.status = RUNNING
+        try:
+            job.result = operation()
+            status = DONE
+        except Exception as e:
+            self.logger.exception("Job {} failed".format(job.id))
+            job.error = str(e) or e.__class__.__name__
+            status = FAILED
+        job.finished_at = time.time()
+        job.status = status
+
+    def _purge(self):
+        expired_before = time.time() - self.job_expiration
+        for job_id, job in self.jobs.items():
+            if job.finished_at is not None and job.finished_at <= expired_before:
+                self.logger.info("Job {} expired".format(job_id))
+                del self.jobs[job_id]
+
+    def _make_room(self):
+        for job_id, job in self.jobs.items():
+            if job.finished_at is not None:
+                self.logger.info("Dropping job {} to make room".format(job_id))
+                del self.jobs[job_id]
+                return
+
+    def _start_workers(self):
+        while len(self.threads) < self.workers:
+            thread = threading.Thread(target=self._work, name="netman-job-worker-{}".format(len(self.threads)))
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def _work(self):
+        while True:
+            job, operation = self.queue.get()
+            try:
+                self.run(job, operation)
+            finally:
+                self.queue.task_done()
@@ -0,0 +1,180 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_context = threading.local()
+
+
+class Measure(object):
+    def __init__(self, kind, command, model=None, operation=None):
+        self.kind = kind
+        self.command = command
+        self.model = model
+        self.operation = operation
+        self.duration = None
+        self.received_bytes = None
+
+
+class Histogram(object):
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bucket in enumerate(self.buckets):
+            if value <= bucket:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Metrics(object):
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.operations = OrderedDict()
+        self.commands = OrderedDict()
+        self.received_bytes = OrderedDict()
+
+    def observe_operation(self, model, operation, duration):
+        with self.lock:
+            self._histogram(self.operations, (model, operation)).observe(duration)
+
+    def observe_command(self, measure):
+        labels = (measure.model, measure.operation, measure.kind)
+        with self.lock:
+            self._histogram(self.commands, labels).observe(measure.duration)
+            if measure.received_bytes is not None:
+                self.received_bytes[labels] = self.received_bytes.get(labels, 0) + measure.received_bytes
+
+    def to_prometheus(self):
+        lines = []
+        with self.lock:
+            lines.append("# HELP netman_operation_duration_seconds Duration of switch operations")
+            lines.append("# TYPE netman_operation_duration_seconds histogram")
+            for (model, operation), histogram in self.operations.items():
+                lines.extend(_histogram_lines("netman_operation_duration_seconds", histogram,
+                                              model=model, operation=operation))
+
+            lines.append("# HELP netman_command_duration_seconds Duration of the commands sent to switches")
+            lines.append("# TYPE netman_command_duration_seconds histogram")
+            for (model, operation, kind), histogram in self.commands.items():
+                lines.extend(_histogram_lines("netman_command_duration_seconds", histogram,
+                                              model=model, operation=operation, kind=kind))
+
+            lines.append("# HELP netman_command_received_bytes_total Bytes received from switches")
+            lines.append("# TYPE netman_command_received_bytes_total counter")
+            for (model, operation, kind), value in self.received_bytes.items():
+                lines.append("netman_command_received_bytes_total{} {}".format(
+                    _labels(model=model, operation=operation, kind=kind), value))
+
+        return "\n".join(lines) + "\n"
+
+    def _histogram(self, histograms, labels):
+        if labels not in histograms:
+            histograms[labels] = Histogram(self.buckets)
+        return histograms[labels]
+
+
+registry = Metrics()
+
+
+def record_in_registry(measure):
+    registry.observe_command(measure)
+
+
+def record_in_request(measure):
+    timings = getattr(_context, "timings", None)
+    if timings is not None:
+        timings.append(measure)
+
+
+def log_measure(measure):
+    logging.getLogger(__name__).debug("[{}] {} took {:.3f}s and received {} bytes".format(
+        measure.kind, measure.command, measure.duration, measure.received_bytes))
+
+
+hooks = [record_in_registry, record_in_request, log_measure]
+
+
+@contextmanager
+def operation(model, name):
+    if getattr(_context, "operation", None) is not None:
+        yield
+        return
+
+    _context.operation = (model, name)
+    started_at = time.time()
+    try:
+        yield
+    finally:
+        _context.operation = None
+        registry.observe_operation(model, name, time.time() - started_at)
+
+
+@contextmanager
+def timed(kind, command):
+    model, operation_name = getattr(_context, "operation", None) or (None, None)
+    measure = Measure(kind, command, model=model, operation=operation_name)
+    started_at = time.time()
+    try:
+        yield measure
+    finally:
+        measure.duration = time.time() - started_at
+        for hook in hooks:
+            try:
+                hook(measure)
+            except Exception:
+                logging.getLogger(__name__).exception("Metrics hook {} failed".format(hook))
+
+
+def start_recording():
+    _context.recording_depth = getattr(_context, "recording_depth", 0) + 1
+    if _context.recording_depth == 1:
+        _context.timings = []
+
+
+def stop_recording():
+    timings = list(getattr(_context, "timings", None) or [])
+    _context.recording_depth = max(getattr(_context, "recording_depth", 0) - 1, 0)
+    if _context.recording_depth == 0:
+        _context.timings = None
+    return timings
+
+
+def _histogram_lines(name, histogram, **labels):
+    lines = []
+    for bucket, count in zip(histogram.buckets, histogram.counts):
+        lines.append("{}_bucket{} {}".format(name, _labels(le=repr(float(bucket)), **labels), count))
+    lines.append("{}_bucket{} {}".format(name, _labels(le="+Inf", **labels), histogram.count))
+    lines.append("{}_sum{} {}".format(name, _labels(**labels), repr(histogram.sum)))
+    lines.append("{}_count{} {}".format(name, _labels(**labels), histogram.count))
+    return lines
+
+
+def _labels(**labels):
+    return "{" + ",".join('{}="{}"'.format(k, _escape(v)) for k, v in sorted(labels.items())) + "}"
+
+
+def _escape(value):
+    return str(value if value is not None else "").replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -14,8 +14,46 @@
 
 
 class Model(object):
+    """
+    Base of the core objects, equal when they are of the same type and hold the same values.
+
+    Objects built by the thousands (interfaces, mac addresses, ...) list their attributes in
+    ``__slots__`` and carry no ``__dict__``, the values compared and shown are then those of the
+    slots of every class of the hierarchy.
+    """
+    __slots__ = ()
+
     def __eq__(self, other):
-        return isinstance(other, type(self)) and vars(self) == vars(other)
+        return isinstance(other, type(self)) and self.as_dict() == other.as_dict()
 
     def __repr__(self):
-        return "<{} {}>".format(type(self).__name__, vars(self))
+        return "<{} {}>".format(type(self).__name__, self.as_dict())
+
+    def __getstate__(self):
+        return self.as_dict()
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def as_dict(self):
+        values = dict(getattr(self, "__dict__", {}))
+        for name in _slots(type(self)):
+            value = getattr(self, name, _unset)
+            if value is not _unset:
+                values[name] = value
+        return values
+
+
+_unset = object()
+_slots_by_class = {}
+
+
+def _slots(cls):
+    slots = _slots_by_class.get(cls)
+    if slots is None:
+        slots = tuple(name for klass in reversed(cls.__mro__)
+                      for name in klass.__dict__.get("__slots__", ())
+                      if name not in ("__dict__", "__weakref__"))
+        _slots_by_class[cls] = slots
+    return slots
@@ -39,6 +39,11 @@ class SessionAlreadyExists(Conflict):
         super(SessionAlreadyExists, self).__init__(msg="Session ID already exists: {}".format(session_id))
 
 
+class TooManyJobs(Conflict):
+    def __init__(self, max_jobs=None):
+        super(TooManyJobs, self).__init__(msg="Too many unfinished jobs, the limit is {}".format(max_jobs))
+
+
 class UnavailableResource(NetmanException):
     def __init__(self, msg="Resource not available"):
         super(UnavailableResource, self).__init__(msg)
@@ -79,6 +84,11 @@ class UnknownSession(UnknownResource):
         super(UnknownSession, self).__init__("Session \"{}\" not found.".format(session_id))
 
 
+class UnknownJob(UnknownResource):
+    def __init__(self, job_id=None):
+        super(UnknownJob, self).__init__("Job \"{}\" not found.".format(job_id))
+
+
 class UnknownVrf(UnknownResource):
     def __init__(self, name=None):
         super(UnknownVrf, self).__init__("VRF name \"{}\" was not configured.".format(name))
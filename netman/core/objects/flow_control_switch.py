@@ -15,6 +15,7 @@ import types
 from contextlib import contextmanager
 from functools import wraps
 
+from netman.core import metrics
 from netman.core.objects.switch_base import SwitchOperations
 
 
@@ -43,9 +44,10 @@ class FlowControlSwitch(SwitchOperations):
     fc_switch.add_vlan(1000) #will auto lock, connect and transaction
 
     """
-    def __init__(self, wrapped_switch, lock):
+    def __init__(self, wrapped_switch, lock, save_scheduler=None):
         self.wrapped_switch = wrapped_switch
         self.lock = lock
+        self.save_scheduler = save_scheduler
         self._has_auto_connected = False
 
     def __new__(cls, *args, **kwargs):
@@ -116,6 +118,7 @@ class FlowControlSwitch(SwitchOperations):
             try:
                 yield
                 self.wrapped_switch.commit_transaction()
+                self._committed()
             except Exception:
                 self.wrapped_switch.rollback_transaction()
                 raise
@@ -133,21 +136,43 @@ class FlowControlSwitch(SwitchOperations):
             finally:
                 self.lock.release()
 
+    def _write(self, method_name, args, kwargs):
+        with self.transaction():
+            return getattr(self.wrapped_switch, method_name)(*args, **kwargs)
+
+    def _committed(self):
+        if self.save_scheduler is not None:
+            self.save_scheduler.mark_dirty(self)
+
+    def _operation(self, name):
+        switch_descriptor = getattr(self.wrapped_switch, "switch_descriptor", None)
+        return metrics.operation(getattr(switch_descriptor, "model", None), name)
+
     @do_not_wrap_with_flow_control
     def connect(self):
-        self.wrapped_switch.connect()
+        with self._operation("connect"):
+            self.wrapped_switch.connect()
 
     @do_not_wrap_with_flow_control
     def disconnect(self):
-        self.wrapped_switch.disconnect()
+        with self._operation("disconnect"):
+            self.wrapped_switch.disconnect()
 
     @do_not_wrap_with_flow_control
     def commit_transaction(self):
-        self.wrapped_switch.commit_transaction()
+        with self._operation("commit_transaction"):
+            self.wrapped_switch.commit_transaction()
+            self._committed()
+
+    @do_not_wrap_with_flow_control
+    def save_configuration(self):
+        with self._operation("save_configuration"), self._locked_context(), self._connected_context():
+            self.wrapped_switch.save_configuration()
 
     @do_not_wrap_with_flow_control
     def rollback_transaction(self):
-        self.wrapped_switch.rollback_transaction()
+        with self._operation("rollback_transaction"):
+            self.wrapped_switch.rollback_transaction()
 
     @property
     def switch_descriptor(self):
@@ -162,12 +187,12 @@ def _wrap_method_with_flow_control(cls, obj, method_name):
     if method_name.startswith("get_"):
         @wraps(original)
         def wrapped(self, *args, **kwargs):
-            with self._connected_context():
+            with self._operation(method_name), self._connected_context():
                 return getattr(self.wrapped_switch, method_name)(*args, **kwargs)
     else:
         @wraps(original)
         def wrapped(self, *args, **kwargs):
-            with self.transaction():
-                return getattr(self.wrapped_switch, method_name)(*args, **kwargs)
+            with self._operation(method_name):
+                return self._write(method_name, args, kwargs)
 
     setattr(obj, method_name, types.MethodType(wrapped, obj))
@@ -0,0 +1,162 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from logging import getLogger
+import threading
+
+from netman.core.objects.flow_control_switch import FlowControlSwitch
+
+
+class GroupCommitSwitch(FlowControlSwitch):
+    """
+    Flow control switch whose writes outside of a transaction go through the group commit of the switch
+
+    Writes made while another one is being committed wait for it, then get applied and committed together.
+    """
+
+    def __init__(self, wrapped_switch, lock, group_commit, save_scheduler=None):
+        super(GroupCommitSwitch, self).__init__(wrapped_switch, lock, save_scheduler=save_scheduler)
+        self.group_commit = group_commit
+
+    def _write(self, method_name, args, kwargs):
+        if self.wrapped_switch.in_transaction:
+            return super(GroupCommitSwitch, self)._write(method_name, args, kwargs)
+
+        return self.group_commit.submit(self, PendingWrite(method_name, args, kwargs))
+
+
+class GroupCommit(object):
+    """
+    Writes queued for a switch, applied in a single transaction and committed once.
+
+    The first writer leads: it opens the transaction, applies every queued write and commits, then
+    hands the lead to the first write queued meanwhile and returns. A failing write is rolled back
+    alone by replaying the others, a failing commit is retried one write at a time so that every
+    writer gets its own result.
+
+    Writes are applied with the switch of the leader, a group commit is shared by switches of the
+    same descriptor only.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queue = []
+        self.leading = False
+
+    @property
+    def logger(self):
+        return getLogger(__name__)
+
+    def submit(self, switch, write):
+        with self.lock:
+            self.queue.append(write)
+            if not self.leading:
+                self.leading = write.leads = True
+
+        if not write.leads:
+            write.woken.wait()
+        if write.leads:
+            self._lead(switch)
+
+        return write.outcome()
+
+    def _lead(self, switch):
+        try:
+            with self.lock:
+                batch, self.queue = self.queue, []
+            self._commit(switch, batch)
+        finally:
+            with self.lock:
+                if len(self.queue) > 0:
+                    successor = self.queue[0]
+                    successor.leads = True
+                    successor.woken.set()
+                else:
+                    self.leading = False
+
+    def _commit(self, switch, batch):
+        try:
+            if len(batch) > 1:
+                self.logger.info("Committing {} writes together on {}"
+                                 .format(len(batch), switch.switch_descriptor.hostname))
+
+            with switch._locked_context(), switch._connected_context():
+                switch.wrapped_switch.start_transaction()
+                try:
+                    self._apply_and_commit(switch, batch)
+                finally:
+                    switch.wrapped_switch.end_transaction()
+        except Exception as e:
+            for write in batch:
+                if not write.finished:
+                    write.fail(e)
+        finally:
+            for write in batch:
+                write.woken.set()
+
+    def _apply_and_commit(self, switch, writes):
+        applied = self._apply(switch.wrapped_switch, writes)
+        if len(applied) == 0:
+            return
+
+        try:
+            switch.wrapped_switch.commit_transaction()
+        except Exception as e:
+            switch.wrapped_switch.rollback_transaction()
+            if len(applied) == 1:
+                applied[0].fail(e)
+            else:
+                self.logger.info("Committing the {} writes one by one to find the failing one".format(len(applied)))
+                for write in applied:
+                    self._apply_and_commit(switch, [write])
+            return
+
+        switch._committed()
+        for write in applied:
+            write.finished = True
+
+    def _apply(self, real_switch, writes):
+        applied = []
+        for write in writes:
+            try:
+                write.result = getattr(real_switch, write.method_name)(*write.args, **write.kwargs)
+                applied.append(write)
+            except Exception as e:
+                write.fail(e)
+                real_switch.rollback_transaction()
+                applied = self._apply(real_switch, applied)
+        return applied
+
+
+class PendingWrite(object):
+    __slots__ = ("method_name", "args", "kwargs", "result", "error", "finished", "leads", "woken")
+
+    def __init__(self, method_name, args, kwargs):
+        self.method_name = method_name
+        self.args = args
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
+        self.finished = False
+        self.leads = False
+        self.woken = threading.Event()
+
+    def fail(self, error):
+        self.error = error
+        self.finished = True
+
+    def outcome(self):
+        if self.error is not None:
+            raise self.error
+        return self.result
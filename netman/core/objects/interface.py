@@ -13,21 +13,26 @@
 # limitations under the License.
 
 from netman.core.objects import Model
+from netman.core.objects.vlan_set import VlanSet
 
 
 class BaseInterface(Model):
+    __slots__ = ("shutdown", "port_mode", "access_vlan", "trunk_native_vlan", "trunk_vlans", "mtu", "recovery_timeout")
+
     def __init__(self, shutdown=None, port_mode=None, access_vlan=None,
                  trunk_native_vlan=None, trunk_vlans=None, mtu=None, recovery_timeout=None):
         self.shutdown = shutdown
         self.port_mode = port_mode
         self.access_vlan = access_vlan
         self.trunk_native_vlan = trunk_native_vlan
-        self.trunk_vlans = trunk_vlans or []
+        self.trunk_vlans = VlanSet(trunk_vlans)
         self.mtu = mtu
         self.recovery_timeout = recovery_timeout
 
 
 class Interface(BaseInterface):
+    __slots__ = ("name", "bond_master", "auto_negotiation", "force_up")
+
     def __init__(self, name=None, bond_master=None, auto_negotiation=None, force_up=None, **interface):
         super(Interface, self).__init__(**interface)
         self.name = name
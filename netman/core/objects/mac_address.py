@@ -15,6 +15,8 @@ from netman.core.objects import Model
 
 
 class MacAddress(Model):
+    __slots__ = ("mac_address", "interface", "vlan", "type")
+
     def __init__(self, vlan, mac_address, interface, type):
         self.mac_address = mac_address
         self.interface = interface
@@ -17,6 +17,7 @@ from contextlib import contextmanager
 from functools import wraps
 
 from netman.core.objects.backward_compatible_switch_operations import BackwardCompatibleSwitchOperations
+from netman.core.objects.exceptions import UnknownVlan, VlanAlreadyExist
 
 
 def not_implemented(func):
@@ -56,6 +57,10 @@ class SwitchOperations(BackwardCompatibleSwitchOperations):
     def end_transaction(self):
         pass
 
+    @not_implemented
+    def save_configuration(self):
+        pass
+
     @not_implemented
     def get_vlan(self, number):
         pass
@@ -64,6 +69,10 @@ class SwitchOperations(BackwardCompatibleSwitchOperations):
     def get_vlans(self):
         pass
 
+    @not_implemented
+    def get_vlans_by_number(self, numbers):
+        pass
+
     @not_implemented
     def add_vlan(self, number, name=None):
         pass
@@ -72,6 +81,14 @@ class SwitchOperations(BackwardCompatibleSwitchOperations):
     def remove_vlan(self, number):
         pass
 
+    @not_implemented
+    def add_vlans(self, numbers):
+        pass
+
+    @not_implemented
+    def remove_vlans(self, numbers):
+        pass
+
     @not_implemented
     def get_interface(self, interface_id):
         pass
@@ -80,6 +97,14 @@ class SwitchOperations(BackwardCompatibleSwitchOperations):
     def get_interfaces(self):
         pass
 
+    @not_implemented
+    def get_interfaces_by_name(self, names):
+        pass
+
+    @not_implemented
+    def get_interfaces_by_name_prefix(self, prefix):
+        pass
+
     @not_implemented
     def set_access_vlan(self, interface_id, vlan):
         pass
@@ -104,6 +129,14 @@ class SwitchOperations(BackwardCompatibleSwitchOperations):
     def remove_trunk_vlan(self, interface_id, vlan):
         pass
 
+    @not_implemented
+    def add_trunk_vlans(self, interface_id, vlans):
+        pass
+
+    @not_implemented
+    def remove_trunk_vlans(self, interface_id, vlans):
+        pass
+
     @not_implemented
     def set_interface_state(self, interface_id, state):
         pass
@@ -112,6 +145,10 @@ class SwitchOperations(BackwardCompatibleSwitchOperations):
     def unset_interface_state(self, interface_id):
         pass
 
+    @not_implemented
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        pass
+
     @not_implemented
     def set_interface_auto_negotiation_state(self, interface_id, negotiation_state):
         pass
@@ -385,6 +422,83 @@ class SwitchBase(SwitchOperations):
         """
         raise NotImplementedError()
 
+    def get_vlans_by_number(self, numbers):
+        """
+        Adapters able to read only some vlans from the switch should override this
+        """
+        return [vlan for vlan in self.get_vlans() if vlan.number in numbers]
+
+    def get_interfaces_by_name(self, names):
+        """
+        Adapters able to read only some interfaces from the switch should override this
+        """
+        return [interface for interface in self.get_interfaces() if interface.name in names]
+
+    def get_interfaces_by_name_prefix(self, prefix):
+        """
+        Adapters able to list the interface names without reading their configuration should override this
+        """
+        return [interface for interface in self.get_interfaces() if interface.name.startswith(prefix)]
+
+    def add_vlans(self, numbers):
+        """
+        Adapters able to create many vlans in one change should override this
+        """
+        self._check_vlans_are_new(numbers)
+
+        for number in numbers:
+            self.add_vlan(number)
+
+    def remove_vlans(self, numbers):
+        """
+        Adapters able to remove many vlans in one change should override this
+        """
+        self._check_vlans_exist(numbers)
+
+        for number in numbers:
+            self.remove_vlan(number)
+
+    def add_trunk_vlans(self, interface_id, vlans):
+        """
+        Adapters able to add many trunk vlans in one change should override this
+        """
+        self._check_vlans_exist(vlans)
+
+        for vlan in vlans:
+            self.add_trunk_vlan(interface_id, vlan)
+
+    def remove_trunk_vlans(self, interface_id, vlans):
+        """
+        Adapters able to remove many trunk vlans in one change should override this
+        """
+        for vlan in vlans:
+            self.remove_trunk_vlan(interface_id, vlan)
+
+    def edit_interfaces(self, interface_ids, description=None, state=None, mtu=None, access_vlan=None):
+        """
+        Adapters able to configure many interfaces in one change should override this
+        """
+        for interface_id in interface_ids:
+            if description is not None:
+                self.set_interface_description(interface_id, description)
+            if state is not None:
+                self.set_interface_state(interface_id, state)
+            if mtu is not None:
+                self.set_interface_mtu(interface_id, mtu)
+            if access_vlan is not None:
+                self.set_access_vlan(interface_id, access_vlan)
+
+    def _check_vlans_are_new(self, numbers):
+        existing = self.get_vlans_by_number(numbers)
+        if len(existing) > 0:
+            raise VlanAlreadyExist(existing[0].number)
+
+    def _check_vlans_exist(self, numbers):
+        existing = [vlan.number for vlan in self.get_vlans_by_number(numbers)]
+        missing = [number for number in numbers if number not in existing]
+        if len(missing) > 0:
+            raise UnknownVlan(missing[0])
+
     @contextmanager
     def transaction(self):
         self.start_transaction()
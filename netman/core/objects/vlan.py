@@ -17,6 +17,9 @@ from netman.core.objects.access_groups import OUT, IN
 
 
 class Vlan(Model):
+    __slots__ = ("number", "name", "access_groups", "vrf_forwarding", "ips", "vrrp_groups", "dhcp_relay_servers",
+                 "arp_routing", "icmp_redirects", "unicast_rpf_mode", "ntp", "varp_ips", "load_interval", "mpls_ip")
+
     def __init__(self, number=None, name=None, ips=None, vrrp_groups=None, vrf_forwarding=None, access_group_in=None,
                  access_group_out=None, dhcp_relay_servers=None, arp_routing=None, icmp_redirects=None,
                  unicast_rpf_mode=None, ntp=None, varp_ips=None, load_interval=None, mpls_ip=None):
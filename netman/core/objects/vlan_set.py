@@ -0,0 +1,186 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from bisect import bisect_right
+import sys
+
+
+class VlanSet(object):
+    """
+    Sorted set of vlan numbers kept as ranges, a trunk carrying ``1-4094`` holds a single range.
+
+    It stands in for the lists of vlan numbers used so far : it iterates in ascending order,
+    compares equal to the same numbers in a list, and supports ``append``, ``remove``, ``extend``,
+    ``+=`` and indexing.
+    """
+    __slots__ = ("ranges",)
+
+    def __init__(self, vlans=None):
+        if isinstance(vlans, VlanSet):
+            self.ranges = list(vlans.ranges)
+            return
+
+        self.ranges = []
+        for vlan in sorted(set(vlans or [])):
+            if self.ranges and self.ranges[-1][1] == vlan - 1:
+                self.ranges[-1] = (self.ranges[-1][0], vlan)
+            else:
+                self.ranges.append((vlan, vlan))
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        vlans = cls()
+        for start, end in ranges:
+            vlans.add_range(start, end)
+        return vlans
+
+    def add_range(self, start, end):
+        if start > end:
+            return
+        i = bisect_right(self.ranges, (start, sys.maxint))
+        if i > 0 and self.ranges[i - 1][1] >= start - 1:
+            i -= 1
+            start = self.ranges[i][0]
+        j = i
+        while j < len(self.ranges) and self.ranges[j][0] <= end + 1:
+            end = max(end, self.ranges[j][1])
+            j += 1
+        self.ranges[i:j] = [(start, end)]
+
+    def remove_range(self, start, end):
+        remaining = []
+        for range_start, range_end in self.ranges:
+            if range_end < start or range_start > end:
+                remaining.append((range_start, range_end))
+                continue
+            if range_start < start:
+                remaining.append((range_start, start - 1))
+            if range_end > end:
+                remaining.append((end + 1, range_end))
+        self.ranges = remaining
+
+    def add(self, vlan):
+        self.add_range(vlan, vlan)
+
+    append = add
+
+    def discard(self, vlan):
+        if vlan in self:
+            self.remove_range(vlan, vlan)
+
+    def remove(self, vlan):
+        if vlan not in self:
+            raise ValueError("{} is not in the vlans".format(vlan))
+        self.remove_range(vlan, vlan)
+
+    def extend(self, vlans):
+        if isinstance(vlans, VlanSet):
+            for start, end in vlans.ranges:
+                self.add_range(start, end)
+        else:
+            for vlan in vlans:
+                self.add(vlan)
+
+    update = extend
+
+    def sort(self):
+        pass
+
+    def index(self, vlan):
+        position = 0
+        for start, end in self.ranges:
+            if start <= vlan <= end:
+                return position + vlan - start
+            position += end - start + 1
+        raise ValueError("{} is not in the vlans".format(vlan))
+
+    def count(self, vlan):
+        return 1 if vlan in self else 0
+
+    def __contains__(self, vlan):
+        i = bisect_right(self.ranges, (vlan, sys.maxint))
+        return i > 0 and self.ranges[i - 1][1] >= vlan
+
+    def __iter__(self):
+        for start, end in self.ranges:
+            for vlan in xrange(start, end + 1):
+                yield vlan
+
+    def __reversed__(self):
+        for start, end in reversed(self.ranges):
+            for vlan in xrange(end, start - 1, -1):
+                yield vlan
+
+    def __len__(self):
+        return sum(end - start + 1 for start, end in self.ranges)
+
+    def __nonzero__(self):
+        return len(self.ranges) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        position = index if index >= 0 else len(self) + index
+        if position >= 0:
+            for start, end in self.ranges:
+                if position <= end - start:
+                    return start + position
+                position -= end - start + 1
+        raise IndexError("vlan index out of range")
+
+    def __or__(self, other):
+        result = VlanSet(self)
+        result.extend(other)
+        return result
+
+    __add__ = __or__
+    __radd__ = __or__
+
+    def __ior__(self, other):
+        self.extend(other)
+        return self
+
+    __iadd__ = __ior__
+
+    def __sub__(self, other):
+        result = VlanSet(self)
+        for start, end in (other.ranges if isinstance(other, VlanSet) else [(v, v) for v in other]):
+            result.remove_range(start, end)
+        return result
+
+    def __eq__(self, other):
+        if isinstance(other, VlanSet):
+            return self.ranges == other.ranges
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return {"ranges": self.ranges}
+
+    def __setstate__(self, state):
+        self.ranges = [tuple(r) for r in state["ranges"]]
+
+    def __repr__(self):
+        return "VlanSet({!r})".format(self.to_ranges_string())
+
+    def to_ranges_string(self):
+        return ",".join(str(start) if start == end else "{}-{}".format(start, end) for start, end in self.ranges)
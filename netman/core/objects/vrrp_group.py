@@ -16,6 +16,8 @@ from netman.core.objects import Model
 
 
 class VrrpGroup(Model):
+    __slots__ = ("id", "ips", "priority", "hello_interval", "dead_interval", "track_id", "track_decrement")
+
     def __init__(self, id=None, ips=None, priority=None, hello_interval=None, dead_interval=None, track_id=None,
                  track_decrement=None):
         self.id = id
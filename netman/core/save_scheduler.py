@@ -0,0 +1,96 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from logging import getLogger
+import threading
+import time
+
+
+class SaveScheduler(object):
+    """
+    Saves the configuration of switches some time after their changes instead of after each of them.
+
+    A switch marked dirty is saved once it went ``quiet_period`` seconds without a change, or
+    ``max_delay`` seconds after its first unsaved change when changes keep coming.
+    """
+
+    def __init__(self, quiet_period=10, max_delay=60):
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    @property
+    def logger(self):
+        return getLogger(__name__)
+
+    def mark_dirty(self, switch):
+        hostname = switch.switch_descriptor.hostname
+        now = time.time()
+
+        with self.lock:
+            pending = self.pending.get(hostname)
+            if pending is not None:
+                pending.timer.cancel()
+            dirty_since = pending.dirty_since if pending is not None else now
+
+            delay = max(0, min(self.quiet_period, dirty_since + self.max_delay - now))
+            timer = threading.Timer(delay, self._save_when_due, kwargs=dict(hostname=hostname))
+            timer.daemon = True
+            self.pending[hostname] = PendingSave(switch, dirty_since, timer)
+            timer.start()
+
+    def is_dirty(self, hostname):
+        return hostname in self.pending
+
+    def flush(self, hostname):
+        with self.lock:
+            pending = self.pending.pop(hostname, None)
+            if pending is not None:
+                pending.timer.cancel()
+
+        if pending is not None:
+            self._save(hostname, pending.switch)
+
+    def flush_all(self):
+        for hostname in list(self.pending.keys()):
+            try:
+                self.flush(hostname)
+            except Exception:
+                self.logger.exception("Could not save the configuration of {}".format(hostname))
+
+    def _save_when_due(self, hostname):
+        with self.lock:
+            pending = self.pending.get(hostname)
+            if pending is None or pending.timer is not threading.current_thread():
+                return
+            del self.pending[hostname]
+
+        try:
+            self._save(hostname, pending.switch)
+        except Exception:
+            self.logger.exception("Could not save the configuration of {}".format(hostname))
+
+    def _save(self, hostname, switch):
+        self.logger.info("Saving the configuration of {}".format(hostname))
+        switch.save_configuration()
+
+
+class PendingSave(object):
+    __slots__ = ("switch", "dirty_since", "timer")
+
+    def __init__(self, switch, dirty_since, timer):
+        self.switch = switch
+        self.dirty_since = dirty_since
+        self.timer = timer
@@ -12,33 +12,59 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from netman.adapters.switches import cisco, juniper, dell, dell10g, brocade, arista
-from netman.adapters.switches.juniper.mx import netconf as mx_netconf
-from netman.adapters.switches.remote import RemoteSwitch
+import importlib
+
 from netman.core.objects.flow_control_switch import FlowControlSwitch
+from netman.core.objects.group_commit_switch import GroupCommit, GroupCommitSwitch
 from netman.core.objects.switch_descriptor import SwitchDescriptor
 
+PLUGINS_ENTRY_POINT = "netman.switches"
+
 factories = {
-    "arista": arista.eapi,
-    "arista_http": arista.eapi_http,
-    "arista_https": arista.eapi_https,
-    "cisco": cisco.ssh,
-    "brocade": brocade.ssh,
-    "brocade_ssh": brocade.ssh,
-    "brocade_telnet": brocade.telnet,
-    "juniper": juniper.standard.netconf,
-    "juniper_qfx_copper": juniper.qfx_copper.netconf,
-    "juniper_mx": mx_netconf,
-    "dell": dell.ssh,
-    "dell_ssh": dell.ssh,
-    "dell_telnet": dell.telnet,
-    "dell10g": dell10g.ssh,
-    "dell10g_ssh": dell10g.ssh,
-    "dell10g_telnet": dell10g.telnet,
+    "arista": "netman.adapters.switches.arista:eapi",
+    "arista_http": "netman.adapters.switches.arista:eapi_http",
+    "arista_https": "netman.adapters.switches.arista:eapi_https",
+    "cisco": "netman.adapters.switches.cisco:ssh",
+    "brocade": "netman.adapters.switches.brocade:ssh",
+    "brocade_ssh": "netman.adapters.switches.brocade:ssh",
+    "brocade_telnet": "netman.adapters.switches.brocade:telnet",
+    "juniper": "netman.adapters.switches.juniper.standard:netconf",
+    "juniper_qfx_copper": "netman.adapters.switches.juniper.qfx_copper:netconf",
+    "juniper_mx": "netman.adapters.switches.juniper.mx:netconf",
+    "dell": "netman.adapters.switches.dell:ssh",
+    "dell_ssh": "netman.adapters.switches.dell:ssh",
+    "dell_telnet": "netman.adapters.switches.dell:telnet",
+    "dell10g": "netman.adapters.switches.dell10g:ssh",
+    "dell10g_ssh": "netman.adapters.switches.dell10g:ssh",
+    "dell10g_telnet": "netman.adapters.switches.dell10g:telnet",
 }
 
 
+def get_factory(model):
+    """
+    Returns the switch constructor of a model, importing its driver the first time it is used.
+
+    Models not listed in ``factories`` are looked up in the ``netman.switches`` entry point group
+    so that drivers can be shipped as separate packages.
+    """
+    if model not in factories:
+        from pkg_resources import iter_entry_points
+        for entry_point in iter_entry_points(PLUGINS_ENTRY_POINT, name=model):
+            factories[model] = entry_point.resolve()
+            break
+        else:
+            raise KeyError(model)
+
+    factory = factories[model]
+    if isinstance(factory, basestring):
+        module, attribute = factory.split(":")
+        factory = factories[model] = getattr(importlib.import_module(module), attribute)
+
+    return factory
+
+
 class RealSwitchFactory(object):
+    deferred_edits = False
 
     def get_switch(self, hostname):
         raise NotImplemented()
@@ -48,20 +74,37 @@ class RealSwitchFactory(object):
 
     def get_switch_by_descriptor(self, switch_descriptor):
         if switch_descriptor.netman_server:
+            from netman.adapters.switches.remote import RemoteSwitch
             return RemoteSwitch(switch_descriptor)
-        return factories[switch_descriptor.model](switch_descriptor)
+
+        switch = get_factory(switch_descriptor.model)(switch_descriptor)
+        if self.deferred_edits and hasattr(switch, "deferred_edits"):
+            switch.deferred_edits = True
+        return switch
 
 
 class FlowControlSwitchFactory(RealSwitchFactory):
 
-    def __init__(self, switch_source, lock_factory):
+    def __init__(self, switch_source, lock_factory, save_scheduler=None, group_commit=False):
         self.switch_source = switch_source
         self.lock_factory = lock_factory
+        self.save_scheduler = save_scheduler
+        self.group_commit = group_commit
         self.locks = {}
+        self.group_commits = {}
 
     def get_switch_by_descriptor(self, switch_descriptor):
         real_switch = super(FlowControlSwitchFactory, self).get_switch_by_descriptor(switch_descriptor)
-        return FlowControlSwitch(real_switch, lock=self._get_lock(switch_descriptor))
+        save_scheduler = None
+        if self.save_scheduler is not None and getattr(real_switch, "write_memory", False):
+            real_switch.write_memory = False
+            save_scheduler = self.save_scheduler
+
+        if self.group_commit and getattr(real_switch, "supports_group_commit", False):
+            return GroupCommitSwitch(real_switch, lock=self._get_lock(switch_descriptor),
+                                     group_commit=self._get_group_commit(switch_descriptor),
+                                     save_scheduler=save_scheduler)
+        return FlowControlSwitch(real_switch, lock=self._get_lock(switch_descriptor), save_scheduler=save_scheduler)
 
     def _get_lock(self, switch_descriptor):
         key = switch_descriptor.hostname
@@ -69,5 +112,13 @@ class FlowControlSwitchFactory(RealSwitchFactory):
             self.locks[key] = self.lock_factory.new_lock(key)
         return self.locks[key]
 
+    def _get_group_commit(self, switch_descriptor):
+        # the writes of a group are applied with the switch of its leader, so with its credentials
+        key = (switch_descriptor.model, switch_descriptor.hostname, switch_descriptor.port,
+               switch_descriptor.username, switch_descriptor.password)
+        if key not in self.group_commits:
+            self.group_commits[key] = GroupCommit()
+        return self.group_commits[key]
+
 
 SwitchFactory = FlowControlSwitchFactory
@@ -13,17 +13,22 @@
 # limitations under the License.
 
 import argparse
+import atexit
 from logging import DEBUG, getLogger
 
 from flask import request
 from flask.app import Flask
 
 from adapters.threading_lock_factory import ThreadingLockFactory
+from netman.adapters import shell
 from netman.adapters.memory_storage import MemoryStorage
 from netman.api.api_utils import RegexConverter
+from netman.api.job_api import JobApi
 from netman.api.netman_api import NetmanApi
 from netman.api.switch_api import SwitchApi
 from netman.api.switch_session_api import SwitchSessionApi
+from netman.core.job_manager import JobManager
+from netman.core.save_scheduler import SaveScheduler
 from netman.core.switch_factory import FlowControlSwitchFactory, RealSwitchFactory
 from netman.core.switch_sessions import SwitchSessionManager
 
@@ -44,15 +49,31 @@ lock_factory = ThreadingLockFactory()
 switch_factory = FlowControlSwitchFactory(MemoryStorage(), lock_factory)
 real_switch_factory = RealSwitchFactory()
 switch_session_manager = SwitchSessionManager()
+job_manager = JobManager()
 
 NetmanApi(switch_factory).hook_to(app)
 SwitchApi(switch_factory, switch_session_manager).hook_to(app)
 SwitchSessionApi(real_switch_factory, switch_session_manager).hook_to(app)
+JobApi(job_manager).hook_to(app)
 
 
-def load_app(session_inactivity_timeout=None):
+def load_app(session_inactivity_timeout=None, job_workers=None, save_quiet_period=None, save_max_delay=None,
+             deferred_edits=False, ssh_pipelining=False, group_commit=False):
     if session_inactivity_timeout:
         switch_session_manager.session_inactivity_timeout = session_inactivity_timeout
+    if job_workers:
+        job_manager.workers = job_workers
+    if save_quiet_period is not None and switch_factory.save_scheduler is None:
+        switch_factory.save_scheduler = SaveScheduler(quiet_period=save_quiet_period)
+        if save_max_delay:
+            switch_factory.save_scheduler.max_delay = save_max_delay
+        atexit.register(switch_factory.save_scheduler.flush_all)
+    if deferred_edits:
+        switch_factory.deferred_edits = real_switch_factory.deferred_edits = True
+    if ssh_pipelining:
+        shell.default_pipelining = True
+    if group_commit:
+        switch_factory.group_commit = True
     return app
 
 
@@ -61,11 +82,38 @@ if __name__ == '__main__':
     parser.add_argument('--host', nargs='?', default="127.0.0.1")
     parser.add_argument('--port', type=int, nargs='?', default=5000)
     parser.add_argument('--session-inactivity-timeout', type=int, nargs='?')
+    parser.add_argument('--job-workers', type=int, nargs='?')
+    parser.add_argument('--save-quiet-period', type=int, nargs='?',
+                        help='Save the configuration of switches this many seconds after their last change '
+                             'instead of after every change')
+    parser.add_argument('--save-max-delay', type=int, nargs='?',
+                        help='Longest time a change can wait for its configuration save')
+    parser.add_argument('--deferred-edits', action='store_true',
+                        help='Send the changes of a transaction to the switch in one edit when it commits, '
+                             'on switches supporting it')
+    parser.add_argument('--ssh-pipelining', action='store_true',
+                        help='Write the configuration commands of a change to SSH switches at once instead of '
+                             'waiting for the prompt after each of them')
+    parser.add_argument('--group-commit', action='store_true',
+                        help='Apply the concurrent changes of a switch in one transaction and commit them once, '
+                             'on switches supporting it')
 
     args = parser.parse_args()
 
     params = {}
     if args.session_inactivity_timeout:
         params["session_inactivity_timeout"] = args.session_inactivity_timeout
+    if args.job_workers:
+        params["job_workers"] = args.job_workers
+    if args.save_quiet_period is not None:
+        params["save_quiet_period"] = args.save_quiet_period
+    if args.save_max_delay:
+        params["save_max_delay"] = args.save_max_delay
+    if args.deferred_edits:
+        params["deferred_edits"] = True
+    if args.ssh_pipelining:
+        params["ssh_pipelining"] = True
+    if args.group_commit:
+        params["group_commit"] = True
 
     load_app(**params).run(host=args.host, port=args.port, threaded=True)
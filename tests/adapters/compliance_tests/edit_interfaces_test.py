@@ -0,0 +1,60 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from hamcrest import assert_that, is_
+
+from netman.core.objects.exceptions import UnknownVlan
+from netman.core.objects.interface_states import OFF
+from tests import has_message
+from tests.adapters.compliance_test_case import ComplianceTestCase
+
+
+class EditInterfacesTest(ComplianceTestCase):
+    _dev_sample = "cisco"
+
+    def setUp(self):
+        super(EditInterfacesTest, self).setUp()
+        self.client.add_vlan(1000)
+        self.interfaces = [self.test_ports[0].name, self.test_ports[1].name]
+        for interface in self.interfaces:
+            self.try_to.set_access_mode(interface)
+
+    def test_sets_the_access_vlan_of_every_interface(self):
+        self.client.edit_interfaces(self.interfaces, access_vlan=1000)
+
+        for interface in self.interfaces:
+            assert_that(self.client.get_interface(interface).access_vlan, is_(1000))
+
+    def test_shuts_every_interface_down(self):
+        self.client.edit_interfaces(self.interfaces, state=OFF)
+
+        for interface in self.interfaces:
+            assert_that(self.client.get_interface(interface).shutdown, is_(True))
+
+    def test_changes_nothing_when_the_vlan_does_not_exist(self):
+        with self.assertRaises(UnknownVlan) as expect:
+            self.client.edit_interfaces(self.interfaces, access_vlan=2999)
+
+        assert_that(expect.exception, has_message("Vlan 2999 not found"))
+        for interface in self.interfaces:
+            assert_that(self.client.get_interface(interface).access_vlan, is_(None))
+
+    def tearDown(self):
+        for interface in self.interfaces:
+            self.janitor.unset_interface_access_vlan(interface)
+            self.janitor.unset_interface_state(interface)
+
+        self.janitor.remove_vlan(1000)
+        super(EditInterfacesTest, self).tearDown()
@@ -0,0 +1,46 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from fake_switches.switch_configuration import AggregatedPort
+from hamcrest import assert_that, is_
+
+from tests.adapters.compliance_test_case import ComplianceTestCase
+
+
+class GetInterfacesByNameTest(ComplianceTestCase):
+    _dev_sample = "juniper"
+
+    def test_returns_the_requested_interfaces_as_listed(self):
+        names = self._physical_test_ports()[:2]
+
+        interfaces = self.client.get_interfaces_by_name(names)
+
+        assert_that(interfaces, is_([i for i in self.client.get_interfaces() if i.name in names]))
+
+    def test_ignores_interfaces_that_do_not_exist(self):
+        name = self._physical_test_ports()[0]
+
+        interfaces = self.client.get_interfaces_by_name([name, "nonexistent 99/99"])
+
+        assert_that([i.name for i in interfaces], is_([name]))
+
+    def test_returns_the_interfaces_starting_with_a_prefix(self):
+        prefix = self._physical_test_ports()[0][:-1]
+
+        interfaces = self.client.get_interfaces_by_name_prefix(prefix)
+
+        assert_that(interfaces, is_([i for i in self.client.get_interfaces() if i.name.startswith(prefix)]))
+
+    def _physical_test_ports(self):
+        return [p.name for p in self.test_ports if not isinstance(p, AggregatedPort)]
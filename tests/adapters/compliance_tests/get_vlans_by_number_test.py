@@ -0,0 +1,45 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from hamcrest import assert_that, is_
+from netaddr import IPNetwork
+
+from tests.adapters.compliance_test_case import ComplianceTestCase
+
+
+class GetVlansByNumberTest(ComplianceTestCase):
+    _dev_sample = "cisco"
+
+    def test_returns_the_requested_vlans_as_listed(self):
+        self.client.add_vlan(1000, name="vlan1000")
+        self.client.add_vlan(1001)
+        self.client.add_vlan(1002, name="vlan1002")
+        self.try_to.add_ip_to_vlan(1002, IPNetwork("10.10.10.2/29"))
+
+        vlans = self.client.get_vlans_by_number([1000, 1002])
+
+        assert_that(vlans, is_([self.get_vlan_from_list(1000), self.get_vlan_from_list(1002)]))
+
+    def test_ignores_vlans_that_do_not_exist(self):
+        self.client.add_vlan(1000)
+
+        vlans = self.client.get_vlans_by_number([1000, 2000])
+
+        assert_that(vlans, is_([self.get_vlan_from_list(1000)]))
+
+    def tearDown(self):
+        self.janitor.remove_vlan(1000)
+        self.janitor.remove_vlan(1001)
+        self.janitor.remove_vlan(1002)
+        super(GetVlansByNumberTest, self).tearDown()
@@ -0,0 +1,45 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from hamcrest import assert_that, is_
+
+from tests.adapters.compliance_test_case import ComplianceTestCase
+
+
+class RemoveTrunkVlansTest(ComplianceTestCase):
+    _dev_sample = "cisco"
+
+    def setUp(self):
+        super(RemoveTrunkVlansTest, self).setUp()
+        self.client.add_vlan(1000)
+        self.client.add_vlan(1001)
+        self.client.add_vlan(1002)
+        self.try_to.set_trunk_mode(self.test_ports[0].name)
+        self.client.add_trunk_vlans(self.test_ports[0].name, [1000, 1001, 1002])
+
+    def test_removes_all_the_vlans_from_the_trunk(self):
+        self.client.remove_trunk_vlans(self.test_ports[0].name, [1000, 1001])
+
+        assert_that(self.client.get_interface(self.test_ports[0].name).trunk_vlans, is_([1002]))
+
+    def tearDown(self):
+        for vlan in [1000, 1001, 1002]:
+            self.janitor.remove_trunk_vlan(self.test_ports[0].name, vlan)
+        self.janitor.set_access_mode(self.test_ports[0].name)
+
+        self.janitor.remove_vlan(1000)
+        self.janitor.remove_vlan(1001)
+        self.janitor.remove_vlan(1002)
+        super(RemoveTrunkVlansTest, self).tearDown()
@@ -0,0 +1,46 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from hamcrest import assert_that, is_
+from netman.core.objects.exceptions import UnknownVlan
+from tests import has_message
+
+from tests.adapters.compliance_test_case import ComplianceTestCase
+
+
+class RemoveVlansTest(ComplianceTestCase):
+    _dev_sample = "juniper"
+
+    def setUp(self):
+        super(RemoveVlansTest, self).setUp()
+        self.client.add_vlan(1000)
+        self.client.add_vlan(1001)
+
+    def tearDown(self):
+        self.janitor.remove_vlan(1000)
+        self.janitor.remove_vlan(1001)
+        super(RemoveVlansTest, self).tearDown()
+
+    def test_removes_all_the_vlans(self):
+        self.client.remove_vlans([1000, 1001])
+
+        assert_that(self.client.get_vlans_by_number([1000, 1001]), is_([]))
+
+    def test_removes_nothing_if_one_vlan_does_not_exist(self):
+        with self.assertRaises(UnknownVlan) as expect:
+            self.client.remove_vlans([1000, 1001, 1002])
+
+        assert_that(expect.exception, has_message("Vlan 1002 not found"))
+        assert_that([v.number for v in self.client.get_vlans_by_number([1000, 1001])], is_([1000, 1001]))
@@ -45,6 +45,16 @@ class ValidatingCachedSwitch(CachedSwitch):
         assert_that(interfaces, is_(self.real_switch.get_interfaces()))
         return interfaces
 
+    def get_interfaces_by_name(self, names):
+        interfaces = super(ValidatingCachedSwitch, self).get_interfaces_by_name(names)
+        assert_that(interfaces, is_(self.real_switch.get_interfaces_by_name(names)))
+        return interfaces
+
+    def get_interfaces_by_name_prefix(self, prefix):
+        interfaces = super(ValidatingCachedSwitch, self).get_interfaces_by_name_prefix(prefix)
+        assert_that(interfaces, is_(self.real_switch.get_interfaces_by_name_prefix(prefix)))
+        return interfaces
+
     def get_interface(self, interface_id):
         interface = super(ValidatingCachedSwitch, self).get_interface(interface_id)
         assert_that(interface, is_(self.real_switch.get_interface(interface_id)))
@@ -60,6 +70,11 @@ class ValidatingCachedSwitch(CachedSwitch):
         assert_that(vlans, is_(self.real_switch.get_vlans()))
         return vlans
 
+    def get_vlans_by_number(self, numbers):
+        vlans = super(ValidatingCachedSwitch, self).get_vlans_by_number(numbers)
+        assert_that(vlans, is_(self.real_switch.get_vlans_by_number(numbers)))
+        return vlans
+
     def get_vlan_interfaces(self, number):
         vlan_interfaces = super(ValidatingCachedSwitch, self).get_vlan_interfaces(number)
         assert_that(vlan_interfaces, is_(self.real_switch.get_vlan_interfaces(number)))
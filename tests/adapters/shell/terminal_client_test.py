@@ -23,8 +23,9 @@ from mock import patch, Mock
 from twisted.internet.protocol import Factory
 
 from netman.adapters import shell
-from netman.adapters.shell.ssh import SshClient
+from netman.adapters.shell.ssh import SshClient, split_pipelined_output
 from netman.adapters.shell.telnet import TelnetClient
+from netman.core import metrics
 from netman.core.objects.exceptions import CouldNotConnect, CommandTimeout, ConnectTimeout
 from tests.adapters.shell.mock_telnet import MockTelnet
 from tests.adapters.shell.mock_terminal_commands import passwd_change_protocol_prompt, passwd_write_password_to_transport, \
@@ -180,6 +181,16 @@ class TerminalClientTest(unittest.TestCase):
             K pressed
             hostname>""")))
 
+    def test_sensitive_commands_are_not_timed_with_their_content(self):
+        measures = []
+        client = self.client("127.0.0.1", "admin", "1234", port=self.port)
+
+        with patch.object(metrics, 'hooks', [measures.append]):
+            client.do('passwd', wait_for="Password:")
+            client.do('1234', sensitive=True)
+
+        assert_that([measure.command for measure in measures], equal_to(['passwd', '<sensitive>']))
+
     def test_support_regex(self):
         client = self.client("127.0.0.1", "admin", "1234", port=self.port)
         res = client.do('ambiguous', wait_for=('>', '#'))
@@ -228,6 +239,65 @@ class SshClientTest(TerminalClientTest):
         del ssh
         paramiko_connection.close.assert_called_once()
 
+    @patch('netman.adapters.shell.ssh.SshClient._open_channel', Mock())
+    def test_pipelined_commands_are_written_at_once_and_their_outputs_split(self):
+        ssh = SshClient(pipelining=True, **self._get_some_credentials())
+        ssh.channel = FakeChannel([["configure\r\nhostname(config)#interface 1\r\nhostname(config-if)#",
+                                    "shutdown\r\n% Invalid\r\nhostname(config-if)#exit\r\nhostname(config)#"]])
+
+        results = ssh.do_many(["configure", "interface 1", "shutdown", "exit"])
+
+        assert_that(ssh.channel.sent, equal_to(["configure\ninterface 1\nshutdown\nexit\n"]))
+        assert_that(results, equal_to([[], [], ["% Invalid"], []]))
+
+    @patch('netman.adapters.shell.ssh.SshClient._open_channel', Mock())
+    def test_pipelining_waits_for_the_echoes_of_slow_commands_without_writing_them_again(self):
+        ssh = SshClient(pipelining=True, **self._get_some_credentials())
+        ssh.channel = FakeChannel([["configure\r\nhostname(config)#"]],
+                                  later=["vlan 1000\r\nhostname(config-vlan)#", "exit\r\nhostname(config)#"])
+
+        results = ssh.do_many(["configure", "vlan 1000", "exit"])
+
+        assert_that(ssh.channel.sent, equal_to(["configure\nvlan 1000\nexit\n"]))
+        assert_that(results, equal_to([[], [], []]))
+
+    @patch('netman.adapters.shell.ssh.SshClient._open_channel', Mock())
+    def test_pipelined_commands_never_answered_time_out(self):
+        ssh = SshClient(pipelining=True, command_timeout=0.05, **self._get_some_credentials())
+        ssh.channel = FakeChannel([["configure\r\nhostname(config)#"]])
+
+        with self.assertRaises(CommandTimeout):
+            ssh.do_many(["configure", "vlan 1000", "exit"])
+
+        assert_that(ssh.channel.sent, equal_to(["configure\nvlan 1000\nexit\n"]))
+
+    @patch('netman.adapters.shell.ssh.SshClient._open_channel', Mock())
+    def test_pipelining_is_off_by_default(self):
+        ssh = SshClient(**self._get_some_credentials())
+        ssh.channel = FakeChannel([["configure\r\nhostname(config)#"], ["exit\r\nhostname#"]])
+
+        ssh.do_many(["configure", "exit"])
+
+        assert_that(ssh.channel.sent, equal_to(["configure\n", "exit\n"]))
+
+    @patch('netman.adapters.shell.ssh.SshClient._open_channel', Mock())
+    def test_pipelining_can_be_enabled_by_default(self):
+        shell.default_pipelining = True
+        try:
+            ssh = SshClient(**self._get_some_credentials())
+        finally:
+            shell.default_pipelining = False
+
+        assert_that(ssh.pipelining, is_(True))
+
+    def test_split_pipelined_output_leaves_out_commands_without_a_complete_output(self):
+        assert_that(split_pipelined_output("show\r\nline\r\nhost#exit\r\nbye", ["show", "exit"], ('>', '#')),
+                    equal_to([["line"]]))
+        assert_that(split_pipelined_output("show\r\nline\r\nhost#", ["show", "exit"], ('>', '#')),
+                    equal_to([["line"]]))
+        assert_that(split_pipelined_output("", ["show", "exit"], ('>', '#')),
+                    equal_to([]))
+
 
 class TelnetClientTest(TerminalClientTest):
     __test__ = True
@@ -262,6 +332,28 @@ class TelnetClientTest(TerminalClientTest):
         self.assertEqual(600, telnet2.command_timeout)
 
 
+class FakeChannel(object):
+    def __init__(self, answers, later=None):
+        self.answers = list(answers)
+        self.later = list(later or [])
+        self.received = []
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data)
+        self.received.extend(self.answers.pop(0))
+
+    def recv_ready(self):
+        if len(self.received) == 0 and len(self.later) > 0:
+            # what a slow command answers shows up on a later poll
+            self.received.append(self.later.pop(0))
+            return False
+        return len(self.received) > 0
+
+    def recv(self, size):
+        return self.received.pop(0)
+
+
 class SwitchTelnetFactory(Factory):
     def __init__(self, prompt, commands):
         self.prompt = prompt
@@ -0,0 +1,102 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+import threading
+import unittest
+
+import mock
+from hamcrest import assert_that, equal_to, less_than_or_equal_to, has_length
+
+from netman.adapters.switches import arista
+from netman.adapters.switches.arista import Arista, EapiNodePool
+from tests.adapters.model_list import available_models
+
+CYCLES = 10
+
+
+class AristaKeepAliveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.descriptor = next(m["switch_descriptor"] for m in available_models
+                               if m["switch_descriptor"].model == "arista_http")
+        self.pool = EapiNodePool()
+
+    def tearDown(self):
+        self.pool.clear()
+
+    def test_successive_connections_reuse_the_same_http_connection(self):
+        with counting_connections() as connections:
+            for _ in range(CYCLES):
+                self._get_vlans()
+
+        assert_that(connections, has_length(1))
+
+    def test_a_connection_per_request_without_the_pool(self):
+        with counting_connections() as connections:
+            for _ in range(CYCLES):
+                self._get_vlans()
+
+        with counting_connections() as unpooled_connections:
+            for _ in range(CYCLES):
+                self._get_vlans(pool=EapiNodePool(max_idle=0))
+
+        assert_that(len(connections), less_than_or_equal_to(1))
+        assert_that(len(unpooled_connections), equal_to(CYCLES))
+
+    def test_threads_share_the_pool_without_sharing_a_connection(self):
+        errors = []
+
+        def work():
+            try:
+                for _ in range(CYCLES):
+                    self._get_vlans()
+            except Exception as e:
+                errors.append(e)
+
+        with counting_connections() as connections:
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert_that(errors, has_length(0))
+        assert_that(len(connections), less_than_or_equal_to(4))
+
+    def _get_vlans(self, pool=None):
+        switch = Arista(self.descriptor, transport="http", node_pool=pool or self.pool)
+        switch.connect()
+        try:
+            return switch.get_vlans()
+        finally:
+            switch.disconnect()
+
+
+class counting_connections(object):
+    def __init__(self):
+        self.connections = []
+        self.patch = mock.patch.object(arista.httplib.socket, "create_connection", side_effect=self._connect)
+        self.create_connection = socket.create_connection
+
+    def __enter__(self):
+        self.patch.start()
+        return self.connections
+
+    def __exit__(self, *_):
+        self.patch.stop()
+
+    def _connect(self, *args, **kwargs):
+        self.connections.append(args[0])
+        return self.create_connection(*args, **kwargs)
@@ -1,14 +1,18 @@
+import httplib
+import json
+import socket
 import unittest
 
 import mock
 import pyeapi
 from flexmock import flexmock, flexmock_teardown
-from hamcrest import assert_that, has_length, equal_to, is_, contains_string
+from hamcrest import assert_that, has_length, equal_to, is_, contains_string, not_, instance_of
 from netaddr import IPNetwork, IPAddress
 from pyeapi.eapilib import CommandError
 
 from netman.adapters.switches import arista
 from netman.adapters.switches.arista import Arista, parse_vlan_ranges
+from netman.adapters.switches.cached import CachedSwitch
 from netman.core.objects.exceptions import BadVlanNumber, VlanAlreadyExist, BadVlanName, UnknownVlan, \
     UnknownIP, IPNotAvailable, IPAlreadySet, UnknownInterface, UnknownDhcpRelayServer, DhcpRelayServerAlreadyExists, \
     UnknownBond, VarpAlreadyExistsForVlan, VarpDoesNotExistForVlan, BadLoadIntervalNumber, BadMplsIpState
@@ -17,6 +21,7 @@ from netman.core.objects.interface_states import ON, OFF
 from netman.core.objects.port_modes import TRUNK
 from netman.core.objects.switch_descriptor import SwitchDescriptor
 from netman.core.objects.vlan import Vlan
+from netman.core.objects.vlan_set import VlanSet
 from tests import ignore_deprecation_warnings
 from tests.fixtures.arista import vlan_data, result_payload, interface_vlan_data, show_interfaces, interface_address, \
     switchport_data, interface_data
@@ -30,6 +35,25 @@ class AristaTest(unittest.TestCase):
     def tearDown(self):
         flexmock_teardown()
 
+    def test_get_vlans_by_number_reads_the_config_of_these_vlans_only(self):
+        vlans_payload = {'vlans': {'1': vlan_data(name='default'),
+                                   '123': vlan_data(name='VLAN0123'),
+                                   '456': vlan_data(name='Patate')}}
+
+        self.switch.node.should_receive("enable") \
+            .with_args(["show vlan"], strict=True) \
+            .and_return([result_payload(result=vlans_payload)])
+
+        self.switch.node.should_receive("get_config").with_args(params="interfaces Vlan456").once() \
+            .and_return(['interface Vlan456',
+                         '   ip address 192.168.11.1/29'])
+
+        vlan456, = self.switch.get_vlans_by_number([456, 457])
+
+        assert_that(vlan456.number, equal_to(456))
+        assert_that(vlan456.name, equal_to('Patate'))
+        assert_that(vlan456.ips, equal_to([IPNetwork("192.168.11.1/29")]))
+
     def test_get_vlans(self):
         vlans_payload = {'vlans': {'1': vlan_data(name='default'),
                                    '123': vlan_data(name='VLAN0123'),
@@ -39,25 +63,9 @@ class AristaTest(unittest.TestCase):
                                    '1235': vlan_data(name="vlan_with_load_interval"),
                                    '1236': vlan_data(name="vlan_with_no_mpls_ip")}}
 
-        interfaces_payload = show_interfaces(
-            interface_vlan_data(name="Vlan456", interfaceAddress=[interface_address(
-                primaryIp={'address': '192.168.11.1', 'maskLen': 29},
-                secondaryIpsOrderedList=[
-                    {'address': '192.168.13.1', 'maskLen': 29},
-                    {'address': '192.168.12.1', 'maskLen': 29}
-                ]
-            )]),
-            interface_vlan_data(name="Vlan789", interfaceAddress=[interface_address(
-                primaryIp={'address': '0.0.0.0', 'maskLen': 0},
-                secondaryIpsOrderedList=[]
-            )]),
-            interface_vlan_data(name="Vlan1234", interfaceAddress=[]),
-        )
-
         self.switch.node.should_receive("enable") \
-            .with_args(["show vlan", "show interfaces"], strict=True) \
-            .and_return([result_payload(result=vlans_payload),
-                         result_payload(result=interfaces_payload)])
+            .with_args(["show vlan"], strict=True) \
+            .and_return([result_payload(result=vlans_payload)])
 
         self.switch.node.should_receive("get_config").with_args(
             params="interfaces Vlan1 Vlan123 Vlan1234 Vlan1235 Vlan1236 Vlan456 Vlan789").once() \
@@ -65,6 +73,9 @@ class AristaTest(unittest.TestCase):
                          '   ip helper-address 10.10.30.200',
                          '   ip helper-address 10.10.30.201',
                          'interface Vlan456',
+                         '   ip address 192.168.11.1/29',
+                         '   ip address 192.168.13.1/29 secondary',
+                         '   ip address 192.168.12.1/29 secondary',
                          '   ip virtual-router address 10.10.77.1',
                          '   ip virtual-router address 10.10.77.200/28',
                          'interface Vlan789',
@@ -124,6 +135,20 @@ class AristaTest(unittest.TestCase):
         assert_that(vlan1236.number, equal_to(1236))
         assert_that(vlan1236.mpls_ip, equal_to(False))
 
+    def test_get_vlans_skips_unsupported_ip_addresses(self):
+        self.switch.node.should_receive("enable") \
+            .with_args(["show vlan"], strict=True) \
+            .and_return([result_payload(result={'vlans': {'456': vlan_data(name='Patate')}})])
+
+        self.switch.node.should_receive("get_config").with_args(params="interfaces Vlan456").once() \
+            .and_return(['interface Vlan456',
+                         '   ip address virtual 192.168.11.1/29',
+                         '   ip address 192.168.12.1/29'])
+
+        vlan456, = self.switch.get_vlans()
+
+        assert_that(vlan456.ips, is_([IPNetwork("192.168.12.1/29")]))
+
     def test_get_vlan(self):
         vlans_payload = {'vlans': {'456': vlan_data(name='Patate')}}
 
@@ -291,6 +316,47 @@ class AristaTest(unittest.TestCase):
         with self.assertRaises(UnknownVlan):
             self.switch.remove_vlan(123)
 
+    def test_add_vlans_creates_them_in_one_batch(self):
+        self.switch.node.should_receive("enable").with_args(["show vlan"], strict=True).once() \
+            .and_return([result_payload(result={'vlans': {'1': vlan_data(name='default')}})])
+
+        self.switch.node.should_receive("config").with_args(["vlan 123", "vlan 124"]).once()
+
+        self.switch.add_vlans([123, 124])
+
+    def test_add_vlans_creates_nothing_when_one_already_exists(self):
+        self.switch.node.should_receive("enable").with_args(["show vlan"], strict=True).once() \
+            .and_return([result_payload(result={'vlans': {'1': vlan_data(name='default'),
+                                                          '124': vlan_data(name='VLAN0124')}})])
+
+        self.switch.node.should_receive("config").never()
+
+        with self.assertRaises(VlanAlreadyExist) as expect:
+            self.switch.add_vlans([123, 124])
+
+        assert_that(str(expect.exception), equal_to("Vlan 124 already exists"))
+
+    def test_remove_vlans_removes_them_with_their_vlan_interfaces_in_one_batch(self):
+        self.switch.node.should_receive("enable").with_args(["show vlan"], strict=True).once() \
+            .and_return([result_payload(result={'vlans': {'123': vlan_data(name='VLAN0123'),
+                                                          '124': vlan_data(name='VLAN0124')}})])
+
+        self.switch.node.should_receive("config").with_args(["no interface Vlan123", "no vlan 123",
+                                                             "no interface Vlan124", "no vlan 124"]).once()
+
+        self.switch.remove_vlans([123, 124])
+
+    def test_remove_vlans_removes_nothing_when_one_does_not_exist(self):
+        self.switch.node.should_receive("enable").with_args(["show vlan"], strict=True).once() \
+            .and_return([result_payload(result={'vlans': {'124': vlan_data(name='VLAN0124')}})])
+
+        self.switch.node.should_receive("config").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.remove_vlans([123, 124])
+
+        assert_that(str(expect.exception), equal_to("Vlan 123 not found"))
+
     def test_add_ip(self):
         self.switch = flexmock(spec=self.switch)
         self.switch.should_receive("get_vlan").with_args(123) \
@@ -517,6 +583,47 @@ class AristaTest(unittest.TestCase):
         assert_that(if2.trunk_vlans, equal_to([]))
         assert_that(if2.auto_negotiation, equal_to(ON))
 
+    def test_get_interfaces_by_name(self):
+        self.switch.node.should_receive("enable").with_args([
+            "show interfaces Ethernet1", "show interfaces Ethernet1 switchport",
+            "show interfaces Ethernet2", "show interfaces Ethernet2 switchport"
+        ], strict=True).once().and_return([
+            result_payload(result={'interfaces': {'Ethernet1': interface_data(name="Ethernet1")}}),
+            result_payload(result={'switchports': {'Ethernet1': {
+                'enabled': True,
+                'switchportInfo': switchport_data(mode="trunk", trunkAllowedVlans="800-802")}}}),
+            result_payload(result={'interfaces': {'Ethernet2': interface_data(name="Ethernet2")}}),
+            result_payload(result={'switchports': {}})
+        ])
+
+        if1, if2 = sorted(self.switch.get_interfaces_by_name(["Ethernet1", "Ethernet2"]), key=lambda i: i.name)
+
+        assert_that(if1.name, equal_to("Ethernet1"))
+        assert_that(if1.port_mode, equal_to(TRUNK))
+        assert_that(if1.trunk_vlans, equal_to([800, 801, 802]))
+        assert_that(if2.name, equal_to("Ethernet2"))
+
+    def test_get_interfaces_by_name_skips_unknown_interfaces(self):
+        self.switch.node.should_receive("enable").with_args([
+            "show interfaces Ethernet1", "show interfaces Ethernet1 switchport",
+            "show interfaces Patate", "show interfaces Patate switchport"
+        ], strict=True).once().and_raise(CommandError(1002, "CLI command 4 of 5 'show interfaces Patate' failed: invalid command",
+                                                      command_error="Invalid input (at token 2: 'Patate')"))
+        self.switch.node.should_receive("enable").with_args([
+            "show interfaces Ethernet1", "show interfaces Ethernet1 switchport"
+        ], strict=True).once().and_return([
+            result_payload(result={'interfaces': {'Ethernet1': interface_data(name="Ethernet1")}}),
+            result_payload(result={'switchports': {}})
+        ])
+        self.switch.node.should_receive("enable").with_args([
+            "show interfaces Patate", "show interfaces Patate switchport"
+        ], strict=True).once().and_raise(CommandError(1002, "CLI command 2 of 3 'show interfaces Patate' failed: invalid command",
+                                                      command_error="Invalid input (at token 2: 'Patate')"))
+
+        interfaces = self.switch.get_interfaces_by_name(["Ethernet1", "Patate"])
+
+        assert_that([i.name for i in interfaces], equal_to(["Ethernet1"]))
+
     def parse_range_test(self):
         result = parse_vlan_ranges(None)
         assert_that(list(result), equal_to(range(1, 4094)))
@@ -632,6 +739,70 @@ class AristaTest(unittest.TestCase):
 
         self.switch.remove_trunk_vlan("Ethernet1", 800)
 
+    def test_add_trunk_vlans_adds_them_as_ranges_in_one_command(self):
+        self.switch.node.should_receive("enable").with_args(["show vlan"], strict=True).once() \
+            .and_return([result_payload(result={'vlans': {'800': vlan_data(name='VLAN0800'),
+                                                          '801': vlan_data(name='VLAN0801'),
+                                                          '803': vlan_data(name='VLAN0803')}})])
+        self.switch.node.should_receive("config") \
+            .with_args(["interface Ethernet1",
+                        "switchport trunk allowed vlan add 800-801,803"]).once()
+
+        self.switch.add_trunk_vlans("Ethernet1", [800, 801, 803])
+
+    def test_add_trunk_vlans_adds_nothing_when_a_vlan_does_not_exist(self):
+        self.switch.node.should_receive("enable").with_args(["show vlan"], strict=True).once() \
+            .and_return([result_payload(result={'vlans': {'800': vlan_data(name='VLAN0800')}})])
+        self.switch.node.should_receive("config").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.add_trunk_vlans("Ethernet1", [800, 801])
+
+        assert_that(str(expect.exception), equal_to("Vlan 801 not found"))
+
+    def test_remove_trunk_vlans_removes_them_as_ranges_in_one_command(self):
+        self.switch = flexmock(self.switch)
+        self.switch.should_receive("get_interface") \
+            .with_args("Ethernet1") \
+            .and_return(Interface(name="Ethernet1", trunk_vlans=[800, 801, 802, 804], port_mode="trunk"))
+        self.switch.node.should_receive("config") \
+            .with_args(["interface Ethernet1", "switchport trunk allowed vlan remove 800-801,804"]).once()
+
+        self.switch.remove_trunk_vlans("Ethernet1", [800, 801, 804])
+
+    def test_remove_trunk_vlans_removes_nothing_when_a_vlan_is_not_a_member(self):
+        self.switch = flexmock(self.switch)
+        self.switch.should_receive("get_interface") \
+            .with_args("Ethernet1") \
+            .and_return(Interface(name="Ethernet1", trunk_vlans=[800, 801], port_mode="trunk"))
+        self.switch.node.should_receive("config").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.remove_trunk_vlans("Ethernet1", [800, 803])
+
+        assert_that(str(expect.exception), equal_to("Vlan 803 not found"))
+
+    def test_remove_trunk_vlans_through_the_cache_of_an_interface_read_without_allowed_vlans(self):
+        def show_interface(trunk_allowed_vlans):
+            return [result_payload(result=show_interfaces(interface_data(name="Ethernet1"))),
+                    result_payload(result={'switchports': {'Ethernet1': {
+                        'enabled': True,
+                        'switchportInfo': switchport_data(mode="trunk", trunkAllowedVlans=trunk_allowed_vlans)}}})]
+
+        self.switch.node.should_receive("enable") \
+            .with_args(["show interfaces Ethernet1", "show interfaces Ethernet1 switchport"], strict=True) \
+            .and_return(show_interface("")) \
+            .and_return(show_interface("800-802"))
+        self.switch.node.should_receive("config") \
+            .with_args(["interface Ethernet1", "switchport trunk allowed vlan remove 801"]).once()
+
+        switch = CachedSwitch(self.switch)
+        assert_that(switch.get_interface("Ethernet1").trunk_vlans, is_(instance_of(VlanSet)))
+
+        switch.remove_trunk_vlans("Ethernet1", [801])
+
+        assert_that(switch.get_interface("Ethernet1").trunk_vlans, equal_to([]))
+
     def test_add_dhcp_relay_server(self):
         vlans_payload = {'vlans': {'123': vlan_data(name='Patate')}}
 
@@ -1029,11 +1200,15 @@ class AristaTest(unittest.TestCase):
 
 
 class AristaFactoryTest(unittest.TestCase):
+    def setUp(self):
+        arista.eapi_node_pool.clear()
+
     def tearDown(self):
+        arista.eapi_node_pool.clear()
         flexmock_teardown()
 
     def test_arista_instance_with_proper_transport(self):
-        pyeapi_client_node = mock.sentinel
+        pyeapi_client_node = a_node()
 
         flexmock(pyeapi).should_receive('connect').once() \
             .with_args(host="1.2.3.4",
@@ -1057,11 +1232,12 @@ class AristaFactoryTest(unittest.TestCase):
         switch._connect()
 
         assert_that(switch.node, is_(pyeapi_client_node))
+        assert_that(switch.node.connection.transport, is_(arista.PersistentTransport))
 
     def test_arista_uses_command_timeout(self):
         arista.default_command_timeout = 500
 
-        pyeapi_client_node = mock.sentinel
+        pyeapi_client_node = a_node()
 
         flexmock(pyeapi).should_receive('connect').once() \
             .with_args(host="1.2.3.4",
@@ -1119,3 +1295,322 @@ class AristaFactoryTest(unittest.TestCase):
         assert_that(arista.eapi(switch_descriptor), is_(instance))
 
         assert_that(switch_descriptor.hostname, is_("hostname"))
+
+
+class AristaDeferredConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.switch = Arista(SwitchDescriptor(model='arista', hostname="my.hostname"), transport="Eytch tea tea pee",
+                             deferred_edits=True)
+        self.switch.node = flexmock()
+        self.switch.in_transaction = True
+        flexmock(arista.uuid).should_receive("uuid4").and_return(flexmock(hex="1234"))
+
+    def tearDown(self):
+        flexmock_teardown()
+
+    def test_config_commands_are_sent_in_one_session_when_committing(self):
+        self.switch.node.should_receive("config").never()
+        self.switch.node.should_receive("run_commands").with_args([
+            "configure session netman-1234",
+            "interface Ethernet1",
+            "switchport mode trunk",
+            "switchport trunk allowed vlan none",
+            "interface Ethernet2",
+            "switchport mode trunk",
+            "switchport trunk allowed vlan none",
+            "commit"
+        ]).once().ordered()
+        self.switch.node.should_receive("enable").with_args("write memory").once().ordered()
+
+        self.switch.set_trunk_mode("Ethernet1")
+        self.switch.set_trunk_mode("Ethernet2")
+
+        self.switch.commit_transaction()
+
+    def test_writes_with_their_checks_are_committed_in_one_session(self):
+        self.switch.node.should_receive("enable").with_args(["show vlan 123"], strict=True).once().ordered() \
+            .and_raise(CommandError(1000, 'msg'))
+        self.switch.node.should_receive("enable").with_args(["show vlan 124"], strict=True).once().ordered() \
+            .and_raise(CommandError(1000, 'msg'))
+        self.switch.node.should_receive("run_commands").with_args([
+            "configure session netman-1234",
+            "vlan 123",
+            "vlan 124",
+            "interface Ethernet1",
+            "switchport mode trunk",
+            "switchport trunk allowed vlan none",
+            "commit"
+        ]).once().ordered()
+        self.switch.node.should_receive("enable").with_args("write memory").once().ordered()
+
+        self.switch.add_vlan(123)
+        self.switch.add_vlan(124)
+        self.switch.set_trunk_mode("Ethernet1")
+
+        assert_that(self.switch.pending_commands, has_length(3))
+
+        self.switch.commit_transaction()
+
+    def test_reads_of_vlans_and_interfaces_left_alone_do_not_send_the_queue(self):
+        self.switch.node.should_receive("run_commands").never()
+        self.switch.node.should_receive("enable").with_args(["show vlan 123"], strict=True).once() \
+            .and_raise(CommandError(1000, 'msg'))
+        self.switch.node.should_receive("enable").with_args(
+            ["show interfaces Ethernet2", "show interfaces Ethernet2 switchport"], strict=True).once() \
+            .and_return([result_payload(result=show_interfaces(interface_data(name="Ethernet2"))),
+                         result_payload(result={'switchports': {'Ethernet2': {
+                             'enabled': True,
+                             'switchportInfo': switchport_data(mode="trunk", trunkAllowedVlans="123")}}})])
+
+        self.switch.set_trunk_mode("Ethernet1")
+        self.switch.add_vlan(123)
+        self.switch.remove_trunk_vlan("Ethernet2", 123)
+
+        assert_that(self.switch.pending_commands, has_length(3))
+
+    def test_queued_commands_are_sent_before_reading_what_they_change(self):
+        self.switch.node.should_receive("enable").with_args(["show vlan 123"], strict=True).once().ordered() \
+            .and_raise(CommandError(1000, 'msg'))
+        self.switch.node.should_receive("run_commands").with_args([
+            "configure session netman-1234",
+            "vlan 123",
+            "commit"
+        ]).once().ordered()
+        self.switch.node.should_receive("enable").with_args(["show vlan 123"], strict=True).once().ordered() \
+            .and_return([result_payload(result={'vlans': {'123': vlan_data(name='VLAN0123')}})])
+
+        self.switch.add_vlan(123)
+        with self.assertRaises(VlanAlreadyExist):
+            self.switch.add_vlan(123)
+
+        assert_that(self.switch.pending_commands, has_length(0))
+
+    def test_queued_vlan_interface_changes_are_sent_before_reading_the_vlan_config(self):
+        self.switch.node.should_receive("run_commands").with_args([
+            "configure session netman-1234",
+            "interface Vlan123",
+            "no load-interval",
+            "commit"
+        ]).once().ordered()
+        self.switch.node.should_receive("get_config").with_args(params="interfaces Vlan123").once().ordered() \
+            .and_return(["interface Vlan123"])
+
+        self.switch.pending_commands = [(["interface Vlan123", "no load-interval"], None)]
+        self.switch._apply_interface_vlan_data([Vlan(123)])
+
+    def test_a_failing_command_aborts_the_session_and_raises_the_error_of_its_operation(self):
+        self.switch.node.should_receive("run_commands").with_args([
+            "configure session netman-1234",
+            "interface Ethernet1",
+            "switchport mode trunk",
+            "switchport trunk allowed vlan none",
+            "interface Ethernet99",
+            "switchport mode trunk",
+            "switchport trunk allowed vlan none",
+            "commit"
+        ]).once().ordered().and_raise(CommandError(1002, "CLI command 6 of 9 'interface Ethernet99' failed",
+                                                   output=[{}, {}, {}, {}, {}, {"errors": ["Invalid input"]}]))
+        self.switch.node.should_receive("run_commands").with_args(["configure session netman-1234", "abort"]) \
+            .once().ordered()
+
+        self.switch.set_trunk_mode("Ethernet1")
+        self.switch.set_trunk_mode("Ethernet99")
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.switch.commit_transaction()
+
+        assert_that(str(expect.exception), contains_string("Ethernet99"))
+
+    def test_rollback_drops_the_queued_commands(self):
+        self.switch.node.should_receive("run_commands").never()
+
+        self.switch.set_trunk_mode("Ethernet1")
+        self.switch.rollback_transaction()
+
+        assert_that(self.switch.pending_commands, has_length(0))
+
+    def test_write_memory_can_be_disabled(self):
+        self.switch.write_memory = False
+        self.switch.node.should_receive("enable").never()
+
+        self.switch.commit_transaction()
+
+    def test_save_configuration_writes_memory(self):
+        self.switch.node.should_receive("enable").with_args("write memory").once()
+
+        self.switch.save_configuration()
+
+    def test_commands_outside_a_transaction_are_sent_right_away(self):
+        self.switch.in_transaction = False
+        self.switch.node.should_receive("config").with_args(["interface Ethernet1",
+                                                             "switchport mode trunk",
+                                                             "switchport trunk allowed vlan none"]).once()
+
+        self.switch.set_trunk_mode("Ethernet1")
+
+
+class AristaNodePoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = arista.EapiNodePool(max_idle=1)
+        self.descriptor = SwitchDescriptor(model='arista', hostname="1.2.3.4")
+
+    def tearDown(self):
+        flexmock_teardown()
+
+    def test_a_disconnected_node_is_reused_by_the_next_connection(self):
+        node = a_node()
+        flexmock(pyeapi).should_receive('connect').once().and_return(node)
+
+        first = Arista(self.descriptor, transport="http", node_pool=self.pool)
+        first._connect()
+        first._disconnect()
+
+        second = Arista(self.descriptor, transport="http", node_pool=self.pool)
+        second._connect()
+
+        assert_that(second.node, is_(node))
+        assert_that(first.node, is_(None))
+
+    def test_concurrent_connections_each_get_their_node(self):
+        flexmock(pyeapi).should_receive('connect').twice().and_return(a_node()).and_return(a_node())
+
+        first = Arista(self.descriptor, transport="http", node_pool=self.pool)
+        second = Arista(self.descriptor, transport="http", node_pool=self.pool)
+        first._connect()
+        second._connect()
+
+        assert_that(first.node, is_(not_(second.node)))
+
+    def test_nodes_are_pooled_per_switch_and_transport(self):
+        flexmock(pyeapi).should_receive('connect').times(3).and_return(a_node())
+
+        for switch in [Arista(self.descriptor, transport="http", node_pool=self.pool),
+                       Arista(self.descriptor, transport="https", node_pool=self.pool),
+                       Arista(SwitchDescriptor(model='arista', hostname="5.6.7.8"), transport="http",
+                              node_pool=self.pool)]:
+            switch._connect()
+            switch._disconnect()
+
+    def test_nodes_over_the_idle_limit_are_closed(self):
+        transport = flexmock()
+        first = flexmock(connection=flexmock(transport=flexmock(disconnect=lambda: None)))
+        second = flexmock(connection=flexmock(transport=transport))
+        transport.should_receive("disconnect").once()
+
+        self.pool.release("key", first)
+        self.pool.release("key", second)
+
+        assert_that(self.pool.acquire("key", lambda: None), is_(first))
+
+    def test_clear_closes_the_idle_nodes(self):
+        transport = flexmock()
+        transport.should_receive("disconnect").once()
+        self.pool.release("key", flexmock(connection=flexmock(transport=transport)))
+
+        self.pool.clear()
+
+        assert_that(self.pool.acquire("key", lambda: "new"), is_("new"))
+
+
+class PersistentTransportTest(unittest.TestCase):
+    def setUp(self):
+        self.connection = flexmock(sock=None, host="1.2.3.4")
+        self.transport = arista.PersistentTransport(self.connection)
+        self.switch_side, self.idle_socket = socket.socketpair()
+
+    def tearDown(self):
+        flexmock_teardown()
+        self.switch_side.close()
+        self.idle_socket.close()
+
+    def test_close_keeps_the_connection_open(self):
+        self.connection.should_receive("close").never()
+
+        self.transport.close()
+
+        assert_that(self.transport.host, is_("1.2.3.4"))
+
+    def test_disconnect_closes_the_connection(self):
+        self.connection.should_receive("close").once()
+
+        self.transport.disconnect()
+
+    def test_a_show_request_on_a_connection_closed_by_the_switch_is_sent_again(self):
+        payload = eapi_payload(["enable", "show vlan"])
+        self.connection.sock = self.idle_socket
+        self.connection.should_receive("putrequest").with_args("POST", "/command-api").twice()
+        self.connection.should_receive("putheader").with_args("Content-length", 12).twice()
+        self.connection.should_receive("endheaders").with_args(message_body=payload).twice()
+        self.connection.should_receive("close").once()
+        self.connection.should_receive("getresponse") \
+            .and_raise(httplib.BadStatusLine("''")) \
+            .and_return("the response")
+
+        self.transport.putrequest("POST", "/command-api")
+        self.transport.putheader("Content-length", 12)
+        self.transport.endheaders(message_body=payload)
+
+        assert_that(self.transport.getresponse(), is_("the response"))
+
+    def test_a_change_request_on_a_connection_closed_by_the_switch_is_not_sent_again(self):
+        payload = eapi_payload(["enable", "configure", "vlan 123"])
+        self.connection.sock = self.idle_socket
+        self.connection.should_receive("putrequest").once()
+        self.connection.should_receive("endheaders").once()
+        self.connection.should_receive("close").never()
+        self.connection.should_receive("getresponse").and_raise(httplib.BadStatusLine("''")).once()
+
+        self.transport.putrequest("POST", "/command-api")
+        self.transport.endheaders(message_body=payload)
+
+        with self.assertRaises(httplib.BadStatusLine):
+            self.transport.getresponse()
+
+    def test_a_connection_closed_by_the_switch_while_idle_is_replaced_before_sending(self):
+        self.connection.sock = self.idle_socket
+        self.switch_side.close()
+
+        def close():
+            self.connection.sock = None
+
+        self.connection.should_receive("close").replace_with(close).once().ordered()
+        self.connection.should_receive("putrequest").with_args("POST", "/command-api").once().ordered()
+        self.connection.should_receive("endheaders").once().ordered()
+        self.connection.should_receive("getresponse").and_raise(httplib.BadStatusLine("''")).once()
+
+        self.transport.putrequest("POST", "/command-api")
+        self.transport.endheaders(message_body=eapi_payload(["enable", "show vlan"]))
+
+        with self.assertRaises(httplib.BadStatusLine):
+            self.transport.getresponse()
+
+    def test_failures_of_a_new_connection_are_raised(self):
+        self.connection.should_receive("putrequest").once()
+        self.connection.should_receive("endheaders").once()
+        self.connection.should_receive("getresponse").and_raise(httplib.BadStatusLine("''")).once()
+
+        self.transport.putrequest("POST", "/command-api")
+        self.transport.endheaders(message_body=eapi_payload(["enable", "show vlan"]))
+
+        with self.assertRaises(httplib.BadStatusLine):
+            self.transport.getresponse()
+
+    def test_timeouts_are_not_sent_again(self):
+        self.connection.sock = self.idle_socket
+        self.connection.should_receive("putrequest").once()
+        self.connection.should_receive("endheaders").once()
+        self.connection.should_receive("getresponse").and_raise(socket.timeout()).once()
+
+        self.transport.putrequest("POST", "/command-api")
+        self.transport.endheaders(message_body=eapi_payload(["enable", "show vlan"]))
+
+        with self.assertRaises(socket.timeout):
+            self.transport.getresponse()
+
+
+def eapi_payload(commands):
+    return json.dumps({"jsonrpc": "2.0", "method": "runCmds", "params": {"version": 1, "cmds": commands}})
+
+
+def a_node():
+    return flexmock(connection=flexmock(transport=flexmock()))
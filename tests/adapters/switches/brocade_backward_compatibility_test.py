@@ -168,6 +168,25 @@ class BrocadeBackwardCompatibilityTest(unittest.TestCase):
 
         self.switch.set_interface_state("1/4", ON)
 
+    @ignore_deprecation_warnings
+    def test_edit_interfaces_accepts_no_ethernet(self):
+        self.shell_mock.should_receive("do_many").with_args([
+            "configure terminal",
+            "interface ethernet 1/4"
+        ]).and_return([[], []]).once().ordered()
+        self.shell_mock.should_receive("do_many").with_args([
+            "enable",
+            "exit",
+            "interface ethernet 1/5"
+        ]).and_return([[], [], []]).once().ordered()
+        self.shell_mock.should_receive("do_many").with_args([
+            "enable",
+            "exit",
+            "exit"
+        ]).and_return([[], [], []]).once().ordered()
+
+        self.switch.edit_interfaces(["1/4", "1/5"], state=ON)
+
     @ignore_deprecation_warnings
     def test_set_interface_native_vlan_backward_compatibility(self):
         self.shell_mock.should_receive("do").with_args("show vlan 2999").once().ordered().and_return(
@@ -581,6 +581,63 @@ class BrocadeTest(unittest.TestCase):
 
         assert_that(str(expect.exception), equal_to("Unknown interface ethernet 9/999"))
 
+    def test_edit_interfaces_configures_every_interface_in_one_session(self):
+        self.shell_mock.should_receive("do").with_args("show vlan 2999").once().ordered().and_return(
+            vlan_display(2999)
+        )
+
+        self.shell_mock.should_receive("do_many").with_args([
+            "configure terminal",
+            "interface ethernet 1/4"
+        ]).and_return([[], []]).once().ordered()
+        self.shell_mock.should_receive("do_many").with_args([
+            "disable",
+            "exit",
+            "interface ethernet 1/5"
+        ]).and_return([[], [], []]).once().ordered()
+        self.shell_mock.should_receive("do_many").with_args([
+            "disable",
+            "exit",
+            "vlan 2999",
+            "untagged ethernet 1/4"
+        ]).and_return([[], [], [], []]).once().ordered()
+        self.shell_mock.should_receive("do_many").with_args([
+            "untagged ethernet 1/5"
+        ]).and_return([[]]).once().ordered()
+        self.shell_mock.should_receive("do_many").with_args([
+            "exit",
+            "exit"
+        ]).and_return([[], []]).once().ordered()
+
+        self.switch.edit_interfaces(["ethernet 1/4", "ethernet 1/5"], state=OFF, access_vlan=2999)
+
+    def test_edit_interfaces_invalid_interface_raises(self):
+        self.shell_mock.should_receive("do").with_args("show vlan 2999").once().ordered().and_return(
+            vlan_display(2999)
+        )
+
+        self.shell_mock.should_receive("do_many").with_args([
+            "configure terminal",
+            "vlan 2999",
+            "untagged ethernet 1/4"
+        ]).once().ordered().and_return([[], [], []])
+        self.shell_mock.should_receive("do_many").with_args([
+            "untagged ethernet 9/999"
+        ]).once().ordered().and_return([[
+            'Invalid input -> 9/999'
+            'Type ? for a list'
+        ]])
+        self.shell_mock.should_receive("do").with_args("exit").twice().and_return([])
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.switch.edit_interfaces(["ethernet 1/4", "ethernet 9/999"], access_vlan=2999)
+
+        assert_that(str(expect.exception), equal_to("Unknown interface ethernet 9/999"))
+
+    def test_edit_interfaces_description_is_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            self.switch.edit_interfaces(["ethernet 1/4"], description="servers")
+
     def test_reset_interfaces_works(self):
         self.shell_mock.should_receive("do").with_args("show vlan ethernet 1/4").once().ordered().and_return([])
 
@@ -2109,7 +2166,7 @@ class BrocadeTest(unittest.TestCase):
         ssh_client_class_mock.return_value = self.shell_mock
         self.shell_mock.should_receive("get_current_prompt").and_return("hostname>").once().ordered()
         self.shell_mock.should_receive("do").with_args("enable", wait_for=":").and_return([]).once().ordered()
-        self.shell_mock.should_receive("do").with_args("the_password").and_return([]).once().ordered()
+        self.shell_mock.should_receive("do").with_args("the_password", sensitive=True).and_return([]).once().ordered()
         self.shell_mock.should_receive("do").with_args("skip-page-display").and_return([]).once().ordered()
 
         self.switch.connect()
@@ -2130,7 +2187,7 @@ class BrocadeTest(unittest.TestCase):
         telnet_client_class_mock.return_value = self.shell_mock
         self.shell_mock.should_receive("get_current_prompt").and_return("hostname>").once().ordered()
         self.shell_mock.should_receive("do").with_args("enable", wait_for=":").and_return([]).once().ordered()
-        self.shell_mock.should_receive("do").with_args("the_password").and_return([]).once().ordered()
+        self.shell_mock.should_receive("do").with_args("the_password", sensitive=True).and_return([]).once().ordered()
         self.shell_mock.should_receive("do").with_args("skip-page-display").and_return([]).once().ordered()
 
         self.switch.connect()
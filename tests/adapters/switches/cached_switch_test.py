@@ -115,6 +115,34 @@ class CacheSwitchTest(unittest.TestCase):
         assert_that(self.switch.get_vlans(), is_(all_vlans))
         assert_that(self.switch.get_vlans(), is_(all_vlans))
 
+    def test_get_vlans_by_number_reads_only_these_vlans(self):
+        some_vlans = [Vlan(2, 'second'), Vlan(3, 'third')]
+
+        self.real_switch_mock.should_receive("get_vlans_by_number").with_args([2, 3]).once().and_return(some_vlans)
+        self.real_switch_mock.should_receive("get_vlans").never()
+
+        assert_that(self.switch.get_vlans_by_number([2, 3]), is_(some_vlans))
+
+    def test_get_vlans_by_number_uses_the_cached_vlans(self):
+        all_vlans = [Vlan(1, 'first'), Vlan(2, 'second'), Vlan(3, 'third')]
+
+        self.real_switch_mock.should_receive("get_vlans").once().and_return(all_vlans)
+        self.real_switch_mock.should_receive("get_vlans_by_number").never()
+
+        self.switch.get_vlans()
+        assert_that(self.switch.get_vlans_by_number([2, 3]), is_(all_vlans[1:]))
+
+    def test_get_vlans_by_number_reads_the_vlans_missing_from_the_cache(self):
+        all_vlans = [Vlan(1, 'first'), Vlan(2, 'second')]
+
+        self.real_switch_mock.should_receive("get_vlans").once().and_return(all_vlans)
+        self.real_switch_mock.should_receive("get_vlans_by_number").with_args([3, 4]).once() \
+            .and_return([Vlan(3, 'third')])
+
+        self.switch.get_vlans()
+        assert_that(self.switch.get_vlans_by_number([2, 3, 4]), is_([Vlan(2, 'second'), Vlan(3, 'third')]))
+        assert_that(self.switch.get_vlan(3), is_(Vlan(3, 'third')))
+
     def test_add_vlan_first(self):
         all_vlans = [Vlan(1), Vlan(2), Vlan(123, name='allo')]
 
@@ -181,6 +209,27 @@ class CacheSwitchTest(unittest.TestCase):
         self.real_switch_mock.should_receive("remove_vlan").once().with_args(1)
         self.switch.remove_vlan(1)
 
+    def test_add_vlans(self):
+        self.real_switch_mock.should_receive("get_vlans").once().and_return([Vlan(1)])
+        self.switch.get_vlans()
+
+        self.real_switch_mock.should_receive("add_vlans").once().with_args([10, 11])
+        self.switch.add_vlans([10, 11])
+
+        self.real_switch_mock.should_receive("get_vlan").with_args(10).once().and_return(Vlan(10))
+        self.real_switch_mock.should_receive("get_vlan").with_args(11).once().and_return(Vlan(11))
+
+        assert_that(self.switch.get_vlans(), is_([Vlan(1), Vlan(10), Vlan(11)]))
+
+    def test_remove_vlans(self):
+        self.real_switch_mock.should_receive("get_vlans").once().and_return([Vlan(1), Vlan(2), Vlan(3)])
+        self.switch.get_vlans()
+
+        self.real_switch_mock.should_receive("remove_vlans").once().with_args([1, 3])
+        self.switch.remove_vlans([1, 3])
+
+        assert_that(self.switch.get_vlans(), is_([Vlan(2)]))
+
     def test_get_interfaces(self):
         all_interfaces = [Interface('xe-1/0/1'), Interface('xe-1/0/2')]
 
@@ -189,6 +238,53 @@ class CacheSwitchTest(unittest.TestCase):
         assert_that(self.switch.get_interfaces(), is_(all_interfaces))
         assert_that(self.switch.get_interfaces(), is_(all_interfaces))
 
+    def test_get_interfaces_by_name_reads_only_these_interfaces(self):
+        some_interfaces = [Interface('xe-1/0/2')]
+
+        self.real_switch_mock.should_receive("get_interfaces_by_name").with_args(['xe-1/0/2']).once() \
+            .and_return(some_interfaces)
+        self.real_switch_mock.should_receive("get_interfaces").never()
+
+        assert_that(self.switch.get_interfaces_by_name(['xe-1/0/2']), is_(some_interfaces))
+
+    def test_get_interfaces_by_name_uses_the_cached_interfaces(self):
+        all_interfaces = [Interface('xe-1/0/1'), Interface('xe-1/0/2')]
+
+        self.real_switch_mock.should_receive("get_interfaces").once().and_return(all_interfaces)
+        self.real_switch_mock.should_receive("get_interfaces_by_name").never()
+
+        self.switch.get_interfaces()
+        assert_that(self.switch.get_interfaces_by_name(['xe-1/0/2']), is_([Interface('xe-1/0/2')]))
+
+    def test_get_interfaces_by_name_reads_the_interfaces_missing_from_the_cache(self):
+        all_interfaces = [Interface('xe-1/0/1'), Interface('xe-1/0/2')]
+
+        self.real_switch_mock.should_receive("get_interfaces").once().and_return(all_interfaces)
+        self.real_switch_mock.should_receive("get_interfaces_by_name").with_args(['ae1', 'xe-1/0/3']).once() \
+            .and_return([Interface('ae1')])
+
+        self.switch.get_interfaces()
+        assert_that(self.switch.get_interfaces_by_name(['xe-1/0/2', 'ae1', 'xe-1/0/3']),
+                    is_([Interface('xe-1/0/2'), Interface('ae1')]))
+
+    def test_get_interfaces_by_name_prefix_reads_only_these_interfaces(self):
+        some_interfaces = [Interface('xe-1/0/2')]
+
+        self.real_switch_mock.should_receive("get_interfaces_by_name_prefix").with_args('xe-1/').once() \
+            .and_return(some_interfaces)
+        self.real_switch_mock.should_receive("get_interfaces").never()
+
+        assert_that(self.switch.get_interfaces_by_name_prefix('xe-1/'), is_(some_interfaces))
+
+    def test_get_interfaces_by_name_prefix_uses_the_cached_interfaces(self):
+        all_interfaces = [Interface('xe-1/0/1'), Interface('xe-2/0/2')]
+
+        self.real_switch_mock.should_receive("get_interfaces").once().and_return(all_interfaces)
+        self.real_switch_mock.should_receive("get_interfaces_by_name_prefix").never()
+
+        self.switch.get_interfaces()
+        assert_that(self.switch.get_interfaces_by_name_prefix('xe-2/'), is_([Interface('xe-2/0/2')]))
+
     def test_get_interface(self):
         interface = Interface('xe-1/0/1')
 
@@ -298,6 +394,34 @@ class CacheSwitchTest(unittest.TestCase):
             self.switch.get_interfaces(),
             is_([Interface('xe-1/0/2', trunk_vlans=[])]))
 
+    def test_add_trunk_vlans(self):
+        self.real_switch_mock.should_receive("get_interfaces").once() \
+            .and_return([Interface('xe-1/0/2', trunk_vlans=[1])])
+        self.switch.get_interfaces()
+
+        self.real_switch_mock.should_receive("add_trunk_vlans").once() \
+            .with_args('xe-1/0/2', [10, 11, 12])
+
+        self.switch.add_trunk_vlans('xe-1/0/2', [10, 11, 12])
+
+        assert_that(
+            self.switch.get_interfaces(),
+            is_([Interface('xe-1/0/2', trunk_vlans=[1, 10, 11, 12])]))
+
+    def test_remove_trunk_vlans(self):
+        self.real_switch_mock.should_receive("get_interfaces").once() \
+            .and_return([Interface('xe-1/0/2', trunk_vlans=[1, 10, 11, 12])])
+        self.switch.get_interfaces()
+
+        self.real_switch_mock.should_receive("remove_trunk_vlans").once() \
+            .with_args('xe-1/0/2', [10, 11])
+
+        self.switch.remove_trunk_vlans('xe-1/0/2', [10, 11])
+
+        assert_that(
+            self.switch.get_interfaces(),
+            is_([Interface('xe-1/0/2', trunk_vlans=[1, 12])]))
+
     def test_remove_trunk_vlan_on_interface_not_in_cache(self):
         self.real_switch_mock.should_receive("remove_trunk_vlan").once() \
             .with_args('xe-1/0/2', 1)
@@ -332,6 +456,37 @@ class CacheSwitchTest(unittest.TestCase):
             self.switch.get_interfaces(),
             is_([Interface('xe-1/0/2', shutdown=False)]))
 
+    def test_edit_interfaces(self):
+        self.real_switch_mock.should_receive("get_interfaces").once() \
+            .and_return([Interface('xe-1/0/2'), Interface('xe-1/0/3'), Interface('xe-1/0/4')])
+        self.switch.get_interfaces()
+
+        self.real_switch_mock.should_receive("edit_interfaces").once() \
+            .with_args(['xe-1/0/2', 'xe-1/0/3'], description="servers", state=OFF, mtu=5000, access_vlan=1000)
+
+        self.switch.edit_interfaces(['xe-1/0/2', 'xe-1/0/3'], description="servers", state=OFF, mtu=5000,
+                                    access_vlan=1000)
+
+        assert_that(
+            self.switch.get_interfaces(),
+            is_([Interface('xe-1/0/2', shutdown=True, mtu=5000, access_vlan=1000),
+                 Interface('xe-1/0/3', shutdown=True, mtu=5000, access_vlan=1000),
+                 Interface('xe-1/0/4')]))
+
+    def test_edit_interfaces_keeps_the_attributes_not_given(self):
+        self.real_switch_mock.should_receive("get_interfaces").once() \
+            .and_return([Interface('xe-1/0/2', shutdown=True, mtu=5000)])
+        self.switch.get_interfaces()
+
+        self.real_switch_mock.should_receive("edit_interfaces").once() \
+            .with_args(['xe-1/0/2'], description=None, state=None, mtu=None, access_vlan=1000)
+
+        self.switch.edit_interfaces(['xe-1/0/2'], access_vlan=1000)
+
+        assert_that(
+            self.switch.get_interfaces(),
+            is_([Interface('xe-1/0/2', shutdown=True, mtu=5000, access_vlan=1000)]))
+
     def test_unset_interface_state(self):
         self.real_switch_mock.should_receive("get_interfaces").once().and_return([Interface('xe-1/0/2')])
         self.switch.get_interfaces()
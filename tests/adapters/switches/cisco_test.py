@@ -21,6 +21,7 @@ from netaddr import IPNetwork
 from netaddr.ip import IPAddress
 
 from netman.adapters.switches import cisco
+from netman.adapters.switches.cached import CachedSwitch
 from netman.adapters.switches.cisco import Cisco, parse_vlan_ranges
 from netman.adapters.switches.util import SubShell
 from netman.core.objects.access_groups import IN, OUT
@@ -34,6 +35,7 @@ from netman.core.objects.port_modes import ACCESS, TRUNK, DYNAMIC
 from netman.core.objects.switch_descriptor import SwitchDescriptor
 from netman.core.objects.switch_transactional import FlowControlSwitch
 from netman.core.objects.unicast_rpf_modes import STRICT
+from netman.core.objects.vlan_set import VlanSet
 from tests import ignore_deprecation_warnings
 
 
@@ -367,6 +369,44 @@ class CiscoTest(unittest.TestCase):
         assert_that(vlan.number, is_(900))
         assert_that(vlan.name, is_("Shizzle"))
 
+    def test_get_vlans_by_number(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config").once().ordered().and_return([
+            "Building configuration...",
+            "",
+            "Current configuration : 3781 bytes",
+            "!",
+            "version 12.2",
+            "!",
+            "vlan 1",
+            "!",
+            "vlan 2222",
+            " name your-name-is-way-too-long-for-this-pretty-printed-interface-man",
+            "!",
+            "vlan 2500-2502",
+            "!",
+            "interface FastEthernet0/1",
+            " switchport access vlan 2222",
+            "!",
+            "interface Vlan2222",
+            " ip address 2.2.2.2 255.255.255.0",
+            " ip access-group SHNITZEL in",
+            "!",
+            "interface Vlan3000",
+            " ip address 3.3.3.3 255.255.255.0",
+            "!",
+            "end",
+        ])
+
+        vlan2222, vlan2501 = self.switch.get_vlans_by_number([2222, 2501, 3000])
+
+        assert_that(vlan2222.number, equal_to(2222))
+        assert_that(vlan2222.name, equal_to("your-name-is-way-too-long-for-this-pretty-printed-interface-man"))
+        assert_that(vlan2222.ips, equal_to([IPNetwork("2.2.2.2/24")]))
+        assert_that(vlan2222.access_groups[IN], equal_to("SHNITZEL"))
+        assert_that(vlan2501.number, equal_to(2501))
+        assert_that(vlan2501.name, equal_to(None))
+        assert_that(vlan2501.ips, has_length(0))
+
     def test_add_vlan(self):
         self.mocked_ssh_client.should_receive("do").with_args("show running-config vlan 2999 | begin vlan").and_return([])
 
@@ -477,6 +517,66 @@ class CiscoTest(unittest.TestCase):
 
         self.switch.remove_vlan(2999)
 
+    def test_add_vlans_creates_them_in_one_configuration_session(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config").once().ordered().and_return([
+            "vlan 1",
+            "!",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["configure terminal", "vlan 2999"]).once().ordered()\
+            .and_return([["Enter configuration commands, one per line.  End with CNTL/Z."], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["exit", "vlan 3000"]).once().ordered()\
+            .and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["exit", "exit"]).once().ordered()\
+            .and_return([[], []])
+
+        self.switch.add_vlans([2999, 3000])
+
+    def test_add_vlans_creates_nothing_when_one_already_exists(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config").once().ordered().and_return([
+            "vlan 1",
+            "!",
+            "vlan 3000",
+            "!",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").never()
+
+        with self.assertRaises(VlanAlreadyExist) as expect:
+            self.switch.add_vlans([2999, 3000])
+
+        assert_that(str(expect.exception), equal_to("Vlan 3000 already exists"))
+
+    def test_remove_vlans_removes_them_with_their_vlan_interfaces_in_one_configuration_session(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config").once().ordered().and_return([
+            "vlan 2999-3000",
+            "!",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure terminal",
+            "no interface vlan 2999",
+            "no vlan 2999",
+            "no interface vlan 3000",
+            "no vlan 3000",
+            "exit"
+        ]).once().ordered().and_return([["Enter configuration commands, one per line.  End with CNTL/Z."], [], [], [], [], []])
+
+        self.switch.remove_vlans([2999, 3000])
+
+    def test_remove_vlans_removes_nothing_when_one_does_not_exist(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config").once().ordered().and_return([
+            "vlan 3000",
+            "!",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.remove_vlans([2999, 3000])
+
+        assert_that(str(expect.exception), equal_to("Vlan 2999 not found"))
+
     def test_get_interface(self):
         self.mocked_ssh_client.should_receive("do").with_args("show running-config interface FastEthernet0/2 | begin interface").once().ordered().and_return([
             "interface FastEthernet0/2",
@@ -967,6 +1067,93 @@ class CiscoTest(unittest.TestCase):
 
         self.switch.remove_trunk_vlan("FastEthernet0/4", vlan=303)
 
+    def test_add_trunk_vlans_adds_them_as_ranges_in_one_command(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config").once().ordered().and_return([
+            "vlan 10-20",
+            "!",
+            "vlan 30",
+            "!",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").once().ordered().and_return([
+            "Enter configuration commands, one per line.  End with CNTL/Z."
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("interface FastEthernet0/4").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("switchport trunk allowed vlan add 10-20,30").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("exit").and_return([]).twice()
+
+        self.switch.add_trunk_vlans("FastEthernet0/4", range(10, 21) + [30])
+
+    def test_add_trunk_vlans_adds_nothing_when_a_vlan_does_not_exist(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config").once().ordered().and_return([
+            "vlan 10-20",
+            "!",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.add_trunk_vlans("FastEthernet0/4", range(10, 21) + [30])
+
+        assert_that(str(expect.exception), equal_to("Vlan 30 not found"))
+
+    def test_remove_trunk_vlans_removes_them_as_ranges_in_one_command(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface FastEthernet0/4 | begin interface").once().ordered().and_return([
+            "interface FastEthernet0/4",
+            " switchport trunk allowed vlan 300,302-304,2998-3000",
+            " switchport mode trunk",
+            "end",
+        ])
+
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").once().ordered().and_return([
+            "Enter configuration commands, one per line.  End with CNTL/Z."
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("interface FastEthernet0/4").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("switchport trunk allowed vlan remove 302-303,2999-3000").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("exit").and_return([]).twice()
+
+        self.switch.remove_trunk_vlans("FastEthernet0/4", [302, 303, 2999, 3000])
+
+    def test_remove_trunk_vlans_removes_nothing_when_a_vlan_is_not_a_member(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface FastEthernet0/4 | begin interface").once().ordered().and_return([
+            "interface FastEthernet0/4",
+            " switchport trunk allowed vlan 300,302-304",
+            " switchport mode trunk",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.remove_trunk_vlans("FastEthernet0/4", [300, 301, 302])
+
+        assert_that(str(expect.exception), equal_to("Vlan 301 not found"))
+
+    def test_remove_trunk_vlans_through_the_cache_of_an_interface_read_without_allowed_vlans(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface FastEthernet0/4 | begin interface").once().ordered().and_return([
+            "interface FastEthernet0/4",
+            " switchport mode trunk",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface FastEthernet0/4 | begin interface").once().ordered().and_return([
+            "interface FastEthernet0/4",
+            " switchport trunk allowed vlan 300,302-304",
+            " switchport mode trunk",
+            "end",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").once().ordered().and_return([
+            "Enter configuration commands, one per line.  End with CNTL/Z."
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("interface FastEthernet0/4").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("switchport trunk allowed vlan remove 302").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("exit").and_return([]).twice()
+
+        switch = CachedSwitch(self.switch)
+        assert_that(switch.get_interface("FastEthernet0/4").trunk_vlans, is_(instance_of(VlanSet)))
+
+        switch.remove_trunk_vlans("FastEthernet0/4", [302])
+
+        assert_that(switch.get_interface("FastEthernet0/4").trunk_vlans, equal_to([]))
+
     def test_add_bond_trunk_vlan(self):
         self.mocked_ssh_client.should_receive("do").with_args("show running-config vlan 2999 | begin vlan").and_return([
             "vlan 2999",
@@ -1082,6 +1269,64 @@ class CiscoTest(unittest.TestCase):
 
         self.switch.set_interface_state("FastEthernet0/4", OFF)
 
+    def test_edit_interfaces_configures_every_interface_in_one_session(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config vlan 2999 | begin vlan").and_return([
+            "vlan 2999",
+            "end"]).once().ordered()
+
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure terminal",
+            "interface FastEthernet0/4"
+        ]).once().ordered().and_return([["Enter configuration commands, one per line.  End with CNTL/Z."], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "shutdown",
+            "switchport access vlan 2999",
+            "exit",
+            "interface FastEthernet0/5"
+        ]).once().ordered().and_return([[], [], [], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "shutdown",
+            "switchport access vlan 2999",
+            "exit",
+            "exit"
+        ]).once().ordered().and_return([[], [], [], []])
+
+        self.switch.edit_interfaces(["FastEthernet0/4", "FastEthernet0/5"], state=OFF, access_vlan=2999)
+
+    def test_edit_interfaces_with_an_unknown_vlan_changes_nothing(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config vlan 2999 | begin vlan").and_return([
+        ]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.edit_interfaces(["FastEthernet0/4", "FastEthernet0/5"], access_vlan=2999)
+
+        assert_that(str(expect.exception), equal_to("Vlan 2999 not found"))
+
+    def test_edit_interfaces_with_an_invalid_interface_raises(self):
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure terminal",
+            "interface FastEthernet0/4"
+        ]).once().ordered().and_return([["Enter configuration commands, one per line.  End with CNTL/Z."], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "no shutdown",
+            "exit",
+            "interface SlowEthernet42/9999"
+        ]).once().ordered().and_return([[], [], [
+            "        ^",
+            "% Invalid input detected at '^' marker."
+        ]])
+        self.mocked_ssh_client.should_receive("do").with_args("exit").and_return([]).once().ordered()
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.switch.edit_interfaces(["FastEthernet0/4", "SlowEthernet42/9999"], state=ON)
+
+        assert_that(str(expect.exception), equal_to("Unknown interface SlowEthernet42/9999"))
+
+    def test_edit_interfaces_description_is_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            self.switch.edit_interfaces(["FastEthernet0/4"], description="servers")
+
     def test_set_ntp_state_disable(self):
         self.mocked_ssh_client.should_receive("do").with_args("show running-config interface vlan 1234").once().ordered().and_return([
             "Building configuration...",
@@ -1924,7 +2169,7 @@ class CiscoTest(unittest.TestCase):
         ssh_client_class_mock.return_value = self.mocked_ssh_client
         self.mocked_ssh_client.should_receive("get_current_prompt").and_return("hostname>").once().ordered()
         self.mocked_ssh_client.should_receive("do").with_args("enable", wait_for=": ").and_return([]).once().ordered()
-        self.mocked_ssh_client.should_receive("do").with_args("the_password").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("the_password", sensitive=True).and_return([]).once().ordered()
         self.mocked_ssh_client.should_receive("do").with_args("terminal length 0").and_return([]).once().ordered()
         self.mocked_ssh_client.should_receive("do").with_args("terminal width 0").and_return([]).once().ordered()
 
@@ -1945,7 +2190,7 @@ class CiscoTest(unittest.TestCase):
         ssh_client_class_mock.return_value = self.mocked_ssh_client
         self.mocked_ssh_client.should_receive("get_current_prompt").and_return("hostname>").once().ordered()
         self.mocked_ssh_client.should_receive("do").with_args("enable", wait_for=": ").and_return([]).once().ordered()
-        self.mocked_ssh_client.should_receive("do").with_args("the_password").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("the_password", sensitive=True).and_return([]).once().ordered()
         self.mocked_ssh_client.should_receive("do").with_args("terminal length 0").and_return([]).once().ordered()
         self.mocked_ssh_client.should_receive("do").with_args("terminal width 0").and_return([]).once().ordered()
 
@@ -2470,6 +2715,55 @@ class CiscoTest(unittest.TestCase):
 
         assert_that(str(expect.exception), equal_to("Vlan 1111 not found"))
 
+    def test_get_vlan_interfaces_reads_the_running_config_once_for_many_vlans(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config | begin interface").once().and_return([
+            "interface FastEthernet0/16",
+            " switchport access vlan 2222",
+            " switchport mode access",
+            "!",
+            "interface FastEthernet0/17",
+            " switchport trunk native vlan 2",
+            " switchport trunk allowed vlan 2222-2998",
+            " switchport mode trunk",
+            "!",
+        ])
+
+        assert_that(self.switch.get_vlan_interfaces(2222), is_(['FastEthernet0/16', 'FastEthernet0/17']))
+        assert_that(self.switch.get_vlan_interfaces(2500), is_(['FastEthernet0/17']))
+        assert_that(self.switch.get_vlan_interfaces(2), is_(['FastEthernet0/17']))
+
+    def test_get_vlan_interfaces_reuses_the_interfaces_read_by_get_interfaces(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config | begin interface").once().and_return([
+            "interface FastEthernet0/16",
+            " switchport access vlan 2222",
+            " switchport mode access",
+            "!",
+        ])
+
+        self.switch.get_interfaces()
+
+        assert_that(self.switch.get_vlan_interfaces(2222), is_(['FastEthernet0/16']))
+
+    def test_get_vlan_interfaces_reads_the_running_config_again_after_a_change(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config | begin interface").twice().and_return([
+            "interface FastEthernet0/16",
+            " switchport access vlan 2222",
+            " switchport mode access",
+            "!",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config vlan 2223 | begin vlan").and_return([
+            "vlan 2223",
+            "end"
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure terminal").and_return([])
+        self.mocked_ssh_client.should_receive("do").with_args("interface FastEthernet0/16").and_return([])
+        self.mocked_ssh_client.should_receive("do").with_args("switchport access vlan 2223").and_return([])
+        self.mocked_ssh_client.should_receive("do").with_args("exit").and_return([])
+
+        self.switch.get_vlan_interfaces(2222)
+        self.switch.set_access_vlan("FastEthernet0/16", 2223)
+        self.switch.get_vlan_interfaces(2222)
+
     def test_set_vlan_icmp_redirects_state_enable(self):
         self.mocked_ssh_client.should_receive("do").with_args("show running-config interface vlan 1234").once().ordered().and_return([
             "Building configuration...",
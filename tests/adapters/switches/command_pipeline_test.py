@@ -0,0 +1,134 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from flexmock import flexmock, flexmock_teardown
+from hamcrest import assert_that, equal_to
+
+from netman.adapters.switches.util import CommandPipeline, SubShell, no_output, ResultChecker
+from netman.core.objects.exceptions import UnknownInterface, UnknownVlan
+
+
+class CommandPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shell_mock = flexmock()
+        self.pipeline = CommandPipeline(self.shell_mock)
+
+    def tearDown(self):
+        flexmock_teardown()
+
+    def test_commands_are_sent_in_a_single_block(self):
+        self.shell_mock.should_receive("do_many").with_args([
+            "configure",
+            "vlan database",
+            "vlan 1000",
+            "exit",
+            "exit"
+        ]).once().and_return([[], [], [], [], []])
+
+        self.pipeline.enter(SubShell(self.shell_mock, enter="configure", exit_cmd="exit"))
+        self.pipeline.enter(SubShell(self.shell_mock, enter="vlan database", exit_cmd="exit"))
+        self.pipeline.do("vlan 1000")
+        self.pipeline.exit()
+        self.pipeline.exit()
+        self.pipeline.run()
+
+    def test_a_validated_sub_shell_entry_ends_a_block(self):
+        self.shell_mock.should_receive("do_many").with_args(["configure", "interface 1"]).once().ordered()\
+            .and_return([[], []])
+        self.shell_mock.should_receive("do_many").with_args(["shutdown", "exit", "exit"]).once().ordered()\
+            .and_return([[], [], []])
+
+        self.pipeline.enter(SubShell(self.shell_mock, enter="configure", exit_cmd="exit"))
+        self.pipeline.enter(SubShell(self.shell_mock, enter="interface 1", exit_cmd="exit",
+                                     validate=no_output(UnknownInterface, "1")))
+        self.pipeline.do("shutdown")
+        self.pipeline.exit()
+        self.pipeline.exit()
+        self.pipeline.run()
+
+    def test_a_failed_sub_shell_entry_leaves_the_opened_ones_and_raises(self):
+        self.shell_mock.should_receive("do_many").with_args(["configure", "interface 1"]).once().ordered()\
+            .and_return([[], ["Invalid interface"]])
+        self.shell_mock.should_receive("do").with_args("end").once().ordered().and_return([])
+
+        self.pipeline.enter(SubShell(self.shell_mock, enter="configure", exit_cmd="end"))
+        self.pipeline.enter(SubShell(self.shell_mock, enter="interface 1", exit_cmd="exit",
+                                     validate=no_output(UnknownInterface, "1")))
+        self.pipeline.do("shutdown")
+        self.pipeline.exit()
+        self.pipeline.exit()
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.pipeline.run()
+
+        assert_that(str(expect.exception), equal_to("Unknown interface 1"))
+
+    def test_a_validated_command_ends_a_block(self):
+        self.shell_mock.should_receive("do_many").with_args(["configure", "interface 1", "description hello"]).once()\
+            .ordered().and_return([[], [], []])
+        self.shell_mock.should_receive("do_many").with_args(["mtu 5000", "exit", "exit"]).once().ordered()\
+            .and_return([[], [], []])
+
+        self.pipeline.enter(SubShell(self.shell_mock, enter="configure", exit_cmd="exit"))
+        self.pipeline.enter(SubShell(self.shell_mock, enter="interface 1", exit_cmd="exit"))
+        self.pipeline.do("description hello", validate=no_output(UnknownInterface, "1"))
+        self.pipeline.do("mtu 5000")
+        self.pipeline.exit()
+        self.pipeline.exit()
+        self.pipeline.run()
+
+    def test_a_failed_command_stops_the_commands_after_it_and_is_raised_once_the_sub_shells_are_left(self):
+        self.shell_mock.should_receive("do_many").with_args(["configure", "interface 1"]).once().ordered()\
+            .and_return([[], []])
+        self.shell_mock.should_receive("do_many").with_args(["switchport access vlan 1000"]).once().ordered()\
+            .and_return([["VLAN ID not found."]])
+        self.shell_mock.should_receive("do").with_args("exit").twice().and_return([])
+
+        self.pipeline.enter(SubShell(self.shell_mock, enter="configure", exit_cmd="exit"))
+        for interface in ["1", "2"]:
+            self.pipeline.enter(SubShell(self.shell_mock, enter="interface {}".format(interface), exit_cmd="exit",
+                                         validate=no_output(UnknownInterface, interface)))
+            for vlan in [1000, 1001]:
+                self.pipeline.do("switchport access vlan {}".format(vlan), validate=vlan_not_found(vlan))
+            self.pipeline.exit()
+        self.pipeline.exit()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.pipeline.run()
+
+        assert_that(str(expect.exception), equal_to("Vlan 1000 not found"))
+
+    def test_sub_shells_entered_with_many_commands_open_on_the_first_one(self):
+        self.shell_mock.should_receive("do_many").with_args([
+            "configure",
+            "interface vlan 1000",
+            "no shutdown",
+            "ip address 1.1.1.1/24",
+            "exit",
+            "exit"
+        ]).once().and_return([[], [], [], [], [], []])
+
+        self.pipeline.enter(SubShell(self.shell_mock, enter="configure", exit_cmd="exit"))
+        self.pipeline.enter(SubShell(self.shell_mock, enter=["interface vlan 1000", "no shutdown"], exit_cmd="exit"))
+        self.pipeline.do("ip address 1.1.1.1/24")
+        self.pipeline.exit()
+        self.pipeline.exit()
+        self.pipeline.run()
+
+
+def vlan_not_found(vlan):
+    return lambda result: ResultChecker(result).on_result_matching(".*VLAN ID not found.*", UnknownVlan, vlan)
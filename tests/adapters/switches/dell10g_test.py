@@ -82,7 +82,7 @@ class Dell10GTest(unittest.TestCase):
         self.mocked_ssh_client = flexmock()
         ssh_client_class_mock.return_value = self.mocked_ssh_client
         self.mocked_ssh_client.should_receive("do").with_args("enable", wait_for=":").and_return([]).once().ordered()
-        self.mocked_ssh_client.should_receive("do").with_args("the_password").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("the_password", sensitive=True).and_return([]).once().ordered()
         self.mocked_ssh_client.should_receive("do").with_args("terminal length 0").and_return([]).once().ordered()
 
         self.switch.connect()
@@ -103,7 +103,7 @@ class Dell10GTest(unittest.TestCase):
         self.mocked_ssh_client = flexmock()
         ssh_client_class_mock.return_value = self.mocked_ssh_client
         self.mocked_ssh_client.should_receive("do").with_args("enable", wait_for=":").and_return([]).once().ordered()
-        self.mocked_ssh_client.should_receive("do").with_args("the_password").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("the_password", sensitive=True).and_return([]).once().ordered()
         self.mocked_ssh_client.should_receive("do").with_args("terminal length 0").and_return([]).once().ordered()
 
         self.switch.connect()
@@ -481,6 +481,52 @@ class Dell10GTest(unittest.TestCase):
 
         assert_that(str(expect.exception), equal_to("Vlan 1000 not found"))
 
+    def test_add_vlans_creates_them_in_one_configuration_session(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show vlan").once().ordered().and_return([
+            "VLAN   Name                             Ports          Type",
+            "-----  ---------------                  -------------  --------------",
+            "1      default                          Po1-5,Po18,   Default",
+        ])
+
+        self.mocked_ssh_client.should_receive("do_many").with_args(["configure", "vlan 1000"]).once().ordered()\
+            .and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["exit", "vlan 1001"]).once().ordered()\
+            .and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["exit", "exit"]).once().ordered()\
+            .and_return([[], []])
+
+        self.switch.add_vlans([1000, 1001])
+
+    def test_remove_vlans_removes_them_in_one_configuration_session(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show vlan").once().ordered().and_return([
+            "VLAN   Name                             Ports          Type",
+            "-----  ---------------                  -------------  --------------",
+            "1000   VLAN1000                                        Static",
+            "1001   VLAN1001                                        Static",
+        ])
+
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure",
+            "no vlan 1000"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["no vlan 1001"]).once().ordered().and_return([[]])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["exit"]).once().ordered().and_return([[]])
+
+        self.switch.remove_vlans([1000, 1001])
+
+    def test_remove_vlans_removes_nothing_when_one_does_not_exist(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show vlan").once().ordered().and_return([
+            "VLAN   Name                             Ports          Type",
+            "-----  ---------------                  -------------  --------------",
+            "1001   VLAN1001                                        Static",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.remove_vlans([1000, 1001])
+
+        assert_that(str(expect.exception), equal_to("Vlan 1000 not found"))
+
     def test_set_access_mode(self):
         with self.configuring_and_committing():
             self.mocked_ssh_client.should_receive("do").with_args("interface tengigabitethernet 1/0/10").once().ordered().and_return([])
@@ -609,6 +655,54 @@ class Dell10GTest(unittest.TestCase):
 
         assert_that(str(expect.exception), equal_to("Operation cannot be performed on a general mode interface"))
 
+    def test_edit_interfaces_configures_every_interface_in_one_session(self):
+        for interface in ["tengigabitethernet 1/0/10", "tengigabitethernet 1/0/11"]:
+            self.mocked_ssh_client.should_receive("do").with_args("show running-config interface {}".format(interface)).and_return([
+                "switchport mode access"
+            ])
+
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure",
+            "interface tengigabitethernet 1/0/10"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "shutdown",
+            "switchport access vlan 1000"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "exit",
+            "interface tengigabitethernet 1/0/11"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "shutdown",
+            "switchport access vlan 1000"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "exit",
+            "exit"
+        ]).once().ordered().and_return([[], []])
+
+        self.switch.edit_interfaces(["tengigabitethernet 1/0/10", "tengigabitethernet 1/0/11"], state=OFF, access_vlan=1000)
+
+    def test_edit_interfaces_access_vlan_on_a_trunk_changes_nothing(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface tengigabitethernet 1/0/10").and_return([
+            "switchport mode access"
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface tengigabitethernet 1/0/11").and_return([
+            "switchport mode trunk"
+        ])
+
+        self.mocked_ssh_client.should_receive("do").with_args("configure").never()
+
+        with self.assertRaises(InterfaceInWrongPortMode) as expect:
+            self.switch.edit_interfaces(["tengigabitethernet 1/0/10", "tengigabitethernet 1/0/11"], access_vlan=1000)
+
+        assert_that(str(expect.exception), equal_to("Operation cannot be performed on a trunk mode interface"))
+
+    def test_edit_interfaces_mtu_is_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            self.switch.edit_interfaces(["tengigabitethernet 1/0/10"], mtu=1520)
+
     def test_unset_interface_access_vlan(self):
         with self.configuring_and_committing():
             self.mocked_ssh_client.should_receive("do").with_args("interface tengigabitethernet 1/0/10").once().ordered().and_return([])
@@ -951,6 +1045,73 @@ class Dell10GTest(unittest.TestCase):
 
         self.switch.remove_trunk_vlan("tengigabitethernet 1/0/10", 1000)
 
+    def test_add_trunk_vlans_adds_them_as_ranges_in_one_command(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface tengigabitethernet 1/0/10").and_return([
+            "switchport mode trunk",
+            "switchport trunk allowed vlan 900"
+        ])
+
+        self.mocked_ssh_client.should_receive("do").with_args("show vlan").and_return([
+            "VLAN   Name                             Ports          Type",
+            "-----  ---------------                  -------------  --------------",
+            "1      default                                         Default",
+            "1000   VLAN1000                                        Static",
+            "1001   VLAN1001                                        Static",
+            "1005   VLAN1005                                        Static",
+        ])
+
+        with self.configuring_and_committing():
+            self.mocked_ssh_client.should_receive("do").with_args("interface tengigabitethernet 1/0/10").once().ordered().and_return([])
+            self.mocked_ssh_client.should_receive("do").with_args("switchport trunk allowed vlan add 1000-1001,1005").once().ordered().and_return([])
+            self.mocked_ssh_client.should_receive("do").with_args("exit").once().ordered().and_return([])
+
+        self.switch.add_trunk_vlans("tengigabitethernet 1/0/10", [1000, 1001, 1005])
+
+    def test_add_trunk_vlans_unknown_vlan(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface tengigabitethernet 1/0/10").and_return([
+            "switchport mode trunk",
+        ])
+
+        self.mocked_ssh_client.should_receive("do").with_args("show vlan").and_return([
+            "VLAN   Name                             Ports          Type",
+            "-----  ---------------                  -------------  --------------",
+            "1      default                                         Default",
+            "1000   VLAN1000                                        Static",
+        ])
+
+        self.mocked_ssh_client.should_receive("do").with_args("configure").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.add_trunk_vlans("tengigabitethernet 1/0/10", [1000, 1001])
+
+        assert_that(str(expect.exception), equal_to("Vlan 1001 not found"))
+
+    def test_remove_trunk_vlans_removes_them_as_ranges_in_one_command(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface tengigabitethernet 1/0/10").and_return([
+            "switchport mode trunk",
+            "switchport trunk allowed vlan 999-1001,1005",
+        ])
+
+        with self.configuring_and_committing():
+            self.mocked_ssh_client.should_receive("do").with_args("interface tengigabitethernet 1/0/10").once().ordered().and_return([])
+            self.mocked_ssh_client.should_receive("do").with_args("switchport trunk allowed vlan remove 1000-1001,1005").once().ordered().and_return([])
+            self.mocked_ssh_client.should_receive("do").with_args("exit").once().ordered().and_return([])
+
+        self.switch.remove_trunk_vlans("tengigabitethernet 1/0/10", [1000, 1001, 1005])
+
+    def test_remove_trunk_vlans_removes_nothing_when_a_vlan_is_not_set(self):
+        self.mocked_ssh_client.should_receive("do").with_args("show running-config interface tengigabitethernet 1/0/10").and_return([
+            "switchport mode trunk",
+            "switchport trunk allowed vlan 999,1001",
+        ])
+
+        self.mocked_ssh_client.should_receive("do").with_args("configure").never()
+
+        with self.assertRaises(TrunkVlanNotSet) as expect:
+            self.switch.remove_trunk_vlans("tengigabitethernet 1/0/10", [999, 1000])
+
+        assert_that(str(expect.exception), equal_to("Trunk Vlan is not set on interface tengigabitethernet 1/0/10"))
+
     def test_edit_interface_spanning_tree_enable_edge(self):
         with self.configuring_and_committing():
             self.mocked_ssh_client.should_receive("do").with_args("interface tengigabitethernet 1/0/10").once().ordered().and_return([])
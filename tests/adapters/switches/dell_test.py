@@ -84,7 +84,7 @@ class DellTest(unittest.TestCase):
         self.mocked_ssh_client = flexmock()
         ssh_client_class_mock.return_value = self.mocked_ssh_client
         self.mocked_ssh_client.should_receive("do").with_args("enable", wait_for=":").and_return([]).once().ordered()
-        self.mocked_ssh_client.should_receive("do").with_args("the_password").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("the_password", sensitive=True).and_return([]).once().ordered()
 
         self.switch.connect()
 
@@ -104,7 +104,7 @@ class DellTest(unittest.TestCase):
         self.mocked_ssh_client = flexmock()
         telnet_client_class_mock.return_value = self.mocked_ssh_client
         self.mocked_ssh_client.should_receive("do").with_args("enable", wait_for=":").and_return([]).once().ordered()
-        self.mocked_ssh_client.should_receive("do").with_args("the_password").and_return([]).once().ordered()
+        self.mocked_ssh_client.should_receive("do").with_args("the_password", sensitive=True).and_return([]).once().ordered()
 
         self.switch.connect()
 
@@ -125,7 +125,7 @@ class DellTest(unittest.TestCase):
         telnet_client_class_mock.return_value = self.mocked_ssh_client
         self.mocked_ssh_client.should_receive("do").with_args("enable", wait_for=":")\
             .and_return([]).once().ordered()
-        self.mocked_ssh_client.should_receive("do").with_args("the_password")\
+        self.mocked_ssh_client.should_receive("do").with_args("the_password", sensitive=True)\
             .and_return(['Incorrect Password!']).once().ordered()
 
         with self.assertRaises(PrivilegedAccessRefused) as expect:
@@ -526,6 +526,57 @@ class DellTest(unittest.TestCase):
 
         assert_that(str(expect.exception), equal_to("Vlan 1000 not found"))
 
+    def test_add_vlans_creates_them_in_one_vlan_database_session(self):
+        flexmock(self.switch.page_reader).should_receive("do").with_args(self.mocked_ssh_client, "show vlan").once().ordered().and_return([
+            "VLAN       Name                         Ports          Type      Authorization",
+            "-----  ---------------                  -------------  -----     -------------",
+            "1      Default                          ch2-3,ch5-6,   Default   Required",
+        ])
+
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure",
+            "vlan database",
+            "vlan 1000",
+            "vlan 1001",
+            "exit",
+            "exit"
+        ]).once().ordered().and_return([[], [], [], [], [], []])
+
+        self.switch.add_vlans([1000, 1001])
+
+    def test_add_vlans_creates_nothing_when_one_already_exists(self):
+        flexmock(self.switch.page_reader).should_receive("do").with_args(self.mocked_ssh_client, "show vlan").once().ordered().and_return([
+            "VLAN       Name                         Ports          Type      Authorization",
+            "-----  ---------------                  -------------  -----     -------------",
+            "1      Default                          ch2-3,ch5-6,   Default   Required",
+            "1001                                                   Static    Required",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure").never()
+
+        with self.assertRaises(VlanAlreadyExist) as expect:
+            self.switch.add_vlans([1000, 1001])
+
+        assert_that(str(expect.exception), equal_to("Vlan 1001 already exists"))
+
+    def test_remove_vlans_removes_them_in_one_vlan_database_session(self):
+        flexmock(self.switch.page_reader).should_receive("do").with_args(self.mocked_ssh_client, "show vlan").once().ordered().and_return([
+            "VLAN       Name                         Ports          Type      Authorization",
+            "-----  ---------------                  -------------  -----     -------------",
+            "1000                                                   Static    Required",
+            "1001                                                   Static    Required",
+        ])
+
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure",
+            "vlan database",
+            "no vlan 1000"
+        ]).once().ordered().and_return([[], [], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["no vlan 1001"]).once().ordered().and_return([[]])
+        self.mocked_ssh_client.should_receive("do_many").with_args(["exit", "exit"]).once().ordered() \
+            .and_return([[], []])
+
+        self.switch.remove_vlans([1000, 1001])
+
     def test_reset_interface(self):
         with self.configuring_and_committing():
             self.mocked_ssh_client.should_receive("do").with_args("interface ethernet 1/g10").once().ordered().and_return([])
@@ -718,6 +769,75 @@ class DellTest(unittest.TestCase):
 
         assert_that(str(expect.exception), equal_to("Vlan 1000 not found"))
 
+    def test_edit_interfaces_configures_every_interface_in_one_session(self):
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure",
+            "interface ethernet 1/g10"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "description \"servers\""
+        ]).once().ordered().and_return([[]])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "no shutdown",
+            "mtu 1520"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "switchport access vlan 1000"
+        ]).once().ordered().and_return([[]])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "exit",
+            "interface ethernet 1/g11"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "description \"servers\""
+        ]).once().ordered().and_return([[]])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "no shutdown",
+            "mtu 1520"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "switchport access vlan 1000"
+        ]).once().ordered().and_return([[]])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "exit",
+            "exit"
+        ]).once().ordered().and_return([[], []])
+
+        self.switch.edit_interfaces(["ethernet 1/g10", "ethernet 1/g11"], description="servers", state=ON, mtu=1520,
+                                    access_vlan=1000)
+
+    def test_edit_interfaces_invalid_vlan(self):
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure",
+            "interface ethernet 1/g10"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "switchport access vlan 1000"
+        ]).once().ordered().and_return([["VLAN ID not found."]])
+        self.mocked_ssh_client.should_receive("do").with_args("exit").twice().and_return([])
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.edit_interfaces(["ethernet 1/g10", "ethernet 1/g11"], access_vlan=1000)
+
+        assert_that(str(expect.exception), equal_to("Vlan 1000 not found"))
+
+    def test_edit_interfaces_invalid_interface(self):
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "configure",
+            "interface ethernet 1/g10"
+        ]).once().ordered().and_return([[], []])
+        self.mocked_ssh_client.should_receive("do_many").with_args([
+            "shutdown",
+            "exit",
+            "interface ethernet 1/g99"
+        ]).once().ordered().and_return([[], [], ["An invalid interface has been used for this function."]])
+        self.mocked_ssh_client.should_receive("do").with_args("exit").once().ordered().and_return([])
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.switch.edit_interfaces(["ethernet 1/g10", "ethernet 1/g99"], state=OFF)
+
+        assert_that(str(expect.exception), equal_to("Unknown interface ethernet 1/g99"))
+
     def test_set_access_vlan_invalid_mode(self):
         with self.configuring():
             self.mocked_ssh_client.should_receive("do").with_args("interface ethernet 1/g10").once().ordered().and_return([])
@@ -1204,6 +1324,74 @@ class DellTest(unittest.TestCase):
 
         self.switch.remove_trunk_vlan("ethernet 1/g10", 1000)
 
+    def test_add_trunk_vlans_adds_them_as_ranges_in_one_command(self):
+        flexmock(self.switch.page_reader).should_receive("do").with_args(self.mocked_ssh_client, "show running-config interface ethernet 1/g10").and_return([
+            "switchport mode trunk",
+        ])
+
+        with self.configuring_and_committing():
+            self.mocked_ssh_client.should_receive("do").with_args("interface ethernet 1/g10").once().ordered().and_return([])
+            self.mocked_ssh_client.should_receive("do").with_args("switchport trunk allowed vlan add 1000-1002,1005").once().ordered().and_return([
+                "Warning: The use of large numbers of VLANs or interfaces may cause significant",
+                "delays in applying the configuration."
+            ])
+            self.mocked_ssh_client.should_receive("do").with_args("exit").once().ordered().and_return([])
+
+        self.switch.add_trunk_vlans("ethernet 1/g10", [1000, 1001, 1002, 1005])
+
+    def test_add_trunk_vlans_unknown_vlan(self):
+        flexmock(self.switch.page_reader).should_receive("do").with_args(self.mocked_ssh_client, "show running-config interface ethernet 1/g10").and_return([
+            "switchport mode trunk",
+        ])
+
+        with self.configuring():
+            self.mocked_ssh_client.should_receive("do").with_args("interface ethernet 1/g10").once().ordered().and_return([])
+            self.mocked_ssh_client.should_receive("do").with_args("switchport trunk allowed vlan add 1000-1002").once().ordered().and_return([
+                "Warning: The use of large numbers of VLANs or interfaces may cause significant",
+                "delays in applying the configuration.",
+                "          Failure Information",
+                "---------------------------------------",
+                "   VLANs failed to be configured : 1",
+                "---------------------------------------",
+                "   VLAN             Error",
+                "---------------------------------------",
+                "VLAN      1001 ERROR: This VLAN does not exist.",
+            ])
+            self.mocked_ssh_client.should_receive("do").with_args("exit").once().ordered().and_return([])
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.add_trunk_vlans("ethernet 1/g10", [1000, 1001, 1002])
+
+        assert_that(str(expect.exception), equal_to("Vlan 1001 not found"))
+
+    def test_remove_trunk_vlans_removes_them_as_ranges_in_one_command(self):
+        flexmock(self.switch.page_reader).should_receive("do").with_args(self.mocked_ssh_client, "show running-config interface ethernet 1/g10").and_return([
+            "switchport mode general",
+            "switchport general allowed vlan add 999-1001,1005",
+        ])
+
+        with self.configuring_and_committing():
+            self.mocked_ssh_client.should_receive("do").with_args("interface ethernet 1/g10").once().ordered().and_return([])
+            self.mocked_ssh_client.should_receive("do").with_args("switchport general allowed vlan remove 1000-1001,1005").once().ordered().and_return([
+                "Warning: The use of large numbers of VLANs or interfaces may cause significant",
+                "delays in applying the configuration."
+            ])
+            self.mocked_ssh_client.should_receive("do").with_args("exit").once().ordered().and_return([])
+
+        self.switch.remove_trunk_vlans("ethernet 1/g10", [1000, 1001, 1005])
+
+    def test_remove_trunk_vlans_removes_nothing_when_a_vlan_is_not_set(self):
+        flexmock(self.switch.page_reader).should_receive("do").with_args(self.mocked_ssh_client, "show running-config interface ethernet 1/g10").and_return([
+            "switchport mode trunk",
+            "switchport trunk allowed vlan add 999,1001",
+        ])
+        self.mocked_ssh_client.should_receive("do").with_args("configure").never()
+
+        with self.assertRaises(TrunkVlanNotSet) as expect:
+            self.switch.remove_trunk_vlans("ethernet 1/g10", [999, 1000, 1001])
+
+        assert_that(str(expect.exception), equal_to("Trunk Vlan is not set on interface ethernet 1/g10"))
+
     def test_add_bond_trunk_vlan(self):
         flexmock(self.switch.page_reader).should_receive("do").with_args(self.mocked_ssh_client, "show running-config interface port-channel 10").and_return([
             "switchport mode trunk",
@@ -1579,6 +1767,19 @@ class DellTest(unittest.TestCase):
 
         self.switch.commit_transaction()
 
+    def test_commit_without_write_memory_leaves_the_startup_config_alone(self):
+        self.switch.write_memory = False
+        self.mocked_ssh_client.should_receive("do").never()
+        self.mocked_ssh_client.should_receive("send_key").never()
+
+        self.switch.commit_transaction()
+
+    def test_save_configuration(self):
+        self.mocked_ssh_client.should_receive("do").with_args("copy running-config startup-config", wait_for="? (y/n) ").once().ordered().and_return([])
+        self.mocked_ssh_client.should_receive("send_key").with_args("y").once().ordered().and_return([])
+
+        self.switch.save_configuration()
+
     @contextmanager
     def configuring_and_committing(self):
         self.mocked_ssh_client.should_receive("do").with_args("configure").once().ordered().and_return([])
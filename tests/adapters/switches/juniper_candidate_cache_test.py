@@ -0,0 +1,142 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from hamcrest import assert_that, equal_to, is_not, empty
+
+from netman.adapters.switches.juniper.base import interface_inventory
+from netman.core.objects.port_modes import TRUNK
+from netman.core.switch_factory import get_factory
+from tests.adapters.model_list import available_models
+
+VLAN = 2999
+OTHER_VLAN = 2998
+
+
+class JuniperCandidateCacheTest(unittest.TestCase):
+    """
+    Every edit is applied to the candidate cache by emulating the NETCONF merge and delete of the switch,
+    each custom strategy building its own edits: reads answered by the cache must match the switch's.
+    """
+    __test__ = False
+    model = None
+
+    def setUp(self):
+        specs = next(s for s in available_models if s["switch_descriptor"].model == self.model)
+        self.port = specs["test_port_name"]
+        interface_inventory.clear()
+
+        self.switch = get_factory(self.model)(specs["switch_descriptor"])
+        self.switch.connect()
+        self.switch.start_transaction()
+
+    def tearDown(self):
+        try:
+            self.switch.rollback_transaction()
+            self.switch.end_transaction()
+        finally:
+            self.switch.disconnect()
+
+    def test_vlan_edits(self):
+        self._read_and_cache()
+
+        self._edit_and_compare("add_vlan", VLAN, "cached")
+        self._edit_and_compare("add_vlan", OTHER_VLAN)
+        self._edit_and_compare("remove_vlan", OTHER_VLAN)
+
+    def test_access_interface_edits(self):
+        self.switch.add_vlan(VLAN)
+        self._read_and_cache()
+
+        self._edit_and_compare("set_access_mode", self.port)
+        self._edit_and_compare("set_access_vlan", self.port, VLAN)
+        self._edit_and_compare("unset_interface_access_vlan", self.port)
+        self._edit_and_compare("set_interface_description", self.port, "cached")
+        self._edit_and_compare("unset_interface_description", self.port)
+        self._edit_and_compare("set_interface_mtu", self.port, 5000)
+        self._edit_and_compare("unset_interface_mtu", self.port)
+
+    def test_trunk_interface_edits(self):
+        self.switch.add_vlan(VLAN)
+        self.switch.add_vlan(OTHER_VLAN)
+        self._read_and_cache()
+
+        self._edit_and_compare("set_trunk_mode", self.port)
+        self._edit_and_compare("add_trunk_vlan", self.port, VLAN)
+        self._edit_and_compare("set_interface_native_vlan", self.port, OTHER_VLAN)
+        self._edit_and_compare("unset_interface_native_vlan", self.port)
+        self._edit_and_compare("add_trunk_vlan", self.port, OTHER_VLAN)
+        self._edit_and_compare("remove_trunk_vlan", self.port, OTHER_VLAN)
+
+        interface = self.switch.get_interface(self.port)
+        assert_that(interface.port_mode, equal_to(TRUNK))
+        assert_that(list(interface.trunk_vlans), equal_to([VLAN]))
+
+    def test_edits_of_an_interface_read_alone(self):
+        self.switch.add_vlan(VLAN)
+        self.switch.get_interface(self.port)
+        assert_that(self.switch.candidate_cache.entries, is_not(empty()))
+
+        self._edit_and_compare_interface("set_access_vlan", self.port, VLAN)
+        self._edit_and_compare_interface("set_interface_description", self.port, "cached")
+        self._edit_and_compare_interface("unset_interface_access_vlan", self.port)
+        self._edit_and_compare_interface("set_trunk_mode", self.port)
+        self._edit_and_compare_interface("add_trunk_vlan", self.port, VLAN)
+        self._edit_and_compare_interface("unset_interface_description", self.port)
+
+    def _read_and_cache(self):
+        self.switch.get_vlans()
+        self.switch.get_interfaces()
+        assert_that(self.switch.candidate_cache.sections, is_not(empty()))
+
+    def _edit_and_compare(self, operation, *args):
+        try:
+            getattr(self.switch, operation)(*args)
+        except NotImplementedError:
+            return
+
+        cached_vlans, cached_interfaces = self.switch.get_vlans(), self.switch.get_interfaces()
+        self.switch.candidate_cache.clear()
+        vlans, interfaces = self.switch.get_vlans(), self.switch.get_interfaces()
+
+        assert_that(cached_vlans, equal_to(vlans), "vlans after {}".format(operation))
+        assert_that(cached_interfaces, equal_to(interfaces), "interfaces after {}".format(operation))
+
+    def _edit_and_compare_interface(self, operation, interface_id, *args):
+        try:
+            getattr(self.switch, operation)(interface_id, *args)
+        except NotImplementedError:
+            return
+
+        cached = self.switch.get_interface(interface_id)
+        self.switch.candidate_cache.clear()
+        interface = self.switch.get_interface(interface_id)
+
+        assert_that(cached, equal_to(interface), "interface after {}".format(operation))
+
+
+class JuniperStandardCandidateCacheTest(JuniperCandidateCacheTest):
+    __test__ = True
+    model = "juniper"
+
+
+class JuniperQfxCopperCandidateCacheTest(JuniperCandidateCacheTest):
+    __test__ = True
+    model = "juniper_qfx_copper"
+
+
+class JuniperMxCandidateCacheTest(JuniperCandidateCacheTest):
+    __test__ = True
+    model = "juniper_mx"
@@ -0,0 +1,161 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from flexmock import flexmock, flexmock_teardown
+from hamcrest import assert_that, equal_to, has_length, less_than, less_than_or_equal_to, \
+    greater_than
+from lxml import etree
+from ncclient.xml_ import to_ele, to_xml
+
+from netman.adapters.switches import juniper
+from netman.adapters.switches.juniper.base import interface_inventory, one_interface
+from netman.adapters.switches.juniper.candidate_cache import CandidateCache
+from netman.core.objects.switch_descriptor import SwitchDescriptor
+from tests.adapters.switches.juniper_test import an_ok_response, a_configuration
+
+VLANS = 1000
+INTERFACES = 200
+
+
+class JuniperFilterSizeTest(unittest.TestCase):
+
+    def setUp(self):
+        interface_inventory.clear()
+        self.switch = juniper.standard.netconf(SwitchDescriptor(model='juniper', hostname="toto"))
+
+        self.device = SubtreeFilteringDevice(a_large_configuration())
+        self.netconf_mock = flexmock()
+        self.netconf_mock.should_receive("get_config").replace_with(self.device.get_config)
+        self.switch.netconf = self.netconf_mock
+        self.switch.in_transaction = False
+
+    def tearDown(self):
+        flexmock_teardown()
+
+    def test_the_configuration_is_large(self):
+        self.switch.get_vlans()
+
+        assert_that(self.device.largest_response(), greater_than(250000))
+
+    def test_get_vlan_reads_the_vlan_and_its_interface_unit(self):
+        vlan = self.switch.get_vlan(500)
+
+        assert_that(vlan.name, equal_to("vlan 500"))
+        assert_that(vlan.ips, has_length(1))
+        assert_that(self.device.requests, has_length(2))
+        assert_that(self.device.largest_filter(), less_than(500))
+        assert_that(self.device.largest_response(), less_than(1000))
+
+    def test_add_vlan_reads_only_the_vlan(self):
+        self.netconf_mock.should_receive("edit_config").once().and_return(an_ok_response())
+
+        self.switch.add_vlan(3000)
+
+        assert_that(self.device.requests, has_length(1))
+        assert_that(self.device.largest_response(), less_than(500))
+
+    def test_interface_edits_read_only_the_interface_besides_the_vlans(self):
+        self.netconf_mock.should_receive("edit_config").and_return(an_ok_response())
+
+        self.switch.set_interface_native_vlan("ge-0/0/10", 500)
+        self.switch.add_trunk_vlan("ge-0/0/11", 500)
+        self.switch.remove_trunk_vlan("ge-0/0/12", 10)
+        self.switch.set_access_mode("ge-0/0/13")
+
+        assert_that(self.device.largest_response(), less_than_or_equal_to(
+            self.device.response_size(one_interface("ge-0/0/10")(), self.switch.custom_strategies.all_vlans())))
+
+
+class SubtreeFilteringDevice(object):
+    """
+    Answers get-config the way a switch would, applying the subtree filter on a configuration and
+    remembering how large every filter and response was.
+    """
+
+    def __init__(self, configuration):
+        self.cache = CandidateCache()
+        self.cache.sections = {section.tag: section for section in configuration}
+        self.requests = []
+
+    def get_config(self, source, filter):
+        response = self._respond(list(list(filter)[0]))
+        self.requests.append((len(to_xml(filter)), len(response.data_xml)))
+        return response
+
+    def response_size(self, *filters):
+        return len(self._respond(filters).data_xml)
+
+    def largest_filter(self):
+        return max(size for size, _ in self.requests)
+
+    def largest_response(self):
+        return max(size for _, size in self.requests)
+
+    def _respond(self, filters):
+        configuration = self.cache.get(filters).find("data/configuration")
+        return a_configuration("".join(etree.tostring(section) for section in configuration))
+
+
+def a_large_configuration():
+    return to_ele("""
+        <configuration>
+          <vlans>{vlans}</vlans>
+          <interfaces>{interfaces}<interface><name>vlan</name>{units}</interface></interfaces>
+        </configuration>
+    """.format(vlans="".join(a_vlan(i) for i in range(1, VLANS + 1)),
+               interfaces="".join(a_trunk_interface(i) for i in range(INTERFACES)),
+               units="".join(a_vlan_unit(i) for i in range(1, VLANS + 1))))
+
+
+def a_vlan(number):
+    return """
+        <vlan>
+          <name>VLAN{0}</name>
+          <vlan-id>{0}</vlan-id>
+          <description>vlan {0}</description>
+          <l3-interface>vlan.{0}</l3-interface>
+        </vlan>""".format(number)
+
+
+def a_trunk_interface(number):
+    return """
+        <interface>
+          <name>ge-0/0/{0}</name>
+          <description>interface {0}</description>
+          <unit>
+            <name>0</name>
+            <family>
+              <ethernet-switching>
+                <port-mode>trunk</port-mode>
+                <vlan>{1}</vlan>
+              </ethernet-switching>
+            </family>
+          </unit>
+        </interface>""".format(number, "".join("<members>{}</members>".format(v) for v in range(1, 50)))
+
+
+def a_vlan_unit(number):
+    return """
+        <unit>
+          <name>{0}</name>
+          <family>
+            <inet>
+              <address>
+                <name>10.{1}.{2}.1/24</name>
+              </address>
+            </inet>
+          </family>
+        </unit>""".format(number, number // 256, number % 256)
@@ -39,15 +39,15 @@ class JuniperIssue125Test(unittest.TestCase):
     def test_juniper_does_not_break_with_after_reading_a_4096_chunk(self):
         self._setup_vlan_list_to_be_the_exact_problematic_size(4097)
 
-        self.switch.query(self.switch.custom_strategies.all_vlans)
+        self._query_switch()
         with Timeout(seconds=1, error_message="ssh reading is stuck"):
-            self.switch.query(self.switch.custom_strategies.all_vlans)
+            self._query_switch()
 
     def _setup_vlan_list_to_be_the_exact_problematic_size(self, problematic_size):
         self.switch.add_vlan(1000, name="a")
-        result_with_one_vlan = self.switch.query(self.switch.custom_strategies.all_vlans).data_xml
+        result_with_one_vlan = self._query_switch().data_xml
         self.switch.add_vlan(1001, name="a")
-        result_with_two_vlan = self.switch.query(self.switch.custom_strategies.all_vlans).data_xml
+        result_with_two_vlan = self._query_switch().data_xml
 
         vlan_with_no_name_size = len(result_with_two_vlan) - len(result_with_one_vlan) - 1
 
@@ -65,6 +65,10 @@ class JuniperIssue125Test(unittest.TestCase):
 
         self.switch.add_vlan(1002, name="x" * (target_xml_size - remaining_size_to_add - vlan_with_no_name_size))
 
+    def _query_switch(self):
+        self.switch.candidate_cache.clear()
+        return self.switch.query(self.switch.custom_strategies.all_vlans)
+
 
 class Timeout:
     def __init__(self, seconds=1, error_message='Timeout'):
@@ -19,7 +19,7 @@ from hamcrest import assert_that, equal_to, instance_of, contains_string, has_le
 from ncclient.operations import RPCError
 from ncclient.xml_ import to_ele
 from netaddr import IPAddress, IPNetwork
-from netman.adapters.switches.juniper.base import Juniper
+from netman.adapters.switches.juniper.base import Juniper, interface_inventory
 from netman.adapters.switches.juniper.mx import netconf
 from netman.core.objects.access_groups import IN, OUT
 from netman.core.objects.exceptions import VlanAlreadyExist, BadVlanNumber, BadVlanName, UnknownVlan, \
@@ -46,6 +46,7 @@ def test_factory():
 
 class JuniperMXTest(unittest.TestCase):
     def setUp(self):
+        interface_inventory.clear()
         self.switch = netconf(SwitchDescriptor(model='juniper_mx', hostname="toto"))
 
         self.netconf_mock = flexmock()
@@ -59,7 +60,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <bridge-domains />
+                <bridge-domains>
+                  <domain>
+                    <vlan-id>1000</vlan-id>
+                  </domain>
+                </bridge-domains>
               </configuration>
             </filter>
         """)).and_return(a_configuration("""
@@ -91,7 +96,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <bridge-domains />
+                <bridge-domains>
+                  <domain>
+                    <vlan-id>1000</vlan-id>
+                  </domain>
+                </bridge-domains>
               </configuration>
             </filter>
         """)).and_return(a_configuration("""
@@ -114,7 +123,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <bridge-domains />
+                <bridge-domains>
+                  <domain>
+                    <vlan-id>1000</vlan-id>
+                  </domain>
+                </bridge-domains>
               </configuration>
             </filter>
         """)).and_return(a_configuration("""
@@ -137,7 +150,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>9000</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration(""))
@@ -172,7 +189,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>1000</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration(""))
@@ -213,7 +234,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>1000</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration(""))
@@ -253,7 +278,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>1000</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration(""))
@@ -705,8 +734,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
-                    <interfaces />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>40</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -727,33 +759,25 @@ class JuniperMXTest(unittest.TestCase):
                     <routing-interface>irb.40</routing-interface>
                   </domain>
                 </bridge-domains>
+            """))
+
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <interfaces>
+                      <interface>
+                        <name>irb</name>
+                        <unit>
+                          <name>70</name>
+                        </unit>
+                      </interface>
+                    </interfaces>
+                  </configuration>
+                </filter>
+            """)).and_return(a_configuration("""
                 <interfaces>
-                  <interface>
-                    <name>xe-0/0/1</name>
-                  </interface>
                   <interface>
                     <name>irb</name>
-                    <unit>
-                      <name>20</name>
-                      <family>
-                        <inet>
-                          <address>
-                            <name>1.1.1.1/24</name>
-                          </address>
-                          <filter>
-                            <input>
-                              <filter-name>AC-IN</filter-name>
-                            </input>
-                            <output>
-                              <filter-name>AC-OUT</filter-name>
-                            </output>
-                          </filter>
-                        </inet>
-                      </family>
-                    </unit>
-                    <unit>
-                      <name>40</name>
-                    </unit>
                     <unit>
                       <name>70</name>
                       <family>
@@ -794,8 +818,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
-                    <interfaces />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>10</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -822,8 +849,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
-                    <interfaces />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>10</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -845,8 +875,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
-                    <interfaces />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>20</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -857,27 +890,30 @@ class JuniperMXTest(unittest.TestCase):
                     <routing-interface>irb.20</routing-interface>
                   </domain>
                 </bridge-domains>
+            """))
+
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <interfaces>
+                      <interface>
+                        <name>irb</name>
+                        <unit>
+                          <name>20</name>
+                        </unit>
+                      </interface>
+                    </interfaces>
+                  </configuration>
+                </filter>
+            """)).and_return(a_configuration("""
                 <interfaces>
-              <interface>
-                <name>xe-0/0/1</name>
-                <unit>
-                  <name>0</name>
-                  <family>
-                    <bridge>
-                    </bridge>
-                  </family>
-                </unit>
-              </interface>
-                  <interface>
-                    <name>xe-0/0/1</name>
-                  </interface>
                   <interface>
                     <name>irb</name>
                     <unit>
                       <name>20</name>
                       <family>
                         <inet>
-                          <no-redirects />
+                          <no-redirects/>
                           <address>
                             <name>1.1.1.1/24</name>
                           </address>
@@ -892,25 +928,6 @@ class JuniperMXTest(unittest.TestCase):
                         </inet>
                       </family>
                     </unit>
-                    <unit>
-                      <name>40</name>
-                    </unit>
-                    <unit>
-                      <name>70</name>
-                      <family>
-                        <inet>
-                          <address>
-                            <name>2.1.1.1/24</name>
-                          </address>
-                          <address>
-                            <name>4.1.1.1/24</name>
-                          </address>
-                          <address>
-                            <name>3.1.1.1/24</name>
-                          </address>
-                        </inet>
-                      </family>
-                    </unit>
                   </interface>
                 </interfaces>
             """))
@@ -932,8 +949,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
-                    <interfaces />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>20</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -944,38 +964,54 @@ class JuniperMXTest(unittest.TestCase):
                     <routing-interface>irb.20</routing-interface>
                   </domain>
                 </bridge-domains>
+            """))
+
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <interfaces>
+                      <interface>
+                        <name>irb</name>
+                        <unit>
+                          <name>20</name>
+                        </unit>
+                      </interface>
+                    </interfaces>
+                  </configuration>
+                </filter>
+            """)).and_return(a_configuration("""
                 <interfaces>
-                <interface>
-                  <name>irb</name>
-                  <unit>
-                    <name>20</name>
-                    <family>
-                      <inet>
-                        <address>
-                          <name>1.1.1.2/24</name>
-                          <vrrp-group>
-                            <name>1</name>
-                            <virtual-address>1.1.1.1</virtual-address>
-                            <priority>90</priority>
-                            <preempt>
-                              <hold-time>60</hold-time>
-                            </preempt>
-                            <accept-data/>
-                            <authentication-type>simple</authentication-type>
-                            <authentication-key>$9$1/aElvwsgoaGz3reKvLX.Pf5n/</authentication-key>
-                            <track>
-                              <route>
-                                <route_address>0.0.0.0/0</route_address>
-                                <routing-instance>default</routing-instance>
-                                <priority-cost>50</priority-cost>
-                              </route>
-                            </track>
-                        </vrrp-group>
-                        </address>
-                      </inet>
-                    </family>
-                  </unit>
-                </interface>
+                  <interface>
+                    <name>irb</name>
+                    <unit>
+                      <name>20</name>
+                      <family>
+                        <inet>
+                          <address>
+                            <name>1.1.1.2/24</name>
+                            <vrrp-group>
+                              <name>1</name>
+                              <virtual-address>1.1.1.1</virtual-address>
+                              <priority>90</priority>
+                              <preempt>
+                                <hold-time>60</hold-time>
+                              </preempt>
+                              <accept-data/>
+                              <authentication-type>simple</authentication-type>
+                              <authentication-key>$9$1/aElvwsgoaGz3reKvLX.Pf5n/</authentication-key>
+                              <track>
+                                <route>
+                                  <route_address>0.0.0.0/0</route_address>
+                                  <routing-instance>default</routing-instance>
+                                  <priority-cost>50</priority-cost>
+                                </route>
+                              </track>
+                            </vrrp-group>
+                          </address>
+                        </inet>
+                      </family>
+                    </unit>
+                  </interface>
                 </interfaces>
             """))
 
@@ -996,8 +1032,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <bridge-domains />
-                    <interfaces />
+                    <bridge-domains>
+                      <domain>
+                        <vlan-id>20</vlan-id>
+                      </domain>
+                    </bridge-domains>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -1008,25 +1047,41 @@ class JuniperMXTest(unittest.TestCase):
                     <routing-interface>irb.20</routing-interface>
                   </domain>
                 </bridge-domains>
+            """))
+
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <interfaces>
+                      <interface>
+                        <name>irb</name>
+                        <unit>
+                          <name>20</name>
+                        </unit>
+                      </interface>
+                    </interfaces>
+                  </configuration>
+                </filter>
+            """)).and_return(a_configuration("""
                 <interfaces>
-                <interface>
-                  <name>irb</name>
-                  <unit>
-                    <name>20</name>
-                    <family>
-                      <inet>
-                        <address>
-                          <name>1.1.1.2/24</name>
-                          <vrrp-group>
-                            <name>1</name>
-                            <virtual-address>1.1.1.1</virtual-address>
-                            <virtual-address>1.1.1.3</virtual-address>
-                          </vrrp-group>
-                        </address>
-                      </inet>
-                    </family>
-                  </unit>
-                </interface>
+                  <interface>
+                    <name>irb</name>
+                    <unit>
+                      <name>20</name>
+                      <family>
+                        <inet>
+                          <address>
+                            <name>1.1.1.2/24</name>
+                            <vrrp-group>
+                              <name>1</name>
+                              <virtual-address>1.1.1.1</virtual-address>
+                              <virtual-address>1.1.1.3</virtual-address>
+                            </vrrp-group>
+                          </address>
+                        </inet>
+                      </family>
+                    </unit>
+                  </interface>
                 </interfaces>
             """))
 
@@ -1922,7 +1977,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -1968,7 +2027,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2015,7 +2078,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2067,7 +2134,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2102,7 +2173,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2154,7 +2229,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2211,7 +2290,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2248,7 +2331,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2285,7 +2372,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2325,7 +2416,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2527,7 +2622,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2581,7 +2680,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2633,7 +2736,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2671,7 +2778,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -2702,7 +2813,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -3128,7 +3243,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -3195,7 +3314,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -3251,7 +3374,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -3290,7 +3417,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -3328,7 +3459,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -3365,7 +3500,11 @@ class JuniperMXTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>xe-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <bridge-domains/>
               </configuration>
             </filter>
@@ -19,7 +19,7 @@ from flexmock import flexmock, flexmock_teardown
 from hamcrest import assert_that, equal_to, is_, instance_of
 
 from netman.adapters.switches import juniper
-from netman.adapters.switches.juniper.base import Juniper
+from netman.adapters.switches.juniper.base import Juniper, interface_inventory
 from netman.core.objects.exceptions import UnknownInterface
 from netman.core.objects.port_modes import ACCESS, TRUNK, BOND_MEMBER
 from netman.core.objects.switch_descriptor import SwitchDescriptor
@@ -48,6 +48,7 @@ def test_factory():
 class JuniperTest(unittest.TestCase):
 
     def setUp(self):
+        interface_inventory.clear()
         self.switch = juniper.qfx_copper.netconf(SwitchDescriptor(model='juniper', hostname="toto"))
 
         self.netconf_mock = flexmock()
@@ -464,7 +465,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -510,11 +515,20 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ae10</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
                 <protocols>
                   <rstp>
-                    <interface />
+                    <interface>
+                      <name>ge-0/0/1</name>
+                    </interface>
                   </rstp>
                 </protocols>
               </configuration>
@@ -554,11 +568,20 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ae10</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
                 <protocols>
                   <rstp>
-                    <interface />
+                    <interface>
+                      <name>ge-0/0/1</name>
+                    </interface>
                   </rstp>
                 </protocols>
               </configuration>
@@ -24,9 +24,10 @@ from hamcrest import assert_that, has_length, equal_to, contains_string, has_key
 from ncclient.devices.junos import JunosDeviceHandler
 from ncclient.operations import RPCError, TimeoutExpiredError
 from ncclient.xml_ import NCElement, to_ele, to_xml
+from netaddr import IPNetwork
 
 from netman.adapters.switches import juniper
-from netman.adapters.switches.juniper.base import Juniper
+from netman.adapters.switches.juniper.base import Juniper, interface_inventory
 from netman.adapters.switches.juniper.standard import JuniperCustomStrategies
 from netman.core.objects.access_groups import OUT, IN
 from netman.core.objects.exceptions import LockedSwitch, VlanAlreadyExist, BadVlanNumber, BadVlanName, UnknownVlan, \
@@ -58,6 +59,7 @@ def test_factory():
 class JuniperTest(unittest.TestCase):
 
     def setUp(self):
+        interface_inventory.clear()
         self.switch = juniper.standard.netconf(SwitchDescriptor(model='juniper', hostname="toto"))
 
         self.netconf_mock = flexmock()
@@ -276,11 +278,7 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                     <filter>
                       <configuration>
-                        <vlans>
-                          <vlan>
-                            <vlan-id>705</vlan-id>
-                          </vlan>
-                        </vlans>
+                        <vlans />
                         <interfaces />
                       </configuration>
                     </filter>
@@ -354,11 +352,7 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                         <filter>
                           <configuration>
-                            <vlans>
-                              <vlan>
-                                <vlan-id>705</vlan-id>
-                              </vlan>
-                            </vlans>
+                            <vlans />
                             <interfaces />
                           </configuration>
                         </filter>
@@ -394,11 +388,7 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                     <filter>
                       <configuration>
-                        <vlans>
-                          <vlan>
-                            <vlan-id>9999999</vlan-id>
-                          </vlan>
-                        </vlans>
+                        <vlans />
                         <interfaces />
                       </configuration>
                     </filter>
@@ -422,13 +412,111 @@ class JuniperTest(unittest.TestCase):
         with self.assertRaises(UnknownVlan):
             self.switch.get_vlan_interfaces("9999999")
 
+    def test_get_vlan_interfaces_reads_the_configuration_once_for_many_vlans(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                    <filter>
+                      <configuration>
+                        <vlans />
+                        <interfaces />
+                      </configuration>
+                    </filter>
+                """)).once().and_return(a_configuration("""
+                    <vlans>
+                      <vlan>
+                        <name>bleu</name>
+                        <vlan-id>705</vlan-id>
+                      </vlan>
+                      <vlan>
+                        <name>VLAN706</name>
+                        <vlan-id>706</vlan-id>
+                      </vlan>
+                      <vlan>
+                        <name>VLAN800</name>
+                        <vlan-id>800</vlan-id>
+                      </vlan>
+                    </vlans>
+                    <interfaces>
+                        <interface>
+                          <name>xe-0/0/6</name>
+                          <unit>
+                            <family>
+                              <ethernet-switching>
+                                <native-vlan-id>800</native-vlan-id>
+                                <vlan>
+                                  <members>bleu</members>
+                                  <members>706</members>
+                                </vlan>
+                              </ethernet-switching>
+                            </family>
+                          </unit>
+                        </interface>
+                        <interface>
+                          <name>xe-0/0/7</name>
+                          <unit>
+                            <family>
+                              <ethernet-switching>
+                                <vlan>
+                                  <members>700-800</members>
+                                </vlan>
+                              </ethernet-switching>
+                            </family>
+                          </unit>
+                        </interface>
+                    </interfaces>
+                """))
+
+        assert_that(self.switch.get_vlan_interfaces(705), equal_to(["xe-0/0/6", "xe-0/0/7"]))
+        assert_that(self.switch.get_vlan_interfaces(706), equal_to(["xe-0/0/6", "xe-0/0/7"]))
+        assert_that(self.switch.get_vlan_interfaces(800), equal_to(["xe-0/0/6", "xe-0/0/7"]))
+        with self.assertRaises(UnknownVlan):
+            self.switch.get_vlan_interfaces(750)
+
+    def test_get_vlan_interfaces_reads_the_configuration_again_after_an_edit(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                    <filter>
+                      <configuration>
+                        <vlans />
+                        <interfaces />
+                      </configuration>
+                    </filter>
+                """)).twice().and_return(a_configuration("""
+                    <vlans>
+                      <vlan>
+                        <name>VLAN705</name>
+                        <vlan-id>705</vlan-id>
+                      </vlan>
+                    </vlans>
+                    <interfaces />
+                """))
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                    <filter>
+                      <configuration>
+                        <vlans>
+                          <vlan>
+                            <vlan-id>1000</vlan-id>
+                          </vlan>
+                        </vlans>
+                      </configuration>
+                    </filter>
+                """)).and_return(a_configuration())
+        self.netconf_mock.should_receive("edit_config").once().and_return(an_ok_response())
+
+        self.switch.get_vlan_interfaces(705)
+        self.switch.add_vlan(1000)
+        self.switch.get_vlan_interfaces(705)
+
     def test_get_vlan_with_no_interface(self):
         self.switch.in_transaction = False
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <vlans />
-                    <interfaces />
+                    <vlans>
+                      <vlan>
+                        <vlan-id>10</vlan-id>
+                      </vlan>
+                    </vlans>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -449,7 +537,78 @@ class JuniperTest(unittest.TestCase):
         assert_that(vlan.access_groups[OUT], equal_to(None))
         assert_that(vlan.ips, has_length(0))
 
-    def test_get_vlan_with_unknown_vlan(self):
+    def test_get_vlans_by_number_reads_the_vlans_then_their_interface_units(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <vlans>
+                      <vlan>
+                        <vlan-id>10</vlan-id>
+                      </vlan>
+                      <vlan>
+                        <vlan-id>20</vlan-id>
+                      </vlan>
+                      <vlan>
+                        <vlan-id>21</vlan-id>
+                      </vlan>
+                    </vlans>
+                  </configuration>
+                </filter>
+            """)).once().ordered().and_return(a_configuration("""
+                <vlans>
+                  <vlan>
+                    <name>STANDARD</name>
+                    <vlan-id>10</vlan-id>
+                    <description>my-description</description>
+                  </vlan>
+                  <vlan>
+                    <name>WITH-IF</name>
+                    <vlan-id>20</vlan-id>
+                    <l3-interface>vlan.20</l3-interface>
+                  </vlan>
+                </vlans>
+            """))
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <interfaces>
+                      <interface>
+                        <name>vlan</name>
+                        <unit>
+                          <name>20</name>
+                        </unit>
+                      </interface>
+                    </interfaces>
+                  </configuration>
+                </filter>
+            """)).once().ordered().and_return(a_configuration("""
+                <interfaces>
+                  <interface>
+                    <name>vlan</name>
+                    <unit>
+                      <name>20</name>
+                      <family>
+                        <inet>
+                          <address>
+                            <name>1.1.1.1/24</name>
+                          </address>
+                        </inet>
+                      </family>
+                    </unit>
+                  </interface>
+                </interfaces>
+            """))
+
+        vlan10, vlan20 = self.switch.get_vlans_by_number([10, 20, 21])
+
+        assert_that(vlan10.number, equal_to(10))
+        assert_that(vlan10.name, equal_to("my-description"))
+        assert_that(vlan10.ips, has_length(0))
+        assert_that(vlan20.number, equal_to(20))
+        assert_that(vlan20.ips, equal_to([IPNetwork("1.1.1.1/24")]))
+
+    def test_get_vlans_by_number_reads_all_the_vlans_when_there_are_too_many_to_name(self):
         self.switch.in_transaction = False
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
@@ -458,6 +617,35 @@ class JuniperTest(unittest.TestCase):
                     <interfaces />
                   </configuration>
                 </filter>
+            """)).once().and_return(a_configuration("""
+                <vlans>
+                  <vlan>
+                    <name>STANDARD</name>
+                    <vlan-id>10</vlan-id>
+                  </vlan>
+                  <vlan>
+                    <name>OTHER</name>
+                    <vlan-id>2000</vlan-id>
+                  </vlan>
+                </vlans>
+            """))
+
+        vlans = self.switch.get_vlans_by_number(range(1, 1001))
+
+        assert_that([v.number for v in vlans], equal_to([10]))
+
+    def test_get_vlan_with_unknown_vlan(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <vlans>
+                      <vlan>
+                        <vlan-id>10</vlan-id>
+                      </vlan>
+                    </vlans>
+                  </configuration>
+                </filter>
             """)).and_return(a_configuration("""
             """))
 
@@ -471,8 +659,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <vlans />
-                    <interfaces />
+                    <vlans>
+                      <vlan>
+                        <vlan-id>20</vlan-id>
+                      </vlan>
+                    </vlans>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -483,20 +674,23 @@ class JuniperTest(unittest.TestCase):
                     <l3-interface>vlan.20</l3-interface>
                   </vlan>
                 </vlans>
+            """))
+
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <interfaces>
+                      <interface>
+                        <name>vlan</name>
+                        <unit>
+                          <name>20</name>
+                        </unit>
+                      </interface>
+                    </interfaces>
+                  </configuration>
+                </filter>
+            """)).and_return(a_configuration("""
                 <interfaces>
-              <interface>
-                <name>ge-0/0/1</name>
-                <unit>
-                  <name>0</name>
-                  <family>
-                    <ethernet-switching>
-                    </ethernet-switching>
-                  </family>
-                </unit>
-              </interface>
-                  <interface>
-                    <name>ge-0/0/1</name>
-                  </interface>
                   <interface>
                     <name>vlan</name>
                     <unit>
@@ -517,25 +711,6 @@ class JuniperTest(unittest.TestCase):
                         </inet>
                       </family>
                     </unit>
-                    <unit>
-                      <name>40</name>
-                    </unit>
-                    <unit>
-                      <name>70</name>
-                      <family>
-                        <inet>
-                          <address>
-                            <name>2.1.1.1/24</name>
-                          </address>
-                          <address>
-                            <name>4.1.1.1/24</name>
-                          </address>
-                          <address>
-                            <name>3.1.1.1/24</name>
-                          </address>
-                        </inet>
-                      </family>
-                    </unit>
                   </interface>
                 </interfaces>
             """))
@@ -556,8 +731,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <vlans />
-                    <interfaces />
+                    <vlans>
+                      <vlan>
+                        <vlan-id>40</vlan-id>
+                      </vlan>
+                    </vlans>
                   </configuration>
                 </filter>
             """)).and_return(a_configuration("""
@@ -568,39 +746,31 @@ class JuniperTest(unittest.TestCase):
                     <l3-interface>vlan.70</l3-interface>
                   </vlan>
                 </vlans>
+            """))
+
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <interfaces>
+                      <interface>
+                        <name>vlan</name>
+                        <unit>
+                          <name>70</name>
+                        </unit>
+                      </interface>
+                    </interfaces>
+                  </configuration>
+                </filter>
+            """)).and_return(a_configuration("""
                 <interfaces>
-                  <interface>
-                    <name>ge-0/0/1</name>
-                  </interface>
                   <interface>
                     <name>vlan</name>
                     <unit>
-                      <name>20</name>
+                      <name>70</name>
                       <family>
                         <inet>
                           <address>
-                            <name>1.1.1.1/24</name>
-                          </address>
-                          <filter>
-                            <input>
-                              <filter-name>AC-IN</filter-name>
-                            </input>
-                            <output>
-                              <filter-name>AC-OUT</filter-name>
-                            </output>
-                          </filter>
-                        </inet>
-                      </family>
-                    </unit>
-                    <unit>
-                      <name>40</name>
-                    </unit>
-                    <unit>
-                      <name>70</name>
-                      <family>
-                        <inet>
-                          <address>
-                            <name>2.1.1.1/24</name>
+                            <name>2.1.1.1/24</name>
                           </address>
                           <address>
                             <name>4.1.1.1/24</name>
@@ -634,11 +804,14 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <vlans />
-                <interfaces />
+                <vlans>
+                  <vlan>
+                    <vlan-id>20</vlan-id>
+                  </vlan>
+                </vlans>
               </configuration>
             </filter>
-        """)).and_return(a_configuration("""
+            """)).and_return(a_configuration("""
             <vlans>
               <vlan>
                 <name>NOT_GOOD_ONE</name>
@@ -654,23 +827,23 @@ class JuniperTest(unittest.TestCase):
                 <vlan-id>21</vlan-id>
               </vlan>
             </vlans>
+            """))
+
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>irb</name>
+                    <unit>
+                      <name>20</name>
+                    </unit>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </filter>
+            """)).and_return(a_configuration("""
             <interfaces>
-              <interface>
-                <name>ge-0/0/1</name>
-              </interface>
-              <interface>
-                <name>vlan</name>
-                <unit>
-                  <name>10</name>
-                  <family>
-                    <inet>
-                      <address>
-                        <name>1.1.1.1/24</name>
-                      </address>
-                    </inet>
-                  </family>
-                </unit>
-              </interface>
               <interface>
                 <name>irb</name>
                 <unit>
@@ -684,21 +857,8 @@ class JuniperTest(unittest.TestCase):
                   </family>
                 </unit>
               </interface>
-              <interface>
-                <name>whatever</name>
-                <unit>
-                  <name>30</name>
-                  <family>
-                    <inet>
-                      <address>
-                        <name>3.1.1.1/24</name>
-                      </address>
-                    </inet>
-                  </family>
-                </unit>
-              </interface>
             </interfaces>
-        """))
+            """))
 
         vlan = self.switch.get_vlan(20)
 
@@ -709,11 +869,14 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
             <filter>
               <configuration>
-                <vlans />
-                <interfaces />
+                <vlans>
+                  <vlan>
+                    <vlan-id>40</vlan-id>
+                  </vlan>
+                </vlans>
               </configuration>
             </filter>
-        """)).and_return(a_configuration("""
+            """)).and_return(a_configuration("""
             <vlans>
               <vlan>
                 <name>NOT_FOUND</name>
@@ -721,58 +884,121 @@ class JuniperTest(unittest.TestCase):
                 <l3-interface>notfound.20</l3-interface>
               </vlan>
             </vlans>
+            """))
+
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>notfound</name>
+                    <unit>
+                      <name>20</name>
+                    </unit>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </filter>
+            """)).and_return(a_configuration("""
+            <interfaces/>
+            """))
+
+        vlan = self.switch.get_vlan(40)
+
+        assert_that(vlan.ips, has_length(0))
+
+    def test_get_interface(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                    <interface>
+                        <name>ge-0/0/1</name>
+                    </interface>
+                </interfaces>
+                <vlans />
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
             <interfaces>
               <interface>
                 <name>ge-0/0/1</name>
-              </interface>
-              <interface>
-                <name>vlan</name>
-                <unit>
-                  <name>10</name>
-                  <family>
-                    <inet>
-                      <address>
-                        <name>1.1.1.1/24</name>
-                      </address>
-                    </inet>
-                  </family>
-                </unit>
-              </interface>
-              <interface>
-                <name>irb</name>
                 <unit>
-                  <name>20</name>
+                  <name>0</name>
                   <family>
-                    <inet>
-                      <address>
-                        <name>2.1.1.1/24</name>
-                      </address>
-                    </inet>
+                    <ethernet-switching>
+                    </ethernet-switching>
                   </family>
                 </unit>
               </interface>
+            </interfaces>
+            <vlans/>
+        """))
+
+        interface = self.switch.get_interface('ge-0/0/1')
+
+        assert_that(interface.name, equal_to("ge-0/0/1"))
+        assert_that(interface.shutdown, equal_to(False))
+        assert_that(interface.port_mode, equal_to(ACCESS))
+        assert_that(interface.access_vlan, equal_to(None))
+        assert_that(interface.trunk_native_vlan, equal_to(None))
+        assert_that(interface.trunk_vlans, equal_to([]))
+        assert_that(interface.auto_negotiation, equal_to(None))
+        assert_that(interface.mtu, equal_to(None))
+
+    def test_get_interfaces_by_name(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                    <interface>
+                        <name>ge-0/0/1</name>
+                    </interface>
+                    <interface>
+                        <name>ge-0/0/2</name>
+                    </interface>
+                    <interface>
+                        <name>ge-0/0/3</name>
+                    </interface>
+                </interfaces>
+                <vlans />
+              </configuration>
+            </filter>
+        """)).once().and_return(a_configuration("""
+            <interfaces>
               <interface>
-                <name>whatever</name>
+                <name>ge-0/0/1</name>
                 <unit>
-                  <name>30</name>
+                  <name>0</name>
                   <family>
-                    <inet>
-                      <address>
-                        <name>3.1.1.1/24</name>
-                      </address>
-                    </inet>
+                    <ethernet-switching>
+                      <port-mode>trunk</port-mode>
+                      <vlan>
+                        <members>10</members>
+                      </vlan>
+                    </ethernet-switching>
                   </family>
                 </unit>
               </interface>
             </interfaces>
+            <vlans/>
         """))
+        self.netconf_mock.should_receive("rpc").twice().and_return(a_physical_interfaces_listing("ge-0/0/1", "ge-0/0/2"))
 
-        vlan = self.switch.get_vlan(40)
+        if1, if2 = self.switch.get_interfaces_by_name(["ge-0/0/1", "ge-0/0/2", "ge-0/0/3"])
 
-        assert_that(vlan.ips, has_length(0))
+        assert_that(if1.name, equal_to("ge-0/0/1"))
+        assert_that(if1.port_mode, equal_to(TRUNK))
+        assert_that(if1.trunk_vlans, equal_to([10]))
+        assert_that(if2.name, equal_to("ge-0/0/2"))
+        assert_that(if2.port_mode, equal_to(ACCESS))
 
-    def test_get_interface(self):
+    def test_get_interfaces_by_name_prefix_reads_only_the_matching_interfaces(self):
         self.switch.in_transaction = False
+        self.netconf_mock.should_receive("rpc").once().and_return(
+            a_physical_interfaces_listing("ge-0/0/1", "ge-0/0/2", "xe-0/0/1", "ae1"))
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
             <filter>
               <configuration>
@@ -780,11 +1006,14 @@ class JuniperTest(unittest.TestCase):
                     <interface>
                         <name>ge-0/0/1</name>
                     </interface>
+                    <interface>
+                        <name>ge-0/0/2</name>
+                    </interface>
                 </interfaces>
                 <vlans />
               </configuration>
             </filter>
-        """)).and_return(a_configuration("""
+        """)).once().and_return(a_configuration("""
             <interfaces>
               <interface>
                 <name>ge-0/0/1</name>
@@ -792,6 +1021,7 @@ class JuniperTest(unittest.TestCase):
                   <name>0</name>
                   <family>
                     <ethernet-switching>
+                      <port-mode>trunk</port-mode>
                     </ethernet-switching>
                   </family>
                 </unit>
@@ -800,16 +1030,11 @@ class JuniperTest(unittest.TestCase):
             <vlans/>
         """))
 
-        interface = self.switch.get_interface('ge-0/0/1')
+        if1, if2 = self.switch.get_interfaces_by_name_prefix("ge-")
 
-        assert_that(interface.name, equal_to("ge-0/0/1"))
-        assert_that(interface.shutdown, equal_to(False))
-        assert_that(interface.port_mode, equal_to(ACCESS))
-        assert_that(interface.access_vlan, equal_to(None))
-        assert_that(interface.trunk_native_vlan, equal_to(None))
-        assert_that(interface.trunk_vlans, equal_to([]))
-        assert_that(interface.auto_negotiation, equal_to(None))
-        assert_that(interface.mtu, equal_to(None))
+        assert_that(if1.name, equal_to("ge-0/0/1"))
+        assert_that(if1.port_mode, equal_to(TRUNK))
+        assert_that(if2.name, equal_to("ge-0/0/2"))
 
     def test_get_unconfigured_but_existing_interface_returns_an_empty_interface(self):
         self.switch.in_transaction = False
@@ -896,6 +1121,46 @@ class JuniperTest(unittest.TestCase):
 
         assert_that(self.switch.get_interface('ge-0/0/27').shutdown, equal_to(True))
 
+    def test_physical_interfaces_are_listed_once_for_all_switches_of_the_same_host(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").and_return(a_configuration())
+        self.netconf_mock.should_receive("rpc").once().and_return(a_physical_interfaces_listing("ge-0/0/1", "ge-0/0/2"))
+
+        assert_that(self.switch.get_interface('ge-0/0/1').name, equal_to("ge-0/0/1"))
+        assert_that(self.switch.get_interface('ge-0/0/2').name, equal_to("ge-0/0/2"))
+
+        other_switch = juniper.standard.netconf(SwitchDescriptor(model='juniper', hostname="toto"))
+        other_switch.netconf = self.netconf_mock
+        assert_that(other_switch.get_interface('ge-0/0/1').name, equal_to("ge-0/0/1"))
+
+    def test_physical_interfaces_are_listed_again_once_expired(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").and_return(a_configuration())
+        self.netconf_mock.should_receive("rpc").twice().and_return(a_physical_interfaces_listing("ge-0/0/1"))
+
+        with mock.patch("time.time", return_value=1000):
+            self.switch.get_interface('ge-0/0/1')
+        with mock.patch("time.time", return_value=1000 + interface_inventory.ttl - 1):
+            self.switch.get_interface('ge-0/0/1')
+        with mock.patch("time.time", return_value=1000 + interface_inventory.ttl):
+            self.switch.get_interface('ge-0/0/1')
+
+    def test_an_interface_missing_from_the_inventory_lists_the_physical_interfaces_again(self):
+        self.switch.in_transaction = False
+        self.netconf_mock.should_receive("get_config").and_return(a_configuration())
+        self.netconf_mock.should_receive("rpc").once().ordered().and_return(a_physical_interfaces_listing("ge-0/0/1"))
+        self.netconf_mock.should_receive("rpc").once().ordered().and_return(a_physical_interfaces_listing("ge-0/0/1", "ge-0/0/2"))
+
+        self.switch.get_interface('ge-0/0/1')
+        assert_that(self.switch.get_interface('ge-0/0/2').name, equal_to("ge-0/0/2"))
+
+    def test_refresh_physical_interfaces(self):
+        self.netconf_mock.should_receive("rpc").once().ordered().and_return(a_physical_interfaces_listing("ge-0/0/1"))
+        self.netconf_mock.should_receive("rpc").once().ordered().and_return(a_physical_interfaces_listing("ge-0/0/1", "ge-0/0/2"))
+
+        assert_that([i.name for i in self.switch.refresh_physical_interfaces()], equal_to(["ge-0/0/1"]))
+        assert_that([i.name for i in self.switch.refresh_physical_interfaces()], equal_to(["ge-0/0/1", "ge-0/0/2"]))
+
     def test_get_nonexistent_interface_raises(self):
         self.switch.in_transaction = False
         self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
@@ -1351,7 +1616,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <vlans />
+                <vlans>
+                  <vlan>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                </vlans>
               </configuration>
             </filter>
         """)).and_return(a_configuration("""
@@ -1383,7 +1652,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <vlans />
+                <vlans>
+                  <vlan>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                </vlans>
               </configuration>
             </filter>
         """)).and_return(a_configuration("""
@@ -1406,7 +1679,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <vlans />
+                <vlans>
+                  <vlan>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                </vlans>
               </configuration>
             </filter>
         """)).and_return(a_configuration("""
@@ -1429,7 +1706,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <vlans />
+                <vlans>
+                  <vlan>
+                    <vlan-id>9000</vlan-id>
+                  </vlan>
+                </vlans>
               </configuration>
             </filter>
         """)).and_return(a_configuration(""))
@@ -1464,7 +1745,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <vlans />
+                <vlans>
+                  <vlan>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                </vlans>
               </configuration>
             </filter>
         """)).and_return(a_configuration(""))
@@ -1874,17 +2159,217 @@ class JuniperTest(unittest.TestCase):
 
         self.switch.remove_vlan(10)
 
-    def test_port_mode_access_with_no_port_mode_or_vlan_set_just_sets_the_port_mode(self):
+    def test_add_vlans_creates_them_in_one_edit(self):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
-                <vlans/>
-              </configuration>
-            </filter>
-        """)).and_return(a_configuration("""
-            <interfaces>
-              <interface>
+                <vlans>
+                  <vlan>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                  <vlan>
+                    <vlan-id>1001</vlan-id>
+                  </vlan>
+                </vlans>
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans/>
+        """))
+
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <vlans>
+                  <vlan>
+                    <name>VLAN1000</name>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                  <vlan>
+                    <name>VLAN1001</name>
+                    <vlan-id>1001</vlan-id>
+                  </vlan>
+                </vlans>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+
+        self.switch.add_vlans([1000, 1001])
+
+    def test_add_vlans_creates_nothing_when_one_already_exists(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans>
+                  <vlan>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                  <vlan>
+                    <vlan-id>1001</vlan-id>
+                  </vlan>
+                </vlans>
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>PATATE</name>
+                <vlan-id>1001</vlan-id>
+              </vlan>
+            </vlans>
+        """))
+
+        self.netconf_mock.should_receive("edit_config").never()
+
+        with self.assertRaises(VlanAlreadyExist) as expect:
+            self.switch.add_vlans([1000, 1001])
+
+        assert_that(str(expect.exception), equal_to("Vlan 1001 already exists"))
+
+    def test_remove_vlans_removes_them_and_their_usages_in_one_edit(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>STANDARD</name>
+                <vlan-id>10</vlan-id>
+                <l3-interface>vlan.25</l3-interface>
+              </vlan>
+              <vlan>
+                <name>OTHER</name>
+                <vlan-id>11</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/1</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>trunk</port-mode>
+                      <vlan>
+                        <members>9-15</members>
+                      </vlan>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+              <interface>
+                <name>ge-0/0/2</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>access</port-mode>
+                      <vlan>
+                        <members>OTHER</members>
+                      </vlan>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
+
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <vlans>
+                  <vlan operation="delete">
+                    <name>STANDARD</name>
+                  </vlan>
+                  <vlan operation="delete">
+                    <name>OTHER</name>
+                  </vlan>
+                </vlans>
+                <interfaces>
+                  <interface>
+                    <name>vlan</name>
+                    <unit operation="delete">
+                      <name>25</name>
+                    </unit>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                    <unit>
+                      <name>0</name>
+                      <family>
+                        <ethernet-switching>
+                          <vlan>
+                            <members operation="delete">9-15</members>
+                            <members>9</members>
+                            <members>12-15</members>
+                          </vlan>
+                        </ethernet-switching>
+                      </family>
+                    </unit>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/2</name>
+                    <unit>
+                      <name>0</name>
+                      <family>
+                        <ethernet-switching>
+                          <vlan>
+                            <members operation="delete">OTHER</members>
+                          </vlan>
+                        </ethernet-switching>
+                      </family>
+                    </unit>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+
+        self.switch.remove_vlans([10, 11])
+
+    def test_remove_vlans_removes_nothing_when_one_does_not_exist(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>STANDARD</name>
+                <vlan-id>10</vlan-id>
+              </vlan>
+            </vlans>
+        """))
+
+        self.netconf_mock.should_receive("edit_config").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.remove_vlans([10, 11])
+
+        assert_that(str(expect.exception), equal_to("Vlan 11 not found"))
+
+    def test_port_mode_access_with_no_port_mode_or_vlan_set_just_sets_the_port_mode(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
+                <vlans/>
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <interfaces>
+              <interface>
                 <name>ge-0/0/6</name>
                 <unit>
                   <name>0</name>
@@ -1924,7 +2409,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -1974,7 +2463,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2025,7 +2518,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2072,7 +2569,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2101,7 +2602,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2145,7 +2650,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2180,7 +2689,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2505,7 +3018,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2559,7 +3076,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2596,7 +3117,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2650,7 +3175,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2714,8 +3243,12 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
-                <vlans/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
+                <vlans/>
               </configuration>
             </filter>
         """)).and_return(a_configuration("""
@@ -2751,7 +3284,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2788,7 +3325,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -2830,7 +3371,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3107,7 +3652,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3159,7 +3708,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3194,7 +3747,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3246,7 +3803,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3303,7 +3864,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3340,7 +3905,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3389,7 +3958,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3426,7 +3999,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <interfaces/>
+                    <interfaces>
+                      <interface>
+                        <name>ge-0/0/99</name>
+                      </interface>
+                    </interfaces>
                     <vlans/>
                   </configuration>
                 </filter>
@@ -3469,7 +4046,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
                 <filter>
                   <configuration>
-                    <interfaces/>
+                    <interfaces>
+                      <interface>
+                        <name>ge-0/0/6</name>
+                      </interface>
+                    </interfaces>
                     <vlans/>
                   </configuration>
                 </filter>
@@ -3818,7 +4399,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3872,7 +4457,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3909,7 +4498,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -3963,7 +4556,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4021,7 +4618,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4060,7 +4661,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4100,7 +4705,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4131,7 +4740,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4176,7 +4789,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4247,7 +4864,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4307,7 +4928,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4348,7 +4973,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4388,7 +5017,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4427,7 +5060,11 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
               </configuration>
             </filter>
@@ -4447,68 +5084,296 @@ class JuniperTest(unittest.TestCase):
 
         assert_that(str(expect.exception), contains_string("Unknown interface ge-0/0/6"))
 
-    def test_set_interface_description_succeeds(self):
-        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
-            <config>
+    def test_add_trunk_vlans_adds_the_missing_ones_as_ranges_in_one_edit(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
               <configuration>
                 <interfaces>
                   <interface>
                     <name>ge-0/0/6</name>
-                    <description>Resistance is futile</description>
                   </interface>
                 </interfaces>
+                <vlans/>
               </configuration>
-            </config>
-        """)).and_return(an_ok_response())
-
-        self.switch.set_interface_description("ge-0/0/6", "Resistance is futile")
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>VLAN1000</name>
+                <vlan-id>1000</vlan-id>
+              </vlan>
+              <vlan>
+                <name>VLAN1001</name>
+                <vlan-id>1001</vlan-id>
+              </vlan>
+              <vlan>
+                <name>VLAN1002</name>
+                <vlan-id>1002</vlan-id>
+              </vlan>
+              <vlan>
+                <name>VLAN1003</name>
+                <vlan-id>1003</vlan-id>
+              </vlan>
+              <vlan>
+                <name>VLAN1005</name>
+                <vlan-id>1005</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/6</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>trunk</port-mode>
+                      <vlan>
+                        <members>1002</members>
+                      </vlan>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
 
-    def test_set_interface_description_on_unkown_interface_raises(self):
         self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
             <config>
               <configuration>
                 <interfaces>
                   <interface>
-                    <name>ge-0/0/99</name>
-                    <description>Resistance is futile</description>
+                    <name>ge-0/0/6</name>
+                    <unit>
+                      <name>0</name>
+                      <family>
+                        <ethernet-switching>
+                          <vlan>
+                            <members>1000-1001</members>
+                            <members>1003</members>
+                            <members>1005</members>
+                          </vlan>
+                        </ethernet-switching>
+                      </family>
+                    </unit>
                   </interface>
                 </interfaces>
               </configuration>
             </config>
-        """)).and_raise(RPCError(to_ele(textwrap.dedent("""
-            <rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/11.4R1/junos" xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0">
-            <error-severity>error</error-severity>
-            <error-message>
-            port value outside range 0..47 for '99' in 'ge-0/0/99'
-            </error-message>
-            </rpc-error>"""))))
-
-        with self.assertRaises(UnknownInterface) as expect:
-            self.switch.set_interface_description("ge-0/0/99", "Resistance is futile")
+        """)).and_return(an_ok_response())
 
-        assert_that(str(expect.exception), contains_string("Unknown interface ge-0/0/99"))
+        self.switch.add_trunk_vlans("ge-0/0/6", [1000, 1001, 1002, 1003, 1005])
 
-    def test_unset_interface_description_succeeds(self):
-        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
-            <config>
+    def test_add_trunk_vlans_with_an_unknown_vlan_raises(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
               <configuration>
                 <interfaces>
                   <interface>
                     <name>ge-0/0/6</name>
-                    <description operation="delete" />
                   </interface>
                 </interfaces>
+                <vlans/>
               </configuration>
-            </config>
-        """)).and_return(an_ok_response())
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>VLAN1000</name>
+                <vlan-id>1000</vlan-id>
+              </vlan>
+            </vlans>
+        """))
 
-        self.switch.unset_interface_description("ge-0/0/6")
+        self.netconf_mock.should_receive("edit_config").never()
 
-    def test_unset_interface_description_on_unkown_interface_raises(self):
-        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
-            <config>
-              <configuration>
-                <interfaces>
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.add_trunk_vlans("ge-0/0/6", [1000, 1001])
+
+        assert_that(str(expect.exception), equal_to("Vlan 1001 not found"))
+
+    def test_remove_trunk_vlans_removes_them_from_the_members_in_one_edit(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
+                <vlans/>
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>VLAN_NAME</name>
+                <vlan-id>1000</vlan-id>
+              </vlan>
+              <vlan>
+                <name>VLAN1001</name>
+                <vlan-id>1001</vlan-id>
+              </vlan>
+              <vlan>
+                <name>VLAN1005</name>
+                <vlan-id>1005</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/6</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>trunk</port-mode>
+                      <vlan>
+                        <members>VLAN_NAME</members>
+                        <members>1001-1006</members>
+                      </vlan>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
+
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                    <unit>
+                      <name>0</name>
+                      <family>
+                        <ethernet-switching>
+                          <vlan>
+                            <members operation="delete">VLAN_NAME</members>
+                            <members operation="delete">1001-1006</members>
+                            <members>1002-1004</members>
+                            <members>1006</members>
+                          </vlan>
+                        </ethernet-switching>
+                      </family>
+                    </unit>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+
+        self.switch.remove_trunk_vlans("ge-0/0/6", [1000, 1001, 1005])
+
+    def test_remove_trunk_vlans_with_a_vlan_not_in_members_raises(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                </interfaces>
+                <vlans/>
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>VLAN1000</name>
+                <vlan-id>1000</vlan-id>
+              </vlan>
+              <vlan>
+                <name>VLAN1001</name>
+                <vlan-id>1001</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/6</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>trunk</port-mode>
+                      <vlan>
+                        <members>1000</members>
+                      </vlan>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
+
+        self.netconf_mock.should_receive("edit_config").never()
+
+        with self.assertRaises(TrunkVlanNotSet) as expect:
+            self.switch.remove_trunk_vlans("ge-0/0/6", [1000, 1001])
+
+        assert_that(str(expect.exception), equal_to("Trunk Vlan is not set on interface ge-0/0/6"))
+
+    def test_set_interface_description_succeeds(self):
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                    <description>Resistance is futile</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+
+        self.switch.set_interface_description("ge-0/0/6", "Resistance is futile")
+
+    def test_set_interface_description_on_unkown_interface_raises(self):
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                    <description>Resistance is futile</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_raise(RPCError(to_ele(textwrap.dedent("""
+            <rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/11.4R1/junos" xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0">
+            <error-severity>error</error-severity>
+            <error-message>
+            port value outside range 0..47 for '99' in 'ge-0/0/99'
+            </error-message>
+            </rpc-error>"""))))
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.switch.set_interface_description("ge-0/0/99", "Resistance is futile")
+
+        assert_that(str(expect.exception), contains_string("Unknown interface ge-0/0/99"))
+
+    def test_unset_interface_description_succeeds(self):
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                    <description operation="delete" />
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+
+        self.switch.unset_interface_description("ge-0/0/6")
+
+    def test_unset_interface_description_on_unkown_interface_raises(self):
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
                   <interface>
                     <name>ge-0/0/99</name>
                     <description operation="delete" />
@@ -5013,82 +5878,292 @@ class JuniperTest(unittest.TestCase):
 
         self.switch.set_interface_state("ge-0/0/6", OFF)
 
-    def test_unset_interface_state_succeeds(self):
+    def test_edit_interfaces_sends_one_edit_for_all_interfaces(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/7</name>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <interfaces>
+              <interface>
+                <name>ge-0/0/6</name>
+              </interface>
+            </interfaces>
+        """))
+
         self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
             <config>
               <configuration>
                 <interfaces>
                   <interface>
                     <name>ge-0/0/6</name>
-                    <disable operation="delete" />
+                    <description>servers</description>
+                    <disable />
+                    <mtu>5000</mtu>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/7</name>
+                    <description>servers</description>
+                    <disable />
+                    <mtu>5000</mtu>
                   </interface>
                 </interfaces>
               </configuration>
             </config>
         """)).and_return(an_ok_response())
 
-        self.switch.unset_interface_state("ge-0/0/6")
+        self.switch.edit_interfaces(["ge-0/0/6", "ge-0/0/7"], description="servers", state=OFF, mtu=5000)
 
-    def test_unset_interface_state_succeeds_even_if_interface_is_already_shut(self):
-        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
-            <config>
+    def test_edit_interfaces_enables_only_the_disabled_interfaces(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
               <configuration>
                 <interfaces>
                   <interface>
                     <name>ge-0/0/6</name>
-                    <disable operation="delete" />
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/7</name>
                   </interface>
                 </interfaces>
               </configuration>
-            </config>
-        """)).and_raise(RPCError(to_ele(textwrap.dedent("""
-            <rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/17.3R3/junos" xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0">
-            <error-severity>warning</error-severity>
-            <error-path>[edit interfaces]</error-path>
-            <error-message>statement not found: ge-0/0/6</error-message>
-            </rpc-error>
-            """))))
-
-        self.switch.unset_interface_state("ge-0/0/6")
+            </filter>
+        """)).and_return(a_configuration("""
+            <interfaces>
+              <interface>
+                <name>ge-0/0/6</name>
+              </interface>
+              <interface>
+                <name>ge-0/0/7</name>
+                <disable />
+              </interface>
+            </interfaces>
+        """))
 
-    def test_unset_interface_state_raises_on_unknown_interface(self):
         self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
             <config>
               <configuration>
                 <interfaces>
                   <interface>
-                    <name>ge-0/0/99</name>
+                    <name>ge-0/0/7</name>
                     <disable operation="delete" />
                   </interface>
                 </interfaces>
               </configuration>
             </config>
-        """)).and_raise(RPCError(to_ele(textwrap.dedent("""
-            <rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/11.4R1/junos" xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0">
-            <error-severity>error</error-severity>
-            <error-message>
-            port value outside range 0..47 for '99' in 'ge-0/0/99'
-            </error-message>
-            </rpc-error>"""))))
-
-        with self.assertRaises(UnknownInterface) as expect:
-            self.switch.unset_interface_state("ge-0/0/99")
+        """)).and_return(an_ok_response())
 
-        assert_that(str(expect.exception), contains_string("Unknown interface ge-0/0/99"))
+        self.switch.edit_interfaces(["ge-0/0/6", "ge-0/0/7"], state=ON)
 
-    def test_unset_interface_state_without_disabled(self):
-        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
-            <config>
+    def test_edit_interfaces_merges_the_access_vlan_in_the_same_edit(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
               <configuration>
                 <interfaces>
                   <interface>
                     <name>ge-0/0/6</name>
-                    <disable operation="delete" />
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/7</name>
                   </interface>
                 </interfaces>
+                <vlans/>
               </configuration>
-            </config>
-        """)).and_raise(RPCError(to_ele(textwrap.dedent("""
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>PATATE</name>
+                <vlan-id>1000</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/6</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>access</port-mode>
+                      <vlan>
+                        <members>1000</members>
+                      </vlan>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
+
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                    <description>servers</description>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/7</name>
+                    <description>servers</description>
+                    <unit>
+                      <name>0</name>
+                      <family>
+                        <ethernet-switching>
+                          <port-mode>access</port-mode>
+                          <vlan>
+                            <members>1000</members>
+                          </vlan>
+                        </ethernet-switching>
+                      </family>
+                    </unit>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+
+        self.switch.edit_interfaces(["ge-0/0/6", "ge-0/0/7"], description="servers", access_vlan=1000)
+
+    def test_edit_interfaces_access_vlan_on_a_trunk_changes_nothing(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/7</name>
+                  </interface>
+                </interfaces>
+                <vlans/>
+              </configuration>
+            </filter>
+        """)).and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>PATATE</name>
+                <vlan-id>1000</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/7</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>trunk</port-mode>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
+
+        self.netconf_mock.should_receive("edit_config").never()
+
+        with self.assertRaises(InterfaceInWrongPortMode) as expect:
+            self.switch.edit_interfaces(["ge-0/0/6", "ge-0/0/7"], access_vlan=1000)
+
+        assert_that(str(expect.exception), contains_string("Operation cannot be performed on a trunk mode interface"))
+
+    def test_edit_interfaces_on_an_unknown_interface_raises(self):
+        self.netconf_mock.should_receive("get_config").and_return(a_configuration(""))
+
+        self.netconf_mock.should_receive("edit_config").once().and_raise(a_port_value_outside_range_rpc_error())
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.switch.edit_interfaces(["ge-0/0/6", "ge-0/0/99"], state=OFF)
+
+        assert_that(str(expect.exception), contains_string("Unknown interface ge-0/0/99"))
+
+    def test_unset_interface_state_succeeds(self):
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                    <disable operation="delete" />
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+
+        self.switch.unset_interface_state("ge-0/0/6")
+
+    def test_unset_interface_state_succeeds_even_if_interface_is_already_shut(self):
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                    <disable operation="delete" />
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_raise(RPCError(to_ele(textwrap.dedent("""
+            <rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/17.3R3/junos" xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0">
+            <error-severity>warning</error-severity>
+            <error-path>[edit interfaces]</error-path>
+            <error-message>statement not found: ge-0/0/6</error-message>
+            </rpc-error>
+            """))))
+
+        self.switch.unset_interface_state("ge-0/0/6")
+
+    def test_unset_interface_state_raises_on_unknown_interface(self):
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                    <disable operation="delete" />
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_raise(RPCError(to_ele(textwrap.dedent("""
+            <rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/11.4R1/junos" xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0">
+            <error-severity>error</error-severity>
+            <error-message>
+            port value outside range 0..47 for '99' in 'ge-0/0/99'
+            </error-message>
+            </rpc-error>"""))))
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.switch.unset_interface_state("ge-0/0/99")
+
+        assert_that(str(expect.exception), contains_string("Unknown interface ge-0/0/99"))
+
+    def test_unset_interface_state_without_disabled(self):
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/6</name>
+                    <disable operation="delete" />
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_raise(RPCError(to_ele(textwrap.dedent("""
             <rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/11.4R1/junos" xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0">
             <error-severity>warning</error-severity>
             <error-path>[edit interfaces ge-0/0/6]</error-path>
@@ -5420,11 +6495,20 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ae10</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
                 <protocols>
                   <rstp>
-                    <interface />
+                    <interface>
+                      <name>ge-0/0/1.0</name>
+                    </interface>
                   </rstp>
                 </protocols>
               </configuration>
@@ -5463,11 +6547,20 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ae10</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
                 <protocols>
                   <rstp>
-                    <interface />
+                    <interface>
+                      <name>ge-0/0/1.0</name>
+                    </interface>
                   </rstp>
                 </protocols>
               </configuration>
@@ -5527,11 +6620,20 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ae10</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
                 <protocols>
                   <rstp>
-                    <interface />
+                    <interface>
+                      <name>ge-0/0/1.0</name>
+                    </interface>
                   </rstp>
                 </protocols>
               </configuration>
@@ -5552,11 +6654,20 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ae10</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
                 <protocols>
                   <rstp>
-                    <interface />
+                    <interface>
+                      <name>ge-0/0/99.0</name>
+                    </interface>
                   </rstp>
                 </protocols>
               </configuration>
@@ -5600,11 +6711,20 @@ class JuniperTest(unittest.TestCase):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
               <configuration>
-                <interfaces/>
+                <interfaces>
+                  <interface>
+                    <name>ae10</name>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                  </interface>
+                </interfaces>
                 <vlans/>
                 <protocols>
                   <rstp>
-                    <interface />
+                    <interface>
+                      <name>ge-0/0/1.0</name>
+                    </interface>
                   </rstp>
                 </protocols>
               </configuration>
@@ -6057,6 +7177,40 @@ class JuniperTest(unittest.TestCase):
         assert_that(if3.trunk_vlans, equal_to([999, 1000, 1001]))
         assert_that(if3.members, equal_to(['ge-1/0/1']))
 
+    def test_get_bonds_on_a_large_chassis_indexes_the_members_in_one_pass(self):
+        self.switch.in_transaction = False
+
+        ports = ["ge-{}/0/{}".format(fpc, port) for fpc in range(4) for port in range(48)]
+        bonds = ["""
+              <interface>
+                <name>ae{}</name>
+                <aggregated-ether-options>
+                  <lacp>
+                    <active/>
+                  </lacp>
+                </aggregated-ether-options>
+              </interface>""".format(number) for number in range(1, 49)]
+        members = ["""
+              <interface>
+                <name>{}</name>
+                <ether-options>
+                  <ieee-802.3ad>
+                    <bundle>ae{}</bundle>
+                  </ieee-802.3ad>
+                </ether-options>
+              </interface>""".format(port, i % 48 + 1) for i, port in enumerate(ports)]
+
+        self.netconf_mock.should_receive("get_config").and_return(a_configuration(
+            "<interfaces>{}</interfaces>".format("".join(bonds + members))))
+        flexmock(self.switch).should_receive("get_bond_slaves_config").never()
+
+        result = self.switch.get_bonds()
+
+        assert_that(result, has_length(48))
+        assert_that(result[0].number, equal_to(1))
+        assert_that(result[0].members, equal_to(['ge-0/0/0', 'ge-1/0/0', 'ge-2/0/0', 'ge-3/0/0']))
+        assert_that(result[47].members, equal_to(['ge-0/0/47', 'ge-1/0/47', 'ge-2/0/47', 'ge-3/0/47']))
+
     def test_set_interface_lldp_state_from_nothing(self):
         self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
             <filter>
@@ -6627,15 +7781,285 @@ class JuniperTest(unittest.TestCase):
 
         self.switch.rollback_transaction()
 
-    def test_get_mac_addresses(self):
-        self.netconf_mock.should_receive("rpc").with_args(is_xml("""
-                    <get-ethernet-switching-table-information>
-                        <detail/>
-                    </get-ethernet-switching-table-information>
-                """)).and_return(an_rpc_response(textwrap.dedent("""
-                  <ethernet-switching-table-information style="extensive">
-                    <ethernet-switching-table style="extensive">
-                      <mac-table-count>385</mac-table-count>
+    def test_reads_during_a_transaction_are_answered_from_the_candidate_cache(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).once().and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>VLAN10</name>
+                <vlan-id>10</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/1</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>access</port-mode>
+                      <vlan>
+                        <members>10</members>
+                      </vlan>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
+
+        self.switch.get_vlans()
+
+        self.netconf_mock.should_receive("edit_config").once().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <vlans>
+                  <vlan>
+                    <name>VLAN1000</name>
+                    <vlan-id>1000</vlan-id>
+                    <description>Shizzle</description>
+                  </vlan>
+                </vlans>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+
+        self.switch.add_vlan(1000, name="Shizzle")
+
+        vlan = self.switch.get_vlan(1000)
+        assert_that(vlan.number, equal_to(1000))
+        assert_that(vlan.name, equal_to("Shizzle"))
+
+        interface = self.switch.get_interface("ge-0/0/1")
+        assert_that(interface.access_vlan, equal_to(10))
+
+    def test_pushed_deletions_are_applied_to_the_candidate_cache(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).once().and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>VLAN10</name>
+                <vlan-id>10</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/1</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>trunk</port-mode>
+                      <vlan>
+                        <members>10</members>
+                      </vlan>
+                      <native-vlan-id>10</native-vlan-id>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
+
+        self.switch.get_vlans()
+
+        self.netconf_mock.should_receive("edit_config").once().and_return(an_ok_response())
+
+        self.switch.unset_interface_native_vlan("ge-0/0/1")
+
+        interface = self.switch.get_interface("ge-0/0/1")
+        assert_that(interface.trunk_native_vlan, equal_to(None))
+        assert_that(interface.trunk_vlans, equal_to([10]))
+
+    def test_interfaces_read_alone_are_kept_in_the_candidate_cache(self):
+        for interface_id in ("ge-0/0/1", "ge-0/0/2"):
+            self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+                <filter>
+                  <configuration>
+                    <interfaces>
+                      <interface>
+                        <name>{}</name>
+                      </interface>
+                    </interfaces>
+                    <vlans />
+                  </configuration>
+                </filter>
+            """.format(interface_id))).once().and_return(a_configuration("""
+                <vlans>
+                  <vlan>
+                    <name>VLAN10</name>
+                    <vlan-id>10</vlan-id>
+                  </vlan>
+                  <vlan>
+                    <name>VLAN20</name>
+                    <vlan-id>20</vlan-id>
+                  </vlan>
+                </vlans>
+                <interfaces>
+                  <interface>
+                    <name>{}</name>
+                    <unit>
+                      <name>0</name>
+                      <family>
+                        <ethernet-switching>
+                          <port-mode>access</port-mode>
+                        </ethernet-switching>
+                      </family>
+                    </unit>
+                  </interface>
+                </interfaces>
+            """.format(interface_id)))
+        self.netconf_mock.should_receive("edit_config").times(6).and_return(an_ok_response())
+
+        for vlan in (10, 20, 10):
+            self.switch.set_access_vlan("ge-0/0/1", vlan)
+            self.switch.set_access_vlan("ge-0/0/2", vlan)
+
+        assert_that(self.switch.get_interface("ge-0/0/1").access_vlan, equal_to(10))
+        assert_that(self.switch.get_interface("ge-0/0/2").access_vlan, equal_to(10))
+
+    def test_a_range_of_members_drops_the_cached_interface(self):
+        self.netconf_mock.should_receive("get_config").twice().and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>VLAN1000</name>
+                <vlan-id>1000</vlan-id>
+              </vlan>
+              <vlan>
+                <name>VLAN1001</name>
+                <vlan-id>1001</vlan-id>
+              </vlan>
+            </vlans>
+            <interfaces>
+              <interface>
+                <name>ge-0/0/1</name>
+                <unit>
+                  <name>0</name>
+                  <family>
+                    <ethernet-switching>
+                      <port-mode>trunk</port-mode>
+                    </ethernet-switching>
+                  </family>
+                </unit>
+              </interface>
+            </interfaces>
+        """))
+        self.netconf_mock.should_receive("edit_config").once().and_return(an_ok_response())
+
+        self.switch.add_trunk_vlans("ge-0/0/1", [1000, 1001])
+        self.switch.get_interface("ge-0/0/1")
+
+    def test_deleting_what_the_candidate_cache_does_not_hold_drops_the_section(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).twice().and_return(a_configuration("""
+            <interfaces>
+              <interface>
+                <name>ge-0/0/1</name>
+              </interface>
+            </interfaces>
+        """))
+
+        self.switch.get_vlans()
+
+        self.switch.candidate_cache.apply(to_ele("""
+            <configuration>
+              <interfaces>
+                <interface>
+                  <name>ge-0/0/1</name>
+                  <native-vlan-id operation="delete" />
+                </interface>
+              </interfaces>
+            </configuration>
+        """))
+
+        self.switch.get_vlans()
+
+    def test_failing_push_drops_the_candidate_cache(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).twice().and_return(a_configuration())
+
+        self.switch.get_vlans()
+
+        self.netconf_mock.should_receive("edit_config").once().and_raise(RPCError(to_ele(textwrap.dedent("""
+            <rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/11.4R1/junos" xmlns:nc="urn:ietf:params:xml:ns:netconf:base:1.0">
+            <error-severity>error</error-severity>
+            <error-message>
+            Whatever right?
+            </error-message>
+            </rpc-error>
+            """))))
+
+        with self.assertRaises(UnknownInterface):
+            self.switch.set_interface_description("ge-0/0/1", "hello")
+
+        self.switch.get_vlans()
+
+    def test_commit_and_rollback_drop_the_candidate_cache(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).times(3).and_return(a_configuration())
+        self.netconf_mock.should_receive("commit").once()
+        self.netconf_mock.should_receive("discard_changes").once()
+
+        self.switch.get_vlans()
+        self.switch.commit_transaction()
+        self.switch.get_vlans()
+        self.switch.rollback_transaction()
+        self.switch.get_vlans()
+
+    def test_reads_outside_a_transaction_are_not_cached(self):
+        self.switch.in_transaction = False
+
+        self.netconf_mock.should_receive("get_config").with_args(source="running", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).twice().and_return(a_configuration())
+
+        self.switch.get_vlans()
+        self.switch.get_vlans()
+
+    def test_get_mac_addresses(self):
+        self.netconf_mock.should_receive("rpc").with_args(is_xml("""
+                    <get-ethernet-switching-table-information>
+                        <detail/>
+                    </get-ethernet-switching-table-information>
+                """)).and_return(an_rpc_response(textwrap.dedent("""
+                  <ethernet-switching-table-information style="extensive">
+                    <ethernet-switching-table style="extensive">
+                      <mac-table-count>385</mac-table-count>
                       <mac-table-learned>181</mac-table-learned>
                       <mac-table-persistent>0</mac-table-persistent>
                       <mac-table-entry style="extensive">
@@ -6712,6 +8136,330 @@ class JuniperTest(unittest.TestCase):
                 self.assert_(False, "Invalid mac_address returned : {}".format(mac_address.mac_address))
 
 
+class JuniperDeferredEditsTest(unittest.TestCase):
+
+    def setUp(self):
+        interface_inventory.clear()
+        self.switch = juniper.standard.netconf(SwitchDescriptor(model='juniper', hostname="toto"), deferred_edits=True)
+
+        self.netconf_mock = flexmock()
+        self.switch.netconf = self.netconf_mock
+        self.switch.in_transaction = True
+
+    def tearDown(self):
+        flexmock_teardown()
+
+    def test_updates_are_sent_together_before_committing(self):
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                    <description>Hey</description>
+                    <mtu>5000</mtu>
+                  </interface>
+                  <interface>
+                    <name>ge-0/0/2</name>
+                    <description>Ho</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("commit").once().ordered()
+
+        self.switch.set_interface_description("ge-0/0/1", "Hey")
+        self.switch.set_interface_description("ge-0/0/2", "Ho")
+        self.switch.set_interface_mtu("ge-0/0/1", 5000)
+
+        self.switch.commit_transaction()
+
+    def test_updates_that_cannot_be_merged_are_sent_one_by_one(self):
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                    <description>Hey</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                    <description operation="delete" />
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("commit").once().ordered()
+
+        self.switch.set_interface_description("ge-0/0/1", "Hey")
+        self.switch.unset_interface_description("ge-0/0/1")
+
+        self.switch.commit_transaction()
+
+    def test_pending_updates_are_sent_before_reading_the_sections_they_change(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).once().ordered().and_return(a_configuration())
+        self.netconf_mock.should_receive("edit_config").once().ordered().and_return(an_ok_response())
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans />
+                <interfaces />
+              </configuration>
+            </filter>
+        """)).once().ordered().and_return(a_configuration("""
+            <vlans>
+              <vlan>
+                <name>VLAN1000</name>
+                <vlan-id>1000</vlan-id>
+              </vlan>
+            </vlans>
+        """))
+
+        self.switch.get_vlans()
+        self.switch.add_vlan(1000)
+
+        assert_that([vlan.number for vlan in self.switch.get_vlans()], equal_to([1000]))
+
+    def test_a_single_update_is_sent_as_is(self):
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                    <description>Hey</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("commit").once().ordered()
+
+        self.switch.set_interface_description("ge-0/0/1", "Hey")
+
+        self.switch.commit_transaction()
+
+    def test_a_failing_update_raises_the_error_of_the_operation_that_made_it(self):
+        self.netconf_mock.should_receive("get_config").and_return(a_configuration())
+
+        self.netconf_mock.should_receive("edit_config").once().ordered().and_raise(a_port_value_outside_range_rpc_error())
+        self.netconf_mock.should_receive("discard_changes").once().ordered()
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <vlans>
+                  <vlan>
+                    <name>VLAN1000</name>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                </vlans>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                    <description>Hey</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_raise(a_port_value_outside_range_rpc_error())
+        self.netconf_mock.should_receive("commit").never()
+
+        self.switch.add_vlan(1000)
+        self.switch.set_interface_description("ge-0/0/99", "Hey")
+
+        with self.assertRaises(UnknownInterface) as expect:
+            self.switch.commit_transaction()
+
+        assert_that(str(expect.exception), equal_to("Unknown interface ge-0/0/99"))
+
+    def test_the_updates_queued_after_a_failing_one_are_still_sent(self):
+        self.netconf_mock.should_receive("edit_config").once().ordered().and_raise(a_port_value_outside_range_rpc_error())
+        self.netconf_mock.should_receive("discard_changes").once().ordered()
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                    <description>Hey</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                    <description>Ho</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_raise(a_port_value_outside_range_rpc_error())
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/2</name>
+                    <mtu>5000</mtu>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("commit").once().ordered()
+
+        self.switch.set_interface_description("ge-0/0/1", "Hey")
+        self.switch.set_interface_description("ge-0/0/99", "Ho")
+        self.switch.set_interface_mtu("ge-0/0/2", 5000)
+
+        with self.assertRaises(UnknownInterface):
+            self.switch.get_interface("ge-0/0/1")
+
+        self.switch.commit_transaction()
+
+    def test_the_candidate_is_restored_to_the_sent_updates_before_sending_the_updates_one_by_one(self):
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                    <description>Hey</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("get_config").once().ordered().and_return(a_configuration("""
+            <interfaces>
+              <interface>
+                <name>ge-0/0/1</name>
+                <description>Hey</description>
+              </interface>
+            </interfaces>
+        """))
+        self.netconf_mock.should_receive("edit_config").once().ordered().and_raise(a_port_value_outside_range_rpc_error())
+        self.netconf_mock.should_receive("discard_changes").once().ordered()
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                    <description>Hey</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/2</name>
+                    <description>Ho</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_return(an_ok_response())
+        self.netconf_mock.should_receive("edit_config").once().ordered().with_args(target="candidate", config=is_xml("""
+            <config>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/99</name>
+                    <description>Ho</description>
+                  </interface>
+                </interfaces>
+              </configuration>
+            </config>
+        """)).and_raise(a_port_value_outside_range_rpc_error())
+        self.netconf_mock.should_receive("commit").never()
+
+        self.switch.set_interface_description("ge-0/0/1", "Hey")
+        self.switch.get_interface("ge-0/0/1")
+        self.switch.set_interface_description("ge-0/0/2", "Ho")
+        self.switch.set_interface_description("ge-0/0/99", "Ho")
+
+        with self.assertRaises(UnknownInterface):
+            self.switch.commit_transaction()
+
+    def test_updates_are_sent_before_reading_what_the_cache_does_not_hold(self):
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <vlans>
+                  <vlan>
+                    <vlan-id>1000</vlan-id>
+                  </vlan>
+                </vlans>
+              </configuration>
+            </filter>
+        """)).once().ordered().and_return(a_configuration())
+        self.netconf_mock.should_receive("edit_config").once().ordered().and_return(an_ok_response())
+        self.netconf_mock.should_receive("get_config").with_args(source="candidate", filter=is_xml("""
+            <filter>
+              <configuration>
+                <interfaces>
+                  <interface>
+                    <name>ge-0/0/1</name>
+                  </interface>
+                </interfaces>
+                <vlans />
+              </configuration>
+            </filter>
+        """)).once().ordered().and_return(a_configuration("""
+            <interfaces>
+              <interface>
+                <name>ge-0/0/1</name>
+              </interface>
+            </interfaces>
+        """))
+
+        self.switch.add_vlan(1000)
+        self.switch.get_interface("ge-0/0/1")
+
+    def test_rollback_drops_the_pending_updates(self):
+        self.netconf_mock.should_receive("edit_config").never()
+        self.netconf_mock.should_receive("discard_changes").once()
+        self.netconf_mock.should_receive("commit").once()
+
+        self.switch.set_interface_description("ge-0/0/1", "Hey")
+        self.switch.rollback_transaction()
+        self.switch.commit_transaction()
+
+
 def a_configuration(inner_data=""):
     return an_rpc_response("""
         <data>
@@ -6720,6 +8468,17 @@ def a_configuration(inner_data=""):
         """.format(inner_data))
 
 
+def a_physical_interfaces_listing(*names):
+    return an_rpc_response("""
+        <interface-information style="terse">{}</interface-information>
+        """.format("".join("""
+          <physical-interface>
+            <name>{}</name>
+            <admin-status>up</admin-status>
+            <oper-status>down</oper-status>
+          </physical-interface>""".format(name) for name in names)))
+
+
 def an_ok_response():
     return an_rpc_response(textwrap.dedent("""
         <ok/>
@@ -37,7 +37,7 @@ class RemoteSwitchARPRoutingTest(unittest.TestCase):
             'Netman-Model': 'juniper',
             'Netman-Password': 'titi',
             'Netman-Username': 'tutu',
-            'Netman-Max-Version': "2",
+            'Netman-Max-Version': "3",
             'Netman-Verbose-Errors': 'yes',
         }
 
@@ -24,12 +24,14 @@ from flexmock import flexmock, flexmock_teardown
 from netman.core.objects.interface_states import OFF, ON
 from tests import ExactIpNetwork, ignore_deprecation_warnings
 from tests.api import open_fixture
+from netman.adapters.switches import remote
 from netman.adapters.switches.remote import RemoteSwitch, factory
 from netman.core.objects.access_groups import IN, OUT
 from netman.core.objects.exceptions import UnknownBond, VlanAlreadyExist, BadBondLinkSpeed, LockedSwitch, \
     NetmanException, UnknownInterface, UnknownSession, UnknownVlan, BadMplsIpState
 from netman.core.objects.port_modes import ACCESS, TRUNK, DYNAMIC
 from netman.core.objects.switch_descriptor import SwitchDescriptor
+from netman.core.objects.vlan_set import VlanSet
 
 
 class AnException(Exception):
@@ -63,10 +65,12 @@ class RemoteSwitchTest(unittest.TestCase):
             'Netman-Model': 'juniper',
             'Netman-Password': 'titi',
             'Netman-Username': 'tutu',
-            'Netman-Max-Version': "2",
+            'Netman-Max-Version': "3",
             'Netman-Verbose-Errors': 'yes',
         }
 
+        remote.conditional_replies.clear()
+
     def tearDown(self):
         flexmock_teardown()
 
@@ -89,7 +93,7 @@ class RemoteSwitchTest(unittest.TestCase):
             url=self.netman_url+'/switches-sessions/0123456789/actions',
             data='start_transaction',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -99,7 +103,7 @@ class RemoteSwitchTest(unittest.TestCase):
             url=self.netman_url+'/switches-sessions/0123456789/actions',
             data='commit',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -109,7 +113,7 @@ class RemoteSwitchTest(unittest.TestCase):
             url=self.netman_url+'/switches-sessions/0123456789/actions',
             data='end_transaction',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -118,7 +122,7 @@ class RemoteSwitchTest(unittest.TestCase):
         self.requests_mock.should_receive("delete").once().with_args(
             url=self.netman_url+'/switches-sessions/0123456789',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -169,7 +173,7 @@ class RemoteSwitchTest(unittest.TestCase):
         self.requests_mock.should_receive("delete").once().with_args(
             url=self.netman_url+'/switches-sessions/0123456789',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -229,7 +233,7 @@ class RemoteSwitchTest(unittest.TestCase):
             url=self.netman_url+'/switches-sessions/0123456789/actions',
             data='commit',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -261,7 +265,7 @@ class RemoteSwitchTest(unittest.TestCase):
             url=self.netman_url+'/switches-sessions/0123456789/actions',
             data='rollback',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -408,7 +412,7 @@ class RemoteSwitchTest(unittest.TestCase):
                 'Netman-Username': 'tutu',
                 'Netman-Verbose-Errors': 'yes',
                 'Netman-Proxy-Server': '1.2.3.4',
-                'Netman-Max-Version': "2",
+                'Netman-Max-Version': "3",
                 'Netman-Session-Id': '0123456789'
             },
             data=JsonData(hostname="toto")
@@ -420,7 +424,7 @@ class RemoteSwitchTest(unittest.TestCase):
         self.requests_mock.should_receive("delete").once().with_args(
             url=self.netman_url+'/switches-sessions/0123456789',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -451,7 +455,7 @@ class RemoteSwitchTest(unittest.TestCase):
                 'Netman-Username': 'tutu',
                 'Netman-Verbose-Errors': 'yes',
                 'Netman-Proxy-Server': '1.2.3.4,5.6.7.8',
-                'Netman-Max-Version': "2",
+                'Netman-Max-Version': "3",
                 'Netman-Session-Id': '0123456789'
             },
             data=JsonData(hostname="toto")
@@ -463,7 +467,7 @@ class RemoteSwitchTest(unittest.TestCase):
         self.requests_mock.should_receive("delete").once().with_args(
             url=self.netman_url+'/switches-sessions/0123456789',
             headers={'Netman-Verbose-Errors': "yes",
-                     'Netman-Max-Version': "2",
+                     'Netman-Max-Version': "3",
                      'Netman-Session-Id': '0123456789'}
         ).and_return(
             Reply(
@@ -503,6 +507,113 @@ class RemoteSwitchTest(unittest.TestCase):
         assert_that(vrrp_group.track_decrement, is_(50))
         assert_that(vlan1.varp_ips, is_([]))
 
+    def test_get_vlan_reuses_the_last_reply_when_not_modified(self):
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/vlans/1',
+            headers=self.headers
+        ).and_return(
+            Reply(
+                content=open_fixture('get_switch_hostname_vlans_vlan.json').read(),
+                status_code=200,
+                headers={'ETag': '"abc"'}))
+
+        first = self.switch.get_vlan(1)
+
+        conditional_headers = dict(self.headers)
+        conditional_headers['If-None-Match'] = '"abc"'
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/vlans/1',
+            headers=conditional_headers
+        ).and_return(
+            Reply(
+                content="",
+                status_code=304))
+
+        second = self.switch.get_vlan(1)
+
+        assert_that(second, equal_to(first))
+        assert_that(second.name, is_('One'))
+
+    def test_replies_are_revalidated_by_every_remote_switch_of_the_same_url_and_version(self):
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/vlans/1',
+            headers=self.headers
+        ).and_return(
+            Reply(
+                content=open_fixture('get_switch_hostname_vlans_vlan.json').read(),
+                status_code=200,
+                headers={'ETag': '"abc"'}))
+
+        self.switch.get_vlan(1)
+
+        conditional_headers = dict(self.headers)
+        conditional_headers['If-None-Match'] = '"abc"'
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/vlans/1',
+            headers=conditional_headers
+        ).and_return(
+            Reply(
+                content="",
+                status_code=304))
+
+        other_switch = RemoteSwitch(self.switch.switch_descriptor)
+        other_switch.requests = self.requests_mock
+
+        assert_that(other_switch.get_vlan(1).name, is_('One'))
+
+        older_headers = dict(self.headers)
+        older_headers['Netman-Max-Version'] = "2"
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/vlans/1',
+            headers=older_headers
+        ).and_return(
+            Reply(
+                content=open_fixture('get_switch_hostname_vlans_vlan.json').read(),
+                status_code=200))
+
+        older_switch = RemoteSwitch(self.switch.switch_descriptor)
+        older_switch.requests = self.requests_mock
+        older_switch.max_version = 2
+
+        older_switch.get_vlan(1)
+
+    def test_conditional_replies_keep_the_most_recently_used_urls(self):
+        replies = remote.ConditionalReplies(max_size=2)
+        replies.store("a", 1)
+        replies.store("b", 2)
+        replies.get("a")
+        replies.store("c", 3)
+
+        assert_that(replies.get("b"), is_(None))
+        assert_that(replies.get("a"), is_(1))
+        assert_that(replies.get("c"), is_(3))
+
+    def test_get_vlan_without_etag_is_not_conditional(self):
+        self.requests_mock.should_receive("get").twice().with_args(
+            url=self.netman_url+'/switches/toto/vlans/1',
+            headers=self.headers
+        ).and_return(
+            Reply(
+                content=open_fixture('get_switch_hostname_vlans_vlan.json').read(),
+                status_code=200))
+
+        self.switch.get_vlan(1)
+        self.switch.get_vlan(1)
+
+    def test_get_vlans_by_number(self):
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/vlans?numbers=1-2%2C10',
+            headers=self.headers
+        ).and_return(
+            Reply(
+                content=open_fixture('get_switch_hostname_vlans.json').read(),
+                status_code=200))
+
+        vlan1, vlan2 = self.switch.get_vlans_by_number([10, 2, 1])
+
+        assert_that(vlan1.number, is_(1))
+        assert_that(vlan2.number, is_(2))
+
     def test_get_vlans(self):
         self.requests_mock.should_receive("get").once().with_args(
             url=self.netman_url+'/switches/toto/vlans',
@@ -603,6 +714,23 @@ class RemoteSwitchTest(unittest.TestCase):
         assert_that(interface.force_up, equal_to(None))
         assert_that(interface.recovery_timeout, equal_to(None))
 
+    def test_get_interface_v3(self):
+        self.requests_mock.should_receive("get").once().with_args(
+                url=self.netman_url+'/switches/toto/interfaces/ethernet 1/4',
+                headers=self.headers
+        ).and_return(
+                Reply(
+                        headers={'Netman-Version': '3.0'},
+                        content=open_fixture('get_switch_hostname_interface_v3.json').read(),
+                        status_code=200))
+
+        interface = self.switch.get_interface('ethernet 1/4')
+
+        assert_that(interface.name, equal_to("ethernet 1/4"))
+        assert_that(interface.port_mode, equal_to(TRUNK))
+        assert_that(interface.trunk_native_vlan, equal_to(2999))
+        assert_that(interface.trunk_vlans, equal_to([3000, 3001, 3002]))
+
     def test_get_nonexistent_interface_raises(self):
         self.requests_mock.should_receive("get").once().with_args(
                 url=self.netman_url+'/switches/toto/interfaces/ethernet 1/INEXISTENT',
@@ -656,6 +784,32 @@ class RemoteSwitchTest(unittest.TestCase):
         assert_that(if4.shutdown, equal_to(False))
         assert_that(if4.bond_master, equal_to(12))
 
+    def test_get_interfaces_by_name(self):
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/interfaces?names=ethernet+1%2F4%2CFastEthernet0%2F3',
+            headers=self.headers
+        ).and_return(
+            Reply(
+                content=open_fixture('get_switch_hostname_interfaces.json').read(),
+                status_code=200))
+
+        interfaces = self.switch.get_interfaces_by_name(["ethernet 1/4", "FastEthernet0/3"])
+
+        assert_that(interfaces[0].name, equal_to("ethernet 1/4"))
+
+    def test_get_interfaces_by_name_prefix(self):
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/interfaces?name_prefix=ethernet+1%2F',
+            headers=self.headers
+        ).and_return(
+            Reply(
+                content=open_fixture('get_switch_hostname_interfaces.json').read(),
+                status_code=200))
+
+        interfaces = self.switch.get_interfaces_by_name_prefix("ethernet 1/")
+
+        assert_that(interfaces[0].name, equal_to("ethernet 1/4"))
+
     @ignore_deprecation_warnings
     def test_get_bond_v1(self):
         self.requests_mock.should_receive("get").once().with_args(
@@ -778,6 +932,30 @@ class RemoteSwitchTest(unittest.TestCase):
         assert_that(if3.trunk_vlans, equal_to([3000, 3001, 3002]))
         assert_that(if3.members, equal_to([]))
 
+    def test_get_bonds_v3(self):
+        self.requests_mock.should_receive("get").once().with_args(
+            url=self.netman_url+'/switches/toto/bonds',
+            headers=self.headers
+        ).and_return(
+            Reply(
+                headers={'Netman-Version': '3.0'},
+                content=open_fixture('get_switch_hostname_bonds_v3.json').read(),
+                status_code=200))
+
+        if1, if2, if3 = self.switch.get_bonds()
+
+        assert_that(if1.number, equal_to(3))
+        assert_that(if1.trunk_vlans, equal_to([]))
+
+        assert_that(if2.number, equal_to(4))
+        assert_that(if2.port_mode, equal_to(TRUNK))
+        assert_that(if2.trunk_native_vlan, equal_to(2999))
+        assert_that(if2.trunk_vlans, equal_to([3000, 3001, 3002]))
+        assert_that(if2.members, equal_to(['ge-0/0/1', 'ge-1/0/1']))
+
+        assert_that(if3.number, equal_to(6))
+        assert_that(if3.trunk_vlans, equal_to([3000, 3001, 3002]))
+
     def test_add_vlan(self):
         self.requests_mock.should_receive("post").once().with_args(
             url=self.netman_url+'/switches/toto/vlans',
@@ -832,6 +1010,29 @@ class RemoteSwitchTest(unittest.TestCase):
 
         self.switch.remove_vlan(2000)
 
+    def test_add_vlans(self):
+        self.requests_mock.should_receive("post").once().with_args(
+            url=self.netman_url+'/switches/toto/vlan-ranges',
+            headers=self.headers,
+            data='100-300,400'
+        ).and_return(
+            Reply(
+                content='',
+                status_code=201))
+
+        self.switch.add_vlans(VlanSet.from_ranges([(100, 300), (400, 400)]))
+
+    def test_remove_vlans(self):
+        self.requests_mock.should_receive("delete").once().with_args(
+            url=self.netman_url+'/switches/toto/vlan-ranges/10,100-102',
+            headers=self.headers,
+        ).and_return(
+            Reply(
+                content='',
+                status_code=204))
+
+        self.switch.remove_vlans([10, 100, 101, 102])
+
     def test_put_access_groups_in(self):
         self.requests_mock.should_receive("put").once().with_args(
             url=self.netman_url+'/switches/toto/vlans/2500/access-groups/in',
@@ -1093,6 +1294,29 @@ class RemoteSwitchTest(unittest.TestCase):
 
         self.switch.remove_trunk_vlan("ge-0/0/6", 1000)
 
+    def test_add_trunk_vlans(self):
+        self.requests_mock.should_receive("post").once().with_args(
+            url=self.netman_url+'/switches/toto/interfaces/ge-0/0/6/trunk-vlan-ranges',
+            headers=self.headers,
+            data='10-20,30'
+        ).and_return(
+            Reply(
+                content='',
+                status_code=204))
+
+        self.switch.add_trunk_vlans("ge-0/0/6", VlanSet.from_ranges([(10, 20), (30, 30)]))
+
+    def test_remove_trunk_vlans(self):
+        self.requests_mock.should_receive("delete").once().with_args(
+            url=self.netman_url+'/switches/toto/interfaces/ge-0/0/6/trunk-vlan-ranges/10-11,30',
+            headers=self.headers
+        ).and_return(
+            Reply(
+                content='',
+                status_code=204))
+
+        self.switch.remove_trunk_vlans("ge-0/0/6", [10, 11, 30])
+
     def test_add_bond_trunk_vlan(self):
         self.requests_mock.should_receive("post").once().with_args(
             url=self.netman_url+'/switches/toto/bonds/123/trunk-vlans',
@@ -1232,6 +1456,31 @@ class RemoteSwitchTest(unittest.TestCase):
 
         self.switch.edit_interface_spanning_tree("ge-0/0/6")
 
+    def test_edit_interfaces(self):
+        self.requests_mock.should_receive("put").once().with_args(
+            url=self.netman_url+'/switches/toto/interfaces',
+            headers=self.headers,
+            data=json.dumps({"interfaces": ["ge-0/0/6", "ge-0/0/7"], "description": "servers", "shutdown": True,
+                             "mtu": 5000, "access_vlan": 1000})
+        ).and_return(
+            Reply(
+                content='',
+                status_code=204))
+
+        self.switch.edit_interfaces(["ge-0/0/6", "ge-0/0/7"], description="servers", state=OFF, mtu=5000, access_vlan=1000)
+
+    def test_edit_interfaces_sends_only_the_given_attributes(self):
+        self.requests_mock.should_receive("put").once().with_args(
+            url=self.netman_url+'/switches/toto/interfaces',
+            headers=self.headers,
+            data=json.dumps({"interfaces": ["ge-0/0/6"], "shutdown": False})
+        ).and_return(
+            Reply(
+                content='',
+                status_code=204))
+
+        self.switch.edit_interfaces(["ge-0/0/6"], state=ON)
+
     def test_enable_interface(self):
         self.requests_mock.should_receive("put").once().with_args(
             url=self.netman_url+'/switches/toto/interfaces/ge-0/0/6/shutdown',
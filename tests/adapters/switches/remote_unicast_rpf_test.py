@@ -23,7 +23,7 @@ class RemoteSwitchUnicastRpfTest(unittest.TestCase):
             'Netman-Model': 'juniper',
             'Netman-Password': 'titi',
             'Netman-Username': 'tutu',
-            'Netman-Max-Version': "2",
+            'Netman-Max-Version': "3",
             'Netman-Verbose-Errors': 'yes',
         }
 
@@ -0,0 +1,66 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from hamcrest import assert_that, is_
+
+from netman.adapters.switches.util import VlanInterfacesIndex
+from netman.core.objects.vlan_set import VlanSet
+
+
+class VlanInterfacesIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = VlanInterfacesIndex()
+
+    def test_is_not_loaded_until_members_are_given(self):
+        assert_that(self.index.loaded, is_(False))
+
+        self.index.load([])
+
+        assert_that(self.index.loaded, is_(True))
+
+    def test_lists_the_interfaces_carrying_a_vlan_in_the_order_they_were_given(self):
+        self.index.load([("ge-0/0/2", VlanSet.from_ranges([(1, 4094)])),
+                         ("ge-0/0/1", VlanSet([10])),
+                         ("ge-0/0/3", VlanSet([20]))])
+
+        assert_that(self.index.interfaces_of(10), is_(["ge-0/0/2", "ge-0/0/1"]))
+        assert_that(self.index.interfaces_of(20), is_(["ge-0/0/2", "ge-0/0/3"]))
+        assert_that(self.index.interfaces_of(4095), is_([]))
+
+    def test_answers_are_copies(self):
+        self.index.load([("ge-0/0/1", VlanSet([10]))])
+
+        self.index.interfaces_of(10).append("ge-0/0/2")
+
+        assert_that(self.index.interfaces_of(10), is_(["ge-0/0/1"]))
+
+    def test_knows_every_vlan_unless_told_which_exist(self):
+        self.index.load([])
+        assert_that(self.index.knows(10), is_(True))
+
+        self.index.load([], known_vlans=VlanSet([20]))
+        assert_that(self.index.knows(10), is_(False))
+        assert_that(self.index.knows(20), is_(True))
+
+    def test_invalidate_forgets_everything(self):
+        self.index.load([("ge-0/0/1", VlanSet([10]))], known_vlans=VlanSet([10]))
+        self.index.interfaces_of(10)
+
+        self.index.invalidate()
+
+        assert_that(self.index.loaded, is_(False))
+        assert_that(self.index.knows(30), is_(True))
@@ -0,0 +1,158 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from flexmock import flexmock, flexmock_teardown
+from hamcrest import assert_that, equal_to, is_, contains_string
+
+from netman.api.job_api import JobApi
+from netman.api.switch_api import SwitchApi
+from netman.core.job_manager import JobManager
+from netman.core.objects.exceptions import UnknownSession, UnknownVlan
+from netman.core.objects.mac_address import MacAddress
+from netman.core.objects.switch_descriptor import SwitchDescriptor
+from tests.api import matches_fixture
+from tests.api.base_api_test import BaseApiTest
+
+
+class JobApiTest(BaseApiTest):
+    def setUp(self):
+        super(JobApiTest, self).setUp()
+
+        self.switch_factory = flexmock()
+        self.switch_mock = flexmock()
+        self.session_manager = flexmock()
+        self.session_manager.should_receive("get_switch_for_session").and_raise(UnknownSession("patate"))
+        self.job_manager = JobManager(workers=1, max_jobs=1)
+
+        SwitchApi(self.switch_factory, self.session_manager).hook_to(self.app)
+        JobApi(self.job_manager).hook_to(self.app)
+
+    def tearDown(self):
+        flexmock_teardown()
+
+    def test_submit_job_and_get_its_result(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_mac_addresses').and_return([
+            MacAddress(1234, "AA:AA:AA:AA:AA:AA", "1/g1", "Physical")
+        ]).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.post("/jobs", fixture="post_jobs.json")
+
+        assert_that(code, equal_to(202))
+        self.job_manager.queue.join()
+
+        result, code = self.get("/jobs/{}".format(result["job_id"]))
+
+        assert_that(code, equal_to(200))
+        result["id"] = "0bc9f2b6-6a2f-4f1d-9f5e-0e9be7bd2c41"
+        assert_that(result, matches_fixture("get_jobs_job_id.json"))
+
+    def test_submit_job_passes_netman_headers_and_body(self):
+        self.switch_factory.should_receive('get_switch_by_descriptor').with_args(SwitchDescriptor(
+            hostname='my.switch',
+            model='cisco',
+            username='me',
+            password='secret',
+            port=None,
+            netman_server=None)).once().ordered().and_return(self.switch_mock)
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('add_vlan').with_args(2000, "two_thousand").once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.post("/jobs", data={
+            "method": "post",
+            "resource": "/switches/my.switch/vlans",
+            "body": {"number": 2000, "name": "two_thousand"}
+        }, headers={"Netman-Model": "cisco", "Netman-Username": "me", "Netman-Password": "secret"})
+
+        assert_that(code, equal_to(202))
+        self.job_manager.queue.join()
+
+        result, code = self.get("/jobs/{}".format(result["job_id"]))
+
+        assert_that(result["status"], is_("done"))
+        assert_that(result["result"], is_({"code": 201, "content": None}))
+
+    def test_a_failed_operation_is_reported_in_the_result(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock)
+        self.switch_mock.should_receive('connect')
+        self.switch_mock.should_receive('remove_vlan').with_args(2000).and_raise(UnknownVlan(2000))
+        self.switch_mock.should_receive('disconnect')
+
+        result, code = self.post("/jobs", data={"method": "DELETE", "resource": "switches/my.switch/vlans/2000"})
+        self.job_manager.queue.join()
+
+        result, code = self.get("/jobs/{}".format(result["job_id"]))
+
+        assert_that(result["result"], is_({"code": 404, "content": {"error": "Vlan 2000 not found"}}))
+
+    def test_submit_job_with_a_text_body(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock)
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('set_interface_description').with_args("xe-1/0/1", "Hey").once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.post("/jobs", data={
+            "method": "PUT",
+            "resource": "switches/my.switch/interfaces/xe-1/0/1/description",
+            "body": "Hey"
+        })
+        self.job_manager.queue.join()
+
+        result, code = self.get("/jobs/{}".format(result["job_id"]))
+
+        assert_that(result["result"], is_({"code": 204, "content": None}))
+
+    def test_a_reply_that_is_not_json_is_reported_as_text(self):
+        result, code = self.post("/jobs", data={"method": "GET", "resource": "switches/my.switch/patate"})
+        self.job_manager.queue.join()
+
+        result, code = self.get("/jobs/{}".format(result["job_id"]))
+
+        assert_that(result["status"], is_("done"))
+        assert_that(result["result"]["code"], is_(404))
+        assert_that(result["result"]["content"], contains_string("Not Found"))
+
+    def test_submit_job_refuses_resources_other_than_switches(self):
+        result, code = self.post("/jobs", data={"method": "GET", "resource": "jobs/patate"})
+
+        assert_that(code, equal_to(400))
+        assert_that(result, equal_to({"error": "Jobs can only run operations on switches resources"}))
+
+    def test_submit_job_refuses_switch_sessions_resources(self):
+        result, code = self.post("/jobs", data={"method": "GET", "resource": "switches-sessions/my.session/vlans"})
+
+        assert_that(code, equal_to(400))
+        assert_that(result, equal_to({"error": "Jobs can only run operations on switches resources"}))
+
+    def test_submit_job_refuses_unknown_methods(self):
+        result, code = self.post("/jobs", data={"method": "PATCH", "resource": "switches/my.switch/vlans"})
+
+        assert_that(code, equal_to(400))
+
+    def test_submit_job_when_too_many_jobs_are_pending(self):
+        self.job_manager.jobs["patate"] = flexmock(finished_at=None)
+
+        result, code = self.post("/jobs", fixture="post_jobs.json")
+
+        assert_that(code, equal_to(409))
+        assert_that(result, equal_to({"error": "Too many unfinished jobs, the limit is 1"}))
+
+    def test_get_unknown_job(self):
+        result, code = self.get("/jobs/patate")
+
+        assert_that(code, equal_to(404))
+        assert_that(result, equal_to({"error": "Job \"patate\" not found."}))
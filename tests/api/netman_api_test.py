@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from hamcrest import assert_that
+from hamcrest import assert_that, contains_string, equal_to, is_
 from mock import Mock
 
 from netman.adapters.threading_lock_factory import ThreadingLockFactory
@@ -20,6 +20,7 @@ from netman.core.switch_factory import SwitchFactory
 from pkg_resources import Distribution
 
 from netman.api.netman_api import NetmanApi
+from netman.core import metrics
 from tests.api import matches_fixture
 from tests.api.base_api_test import BaseApiTest
 
@@ -35,3 +36,43 @@ class NetmanApiTest(BaseApiTest):
         data, code = self.get("/netman/info")
 
         assert_that(data, matches_fixture("get_info.json"))
+
+    def test_get_metrics(self):
+        NetmanApi(SwitchFactory(None, ThreadingLockFactory())).hook_to(self.app)
+
+        with metrics.operation("cisco", "get_vlans"):
+            with metrics.timed("ssh", "show vlan"):
+                pass
+
+        with self.app.test_client() as http_client:
+            result = http_client.get("/netman/metrics")
+
+        assert_that(result.status_code, equal_to(200))
+        assert_that(result.headers["Content-Type"], contains_string("text/plain"))
+        assert_that(result.data, contains_string('netman_command_duration_seconds_count{kind="ssh",model="cisco",operation="get_vlans"}'))
+
+    def test_responses_have_a_timing_breakdown(self):
+        NetmanApi(SwitchFactory(None, ThreadingLockFactory())).hook_to(self.app)
+
+        def get_vlans():
+            with metrics.operation("cisco", "get_vlans"):
+                for command in ["terminal length 0", "show vlan"]:
+                    with metrics.timed("ssh", command):
+                        pass
+            return ""
+
+        self.app.add_url_rule('/vlans', view_func=get_vlans)
+
+        with self.app.test_client() as http_client:
+            result = http_client.get("/vlans")
+
+        assert_that(result.headers["Server-Timing"], contains_string('get_vlans.ssh;dur='))
+        assert_that(result.headers["Server-Timing"], contains_string(';desc="2 commands"'))
+
+    def test_responses_without_commands_have_no_timing_breakdown(self):
+        NetmanApi(SwitchFactory(None, ThreadingLockFactory())).hook_to(self.app)
+
+        with self.app.test_client() as http_client:
+            result = http_client.get("/netman/metrics")
+
+        assert_that(result.headers.get("Server-Timing"), is_(None))
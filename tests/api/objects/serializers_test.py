@@ -0,0 +1,105 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from hamcrest import assert_that, equal_to, is_, has_length, is_not, is_in
+
+from netman.api.objects import MAX_PLANS, Serializer, Serializers, base_interface, bond, interface
+from netman.core.objects.bond import Bond
+from netman.core.objects.interface import Interface
+from netman.core.objects.port_modes import TRUNK
+
+
+class SerializersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.v1 = VersionedSerializer(since_version=1)
+        self.v2 = VersionedSerializer(since_version=2)
+        self.serializers = Serializers(self.v1, self.v2)
+
+    def test_at_most_picks_the_latest_serializer_allowed_by_the_version(self):
+        assert_that(self.serializers.at_most(None), is_(self.v1))
+        assert_that(self.serializers.at_most("1"), is_(self.v1))
+        assert_that(self.serializers.at_most("1.5"), is_(self.v1))
+        assert_that(self.serializers.at_most("2"), is_(self.v2))
+        assert_that(self.serializers.at_most("3.1"), is_(self.v2))
+
+    def test_the_serializer_of_a_version_is_resolved_once(self):
+        self.serializers.at_most("2")
+        self.serializers.serializers = []
+
+        assert_that(self.serializers.at_most("2"), is_(self.v2))
+
+    def test_to_api_list_uses_the_serializer_of_the_version(self):
+        assert_that(self.serializers.to_api_list(["a", "b"], version="2"), equal_to([(2, "a"), (2, "b")]))
+        assert_that(self.serializers.to_api_list(["a"]), equal_to([(1, "a")]))
+
+    def test_bonds_in_bulk_are_serialized_like_one_at_a_time(self):
+        bonds = [Bond(number=i, port_mode=TRUNK, trunk_vlans=[3, 1, 2], members=["ge-0/0/{}".format(i)])
+                 for i in range(3)]
+
+        for version in [None, "1", "2"]:
+            assert_that(bond.to_api_list(bonds, version=version),
+                        equal_to([bond.to_api(b, version=version) for b in bonds]))
+
+    def test_interfaces_in_bulk_are_serialized_like_merging_dictionaries(self):
+        interfaces = [Interface(name="ge-0/0/{}".format(i), port_mode=TRUNK, trunk_vlans=range(1, 50))
+                      for i in range(3)]
+
+        assert_that(interface.to_api_list(interfaces), equal_to([merged_interface_to_api(i) for i in interfaces]))
+
+    def test_the_plans_of_versions_already_seen_are_reused(self):
+        self.serializers.at_most("2")
+        self.serializers.at_most("2")
+        self.serializers.at_most("1.5")
+
+        assert_that(self.serializers.plans, equal_to({None: self.v1, "2": self.v2, "1.5": self.v1}))
+
+    def test_the_plans_are_bounded(self):
+        versions = ["1.{}".format(i) for i in range(MAX_PLANS * 2)]
+        for version in versions:
+            self.serializers.at_most(version)
+
+        assert_that(self.serializers.plans, has_length(MAX_PLANS))
+        assert_that(self.serializers.at_most(versions[-1]), is_(self.v1))
+        assert_that(self.serializers.at_most("2.5"), is_(self.v2))
+        assert_that(self.serializers.plans, has_length(MAX_PLANS))
+        assert_that("2.5", is_not(is_in(self.serializers.plans)))
+
+
+class VersionedSerializer(Serializer):
+    def __init__(self, since_version):
+        self.since_version = since_version
+
+    def to_api(self, core_object):
+        return self.since_version, core_object
+
+
+def merged_interface_to_api(i):
+    return dict(
+        dict(
+            shutdown=i.shutdown,
+            port_mode=base_interface.serialized_port_mode[i.port_mode],
+            access_vlan=i.access_vlan,
+            trunk_native_vlan=i.trunk_native_vlan,
+            trunk_vlans=sorted(i.trunk_vlans),
+            mtu=i.mtu
+        ),
+        name=i.name,
+        bond_master=i.bond_master,
+        auto_negotiation=i.auto_negotiation,
+        force_up=i.force_up,
+        recovery_timeout=i.recovery_timeout
+    )
@@ -14,7 +14,7 @@
 import json
 
 from flexmock import flexmock, flexmock_teardown
-from hamcrest import assert_that, equal_to, is_
+from hamcrest import assert_that, equal_to, is_, is_not
 from netaddr import IPNetwork
 from netaddr.ip import IPAddress
 
@@ -35,6 +35,7 @@ from netman.core.objects.exceptions import IPNotAvailable, UnknownIP, UnknownVla
 from netman.core.objects.interface import Interface
 from netman.core.objects.port_modes import ACCESS, TRUNK, DYNAMIC, BOND_MEMBER
 from netman.core.objects.vlan import Vlan
+from netman.core.objects.vlan_set import VlanSet
 from netman.core.objects.bond import Bond
 
 
@@ -120,6 +121,177 @@ class SwitchApiTest(BaseApiTest):
         assert_that(code, equal_to(200))
         assert_that(result, equal_to([]))
 
+    def test_get_vlans_returns_an_etag_of_the_content(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock)
+        self.switch_mock.should_receive('connect')
+        self.switch_mock.should_receive('get_vlans').and_return([Vlan(1, "One")])
+        self.switch_mock.should_receive('disconnect')
+
+        with self.app.test_client() as http_client:
+            first = http_client.get("/switches/my.switch/vlans")
+            second = http_client.get("/switches/my.switch/vlans")
+
+        assert_that(first.status_code, equal_to(200))
+        assert_that(first.headers.get("ETag"), is_not(None))
+        assert_that(second.headers.get("ETag"), equal_to(first.headers.get("ETag")))
+        assert_that(first.headers.get("Vary"), equal_to("Netman-Max-Version"))
+
+    def test_get_vlans_is_not_modified_when_etag_matches(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock)
+        self.switch_mock.should_receive('connect')
+        self.switch_mock.should_receive('get_vlans').and_return([Vlan(1, "One")]).and_return([Vlan(1, "One")]).and_return([Vlan(1, "Two")])
+        self.switch_mock.should_receive('disconnect')
+
+        with self.app.test_client() as http_client:
+            etag = http_client.get("/switches/my.switch/vlans").headers["ETag"]
+            not_modified = http_client.get("/switches/my.switch/vlans", headers={"If-None-Match": etag})
+            modified = http_client.get("/switches/my.switch/vlans", headers={"If-None-Match": etag})
+
+        assert_that(not_modified.status_code, equal_to(304))
+        assert_that(not_modified.data, equal_to(""))
+        assert_that(modified.status_code, equal_to(200))
+        assert_that(json.loads(modified.data)[0]["name"], equal_to("Two"))
+
+    def test_get_interfaces_is_not_modified_when_etag_matches(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock)
+        self.switch_mock.should_receive('connect')
+        self.switch_mock.should_receive('get_interfaces').and_return([Interface(name="ethernet 1/1", port_mode=ACCESS)])
+        self.switch_mock.should_receive('disconnect')
+
+        with self.app.test_client() as http_client:
+            etag = http_client.get("/switches/my.switch/interfaces").headers["ETag"]
+            result = http_client.get("/switches/my.switch/interfaces", headers={"If-None-Match": etag})
+
+        assert_that(result.status_code, equal_to(304))
+
+    def test_errors_have_no_etag(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock)
+        self.switch_mock.should_receive('connect')
+        self.switch_mock.should_receive('get_vlan').with_args(4000).and_raise(UnknownVlan('4000'))
+        self.switch_mock.should_receive('disconnect')
+
+        with self.app.test_client() as http_client:
+            result = http_client.get("/switches/my.switch/vlans/4000")
+
+        assert_that(result.status_code, equal_to(404))
+        assert_that(result.headers.get("ETag"), is_(None))
+
+    def test_get_vlans_with_fields_and_name_prefix(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_vlans').and_return([
+            Vlan(3, "web-3"), Vlan(1, "web-1"), Vlan(2, "db-2"), Vlan(4)
+        ]).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.get("/switches/my.switch/vlans?fields=number,name&name_prefix=web-")
+
+        assert_that(code, equal_to(200))
+        assert_that(result, equal_to([
+            {"number": 1, "name": "web-1"},
+            {"number": 3, "name": "web-3"}
+        ]))
+
+    def test_get_vlans_with_unknown_fields(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock)
+        self.switch_mock.should_receive('get_vlans').never()
+
+        result, code = self.get("/switches/my.switch/vlans?fields=number,patate")
+
+        assert_that(code, equal_to(400))
+        assert_that(result, equal_to({"error": "Unknown fields : patate"}))
+
+    def test_get_interfaces_with_unknown_fields(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock)
+        self.switch_mock.should_receive('get_interfaces').never()
+
+        result, code = self.get("/switches/my.switch/interfaces?fields=name,patate&name_prefix=nothing")
+
+        assert_that(code, equal_to(400))
+        assert_that(result, equal_to({"error": "Unknown fields : patate"}))
+
+    def test_get_interfaces_with_filters(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_interfaces').never()
+        self.switch_mock.should_receive('get_interfaces_by_name_prefix').with_args("ge-0/0/").and_return([
+            Interface(name="ge-0/0/1", port_mode=TRUNK, trunk_vlans=[1200, 1201]),
+            Interface(name="ge-0/0/2", port_mode=TRUNK, trunk_native_vlan=1200),
+            Interface(name="ge-0/0/3", port_mode=TRUNK, trunk_vlans=[1300]),
+            Interface(name="ge-0/0/4", port_mode=ACCESS, access_vlan=1200)
+        ]).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.get("/switches/my.switch/interfaces?name_prefix=ge-0/0/&port_mode=trunk&vlan=1200&fields=name")
+
+        assert_that(code, equal_to(200))
+        assert_that(result, equal_to([{"name": "ge-0/0/1"}, {"name": "ge-0/0/2"}]))
+
+    def test_get_vlans_by_number(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_vlans').never()
+        self.switch_mock.should_receive('get_vlans_by_number').with_args(VlanSet([10, 20, 21, 22])).and_return([
+            Vlan(20, "twenty"), Vlan(10, "ten")
+        ]).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.get("/switches/my.switch/vlans?numbers=10,20-22&fields=number,name")
+
+        assert_that(code, equal_to(200))
+        assert_that(result, equal_to([
+            {"number": 10, "name": "ten"},
+            {"number": 20, "name": "twenty"}
+        ]))
+
+    def test_get_vlans_by_number_with_invalid_numbers(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('get_vlans_by_number').never()
+
+        result, code = self.get("/switches/my.switch/vlans?numbers=10,patate")
+
+        assert_that(code, equal_to(400))
+
+    def test_get_interfaces_by_name(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_interfaces').never()
+        self.switch_mock.should_receive('get_interfaces_by_name').with_args(["ge-0/0/2", "ge-0/0/1"]).and_return([
+            Interface(name="ge-0/0/2", port_mode=ACCESS, access_vlan=1200),
+            Interface(name="ge-0/0/1", port_mode=TRUNK, trunk_vlans=[1200])
+        ]).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.get("/switches/my.switch/interfaces?names=ge-0/0/2,ge-0/0/1&fields=name")
+
+        assert_that(code, equal_to(200))
+        assert_that(result, equal_to([{"name": "ge-0/0/1"}, {"name": "ge-0/0/2"}]))
+
+    def test_get_interfaces_by_name_without_names(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('get_interfaces_by_name').never()
+
+        result, code = self.get("/switches/my.switch/interfaces?names=,")
+
+        assert_that(code, equal_to(400))
+
+    def test_get_interfaces_with_an_invalid_port_mode_filter(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('get_interfaces').never()
+
+        result, code = self.get("/switches/my.switch/interfaces?port_mode=patate")
+
+        assert_that(code, equal_to(400))
+        assert_that(result, equal_to({"error": "Unknown port mode : patate"}))
+
+    def test_get_interfaces_with_an_invalid_vlan_filter(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('get_interfaces').never()
+
+        result, code = self.get("/switches/my.switch/interfaces?vlan=5000")
+
+        assert_that(code, equal_to(400))
+
     def test_get_vlan_interfaces(self):
         self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
         self.switch_mock.should_receive('connect').once().ordered()
@@ -158,6 +330,21 @@ class SwitchApiTest(BaseApiTest):
         assert_that(code, equal_to(200))
         assert_that(result, matches_fixture("get_switch_hostname_interface.json"))
 
+    def test_single_interfaces_serialization_v3(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_interface').with_args('ethernet 1/4').and_return(
+            Interface(name="ethernet 1/4", shutdown=False, port_mode=TRUNK, trunk_native_vlan=2999,
+                      trunk_vlans=[3001, 3000, 3002], mtu=1500),
+        ).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.get("/switches/my.switch/interfaces/ethernet 1/4",
+                                headers={"Netman-Max-Version": "3"})
+
+        assert_that(code, equal_to(200))
+        assert_that(result, matches_fixture("get_switch_hostname_interface_v3.json"))
+
     def test_single_interfaces_is_inexistent(self):
         self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
         self.switch_mock.should_receive('connect').once().ordered()
@@ -189,6 +376,24 @@ class SwitchApiTest(BaseApiTest):
         assert_that(code, equal_to(200))
         assert_that(result, matches_fixture("get_switch_hostname_interfaces.json"))
 
+    def test_interfaces_serialization_v3(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_interfaces').and_return([
+            Interface(name="FastEthernet0/3", shutdown=True, port_mode=ACCESS, access_vlan=1999),
+            Interface(name="GigabitEthernet0/6", shutdown=False, port_mode=DYNAMIC, access_vlan=1999, trunk_native_vlan=2999, trunk_vlans=[3001, 3000, 3002],
+                      auto_negotiation=True),
+            Interface(name="ethernet 1/4", shutdown=False, port_mode=TRUNK, trunk_native_vlan=2999, trunk_vlans=[3001, 3000, 3002], mtu=1500),
+            Interface(name="GigabitEthernet0/8", shutdown=False, bond_master=12, port_mode=BOND_MEMBER, trunk_native_vlan=None, trunk_vlans=[],
+                      auto_negotiation=False),
+        ]).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.get("/switches/my.switch/interfaces", headers={"Netman-Max-Version": "3"})
+
+        assert_that(code, equal_to(200))
+        assert_that(result, matches_fixture("get_switch_hostname_interfaces_v3.json"))
+
     def test_add_vlan(self):
         self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
         self.switch_mock.should_receive('connect').once().ordered()
@@ -266,6 +471,34 @@ class SwitchApiTest(BaseApiTest):
 
         assert_that(code, equal_to(204))
 
+    def test_add_vlans(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('add_vlans').with_args(VlanSet.from_ranges([(100, 300), (400, 400)])).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.post("/switches/my.switch/vlan-ranges", fixture="post_switch_hostname_vlan_ranges.txt")
+
+        assert_that(code, equal_to(201))
+
+    def test_add_vlans_with_an_invalid_range(self):
+        self.switch_mock.should_receive('add_vlans').never()
+
+        result, code = self.post("/switches/my.switch/vlan-ranges", raw_data="300-100")
+
+        assert_that(code, equal_to(400))
+        assert_that(result, equal_to({'error': 'Vlan number is invalid'}))
+
+    def test_remove_vlans(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('remove_vlans').with_args(VlanSet([10, 100, 101, 102])).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.delete("/switches/my.switch/vlan-ranges/10,100-102")
+
+        assert_that(code, equal_to(204))
+
     def test_configure_switch_port_access(self):
         self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
         self.switch_mock.should_receive('connect').once().ordered()
@@ -679,6 +912,71 @@ class SwitchApiTest(BaseApiTest):
 
         assert_that(code, equal_to(204))
 
+    def test_add_trunk_vlan_ranges(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('add_trunk_vlans').with_args('FastEthernet0/4', VlanSet.from_ranges([(10, 20), (30, 30)])).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.post("/switches/my.switch/interfaces/FastEthernet0/4/trunk-vlan-ranges",
+                                 fixture="post_switch_hostname_interfaces_intname_trunkvlanranges.txt")
+
+        assert_that(code, equal_to(204))
+
+    def test_edit_interfaces(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('edit_interfaces').with_args(
+            ["FastEthernet0/1", "FastEthernet0/2", "FastEthernet0/3"],
+            description="Rack 12 servers", state=ON, mtu=None, access_vlan=1000).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.put("/switches/my.switch/interfaces",
+                                fixture="put_switch_hostname_interfaces.json")
+
+        assert_that(code, equal_to(204))
+
+    def test_edit_interfaces_shutdown(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('edit_interfaces').with_args(
+            ["FastEthernet0/1"], description=None, state=OFF, mtu=5000, access_vlan=None).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.put("/switches/my.switch/interfaces",
+                                data={"interfaces": ["FastEthernet0/1"], "shutdown": True, "mtu": 5000})
+
+        assert_that(code, equal_to(204))
+
+    def test_edit_interfaces_with_a_bad_access_vlan(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('edit_interfaces').never()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.put("/switches/my.switch/interfaces",
+                                data={"interfaces": ["FastEthernet0/1"], "access_vlan": 5000})
+
+        assert_that(code, equal_to(400))
+        assert_that(result, equal_to({'error': 'Vlan number is invalid'}))
+
+    def test_edit_interfaces_with_wrong_params(self):
+        result, code = self.put("/switches/my.switch/interfaces",
+                                data={"interfaces": ["FastEthernet0/1"], "mtu": "big"})
+
+        assert_that(code, equal_to(400))
+        assert_that(result['error'], is_('Expected "int" type for key mtu, got "unicode"'))
+
+    def test_remove_trunk_vlan_ranges(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('remove_trunk_vlans').with_args('FastEthernet0/4', VlanSet([10, 11, 30])).once().ordered()
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.delete("/switches/my.switch/interfaces/FastEthernet0/4/trunk-vlan-ranges/10-11,30")
+
+        assert_that(code, equal_to(204))
+
     def test_add_bond_trunk_vlan(self):
         self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
         self.switch_mock.should_receive('connect').once().ordered()
@@ -1338,6 +1636,54 @@ class SwitchApiTest(BaseApiTest):
         assert_that(code, equal_to(200))
         assert_that(result, matches_fixture("get_switch_hostname_bonds_v2.json"))
 
+    def test_get_bonds_is_correctly_serialized_v3(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_bonds').once().ordered().and_return([
+            Bond(
+                number=3,
+                link_speed='1g',
+                shutdown=True,
+                port_mode=ACCESS,
+                access_vlan=1999,
+                mtu=1500),
+            Bond(
+                number=6,
+                link_speed='10g',
+                shutdown=False,
+                port_mode=DYNAMIC,
+                access_vlan=1999,
+                trunk_native_vlan=2999,
+                trunk_vlans=[3001, 3000, 3002]),
+            Bond(
+                number=4,
+                members=["ge-0/0/1", "ge-1/0/1"],
+                shutdown=False,
+                port_mode=TRUNK,
+                trunk_native_vlan=2999,
+                trunk_vlans=[3001, 3000, 3002]),
+        ])
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.get("/switches/my.switch/bonds",
+                                headers={"Netman-Max-Version": "3"})
+
+        assert_that(code, equal_to(200))
+        assert_that(result, matches_fixture("get_switch_hostname_bonds_v3.json"))
+
+    def test_newer_clients_get_the_latest_version(self):
+        self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
+        self.switch_mock.should_receive('connect').once().ordered()
+        self.switch_mock.should_receive('get_bond').with_args(4).once().ordered().and_return(
+            Bond(number=4, port_mode=TRUNK, trunk_vlans=range(1, 4095)))
+        self.switch_mock.should_receive('disconnect').once().ordered()
+
+        result, code = self.get("/switches/my.switch/bonds/4",
+                                headers={"Netman-Max-Version": "4"})
+
+        assert_that(code, equal_to(200))
+        assert_that(result["trunk_vlans"], equal_to([[1, 4094]]))
+
     def test_get_bond_is_correctly_serialized_v2(self):
         self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
         self.switch_mock.should_receive('connect').once().ordered()
@@ -1508,6 +1854,21 @@ class SwitchApiTest(BaseApiTest):
         assert_that(code, equal_to(200))
         assert_that(result, matches_fixture("get_switch_hostname_versions.json"))
 
+    def test_flush_saves_the_pending_configuration_of_the_switch(self):
+        self.switch_factory.save_scheduler = flexmock()
+        self.switch_factory.save_scheduler.should_receive('flush').with_args('my.switch').once()
+
+        result, code = self.post("/switches/my.switch/flush")
+
+        assert_that(code, equal_to(204))
+
+    def test_flush_without_save_scheduler_does_nothing(self):
+        self.switch_factory.should_receive('get_switch').never()
+
+        result, code = self.post("/switches/my.switch/flush")
+
+        assert_that(code, equal_to(204))
+
     def test_uncaught_exceptions_are_formatted_correctly(self):
         self.switch_factory.should_receive('get_switch').with_args('my.switch').and_return(self.switch_mock).once().ordered()
         self.switch_mock.should_receive('connect').once().ordered()
@@ -1692,6 +2053,21 @@ class SwitchApiTest(BaseApiTest):
         assert_that(code, equal_to(404))
         assert_that(result, equal_to({'error': 'Vlan 2500 not found'}))
 
+    def test_a_session_call_keeps_its_query_string(self):
+        session_uuid = 'patate'
+
+        self.session_manager.should_receive("get_switch_for_session").with_args(session_uuid).and_return(self.switch_mock)
+        self.session_manager.should_receive("keep_alive").with_args(session_uuid).once()
+        self.switch_mock.should_receive('get_vlans').never()
+        self.switch_mock.should_receive('get_vlans_by_number').with_args(VlanSet([10])).and_return([
+            Vlan(10, "ten")
+        ]).once()
+
+        result, code = self.get("/switches-sessions/{}/vlans?numbers=10&fields=number".format(session_uuid))
+
+        assert_that(code, equal_to(200))
+        assert_that(result, equal_to([{"number": 10}]))
+
     def test_an_error_inside_a_session_call_is_properly_relayed_with_exception_marshalling_when_requested(self):
         session_uuid = 'patate'
 
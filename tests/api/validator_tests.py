@@ -20,7 +20,7 @@ from hamcrest import is_, equal_to
 
 from netman.api.api_utils import MultiContext, BadRequest
 from netman.api.validators import is_vlan_number, is_boolean, Vlan, Interface, is_dict_with, \
-    optional, is_type
+    optional, is_type, is_vlan_ranges
 from netman.core.objects.exceptions import BadVlanNumber
 
 
@@ -50,6 +50,15 @@ class DecoratorTests(unittest.TestCase):
     def test_content_vlan_invalid_number(self):
         self.assertRaises(BadVlanNumber, is_vlan_number, 2888888)
 
+    def test_content_vlan_ranges(self):
+        assert_that(is_vlan_ranges('10, 20,100-120')['vlans'].ranges, is_([(10, 10), (20, 20), (100, 120)]))
+
+    def test_content_vlan_ranges_invalid(self):
+        self.assertRaises(BadVlanNumber, is_vlan_ranges, '')
+        self.assertRaises(BadVlanNumber, is_vlan_ranges, '10,patate')
+        self.assertRaises(BadVlanNumber, is_vlan_ranges, '10-5000')
+        self.assertRaises(BadVlanNumber, is_vlan_ranges, '120-100')
+
     def test_content_shutdown_options_true(self):
         self.assertEquals(is_boolean('true'), {'state': True})
 
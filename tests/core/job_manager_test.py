@@ -0,0 +1,98 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from unittest import TestCase
+
+from hamcrest import assert_that, is_, has_length
+
+from netman.core.job_manager import JobManager
+from netman.core.objects.exceptions import UnknownJob, TooManyJobs
+from netman.core.objects.job import PENDING, RUNNING, DONE, FAILED
+
+
+class JobManagerTest(TestCase):
+    def setUp(self):
+        self.job_manager = JobManager(workers=2, max_jobs=3, job_expiration=60)
+
+    def test_submit_runs_the_operation_in_the_background(self):
+        job_id = self.job_manager.submit(lambda: (200, ["patate"]))
+        self.job_manager.queue.join()
+
+        job = self.job_manager.get_job(job_id)
+        assert_that(job.status, is_(DONE))
+        assert_that(job.result, is_((200, ["patate"])))
+        assert_that(job.error, is_(None))
+
+    def test_a_failing_operation_marks_the_job_as_failed(self):
+        def operation():
+            raise ValueError("patate")
+
+        job_id = self.job_manager.submit(operation)
+        self.job_manager.queue.join()
+
+        job = self.job_manager.get_job(job_id)
+        assert_that(job.status, is_(FAILED))
+        assert_that(job.error, is_("patate"))
+
+    def test_workers_are_bounded(self):
+        release = threading.Event()
+        started = threading.Semaphore(0)
+
+        def operation():
+            started.release()
+            release.wait()
+
+        job_ids = [self.job_manager.submit(operation) for _ in range(3)]
+        started.acquire()
+        started.acquire()
+
+        assert_that(self.job_manager.threads, has_length(2))
+        assert_that([self.job_manager.get_job(i).status for i in job_ids], is_([RUNNING, RUNNING, PENDING]))
+
+        release.set()
+        self.job_manager.queue.join()
+
+    def test_unknown_job(self):
+        with self.assertRaises(UnknownJob):
+            self.job_manager.get_job("patate")
+
+    def test_finished_jobs_expire(self):
+        self.job_manager.job_expiration = 0
+        job_id = self.job_manager.submit(lambda: (204, None))
+        self.job_manager.queue.join()
+
+        with self.assertRaises(UnknownJob):
+            self.job_manager.get_job(job_id)
+
+    def test_the_oldest_finished_job_makes_room_when_the_store_is_full(self):
+        job_ids = [self.job_manager.submit(lambda: (204, None)) for _ in range(3)]
+        self.job_manager.queue.join()
+
+        self.job_manager.submit(lambda: (204, None))
+
+        with self.assertRaises(UnknownJob):
+            self.job_manager.get_job(job_ids[0])
+        assert_that(self.job_manager.get_job(job_ids[1]).status, is_(DONE))
+
+    def test_submit_is_refused_when_the_store_is_full_of_unfinished_jobs(self):
+        release = threading.Event()
+        for _ in range(3):
+            self.job_manager.submit(release.wait)
+
+        with self.assertRaises(TooManyJobs):
+            self.job_manager.submit(release.wait)
+
+        release.set()
+        self.job_manager.queue.join()
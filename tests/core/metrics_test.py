@@ -0,0 +1,97 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import TestCase
+
+from flexmock import flexmock, flexmock_teardown
+from hamcrest import assert_that, is_, contains_string, has_length
+
+from netman.core import metrics
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        self.original_registry, self.original_hooks = metrics.registry, metrics.hooks
+        self.registry = metrics.registry = metrics.Metrics(buckets=(0.1, 1.0))
+        metrics.hooks = [metrics.record_in_registry, metrics.record_in_request]
+
+    def tearDown(self):
+        metrics.registry, metrics.hooks = self.original_registry, self.original_hooks
+        flexmock_teardown()
+
+    def test_timed_commands_are_labeled_with_the_current_operation(self):
+        flexmock(metrics.time).should_receive("time").and_return(10.0).and_return(10.0).and_return(10.5).and_return(10.75)
+
+        with metrics.operation("cisco", "get_vlans"):
+            with metrics.timed("ssh", "show vlan") as measure:
+                measure.received_bytes = 1234
+
+        histogram = self.registry.commands[("cisco", "get_vlans", "ssh")]
+        assert_that(histogram.count, is_(1))
+        assert_that(histogram.sum, is_(0.5))
+        assert_that(histogram.counts, is_([0, 1]))
+        assert_that(self.registry.received_bytes[("cisco", "get_vlans", "ssh")], is_(1234))
+        assert_that(self.registry.operations[("cisco", "get_vlans")].sum, is_(0.75))
+
+    def test_nested_operations_are_attributed_to_the_outermost_one(self):
+        with metrics.operation("cisco", "add_vlan"):
+            with metrics.operation("cisco", "get_vlan"):
+                with metrics.timed("ssh", "show vlan 1000"):
+                    pass
+
+        assert_that(self.registry.commands.keys(), is_([("cisco", "add_vlan", "ssh")]))
+        assert_that(self.registry.operations.keys(), is_([("cisco", "add_vlan")]))
+
+    def test_prometheus_format(self):
+        with metrics.operation("juniper", "get_vlans"):
+            with metrics.timed("netconf", "get-config") as measure:
+                measure.received_bytes = 100
+
+        text = self.registry.to_prometheus()
+
+        assert_that(text, contains_string("# TYPE netman_command_duration_seconds histogram"))
+        assert_that(text, contains_string('netman_command_duration_seconds_bucket{kind="netconf",le="0.1",model="juniper",operation="get_vlans"} 1'))
+        assert_that(text, contains_string('netman_command_duration_seconds_bucket{kind="netconf",le="+Inf",model="juniper",operation="get_vlans"} 1'))
+        assert_that(text, contains_string('netman_command_duration_seconds_count{kind="netconf",model="juniper",operation="get_vlans"} 1'))
+        assert_that(text, contains_string('netman_command_received_bytes_total{kind="netconf",model="juniper",operation="get_vlans"} 100'))
+        assert_that(text, contains_string('netman_operation_duration_seconds_count{model="juniper",operation="get_vlans"} 1'))
+
+    def test_request_recording_survives_nested_requests(self):
+        metrics.start_recording()
+        with metrics.timed("ssh", "show vlan"):
+            pass
+
+        metrics.start_recording()
+        with metrics.timed("ssh", "show interfaces"):
+            pass
+        assert_that(metrics.stop_recording(), has_length(2))
+
+        with metrics.timed("ssh", "show run"):
+            pass
+        assert_that([m.command for m in metrics.stop_recording()], is_(["show vlan", "show interfaces", "show run"]))
+
+        with metrics.timed("ssh", "show version"):
+            pass
+        assert_that(metrics.stop_recording(), is_([]))
+
+    def test_a_failing_hook_does_not_break_the_command(self):
+        def failing_hook(measure):
+            raise ValueError()
+
+        metrics.hooks = [failing_hook, metrics.record_in_registry]
+
+        with metrics.timed("telnet", "show vlan"):
+            pass
+
+        assert_that(self.registry.commands[(None, None, "telnet")].count, is_(1))
@@ -16,6 +16,7 @@ from unittest import TestCase
 from flexmock import flexmock, flexmock_teardown
 from hamcrest import assert_that, is_
 
+from netman.core import metrics
 from netman.core.objects.exceptions import NetmanException
 from netman.core.objects.flow_control_switch import FlowControlSwitch
 from netman.core.objects.switch_base import SwitchBase
@@ -39,6 +40,24 @@ class FlowControlSwitchTest(TestCase):
 
         self.switch.get_vlan(1000)
 
+    def test_commands_are_attributed_to_the_model_and_the_operation(self):
+        def get_vlan(number):
+            with metrics.timed("ssh", "show vlan {}".format(number)):
+                pass
+
+        measures = []
+        self.wrapped_switch.should_receive("_connect").once().ordered()
+        self.wrapped_switch.should_receive("get_vlan").once().ordered().with_args(1000).replace_with(get_vlan)
+        self.wrapped_switch.should_receive("_disconnect").once().ordered()
+
+        original_hooks, metrics.hooks = metrics.hooks, [measures.append]
+        try:
+            self.switch.get_vlan(1000)
+        finally:
+            metrics.hooks = original_hooks
+
+        assert_that([(m.model, m.operation, m.command) for m in measures], is_([("cisco", "get_vlan", "show vlan 1000")]))
+
     def test_a_get_method_still_dc_if_raising(self):
         self.wrapped_switch.should_receive("_connect").once().ordered()
         self.wrapped_switch.should_receive("get_vlan").once().ordered().with_args(1000).and_raise(NetmanException)
@@ -371,3 +390,47 @@ class FlowControlSwitchTest(TestCase):
 
     def test_switch_contract_compliance_switch_descriptor(self):
         assert_that(self.switch.switch_descriptor, is_(self.wrapped_switch.switch_descriptor))
+
+    def test_a_committed_operation_marks_the_switch_dirty_on_the_save_scheduler(self):
+        save_scheduler = flexmock()
+        switch = FlowControlSwitch(self.wrapped_switch, self.lock, save_scheduler=save_scheduler)
+
+        self.lock.should_receive("acquire").once().ordered()
+        self.wrapped_switch.should_receive("_connect").once().ordered()
+        self.wrapped_switch.should_receive("_start_transaction").once().ordered()
+        self.wrapped_switch.should_receive("add_vlan").once().ordered().with_args(1000)
+        self.wrapped_switch.should_receive("commit_transaction").once().ordered()
+        save_scheduler.should_receive("mark_dirty").with_args(switch).once().ordered()
+        self.wrapped_switch.should_receive("_end_transaction").once().ordered()
+        self.wrapped_switch.should_receive("_disconnect").once().ordered()
+        self.lock.should_receive("release").once().ordered()
+
+        switch.add_vlan(1000)
+
+    def test_a_failed_operation_leaves_the_switch_clean(self):
+        save_scheduler = flexmock()
+        switch = FlowControlSwitch(self.wrapped_switch, self.lock, save_scheduler=save_scheduler)
+
+        self.lock.should_receive("acquire").once()
+        self.wrapped_switch.should_receive("_connect").once()
+        self.wrapped_switch.should_receive("_start_transaction").once()
+        self.wrapped_switch.should_receive("add_vlan").with_args(1000).and_raise(NetmanException)
+        self.wrapped_switch.should_receive("rollback_transaction").once()
+        save_scheduler.should_receive("mark_dirty").never()
+        self.wrapped_switch.should_receive("_end_transaction").once()
+        self.wrapped_switch.should_receive("_disconnect").once()
+        self.lock.should_receive("release").once()
+
+        with self.assertRaises(NetmanException):
+            switch.add_vlan(1000)
+
+    def test_save_configuration_locks_and_connects_without_a_transaction(self):
+        self.lock.should_receive("acquire").once().ordered()
+        self.wrapped_switch.should_receive("_connect").once().ordered()
+        self.wrapped_switch.should_receive("save_configuration").once().ordered()
+        self.wrapped_switch.should_receive("_disconnect").once().ordered()
+        self.lock.should_receive("release").once().ordered()
+        self.wrapped_switch.should_receive("_start_transaction").never()
+        self.wrapped_switch.should_receive("commit_transaction").never()
+
+        self.switch.save_configuration()
@@ -0,0 +1,227 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from unittest import TestCase
+
+import mock
+from hamcrest import assert_that, is_, has_length, contains_inanyorder
+
+from netman.core.objects.exceptions import NetmanException, OperationNotCompleted, VlanAlreadyExist
+from netman.core.objects.group_commit_switch import GroupCommit, GroupCommitSwitch, PendingWrite
+from netman.core.objects.switch_base import SwitchBase
+from netman.core.objects.switch_descriptor import SwitchDescriptor
+
+
+class GroupCommitSwitchTest(TestCase):
+
+    def setUp(self):
+        self.device = FakeDevice()
+        self.lock = threading.Lock()
+        self.group_commit = GroupCommit()
+
+    def test_a_single_write_is_applied_and_committed(self):
+        switch = self._switch()
+
+        result = switch.add_vlan(1000)
+
+        assert_that(result, is_("vlan 1000 added"))
+        assert_that(self.device.commits, is_([[1000]]))
+        assert_that(switch.wrapped_switch.connected, is_(False))
+        assert_that(switch.wrapped_switch.in_transaction, is_(False))
+        assert_that(self.lock.locked(), is_(False))
+
+    def test_writes_arriving_during_a_commit_are_committed_together(self):
+        gate = threading.Event()
+        self.device.commit_gates = [gate]
+        results = {}
+
+        first = self._in_thread(results, 1000)
+        _wait_for(lambda: self.device.committing)
+        others = [self._in_thread(results, number) for number in (1001, 1002)]
+        _wait_for(lambda: len(self.group_commit.queue) == 2)
+        gate.set()
+
+        for thread in [first] + others:
+            thread.join(5)
+
+        assert_that(self.device.commits, has_length(2))
+        assert_that(self.device.commits[0], is_([1000]))
+        assert_that(self.device.commits[1], contains_inanyorder(1001, 1002))
+        assert_that(results, is_({1000: "vlan 1000 added", 1001: "vlan 1001 added", 1002: "vlan 1002 added"}))
+
+    def test_the_leader_hands_the_lead_to_the_next_writer_after_its_batch(self):
+        gates = [threading.Event(), threading.Event()]
+        self.device.commit_gates = list(gates)
+        results = {}
+
+        first = self._in_thread(results, 1000)
+        _wait_for(lambda: self.device.committing)
+        second = self._in_thread(results, 1001)
+        _wait_for(lambda: len(self.group_commit.queue) == 1)
+        gates[0].set()
+
+        first.join(5)
+        assert_that(first.is_alive(), is_(False))
+        assert_that(results, is_({1000: "vlan 1000 added"}))
+
+        _wait_for(lambda: self.device.committing)
+        gates[1].set()
+        second.join(5)
+
+        assert_that(self.device.commits, is_([[1000], [1001]]))
+        assert_that(results, is_({1000: "vlan 1000 added", 1001: "vlan 1001 added"}))
+        assert_that(self.group_commit.leading, is_(False))
+
+    def test_the_lead_is_released_when_the_leader_fails_outside_of_the_commit(self):
+        switch = self._switch()
+
+        with mock.patch.object(self.group_commit, "_commit", side_effect=RuntimeError("unexpected")):
+            with self.assertRaises(RuntimeError):
+                switch.add_vlan(1000)
+
+        assert_that(self.group_commit.leading, is_(False))
+        assert_that(switch.add_vlan(1001), is_("vlan 1001 added"))
+
+    def test_a_failing_write_gets_its_error_and_the_others_are_committed(self):
+        self.device.running = [1001]
+        writes = [_add_vlan(number) for number in (1000, 1001, 1002)]
+
+        self.group_commit._commit(self._switch(), writes)
+
+        assert_that(self.device.commits, is_([[1000, 1002]]))
+        assert_that(writes[0].outcome(), is_("vlan 1000 added"))
+        assert_that(writes[2].outcome(), is_("vlan 1002 added"))
+        with self.assertRaises(VlanAlreadyExist):
+            writes[1].outcome()
+
+    def test_a_failing_commit_of_many_writes_is_retried_one_write_at_a_time(self):
+        self.device.invalid_on_commit = 1001
+        writes = [_add_vlan(number) for number in (1000, 1001, 1002)]
+
+        self.group_commit._commit(self._switch(), writes)
+
+        assert_that(self.device.commits, is_([[1000], [1002]]))
+        assert_that(writes[0].outcome(), is_("vlan 1000 added"))
+        assert_that(writes[2].outcome(), is_("vlan 1002 added"))
+        with self.assertRaises(OperationNotCompleted):
+            writes[1].outcome()
+
+    def test_a_failure_to_connect_is_raised_to_every_write(self):
+        switch = self._switch()
+        switch.wrapped_switch._connect = mock.Mock(side_effect=NetmanException("unreachable"))
+        writes = [_add_vlan(number) for number in (1000, 1001)]
+
+        self.group_commit._commit(switch, writes)
+
+        for write in writes:
+            assert_that(write.woken.is_set(), is_(True))
+            with self.assertRaises(NetmanException):
+                write.outcome()
+        assert_that(self.lock.locked(), is_(False))
+
+    def test_writes_within_a_transaction_are_not_grouped(self):
+        switch = self._switch()
+        switch.start_transaction()
+        switch.add_vlan(1000)
+        switch.add_vlan(1001)
+
+        assert_that(self.group_commit.queue, has_length(0))
+        assert_that(self.device.commits, has_length(0))
+
+        switch.commit_transaction()
+        switch.end_transaction()
+
+        assert_that(self.device.commits, is_([[1000, 1001]]))
+
+    def test_committed_writes_mark_the_switch_dirty(self):
+        save_scheduler = mock.Mock()
+        switch = GroupCommitSwitch(FakeCandidateSwitch(self.device), self.lock, self.group_commit,
+                                   save_scheduler=save_scheduler)
+
+        switch.add_vlan(1000)
+
+        save_scheduler.mark_dirty.assert_called_once_with(switch)
+
+    def _switch(self):
+        return GroupCommitSwitch(FakeCandidateSwitch(self.device), self.lock, self.group_commit)
+
+    def _in_thread(self, results, number):
+        def add_vlan():
+            results[number] = self._switch().add_vlan(number)
+
+        thread = threading.Thread(target=add_vlan)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+
+class FakeDevice(object):
+    def __init__(self):
+        self.running = []
+        self.commits = []
+        self.committing = False
+        self.commit_gates = []
+        self.invalid_on_commit = None
+
+
+class FakeCandidateSwitch(SwitchBase):
+    def __init__(self, device):
+        super(FakeCandidateSwitch, self).__init__(SwitchDescriptor("juniper", "my.switch"))
+        self.device = device
+        self.candidate = []
+
+    def _connect(self):
+        pass
+
+    def _disconnect(self):
+        pass
+
+    def _start_transaction(self):
+        self.candidate = list(self.device.running)
+
+    def _end_transaction(self):
+        pass
+
+    def add_vlan(self, number, name=None):
+        if number in self.candidate:
+            raise VlanAlreadyExist(number)
+        self.candidate.append(number)
+        return "vlan {} added".format(number)
+
+    def commit_transaction(self):
+        self.device.committing = True
+        if len(self.device.commit_gates) > 0:
+            self.device.commit_gates.pop(0).wait(5)
+        self.device.committing = False
+        if self.device.invalid_on_commit in self.candidate:
+            raise OperationNotCompleted("invalid vlan {}".format(self.device.invalid_on_commit))
+        self.device.commits.append([n for n in self.candidate if n not in self.device.running])
+        self.device.running = list(self.candidate)
+
+    def rollback_transaction(self):
+        self.candidate = list(self.device.running)
+
+
+def _add_vlan(number):
+    return PendingWrite("add_vlan", (number,), {})
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.01)
@@ -0,0 +1,108 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import pickle
+import sys
+import unittest
+
+from hamcrest import assert_that, equal_to, is_, is_not, less_than, contains_string, \
+    same_instance
+
+from netman.core.objects.bond import Bond
+from netman.core.objects.interface import Interface
+from netman.core.objects.mac_address import MacAddress
+from netman.core.objects.port_modes import TRUNK
+from netman.core.objects.switch_descriptor import SwitchDescriptor
+from netman.core.objects.vlan import Vlan
+
+OBJECTS = 100000
+
+
+class ModelTest(unittest.TestCase):
+
+    def test_models_are_equal_when_all_their_attributes_are(self):
+        assert_that(Bond(number=1, trunk_vlans=[1, 2]), equal_to(Bond(number=1, trunk_vlans=[1, 2])))
+        assert_that(Bond(number=1, trunk_vlans=[1, 2]), is_not(equal_to(Bond(number=1, trunk_vlans=[1, 3]))))
+        assert_that(Bond(number=1, trunk_vlans=[1, 2]), is_not(equal_to(Bond(number=2, trunk_vlans=[1, 2]))))
+
+    def test_models_of_another_type_are_not_equal(self):
+        assert_that(Interface(name="ge-0/0/1"), is_not(equal_to(Vlan(name="ge-0/0/1"))))
+
+    def test_models_have_no_instance_dictionary(self):
+        for model in [Vlan(), Interface(), Bond(), MacAddress(1, "00:11:22:33:44:55", "ge-0/0/1", "agent")]:
+            assert_that(hasattr(model, "__dict__"), is_(False))
+
+    def test_as_dict_holds_the_attributes_of_the_whole_hierarchy(self):
+        bond = Bond(number=4, port_mode=TRUNK)
+
+        assert_that(bond.as_dict(), equal_to(dict(
+            number=4, link_speed=None, members=[], shutdown=None, port_mode=TRUNK, access_vlan=None,
+            trunk_native_vlan=None, trunk_vlans=[], mtu=None, recovery_timeout=None)))
+
+    def test_as_dict_of_models_without_slots(self):
+        descriptor = SwitchDescriptor(model="juniper", hostname="my.switch")
+
+        assert_that(descriptor.as_dict()["hostname"], equal_to("my.switch"))
+        assert_that(descriptor, equal_to(SwitchDescriptor(model="juniper", hostname="my.switch")))
+
+    def test_repr_shows_the_attributes(self):
+        assert_that(repr(Interface(name="ge-0/0/1")), contains_string("<Interface {"))
+        assert_that(repr(Interface(name="ge-0/0/1")), contains_string("'name': 'ge-0/0/1'"))
+
+    def test_models_can_be_copied_and_pickled(self):
+        interface = Interface(name="ge-0/0/1", trunk_vlans=[1, 2])
+
+        copied = copy.deepcopy(interface)
+        assert_that(copied, equal_to(interface))
+        assert_that(copied.trunk_vlans, is_not(same_instance(interface.trunk_vlans)))
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            assert_that(pickle.loads(pickle.dumps(interface, protocol)), equal_to(interface))
+
+    def test_a_hundred_thousand_objects_take_less_than_half_the_memory_of_dictionary_based_ones(self):
+        interfaces = [Interface(name="ge-0/0/{}".format(i)) for i in range(OBJECTS)]
+        macs = [MacAddress(i % 4094, "00:11:22:33:44:55", "ge-0/0/1", "agent") for i in range(OBJECTS)]
+        dict_interfaces = [DictionaryInterface(name="ge-0/0/{}".format(i)) for i in range(OBJECTS)]
+        dict_macs = [DictionaryMacAddress(i % 4094, "00:11:22:33:44:55", "ge-0/0/1", "agent") for i in range(OBJECTS)]
+
+        assert_that(_size_of(interfaces), less_than(_size_of(dict_interfaces) / 2))
+        assert_that(_size_of(macs), less_than(_size_of(dict_macs) / 2))
+
+
+class DictionaryInterface(object):
+    def __init__(self, name=None):
+        self.shutdown = None
+        self.port_mode = None
+        self.access_vlan = None
+        self.trunk_native_vlan = None
+        self.trunk_vlans = []
+        self.mtu = None
+        self.recovery_timeout = None
+        self.name = name
+        self.bond_master = None
+        self.auto_negotiation = None
+        self.force_up = None
+
+
+class DictionaryMacAddress(object):
+    def __init__(self, vlan, mac_address, interface, type):
+        self.mac_address = mac_address
+        self.interface = interface
+        self.vlan = vlan
+        self.type = type
+
+
+def _size_of(objects):
+    return sum(sys.getsizeof(o) + (sys.getsizeof(o.__dict__) if hasattr(o, "__dict__") else 0) for o in objects)
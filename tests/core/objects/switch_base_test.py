@@ -16,9 +16,12 @@ from unittest import TestCase
 from flexmock import flexmock, flexmock_teardown
 from hamcrest import assert_that, is_
 
-from netman.core.objects.exceptions import NetmanException
+from netman.core.objects.exceptions import NetmanException, UnknownVlan, VlanAlreadyExist
+from netman.core.objects.interface import Interface
+from netman.core.objects.interface_states import OFF
 from netman.core.objects.switch_base import SwitchBase, SwitchOperations
 from netman.core.objects.switch_descriptor import SwitchDescriptor
+from netman.core.objects.vlan import Vlan
 
 
 class SwitchBaseTest(TestCase):
@@ -63,6 +66,91 @@ class SwitchBaseTest(TestCase):
 
         assert_that(self.switch.connected, is_(True))
 
+    def test_get_vlans_by_number_filters_all_the_vlans_by_default(self):
+        self.switch.should_receive("get_vlans").once().and_return([Vlan(1), Vlan(2), Vlan(3)])
+
+        assert_that(self.switch.get_vlans_by_number([1, 3]), is_([Vlan(1), Vlan(3)]))
+
+    def test_get_interfaces_by_name_filters_all_the_interfaces_by_default(self):
+        self.switch.should_receive("get_interfaces").once().and_return([Interface("ge-0/0/1"), Interface("ge-0/0/2")])
+
+        assert_that(self.switch.get_interfaces_by_name(["ge-0/0/2"]), is_([Interface("ge-0/0/2")]))
+
+    def test_get_interfaces_by_name_prefix_filters_all_the_interfaces_by_default(self):
+        self.switch.should_receive("get_interfaces").once().and_return([Interface("ge-0/0/1"), Interface("xe-0/0/1")])
+
+        assert_that(self.switch.get_interfaces_by_name_prefix("xe-"), is_([Interface("xe-0/0/1")]))
+
+    def test_add_vlans_adds_each_vlan_by_default(self):
+        self.switch.should_receive("get_vlans_by_number").with_args([2, 3]).once().and_return([]).ordered()
+        self.switch.should_receive("add_vlan").with_args(2).once().ordered()
+        self.switch.should_receive("add_vlan").with_args(3).once().ordered()
+
+        self.switch.add_vlans([2, 3])
+
+    def test_add_vlans_adds_nothing_when_a_vlan_already_exists(self):
+        self.switch.should_receive("get_vlans_by_number").with_args([2, 3]).once().and_return([Vlan(3)])
+        self.switch.should_receive("add_vlan").never()
+
+        with self.assertRaises(VlanAlreadyExist) as expect:
+            self.switch.add_vlans([2, 3])
+
+        assert_that(str(expect.exception), is_("Vlan 3 already exists"))
+
+    def test_remove_vlans_removes_each_vlan_by_default(self):
+        self.switch.should_receive("get_vlans_by_number").with_args([2, 3]).once().and_return([Vlan(2), Vlan(3)]).ordered()
+        self.switch.should_receive("remove_vlan").with_args(2).once().ordered()
+        self.switch.should_receive("remove_vlan").with_args(3).once().ordered()
+
+        self.switch.remove_vlans([2, 3])
+
+    def test_remove_vlans_removes_nothing_when_a_vlan_is_missing(self):
+        self.switch.should_receive("get_vlans_by_number").with_args([2, 3]).once().and_return([Vlan(3)])
+        self.switch.should_receive("remove_vlan").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.remove_vlans([2, 3])
+
+        assert_that(str(expect.exception), is_("Vlan 2 not found"))
+
+    def test_add_trunk_vlans_adds_each_vlan_by_default(self):
+        self.switch.should_receive("get_vlans_by_number").with_args([2, 3]).once().and_return([Vlan(2), Vlan(3)]).ordered()
+        self.switch.should_receive("add_trunk_vlan").with_args("eth0", 2).once().ordered()
+        self.switch.should_receive("add_trunk_vlan").with_args("eth0", 3).once().ordered()
+
+        self.switch.add_trunk_vlans("eth0", [2, 3])
+
+    def test_add_trunk_vlans_adds_nothing_when_a_vlan_is_missing(self):
+        self.switch.should_receive("get_vlans_by_number").with_args([2, 3]).once().and_return([Vlan(2)])
+        self.switch.should_receive("add_trunk_vlan").never()
+
+        with self.assertRaises(UnknownVlan) as expect:
+            self.switch.add_trunk_vlans("eth0", [2, 3])
+
+        assert_that(str(expect.exception), is_("Vlan 3 not found"))
+
+    def test_remove_trunk_vlans_removes_each_vlan_by_default(self):
+        self.switch.should_receive("remove_trunk_vlan").with_args("eth0", 2).once().ordered()
+        self.switch.should_receive("remove_trunk_vlan").with_args("eth0", 3).once().ordered()
+
+        self.switch.remove_trunk_vlans("eth0", [2, 3])
+
+    def test_edit_interfaces_sets_each_given_attribute_on_each_interface_by_default(self):
+        self.switch.should_receive("set_interface_description").with_args("eth0", "uplink").once().ordered()
+        self.switch.should_receive("set_interface_state").with_args("eth0", OFF).once().ordered()
+        self.switch.should_receive("set_interface_description").with_args("eth1", "uplink").once().ordered()
+        self.switch.should_receive("set_interface_state").with_args("eth1", OFF).once().ordered()
+        self.switch.should_receive("set_interface_mtu").never()
+        self.switch.should_receive("set_access_vlan").never()
+
+        self.switch.edit_interfaces(["eth0", "eth1"], description="uplink", state=OFF)
+
+    def test_edit_interfaces_sets_the_mtu_and_access_vlan_by_default(self):
+        self.switch.should_receive("set_interface_mtu").with_args("eth0", 5000).once().ordered()
+        self.switch.should_receive("set_access_vlan").with_args("eth0", 2).once().ordered()
+
+        self.switch.edit_interfaces(["eth0"], mtu=5000, access_vlan=2)
+
     def test_start_transaction_sets_an_internal_flag(self):
         self.switch.should_receive("_start_transaction").once()
 
@@ -0,0 +1,130 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import pickle
+import sys
+import unittest
+
+from hamcrest import assert_that, equal_to, is_, less_than
+
+from netman.core.objects.interface import Interface
+from netman.core.objects.vlan_set import VlanSet
+
+PORTS = 48
+
+
+class VlanSetTest(unittest.TestCase):
+
+    def test_vlans_are_kept_sorted_as_ranges(self):
+        vlans = VlanSet([5, 1, 3, 2, 10, 2])
+
+        assert_that(vlans.ranges, equal_to([(1, 3), (5, 5), (10, 10)]))
+        assert_that(list(vlans), equal_to([1, 2, 3, 5, 10]))
+        assert_that(vlans.to_ranges_string(), equal_to("1-3,5,10"))
+
+    def test_it_behaves_like_the_list_of_its_vlans(self):
+        vlans = VlanSet([1, 2, 3, 5])
+
+        assert_that(vlans, equal_to([1, 2, 3, 5]))
+        assert_that([1, 2, 3, 5], equal_to(vlans))
+        assert_that(vlans != [1, 2, 3], is_(True))
+        assert_that(len(vlans), equal_to(4))
+        assert_that(vlans[0], equal_to(1))
+        assert_that(vlans[3], equal_to(5))
+        assert_that(vlans[-1], equal_to(5))
+        assert_that(vlans[1:3], equal_to([2, 3]))
+        assert_that(vlans.index(5), equal_to(3))
+        assert_that(sorted(vlans), equal_to([1, 2, 3, 5]))
+        assert_that(bool(VlanSet()), is_(False))
+
+        with self.assertRaises(IndexError):
+            vlans[4]
+        with self.assertRaises(ValueError):
+            vlans.index(4)
+
+    def test_membership(self):
+        vlans = VlanSet.from_ranges([(1, 100), (200, 300)])
+
+        assert_that(1 in vlans, is_(True))
+        assert_that(100 in vlans, is_(True))
+        assert_that(150 in vlans, is_(False))
+        assert_that(250 in vlans, is_(True))
+        assert_that(301 in vlans, is_(False))
+        assert_that(0 in vlans, is_(False))
+
+    def test_adding_merges_the_ranges(self):
+        vlans = VlanSet.from_ranges([(1, 10), (20, 30)])
+
+        vlans.append(11)
+        assert_that(vlans.ranges, equal_to([(1, 11), (20, 30)]))
+
+        vlans.add_range(12, 19)
+        assert_that(vlans.ranges, equal_to([(1, 30)]))
+
+        vlans += [40, 41]
+        vlans.extend(VlanSet([35]))
+        assert_that(vlans.ranges, equal_to([(1, 30), (35, 35), (40, 41)]))
+
+    def test_removing_splits_the_ranges(self):
+        vlans = VlanSet.from_ranges([(1, 10)])
+
+        vlans.remove(5)
+        assert_that(vlans.ranges, equal_to([(1, 4), (6, 10)]))
+
+        vlans.remove_range(1, 4)
+        assert_that(vlans.ranges, equal_to([(6, 10)]))
+
+        with self.assertRaises(ValueError):
+            vlans.remove(5)
+
+    def test_union_and_difference(self):
+        trunk = VlanSet.from_ranges([(1, 4094)])
+
+        assert_that((trunk - VlanSet.from_ranges([(100, 199)])).ranges, equal_to([(1, 99), (200, 4094)]))
+        assert_that((trunk - [1, 4094]).ranges, equal_to([(2, 4093)]))
+        assert_that((VlanSet([1]) | VlanSet([2])).ranges, equal_to([(1, 2)]))
+        assert_that([3] + VlanSet([1]), equal_to([1, 3]))
+
+    def test_copies_and_pickles(self):
+        vlans = VlanSet([1, 2, 3])
+
+        copied = copy.deepcopy(vlans)
+        copied.append(4)
+        assert_that(vlans, equal_to([1, 2, 3]))
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            assert_that(pickle.loads(pickle.dumps(vlans, protocol)), equal_to(vlans))
+            assert_that(pickle.loads(pickle.dumps(VlanSet(), protocol)), equal_to(VlanSet()))
+
+    def test_interfaces_keep_their_trunk_vlans_in_a_vlan_set(self):
+        interface = Interface(trunk_vlans=[3, 1, 2])
+
+        assert_that(interface.trunk_vlans, is_(VlanSet))
+        assert_that(interface.trunk_vlans, equal_to([1, 2, 3]))
+        assert_that(interface, equal_to(Interface(trunk_vlans=[1, 2, 3])))
+
+    def test_all_vlans_trunks_take_a_fraction_of_the_memory_of_lists(self):
+        lists = [range(1, 4095) for _ in range(PORTS)]
+        vlan_sets = [VlanSet.from_ranges([(1, 4094)]) for _ in range(PORTS)]
+
+        assert_that(_size_of(vlan_sets), less_than(_size_of(lists) / 100))
+
+
+def _size_of(vlan_lists):
+    total = 0
+    for vlans in vlan_lists:
+        items = vlans.ranges if isinstance(vlans, VlanSet) else vlans
+        total += sys.getsizeof(vlans) + sys.getsizeof(items) + sum(sys.getsizeof(i) for i in items)
+    return total
@@ -0,0 +1,110 @@
+# Copyright 2019 Internap.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from unittest import TestCase
+
+from hamcrest import assert_that, is_, has_length
+
+from netman.core.objects.switch_descriptor import SwitchDescriptor
+from netman.core.save_scheduler import SaveScheduler
+
+
+class SaveSchedulerTest(TestCase):
+    def setUp(self):
+        self.scheduler = SaveScheduler(quiet_period=0.2, max_delay=0.5)
+        self.switch = SavingSwitch("my.switch")
+
+    def tearDown(self):
+        for pending in self.scheduler.pending.values():
+            pending.timer.cancel()
+
+    def test_a_dirty_switch_is_saved_once_after_the_quiet_period(self):
+        self.scheduler.mark_dirty(self.switch)
+        self.scheduler.mark_dirty(self.switch)
+
+        assert_that(self.scheduler.is_dirty("my.switch"), is_(True))
+        assert_that(self.switch.saved.wait(2), is_(True))
+        time.sleep(0.3)
+
+        assert_that(self.switch.saves, has_length(1))
+        assert_that(self.scheduler.is_dirty("my.switch"), is_(False))
+
+    def test_every_change_pushes_the_save_back_by_the_quiet_period(self):
+        self.scheduler.quiet_period = 0.4
+        self.scheduler.max_delay = 2
+
+        self.scheduler.mark_dirty(self.switch)
+        time.sleep(0.2)
+        self.scheduler.mark_dirty(self.switch)
+        time.sleep(0.3)
+
+        assert_that(self.switch.saves, has_length(0))
+        assert_that(self.switch.saved.wait(2), is_(True))
+
+    def test_changes_that_keep_coming_are_saved_after_the_max_delay(self):
+        started_at = time.time()
+        while not self.switch.saved.is_set() and time.time() - started_at < 2:
+            self.scheduler.mark_dirty(self.switch)
+            time.sleep(0.05)
+
+        assert_that(self.switch.saves, has_length(1))
+        assert_that(self.switch.saves[0] - started_at < 0.8, is_(True))
+
+    def test_flush_saves_right_away(self):
+        self.scheduler.mark_dirty(self.switch)
+
+        self.scheduler.flush("my.switch")
+
+        assert_that(self.switch.saves, has_length(1))
+        time.sleep(0.3)
+        assert_that(self.switch.saves, has_length(1))
+
+    def test_flush_of_a_clean_switch_does_nothing(self):
+        self.scheduler.flush("my.switch")
+
+        assert_that(self.switch.saves, has_length(0))
+
+    def test_a_failed_flush_is_raised(self):
+        self.switch.error = ValueError("patate")
+        self.scheduler.mark_dirty(self.switch)
+
+        with self.assertRaises(ValueError):
+            self.scheduler.flush("my.switch")
+
+    def test_flush_all_saves_every_dirty_switch_even_when_one_fails(self):
+        failing_switch = SavingSwitch("failing.switch")
+        failing_switch.error = ValueError("patate")
+        self.scheduler.mark_dirty(failing_switch)
+        self.scheduler.mark_dirty(self.switch)
+
+        self.scheduler.flush_all()
+
+        assert_that(self.switch.saves, has_length(1))
+        assert_that(self.scheduler.pending, is_({}))
+
+
+class SavingSwitch(object):
+    def __init__(self, hostname):
+        self.switch_descriptor = SwitchDescriptor(model="dell", hostname=hostname)
+        self.saves = []
+        self.saved = threading.Event()
+        self.error = None
+
+    def save_configuration(self):
+        if self.error:
+            raise self.error
+        self.saves.append(time.time())
+        self.saved.set()
@@ -12,11 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import subprocess
+import sys
 import unittest
 
-from hamcrest import assert_that, instance_of, is_, is_not
+from hamcrest import assert_that, instance_of, is_, is_not, empty
 import mock
+from pkg_resources import EntryPoint
+
+from netman.adapters.switches.juniper import standard
 from netman.core.objects.flow_control_switch import FlowControlSwitch
+from netman.core.objects.group_commit_switch import GroupCommit, GroupCommitSwitch
 
 from netman.core import switch_factory
 
@@ -95,6 +101,122 @@ class SwitchFactoryTest(unittest.TestCase):
         assert_that(switch.wrapped_switch.switch_descriptor,
                     is_(SwitchDescriptor(model='test_model', hostname='hostname')))
 
+    def test_switches_saving_on_commit_leave_the_save_to_the_save_scheduler(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        self.factory.save_scheduler = save_scheduler = mock.Mock()
+        switch_factory.factories['test_model'] = _FakeSavingSwitch
+
+        switch = self.factory.get_switch_by_descriptor(SwitchDescriptor(model='test_model', hostname='hostname'))
+
+        assert_that(switch.save_scheduler, is_(save_scheduler))
+        assert_that(switch.wrapped_switch.write_memory, is_(False))
+
+    def test_other_switches_are_not_given_the_save_scheduler(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        self.factory.save_scheduler = mock.Mock()
+
+        switch = self.factory.get_switch_by_descriptor(SwitchDescriptor(model='test_model', hostname='hostname'))
+
+        assert_that(switch.save_scheduler, is_(None))
+
+    def test_switches_supporting_group_commit_share_the_group_commit_of_their_descriptor(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        self.factory.group_commit = True
+        switch_factory.factories['test_model'] = _FakeGroupCommitSwitch
+
+        switch = self.factory.get_switch_by_descriptor(SwitchDescriptor(model='test_model', hostname='hostname'))
+        other_switch = self.factory.get_switch_by_descriptor(SwitchDescriptor(model='test_model', hostname='hostname'))
+
+        assert_that(switch, is_(instance_of(GroupCommitSwitch)))
+        assert_that(switch.group_commit, is_(instance_of(GroupCommit)))
+        assert_that(other_switch.group_commit, is_(switch.group_commit))
+
+    def test_switches_with_other_credentials_do_not_share_a_group_commit(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        self.factory.group_commit = True
+        switch_factory.factories['test_model'] = _FakeGroupCommitSwitch
+
+        switch = self.factory.get_switch_by_descriptor(
+            SwitchDescriptor(model='test_model', hostname='hostname', username='alice', password='a'))
+        other_switch = self.factory.get_switch_by_descriptor(
+            SwitchDescriptor(model='test_model', hostname='hostname', username='bob', password='b'))
+
+        assert_that(other_switch.group_commit, is_not(switch.group_commit))
+        assert_that(other_switch.lock, is_(switch.lock))
+
+    def test_group_commit_is_off_by_default(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        switch_factory.factories['test_model'] = _FakeGroupCommitSwitch
+
+        switch = self.factory.get_switch_by_descriptor(SwitchDescriptor(model='test_model', hostname='hostname'))
+
+        assert_that(switch, is_not(instance_of(GroupCommitSwitch)))
+
+    def test_deferred_edits_are_enabled_on_the_switches_supporting_them(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        self.factory.deferred_edits = True
+        switch_factory.factories['test_model'] = _FakeDeferringSwitch
+
+        switch = self.factory.get_switch_by_descriptor(SwitchDescriptor(model='test_model', hostname='hostname'))
+
+        assert_that(switch.wrapped_switch.deferred_edits, is_(True))
+
+    def test_deferred_edits_are_enabled_on_arista_switches(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        self.factory.deferred_edits = True
+
+        switch = self.factory.get_switch_by_descriptor(SwitchDescriptor(model='arista_http', hostname='hostname'))
+
+        assert_that(switch.wrapped_switch.deferred_edits, is_(True))
+
+    def test_deferred_edits_are_off_by_default(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        switch_factory.factories['test_model'] = _FakeDeferringSwitch
+
+        switch = self.factory.get_switch_by_descriptor(SwitchDescriptor(model='test_model', hostname='hostname'))
+
+        assert_that(switch.wrapped_switch.deferred_edits, is_(False))
+
+    def test_get_factory_imports_the_driver_on_first_use(self):
+        switch_factory.factories['test_lazy_model'] = "netman.adapters.switches.juniper.standard:netconf"
+        try:
+            assert_that(switch_factory.get_factory('test_lazy_model'), is_(standard.netconf))
+            assert_that(switch_factory.factories['test_lazy_model'], is_(standard.netconf))
+        finally:
+            switch_factory.factories.pop('test_lazy_model')
+
+    def test_every_builtin_model_can_be_resolved(self):
+        for model in list(switch_factory.factories):
+            assert_that(callable(switch_factory.get_factory(model)), is_(True))
+
+    def test_get_factory_falls_back_to_the_plugins_entry_point(self):
+        self.semaphore_mocks['hostname'] = mock.Mock()
+        entry_point = EntryPoint.parse("plugin_model = tests.core.switch_factory_test:_FakeSwitch")
+
+        with mock.patch('pkg_resources.iter_entry_points', return_value=[entry_point]) as iter_entry_points:
+            try:
+                switch = self.factory.get_anonymous_switch(hostname='hostname', model='plugin_model')
+            finally:
+                switch_factory.factories.pop('plugin_model', None)
+
+        iter_entry_points.assert_called_once_with("netman.switches", name='plugin_model')
+        assert_that(switch.wrapped_switch, is_(instance_of(_FakeSwitch)))
+
+    def test_get_factory_of_an_unknown_model(self):
+        with mock.patch('pkg_resources.iter_entry_points', return_value=[]):
+            with self.assertRaises(KeyError):
+                switch_factory.get_factory('patate')
+
+    def test_starting_the_server_does_not_import_the_drivers_dependencies(self):
+        heavy_modules = ['ncclient', 'lxml', 'pyeapi', 'paramiko', 'requests', 'telnetlib', 'pkg_resources']
+        loaded = subprocess.check_output([sys.executable, "-c", "; ".join([
+            "import sys",
+            "import netman.main",
+            "print(','.join(m for m in {} if m in sys.modules))".format(heavy_modules)
+        ])]).strip()
+
+        assert_that(loaded.split(",") if loaded else [], is_(empty()))
+
 
 class MockLockFactory(object):
 
@@ -107,3 +229,15 @@ class MockLockFactory(object):
 
 class _FakeSwitch(SwitchBase):
     pass
+
+
+class _FakeSavingSwitch(SwitchBase):
+    write_memory = True
+
+
+class _FakeDeferringSwitch(SwitchBase):
+    deferred_edits = False
+
+
+class _FakeGroupCommitSwitch(SwitchBase):
+    supports_group_commit = True